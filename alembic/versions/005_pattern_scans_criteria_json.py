@@ -0,0 +1,63 @@
+"""Store pattern_scans.criteria_met as JSON
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+Rows written before this revision hold a Python repr of the criteria list
+(``str(list)``); they are rewritten as JSON before the column type changes.
+"""
+import ast
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSON
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def _to_json(raw):
+    if raw is None:
+        return None
+    try:
+        json.loads(raw)
+        return raw
+    except ValueError:
+        pass
+    try:
+        value = ast.literal_eval(raw)
+    except (ValueError, SyntaxError):
+        value = [raw]
+    return json.dumps(list(value) if isinstance(value, (list, tuple, set)) else [value])
+
+
+def upgrade():
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, criteria_met FROM pattern_scans WHERE criteria_met IS NOT NULL"))
+    updates = [
+        {"id": row.id, "criteria": converted}
+        for row in rows
+        if (converted := _to_json(row.criteria_met)) != row.criteria_met
+    ]
+    if updates:
+        bind.execute(sa.text("UPDATE pattern_scans SET criteria_met = :criteria WHERE id = :id"), updates)
+
+    if bind.dialect.name == 'postgresql':
+        op.alter_column(
+            'pattern_scans', 'criteria_met',
+            type_=JSON(), existing_type=sa.Text(),
+            postgresql_using='criteria_met::json',
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.alter_column(
+            'pattern_scans', 'criteria_met',
+            type_=sa.Text(), existing_type=JSON(),
+            postgresql_using='criteria_met::text',
+        )
@@ -0,0 +1,158 @@
+"""Partition pattern_scans by month and add scan history rollups
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+On PostgreSQL the plain ``pattern_scans`` table is rebuilt as a table
+range-partitioned on ``scanned_at``. It gets one partition per month from
+the oldest row to two months ahead, plus a default partition. The primary
+key becomes ``(id, scanned_at)`` because a partitioned table's keys must
+include the partition column. Ids keep coming from the existing sequence.
+Later months are created by the nightly scan history job.
+
+SQLite keeps the plain table. The application moves its rows into monthly
+tables on first use (see ``app.services.scan_history``).
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    "id, ticker_id, pattern_type, score, entry_price, stop_price, target_price, risk_reward_ratio,"
+    " criteria_met, analysis, current_price, volume_dry_up, consolidation_days, chart_url, rs_rating, scanned_at"
+)
+MONTHS_AHEAD = 2
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _create_indexes():
+    op.create_index('ix_pattern_scans_id', 'pattern_scans', ['id'])
+    op.create_index('ix_pattern_scans_ticker_id', 'pattern_scans', ['ticker_id'])
+    op.create_index('ix_pattern_scans_pattern_type', 'pattern_scans', ['pattern_type'])
+    op.create_index('ix_pattern_scans_scanned_at', 'pattern_scans', ['scanned_at'])
+
+
+def upgrade():
+    op.create_table(
+        'pattern_scan_rollups',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('pattern_type', sa.String(length=50), nullable=False),
+        sa.Column('scans', sa.Integer(), nullable=False),
+        sa.Column('tickers', sa.Integer(), nullable=False),
+        sa.Column('avg_score', sa.Float(), nullable=True),
+        sa.Column('min_score', sa.Float(), nullable=True),
+        sa.Column('max_score', sa.Float(), nullable=True),
+        sa.Column('score_histogram', sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint('day', 'pattern_type')
+    )
+    op.create_table(
+        'ticker_pattern_seen',
+        sa.Column('ticker_id', sa.Integer(), nullable=False),
+        sa.Column('pattern_type', sa.String(length=50), nullable=False),
+        sa.Column('first_seen', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_seen', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('best_score', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['ticker_id'], ['tickers.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('ticker_id', 'pattern_type')
+    )
+    op.create_index('ix_ticker_pattern_seen_last_seen', 'ticker_pattern_seen', ['last_seen'])
+
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        op.create_index('ix_pattern_scans_pattern_scanned', 'pattern_scans', ['pattern_type', 'scanned_at'])
+        op.create_index('ix_pattern_scans_ticker_scanned', 'pattern_scans', ['ticker_id', 'scanned_at'])
+        return
+
+    sequence = bind.execute(sa.text("SELECT pg_get_serial_sequence('pattern_scans', 'id')")).scalar()
+    op.execute("ALTER TABLE pattern_scans RENAME TO pattern_scans_legacy")
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+    else:
+        sequence = 'pattern_scans_id_seq'
+        op.execute(f"CREATE SEQUENCE {sequence}")
+
+    op.execute(f"""
+        CREATE TABLE pattern_scans (
+            id INTEGER NOT NULL DEFAULT nextval('{sequence}'),
+            ticker_id INTEGER REFERENCES tickers (id),
+            pattern_type VARCHAR(50),
+            score DOUBLE PRECISION NOT NULL,
+            entry_price DOUBLE PRECISION,
+            stop_price DOUBLE PRECISION,
+            target_price DOUBLE PRECISION,
+            risk_reward_ratio DOUBLE PRECISION,
+            criteria_met JSON,
+            analysis TEXT,
+            current_price DOUBLE PRECISION,
+            volume_dry_up BOOLEAN DEFAULT false,
+            consolidation_days INTEGER,
+            chart_url TEXT,
+            rs_rating DOUBLE PRECISION,
+            scanned_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        ) PARTITION BY RANGE (scanned_at)
+    """)
+    op.execute("CREATE TABLE pattern_scans_default PARTITION OF pattern_scans DEFAULT")
+
+    now = datetime.now(timezone.utc)
+    oldest = bind.execute(sa.text("SELECT MIN(scanned_at) FROM pattern_scans_legacy")).scalar() or now
+    month = datetime(oldest.year, oldest.month, 1, tzinfo=timezone.utc)
+    last = _add_months(datetime(now.year, now.month, 1, tzinfo=timezone.utc), MONTHS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE pattern_scans_y{month.year:04d}m{month.month:02d} PARTITION OF pattern_scans"
+            f" FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+
+    op.execute(
+        f"INSERT INTO pattern_scans ({COLUMNS})"
+        f" SELECT {COLUMNS.replace('scanned_at', 'COALESCE(scanned_at, now())')} FROM pattern_scans_legacy"
+    )
+    op.execute("DROP TABLE pattern_scans_legacy")
+    op.execute(f"ALTER SEQUENCE {sequence} OWNED BY pattern_scans.id")
+    op.execute(f"SELECT setval('{sequence}', COALESCE((SELECT MAX(id) FROM pattern_scans), 0) + 1, false)")
+
+    op.execute("ALTER TABLE pattern_scans ADD PRIMARY KEY (id, scanned_at)")
+    _create_indexes()
+    op.create_index('ix_pattern_scans_pattern_scanned', 'pattern_scans', ['pattern_type', 'scanned_at'])
+    op.create_index('ix_pattern_scans_ticker_scanned', 'pattern_scans', ['ticker_id', 'scanned_at'])
+
+
+def downgrade():
+    op.drop_index('ix_pattern_scans_ticker_scanned', table_name='pattern_scans')
+    op.drop_index('ix_pattern_scans_pattern_scanned', table_name='pattern_scans')
+
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        sequence = bind.execute(sa.text("SELECT pg_get_serial_sequence('pattern_scans', 'id')")).scalar()
+        op.execute("ALTER TABLE pattern_scans RENAME TO pattern_scans_partitioned")
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+        for index in ('id', 'ticker_id', 'pattern_type', 'scanned_at'):
+            op.execute(f"DROP INDEX IF EXISTS ix_pattern_scans_{index}")
+        op.execute(
+            "CREATE TABLE pattern_scans (LIKE pattern_scans_partitioned INCLUDING DEFAULTS)"
+        )
+        op.execute(f"INSERT INTO pattern_scans SELECT {COLUMNS} FROM pattern_scans_partitioned")
+        op.execute("DROP TABLE pattern_scans_partitioned CASCADE")
+        op.execute("ALTER TABLE pattern_scans ADD PRIMARY KEY (id)")
+        op.execute(
+            "ALTER TABLE pattern_scans ADD FOREIGN KEY (ticker_id) REFERENCES tickers (id)"
+        )
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY pattern_scans.id")
+        _create_indexes()
+
+    op.drop_index('ix_ticker_pattern_seen_last_seen', table_name='ticker_pattern_seen')
+    op.drop_table('ticker_pattern_seen')
+    op.drop_table('pattern_scan_rollups')
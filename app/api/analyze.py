@@ -17,6 +17,7 @@ from app.core.metrics import (
     relative_strength_metrics,
     sanitize_series,
 )
+from app.services.access_tracker import record_access
 from app.services.cache import get_cache_service
 from app.infra.chartimg import build_analyze_chart
 from app.services.universe_store import universe_store
@@ -83,6 +84,7 @@ async def analyze(
         return duration_sec
 
     _update_request_state(request, ticker_clean, interval, "received")
+    record_access(ticker_clean, interval)
 
     cached = await cache.get(cache_key)
     if cached:
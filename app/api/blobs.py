@@ -0,0 +1,38 @@
+"""Blob endpoint: serves content-addressed files from the local blob store.
+
+A digest names immutable content, so responses carry a one-year
+``immutable`` Cache-Control and the digest as a strong ETag; revalidations
+with a matching ``If-None-Match`` get a bodyless 304.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from app.services.blob_store import get_blob_store
+
+router = APIRouter(prefix="/blobs", tags=["blobs"])
+
+DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/{digest}")
+async def get_blob(digest: str, request: Request):
+    """Serve a stored blob by its SHA-256 digest."""
+    if not DIGEST_RE.match(digest):
+        raise HTTPException(status_code=404, detail="Blob not found")
+
+    etag = f'"{digest}"'
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": etag}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+
+    blob = await asyncio.to_thread(get_blob_store().get, digest)
+    if blob is None:
+        raise HTTPException(status_code=404, detail="Blob not found")
+    return FileResponse(blob.path, media_type=blob.content_type, headers=headers)
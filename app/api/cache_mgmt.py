@@ -8,8 +8,10 @@ from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
 import logging
 
+from app.services.cache_analytics import get_keyspace_sampler, latest_snapshot, lookup_stats
 from app.services.multi_tier_cache import get_multi_tier_cache, CacheTier
 from app.services.cache_warmer import get_cache_warmer
+from app.services.database import run_db
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +22,7 @@ class CacheInvalidateRequest(BaseModel):
     """Request to invalidate cache entries"""
     key: Optional[str] = None
     pattern: Optional[str] = None
+    tags: Optional[List[str]] = None  # e.g. ["ticker:AAPL"], ["detector:2.0.0"]
     all_tiers: bool = True
 
 
@@ -34,6 +37,7 @@ class CacheSetRequest(BaseModel):
     value: Any
     data_type: str = "generic"
     tier: Optional[str] = None
+    tags: Optional[List[str]] = None
 
 
 @router.get("/stats")
@@ -96,16 +100,29 @@ async def invalidate_cache(request: CacheInvalidateRequest):
     Args:
         key: Specific cache key to invalidate (optional)
         pattern: Pattern to match multiple keys (e.g., "pattern:*", "ohlcv:AAPL:*")
+        tags: Tags to invalidate (e.g., ["ticker:AAPL"], ["type:pattern"], ["detector:2.0.0"]);
+            constant time regardless of cache size
         all_tiers: If true, invalidates across all cache tiers
 
     Returns:
-        Number of entries invalidated
+        Number of entries invalidated (new tag generations for tag invalidation)
     """
     try:
         cache = get_multi_tier_cache()
         count = 0
 
-        if request.pattern:
+        if request.tags:
+            generations = await cache.invalidate_tags(request.tags)
+            if not generations:
+                raise HTTPException(status_code=500, detail="Tag invalidation failed")
+            return {
+                "status": "success",
+                "invalidated": len(generations),
+                "tags": request.tags,
+                "generations": generations,
+            }
+
+        elif request.pattern:
             # Invalidate by pattern
             count = await cache.invalidate_pattern(request.pattern)
             logger.info(f"Invalidated {count} entries matching pattern: {request.pattern}")
@@ -116,7 +133,7 @@ async def invalidate_cache(request: CacheInvalidateRequest):
             logger.info(f"Invalidated {count} entries for key: {request.key}")
 
         else:
-            raise HTTPException(status_code=400, detail="Must provide either 'key' or 'pattern'")
+            raise HTTPException(status_code=400, detail="Must provide 'tags', 'key' or 'pattern'")
 
         return {
             "status": "success",
@@ -192,6 +209,7 @@ async def set_cache_entry(request: CacheSetRequest):
         value: Value to cache
         data_type: Type of data (pattern, price, chart, etc.)
         tier: Force specific tier (hot, warm, cdn) - optional
+        tags: Invalidation tags (e.g., ["ticker:AAPL"]) - optional
 
     Returns:
         Success status
@@ -207,7 +225,8 @@ async def set_cache_entry(request: CacheSetRequest):
             request.key,
             request.value,
             data_type=request.data_type,
-            tier=tier
+            tier=tier,
+            tags=request.tags,
         )
 
         if not success:
@@ -227,20 +246,25 @@ async def set_cache_entry(request: CacheSetRequest):
 
 
 @router.get("/get/{key}")
-async def get_cache_entry(key: str, data_type: str = Query("generic")):
+async def get_cache_entry(
+    key: str,
+    data_type: str = Query("generic"),
+    tags: Optional[List[str]] = Query(None),
+):
     """
     Get a cache entry
 
     Args:
         key: Cache key to retrieve
         data_type: Type of data (for tier selection)
+        tags: Tags the entry was stored with
 
     Returns:
         Cached value or 404 if not found
     """
     try:
         cache = get_multi_tier_cache()
-        value = await cache.get(key, data_type=data_type)
+        value = await cache.get(key, data_type=data_type, tags=tags)
 
         if value is None:
             raise HTTPException(status_code=404, detail="Cache entry not found")
@@ -258,6 +282,36 @@ async def get_cache_entry(key: str, data_type: str = Query("generic")):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/keyspace")
+async def get_keyspace_analytics(refresh: bool = Query(False, description="Run a sampling pass now")):
+    """
+    Get Redis keyspace analytics per key prefix
+
+    Returns:
+    - Keys, bytes and remaining-TTL histogram per prefix (last SCAN sampling pass)
+    - Largest keys
+    - Hit/miss counts per prefix seen by this worker
+    """
+    try:
+        sampler = get_keyspace_sampler()
+        if refresh:
+            snapshot = await sampler.run_pass()
+        else:
+            snapshot = await latest_snapshot(sampler.cache)
+
+        return {
+            "status": "success",
+            "data": {
+                "keyspace": snapshot,
+                "lookups": lookup_stats(),
+            }
+        }
+
+    except Exception as e:
+        logger.error(f"Error getting keyspace analytics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/health")
 async def cache_health():
     """
@@ -274,7 +328,7 @@ async def cache_health():
         # Check database health (if available)
         db_health = {"status": "not_configured"}
         if cache.db_service:
-            db_health = cache.db_service.health_check()
+            db_health = await run_db(cache.db_service.health_check)
 
         # Check CDN path
         cdn_health = {
@@ -5,6 +5,7 @@ import logging
 import time
 
 from app.services.charting import get_charting_service
+from app.services.access_tracker import record_access
 from app.services.cache import get_cache_service
 from app.infra.chartimg import build_analyze_chart
 
@@ -92,6 +93,7 @@ async def generate_chart(request: ChartRequest):
 
     try:
         logger.info(f"🎨 Generating chart for {request.ticker} with annotations")
+        record_access(request.ticker)
 
         # Try cache first (24 hour TTL for generated charts)
         cached_url = await cache.get_chart(request.ticker, request.interval)
@@ -208,6 +210,7 @@ async def generate_multi_timeframe_charts(request: MultiTimeframeChartRequest):
 
     try:
         logger.info(f"🎨 Generating multi-timeframe charts for {request.ticker}: {request.timeframes}")
+        record_access(request.ticker)
 
         # Generate charts for all timeframes concurrently
         chart_urls = await charting_service.generate_multi_timeframe_charts(
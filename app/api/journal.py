@@ -10,11 +10,24 @@ import csv
 from io import StringIO
 from fastapi.responses import StreamingResponse
 
-from app.services.database import get_database_service
+from app.services.database import get_database_service, run_db
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/journal", tags=["journal"])
 
+
+def _fetch(engine, statement, params=None) -> list:
+    """Run a read query and return its rows (blocking; call through ``run_db``)"""
+    with engine.connect() as conn:
+        return conn.execute(statement, params or {}).fetchall()
+
+
+def _write(engine, statement, params=None) -> list:
+    """Run a write in its own transaction; returns any RETURNING rows (blocking; call through ``run_db``)"""
+    with engine.begin() as conn:
+        result = conn.execute(statement, params or {})
+        return result.fetchall() if result.returns_rows else []
+
 class TradeCreate(BaseModel):
     ticker: str
     pattern: Optional[str] = None
@@ -82,31 +95,32 @@ async def log_trade(trade: TradeCreate):
         
         # Insert trade into database
         from sqlalchemy import text
-        with db.engine.begin() as conn:
-            result = conn.execute(
-                text("""
-                    INSERT INTO trades (
-                        ticker, pattern, entry_date, entry_price, stop_price,
-                        target_price, shares, notes, status, created_at
-                    )
-                    VALUES (
-                        :ticker, :pattern, :entry_date, :entry_price, :stop_price,
-                        :target_price, :shares, :notes, 'Open', NOW()
-                    )
-                    RETURNING id
-                """),
-                {
-                    "ticker": trade.ticker,
-                    "pattern": trade.pattern,
-                    "entry_date": trade.entry_date,
-                    "entry_price": trade.entry_price,
-                    "stop_price": trade.stop_price,
-                    "target_price": trade.target_price,
-                    "shares": trade.shares,
-                    "notes": trade.notes
-                }
-            )
-            trade_id = result.fetchone()[0]
+        inserted = await run_db(
+            _write,
+            db.engine,
+            text("""
+                INSERT INTO trades (
+                    ticker, pattern, entry_date, entry_price, stop_price,
+                    target_price, shares, notes, status, created_at
+                )
+                VALUES (
+                    :ticker, :pattern, :entry_date, :entry_price, :stop_price,
+                    :target_price, :shares, :notes, 'Open', NOW()
+                )
+                RETURNING id
+            """),
+            {
+                "ticker": trade.ticker,
+                "pattern": trade.pattern,
+                "entry_date": trade.entry_date,
+                "entry_price": trade.entry_price,
+                "stop_price": trade.stop_price,
+                "target_price": trade.target_price,
+                "shares": trade.shares,
+                "notes": trade.notes
+            }
+        )
+        trade_id = inserted[0][0]
         
         logger.info(f"Trade logged: {trade.ticker} @ ${trade.entry_price} x {trade.shares} shares")
         
@@ -161,9 +175,7 @@ async def get_trades(
         
         query += " ORDER BY entry_date DESC LIMIT :limit"
         
-        with db.engine.connect() as conn:
-            result = conn.execute(text(query), params)
-            rows = result.fetchall()
+        rows = await run_db(_fetch, db.engine, text(query), params)
         
         trades = []
         for row in rows:
@@ -207,17 +219,16 @@ async def update_trade(trade_id: int, update: TradeUpdate):
         from sqlalchemy import text
         
         # Fetch current trade
-        with db.engine.connect() as conn:
-            result = conn.execute(
-                text("SELECT entry_price, stop_price, shares FROM trades WHERE id = :id"),
-                {"id": trade_id}
-            )
-            row = result.fetchone()
-            
-            if not row:
-                raise HTTPException(status_code=404, detail="Trade not found")
-            
-            entry_price, stop_price, shares = row[0], row[1], row[2]
+        rows = await run_db(
+            _fetch,
+            db.engine,
+            text("SELECT entry_price, stop_price, shares FROM trades WHERE id = :id"),
+            {"id": trade_id}
+        )
+        if not rows:
+            raise HTTPException(status_code=404, detail="Trade not found")
+
+        entry_price, stop_price, shares = rows[0][0], rows[0][1], rows[0][2]
         
         # Calculate P&L and R-multiple if closing
         profit_loss = None
@@ -258,8 +269,7 @@ async def update_trade(trade_id: int, update: TradeUpdate):
         
         query = f"UPDATE trades SET {', '.join(set_clauses)} WHERE id = :id"
         
-        with db.engine.begin() as conn:
-            conn.execute(text(query), params)
+        await run_db(_write, db.engine, text(query), params)
         
         logger.info(f"Trade {trade_id} updated")
         
@@ -291,27 +301,27 @@ async def get_stats():
         
         from sqlalchemy import text
         
-        with db.engine.connect() as conn:
-            # Get all closed trades
-            result = conn.execute(
-                text("""
-                    SELECT 
-                        COUNT(*) as total,
-                        COUNT(CASE WHEN status = 'Open' THEN 1 END) as open_count,
-                        COUNT(CASE WHEN status != 'Open' THEN 1 END) as closed_count,
-                        COUNT(CASE WHEN profit_loss > 0 THEN 1 END) as wins,
-                        AVG(CASE WHEN profit_loss IS NOT NULL THEN r_multiple END) as avg_r,
-                        SUM(CASE WHEN profit_loss IS NOT NULL THEN profit_loss ELSE 0 END) as total_pl,
-                        MAX(CASE WHEN profit_loss > 0 THEN profit_loss END) as max_win,
-                        MIN(CASE WHEN profit_loss < 0 THEN profit_loss END) as max_loss,
-                        AVG(CASE WHEN profit_loss > 0 THEN profit_loss END) as avg_win,
-                        AVG(CASE WHEN profit_loss < 0 THEN profit_loss END) as avg_loss,
-                        SUM(CASE WHEN profit_loss > 0 THEN profit_loss ELSE 0 END) as total_wins,
-                        SUM(CASE WHEN profit_loss < 0 THEN ABS(profit_loss) ELSE 0 END) as total_losses
-                    FROM trades
-                """)
-            )
-            row = result.fetchone()
+        # Get all closed trades
+        row = (await run_db(
+            _fetch,
+            db.engine,
+            text("""
+                SELECT 
+                    COUNT(*) as total,
+                    COUNT(CASE WHEN status = 'Open' THEN 1 END) as open_count,
+                    COUNT(CASE WHEN status != 'Open' THEN 1 END) as closed_count,
+                    COUNT(CASE WHEN profit_loss > 0 THEN 1 END) as wins,
+                    AVG(CASE WHEN profit_loss IS NOT NULL THEN r_multiple END) as avg_r,
+                    SUM(CASE WHEN profit_loss IS NOT NULL THEN profit_loss ELSE 0 END) as total_pl,
+                    MAX(CASE WHEN profit_loss > 0 THEN profit_loss END) as max_win,
+                    MIN(CASE WHEN profit_loss < 0 THEN profit_loss END) as max_loss,
+                    AVG(CASE WHEN profit_loss > 0 THEN profit_loss END) as avg_win,
+                    AVG(CASE WHEN profit_loss < 0 THEN profit_loss END) as avg_loss,
+                    SUM(CASE WHEN profit_loss > 0 THEN profit_loss ELSE 0 END) as total_wins,
+                    SUM(CASE WHEN profit_loss < 0 THEN ABS(profit_loss) ELSE 0 END) as total_losses
+                FROM trades
+            """)
+        ))[0]
         
         total_trades = row[0] or 0
         open_trades = row[1] or 0
@@ -370,18 +380,18 @@ async def export_trades():
         
         from sqlalchemy import text
         
-        with db.engine.connect() as conn:
-            result = conn.execute(
-                text("""
-                    SELECT 
-                        ticker, pattern, entry_date, entry_price, stop_price,
-                        target_price, exit_date, exit_price, shares, profit_loss,
-                        r_multiple, status, notes
-                    FROM trades
-                    ORDER BY entry_date DESC
-                """)
-            )
-            rows = result.fetchall()
+        rows = await run_db(
+            _fetch,
+            db.engine,
+            text("""
+                SELECT 
+                    ticker, pattern, entry_date, entry_price, stop_price,
+                    target_price, exit_date, exit_price, shares, profit_loss,
+                    r_multiple, status, notes
+                FROM trades
+                ORDER BY entry_date DESC
+            """)
+        )
         
         # Create CSV
         output = StringIO()
@@ -1,10 +1,11 @@
 from fastapi import APIRouter
 import logging
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 from app.services.cache import get_cache_service
 from app.services.market_data import market_data_service
+from app.services.xfetch import xfetch
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/market", tags=["market"])
@@ -207,6 +208,78 @@ async def _fetch_vix_level() -> Dict[str, Any]:
     }
 
 
+async def _build_market_internals() -> Optional[Dict[str, Any]]:
+    """Compute the market internals snapshot (None when SPY data is unavailable)."""
+    # Fetch fresh SPY data
+    spy_data = await market_data_service.get_time_series("SPY", "1day", 200)
+
+    if not spy_data or not spy_data.get("c"):
+        return None
+
+    # Extract price and moving averages
+    prices = spy_data["c"]
+    current_price = prices[-1]
+
+    # Calculate SMAs
+    sma_50 = sum(prices[-50:]) / 50 if len(prices) >= 50 else current_price
+    sma_200 = sum(prices[-200:]) / 200 if len(prices) >= 200 else current_price
+
+    # Get regime label
+    regime_info = _get_market_regime_label(current_price, sma_50, sma_200)
+
+    # Get market breadth (this can be slow, so we cache heavily)
+    try:
+        from app.services.universe import universe_service
+
+        # UniverseService exposes async helpers for ticker lists
+        try:
+            sp500_list = await universe_service.get_sp500_tickers()
+        except AttributeError:
+            # Legacy fallback to static data module if service API changes
+            from app.services import universe_data
+
+            logger.warning("UniverseService missing get_sp500_tickers(); using static fallback list")
+            sp500_list = universe_data.get_sp500()
+
+        breadth = await _calculate_market_breadth(sp500_list[:30])  # Sample 30 for speed
+    except Exception as e:
+        logger.warning(f"Market breadth calculation failed: {e}")
+        breadth = {
+            "error": "Breadth calculation unavailable",
+            "advances": 0,
+            "declines": 0
+        }
+
+    # Get VIX level
+    vix_info = await _fetch_vix_level()
+
+    # Get API usage
+    try:
+        api_usage = await market_data_service.get_usage_stats()
+    except Exception as e:
+        logger.warning(f"Failed to fetch API usage stats: {e}")
+        api_usage = {"status": "unknown"}
+
+    # Build response
+    internals_data = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "spy_price": round(current_price, 2),
+        "sma_50": round(sma_50, 2),
+        "sma_200": round(sma_200, 2),
+        "regime": f"{regime_info['emoji']} {regime_info['regime']}",
+        "regime_details": {
+            "label": regime_info["regime"],
+            "signal": regime_info["signal"],
+            "confidence": regime_info["confidence"],
+            "color": regime_info["color"]
+        },
+        "market_breadth": breadth,
+        "volatility": vix_info,
+        "api_usage": api_usage
+    }
+    return internals_data
+
+
 @router.get("/internals")
 async def get_market_internals():
     """
@@ -221,94 +294,29 @@ async def get_market_internals():
     - Cached for 10 minutes for performance
     """
     try:
-        cache = get_cache_service()
-        cache_key = "market_internals"
         cache_ttl = 600  # 10 minutes
-        
-        # Try to get from cache first
-        cached = await cache.get(cache_key)
-        if cached:
-            logger.info("📊 Market internals from cache")
-            return {
-                "success": True,
-                "cached": True,
-                "data": cached
-            }
-        
-        # Fetch fresh SPY data
-        spy_data = await market_data_service.get_time_series("SPY", "1day", 200)
+        computed = False
+
+        async def _compute():
+            nonlocal computed
+            computed = True
+            return await _build_market_internals()
 
-        if not spy_data or not spy_data.get("c"):
+        # XFetch: one worker refreshes shortly before expiry, the rest keep the cached copy
+        internals_data = await xfetch(get_cache_service(), "market_internals", _compute, ttl=cache_ttl)
+        if internals_data is None:
             return {
                 "success": False,
                 "detail": "Could not fetch market data"
             }
-
-        # Extract price and moving averages
-        prices = spy_data["c"]
-        current_price = prices[-1]
-        
-        # Calculate SMAs
-        sma_50 = sum(prices[-50:]) / 50 if len(prices) >= 50 else current_price
-        sma_200 = sum(prices[-200:]) / 200 if len(prices) >= 200 else current_price
-        
-        # Get regime label
-        regime_info = _get_market_regime_label(current_price, sma_50, sma_200)
-
-        # Get market breadth (this can be slow, so we cache heavily)
-        try:
-            from app.services.universe import universe_service
-
-            # UniverseService exposes async helpers for ticker lists
-            try:
-                sp500_list = await universe_service.get_sp500_tickers()
-            except AttributeError:
-                # Legacy fallback to static data module if service API changes
-                from app.services import universe_data
-
-                logger.warning("UniverseService missing get_sp500_tickers(); using static fallback list")
-                sp500_list = universe_data.get_sp500()
-
-            breadth = await _calculate_market_breadth(sp500_list[:30])  # Sample 30 for speed
-        except Exception as e:
-            logger.warning(f"Market breadth calculation failed: {e}")
-            breadth = {
-                "error": "Breadth calculation unavailable",
-                "advances": 0,
-                "declines": 0
+        if not computed:
+            logger.info("📊 Market internals from cache")
+            return {
+                "success": True,
+                "cached": True,
+                "data": internals_data
             }
 
-        # Get VIX level
-        vix_info = await _fetch_vix_level()
-
-        # Get API usage
-        try:
-            api_usage = await market_data_service.get_usage_stats()
-        except Exception as e:
-            logger.warning(f"Failed to fetch API usage stats: {e}")
-            api_usage = {"status": "unknown"}
-
-        # Build response
-        internals_data = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "spy_price": round(current_price, 2),
-            "sma_50": round(sma_50, 2),
-            "sma_200": round(sma_200, 2),
-            "regime": f"{regime_info['emoji']} {regime_info['regime']}",
-            "regime_details": {
-                "label": regime_info["regime"],
-                "signal": regime_info["signal"],
-                "confidence": regime_info["confidence"],
-                "color": regime_info["color"]
-            },
-            "market_breadth": breadth,
-            "volatility": vix_info,
-            "api_usage": api_usage
-        }
-
-        # Cache for performance
-        await cache.set(cache_key, internals_data, ttl=cache_ttl)
-
         return {
             "success": True,
             "cached": False,
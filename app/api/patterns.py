@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Dict, Any
 from pathlib import Path
@@ -11,11 +12,16 @@ from app.core.pattern_engine.detector import get_pattern_detector
 from app.core.pattern_engine.export import PatternExporter
 from app.core.pattern_engine.filter import PatternFilter
 from app.core.pattern_engine.scoring import PatternScorer
+from app.api.streaming import event_stream_response, resolve_stream_format
 from app.services.market_data import market_data_service
+from app.services.access_tracker import record_access
 from app.services.cache import get_cache_service
 from app.services.charting import get_charting_service
 from app.services.pattern_scanner import pattern_scanner_service
+from app.services.scan_jobs import get_scan_job_queue
+from app.services.scan_stream import stream_pattern_scan
 from app.services.universe_store import universe_store
+from app.services.xfetch import xfetch
 
 logger = logging.getLogger(__name__)
 charting_service = get_charting_service()
@@ -290,6 +296,7 @@ async def detect_pattern(request: PatternRequest):
             )
 
         logger.info(f"🔍 Analyzing pattern for {ticker}")
+        record_access(ticker, request.interval)
 
         # 1. Try cache first
         cached_result = await cache.get_pattern(ticker=ticker, interval=request.interval)
@@ -574,9 +581,12 @@ async def scan_tickers(
 
 @router.post("/scan-universe", response_model=ScanTickersResponse)
 async def scan_universe_patterns(
+    request: Request,
     min_score: float = Query(4.0, ge=0.0, le=10.0, description="Minimum pattern score"),
     limit: int = Query(20, ge=1, le=50, description="Max results to return"),
     offset: int = Query(0, ge=0, description="Offset for pagination (batch processing)"),
+    stream: Optional[str] = Query(None, pattern="^(ndjson|sse)$", description="Stream per-symbol events as NDJSON or SSE"),
+    summary: bool = Query(True, description="Emit a final ranked summary event when streaming"),
 ) -> ScanTickersResponse:
     """
     Scan full universe (518+ cached symbols) for top patterns with batch processing.
@@ -586,20 +596,23 @@ async def scan_universe_patterns(
     - Returns top 10-20 results ranked by score
     - Includes Chart-IMG URLs for inline display
     - Uses BATCH_SIZE=10 for memory-efficient processing
+    - ``stream=ndjson|sse`` emits each symbol's result as soon as it is ready
     """
 
     # Memory optimization: Process in batches to avoid OOM
     BATCH_SIZE = 10
+    stream_format = resolve_stream_format(stream, request)
 
     # Check cache first
     cache_key = f"universe_scan:v3:min{min_score}:limit{limit}:offset{offset}"
-    try:
-        cached = await get_cache_service().get(cache_key)
-        if cached:
-            logger.info("Returning cached universe scan results")
-            return ScanTickersResponse(**cached)
-    except Exception as e:
-        logger.debug(f"Cache retrieval failed: {e}")
+    if stream_format is None:
+        try:
+            cached = await get_cache_service().get(cache_key)
+            if cached:
+                logger.info("Returning cached universe scan results")
+                return ScanTickersResponse(**cached)
+        except Exception as e:
+            logger.debug(f"Cache retrieval failed: {e}")
 
     # Get universe symbols
     try:
@@ -619,6 +632,16 @@ async def scan_universe_patterns(
         all_tickers = all_tickers[offset:]
         logger.info(f"Starting scan from offset {offset}, {len(all_tickers)} symbols remaining")
 
+    if stream_format:
+        events = stream_pattern_scan(
+            all_tickers,
+            min_score=min_score,
+            limit=limit,
+            summary=summary,
+            meta={"universe_size": total_symbols, "offset": offset},
+        )
+        return event_stream_response(events, stream_format)
+
     # Batch processing for memory efficiency
     all_results = []
     total_batches = (len(all_tickers) + BATCH_SIZE - 1) // BATCH_SIZE
@@ -715,6 +738,7 @@ async def scan_universe_patterns(
 async def scan_quick_patterns(
     min_score: float = Query(4.0, ge=0.0, le=10.0, description="Minimum pattern score"),
     limit: int = Query(20, ge=1, le=50, description="Max results to return"),
+    force_refresh: bool = Query(False, description="Recompute instead of serving the cached scan"),
 ) -> ScanTickersResponse:
     """
     Quick scan of top 15 core mega-cap stocks (15-25 second response time).
@@ -728,16 +752,20 @@ async def scan_quick_patterns(
     - Uses 1-hour cache for instant subsequent requests
     """
 
-    # Check cache first (1-hour cache for quick scans)
+    # 1-hour cache; XFetch refreshes it early from a single worker so expiry never stampedes
     cache_key = f"quick_scan:v3:min{min_score}:limit{limit}"  # v3 = 15 core mega-caps
-    try:
-        cached = await get_cache_service().get(cache_key)
-        if cached:
-            logger.info("Returning cached quick scan results")
-            return ScanTickersResponse(**cached)
-    except Exception as e:
-        logger.debug(f"Cache retrieval failed: {e}")
+    payload = await xfetch(
+        get_cache_service(),
+        cache_key,
+        lambda: _run_quick_scan(min_score, limit),
+        ttl=3600,
+        force=force_refresh,
+    )
+    return ScanTickersResponse(**payload)
+
 
+async def _run_quick_scan(min_score: float, limit: int) -> Dict[str, Any]:
+    """Scan the quick-scan universe; returns the JSON-ready response body."""
     # Get universe and filter to top 100 most liquid stocks
     try:
         await universe_store.seed()
@@ -828,13 +856,7 @@ async def scan_quick_patterns(
         }
     )
 
-    # Cache for 1 hour (quicker refresh for fast scans)
-    try:
-        await get_cache_service().set(cache_key, response_data.model_dump(mode='json'), ttl=3600)
-    except Exception as e:
-        logger.debug(f"Cache storage failed: {e}")
-
-    return response_data
+    return response_data.model_dump(mode='json')
 
 
 @router.post("/scan-quick/warmup")
@@ -864,8 +886,12 @@ async def warmup_quick_scan():
 
 @router.post("/scan-market", response_model=ScanTickersResponse)
 async def scan_market_patterns(
+    request: Request,
     min_score: float = Query(3.5, ge=0.0, le=10.0, description="Minimum pattern score"),
     limit: int = Query(25, ge=1, le=100, description="Max results to return"),
+    background: bool = Query(False, description="Queue as a background job and return its ID"),
+    stream: Optional[str] = Query(None, pattern="^(ndjson|sse)$", description="Stream per-symbol events as NDJSON or SSE"),
+    summary: bool = Query(True, description="Emit a final ranked summary event when streaming"),
 ) -> ScanTickersResponse:
     """
     Scan top 150 liquid stocks from Nasdaq 100 + S&P 500 (60-90 second response time).
@@ -877,17 +903,22 @@ async def scan_market_patterns(
     - Includes Chart-IMG URLs for inline display
     - Uses 4-hour cache for balance between freshness and performance
     - Processes 150 stocks with concurrency=20 (~60-90 seconds)
+    - ``stream=ndjson|sse`` emits each symbol's result as soon as it is ready
+    - ``background=true`` queues the scan; poll ``/api/scan/jobs/{job_id}``
     """
 
+    stream_format = resolve_stream_format(stream, request)
+
     # Check cache first (4-hour cache for market scans)
     cache_key = f"market_scan:v1:min{min_score}:limit{limit}"
-    try:
-        cached = await get_cache_service().get(cache_key)
-        if cached:
-            logger.info("Returning cached market scan results")
-            return ScanTickersResponse(**cached)
-    except Exception as e:
-        logger.debug(f"Cache retrieval failed: {e}")
+    if stream_format is None:
+        try:
+            cached = await get_cache_service().get(cache_key)
+            if cached:
+                logger.info("Returning cached market scan results")
+                return ScanTickersResponse(**cached)
+        except Exception as e:
+            logger.debug(f"Cache retrieval failed: {e}")
 
     # Get universe and filter to top 150 most liquid stocks
     try:
@@ -935,6 +966,26 @@ async def scan_market_patterns(
             "WFC", "BMY", "TXN", "PM", "COP"
         ]
 
+    if background:
+        job = await get_scan_job_queue().submit(
+            "pattern",
+            {"tickers": market_tickers, "min_score": min_score, "limit": limit},
+        )
+        return JSONResponse(
+            status_code=202,
+            content={"success": True, "job_id": job["job_id"], "status": job["status"], "deduplicated": job["deduplicated"]},
+        )
+
+    if stream_format:
+        events = stream_pattern_scan(
+            market_tickers,
+            min_score=min_score,
+            limit=limit,
+            summary=summary,
+            meta={"universe_size": len(market_tickers)},
+        )
+        return event_stream_response(events, stream_format)
+
     # Scan with pattern engine (concurrency=20 for faster processing)
     try:
         payload = await pattern_scanner_service.scan_with_pattern_engine(
@@ -0,0 +1,72 @@
+"""RS history endpoints: a symbol's RS trajectory and a day's RS distribution.
+
+Both read the materialized ``rs_history`` table written by the nightly RS
+job. Responses are cached in Redis under the date of the latest snapshot, so
+a new nightly run naturally moves readers to fresh keys.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.services.cache import get_cache_service
+from app.services.database import get_database_service, run_db
+from app.services.rs_history import RS_LATEST_DATE_KEY, RSHistoryStore
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/rs", tags=["relative-strength"])
+cache_service = get_cache_service()
+RS_QUERY_TTL = 6 * 3600
+
+
+async def _snapshot_date() -> str:
+    try:
+        redis = await cache_service._get_redis()
+        return await redis.get(RS_LATEST_DATE_KEY) or "none"
+    except Exception:
+        return "none"
+
+
+async def _cached(key: str, compute) -> Any:
+    cache_key = f"{key}:{await _snapshot_date()}"
+    cached = await cache_service.get(cache_key)
+    if cached is not None:
+        return cached
+    result = await run_db(compute)
+    if result is not None:
+        await cache_service.set(cache_key, result, ttl=RS_QUERY_TTL)
+    return result
+
+
+@router.get("/distribution")
+async def get_rs_distribution(
+    as_of: Optional[date] = Query(None, alias="date", description="YYYY-MM-DD; latest when omitted"),
+) -> Dict[str, Any]:
+    """Every symbol's RS rating for one day, strongest first, plus a histogram."""
+    store = RSHistoryStore(get_database_service())
+    payload = await _cached(
+        f"rs:dist:{as_of.isoformat() if as_of else 'latest'}",
+        lambda: store.distribution(as_of),
+    )
+    if not payload:
+        raise HTTPException(status_code=404, detail="No RS history for that date")
+    return payload
+
+
+@router.get("/{symbol}/history")
+async def get_rs_history(
+    symbol: str,
+    days: int = Query(180, ge=1, le=1825),
+) -> Dict[str, Any]:
+    """Daily RS rating trajectory of one symbol, oldest first."""
+    store = RSHistoryStore(get_database_service())
+    history = await _cached(
+        f"rs:history:{symbol.upper()}:{days}",
+        lambda: store.trajectory(symbol, days),
+    )
+    if not history:
+        raise HTTPException(status_code=404, detail=f"No RS history for {symbol.upper()}")
+    return {"symbol": symbol.upper(), "days": days, "history": history}
@@ -33,11 +33,14 @@ from app.telemetry.metrics import (
 )
 from app.utils.build_info import resolve_build_sha
 from app.services.cache import get_cache_service
+from app.services.scan_index import ScanIndex, index_slug
+from app.services.scan_jobs import get_scan_job_queue
 from app.utils.pattern_groups import bucket_name
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["scan"])
 cache_service = get_cache_service()
+scan_index = ScanIndex(cache_service)
 SCAN_LATEST_KEY = "scan:latest"
 SCAN_HISTORY_TEMPLATE = "scan:results:{date}"
 
@@ -188,24 +191,57 @@ async def get_top_setups(
 
 
 @router.get("/scan/latest")
-async def get_latest_scan_result() -> Dict[str, Any]:
-    """Return the latest cached EOD scan payload."""
+async def get_latest_scan_result(
+    partial: bool = Query(False, description="Serve the checkpointed results of a scan still running"),
+) -> Dict[str, Any]:
+    """Return the latest cached EOD scan payload, or partial results while a scan runs."""
+    from app.services.eod_scanner import EODScanner, get_eod_scanner
+    from app.services.scan_checkpoint import get_active_scan
+
+    active = await get_active_scan(cache_service)
     payload = await cache_service.get(SCAN_LATEST_KEY)
+    if active and (partial or not payload):
+        return await get_eod_scanner().partial_summary(active)
     if not payload:
         raise HTTPException(
             status_code=404, 
             detail="No scan results yet. EOD scan runs at 4:05 PM ET Mon-Fri. Use POST /api/scan/trigger to run manually."
         )
+    if active:
+        payload = {**payload, "in_progress": EODScanner.progress_view(active)}
     return payload
 
 
+@router.get("/scan/progress")
+async def get_scan_progress() -> Dict[str, Any]:
+    """Return progress of the EOD scan currently running, if any."""
+    from app.services.eod_scanner import EODScanner
+    from app.services.scan_checkpoint import get_active_scan
+
+    active = await get_active_scan(cache_service)
+    if not active:
+        return {"running": False}
+    return {"running": True, "progress": EODScanner.progress_view(active)}
+
+
 @router.post("/scan/trigger")
-async def trigger_manual_scan() -> Dict[str, Any]:
+async def trigger_manual_scan(
+    fresh: bool = Query(False, description="Discard today's checkpoint and rescan everything"),
+    background: bool = Query(False, description="Queue the scan as a job and return its ID"),
+    full: bool = Query(False, description="Rescan symbols whose inputs are unchanged too"),
+) -> Dict[str, Any]:
     """Manually trigger an EOD scan (for testing/admin use)"""
+    incremental = False if full else None
+    if background:
+        params: Dict[str, Any] = {"resume": not fresh}
+        if full:
+            params["incremental"] = False
+        job = await get_scan_job_queue().submit("eod", params)
+        return {"success": True, "job": _job_view(job)}
     try:
         from app.jobs.scan_universe import run_scan_job
-        logger.info("Manual scan triggered via API")
-        await run_scan_job()
+        logger.info("Manual scan triggered via API (fresh=%s, full=%s)", fresh, full)
+        await run_scan_job(resume=not fresh, incremental=incremental)
         
         # Fetch and return the results
         payload = await cache_service.get(SCAN_LATEST_KEY)
@@ -225,38 +261,168 @@ async def trigger_manual_scan() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Scan failed: {str(e)}")
 
 
-@router.get("/scan/date/{scan_date}")
-async def get_scan_by_date(scan_date: str) -> Dict[str, Any]:
-    """Return cached scan results for a specific date (YYYYMMDD)."""
-    key = SCAN_HISTORY_TEMPLATE.format(date=scan_date)
-    payload = await cache_service.get(key)
-    if not payload:
-        raise HTTPException(status_code=404, detail=f"No scan data for {scan_date}")
-    return payload
+class ScanJobRequest(BaseModel):
+    kind: str = "eod"  # eod | pattern | universe
+    params: Dict[str, Any] = {}
 
 
-@router.get("/scan/sector/{sector}")
-async def get_scan_by_sector(sector: str) -> Dict[str, Any]:
-    """Return latest scan data filtered by sector name."""
-    payload = await cache_service.get(SCAN_LATEST_KEY)
-    if not payload:
-        raise HTTPException(status_code=404, detail="No scan results yet")
+def _job_view(job: Dict[str, Any], *, include_results: bool = False) -> Dict[str, Any]:
+    if include_results:
+        return job
+    return {k: v for k, v in job.items() if k not in ("result", "partial_results")}
+
+
+@router.post("/scan/jobs", status_code=202)
+async def submit_scan_job(request: ScanJobRequest) -> Dict[str, Any]:
+    """Queue a scan; identical in-flight requests return the existing job."""
+    try:
+        job = await get_scan_job_queue().submit(request.kind, request.params)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {"success": True, "job": _job_view(job)}
+
+
+@router.get("/scan/jobs")
+async def list_scan_jobs(
+    status: Optional[str] = Query(None, description="queued | running | complete | failed | cancelled"),
+    limit: int = Query(20, ge=1, le=100),
+) -> Dict[str, Any]:
+    jobs = await get_scan_job_queue().list(limit=limit, status=status)
+    return {"success": True, "count": len(jobs), "jobs": jobs}
+
+
+@router.get("/scan/jobs/{job_id}")
+async def get_scan_job(
+    job_id: str,
+    results: bool = Query(True, description="Include partial and final results"),
+) -> Dict[str, Any]:
+    job = await get_scan_job_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Unknown scan job {job_id}")
+    return {"success": True, "job": _job_view(job, include_results=results)}
+
+
+@router.delete("/scan/jobs/{job_id}")
+async def cancel_scan_job(job_id: str) -> Dict[str, Any]:
+    job = await get_scan_job_queue().cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Unknown scan job {job_id}")
+    return {"success": True, "job": _job_view(job)}
+
+
+async def _screen_page(
+    scan_date: Optional[str] = None,
+    *,
+    sector: Optional[str] = None,
+    pattern: Optional[str] = None,
+    min_score: float = 0.0,
+    offset: int = 0,
+    limit: int = 100,
+) -> Optional[Dict[str, Any]]:
+    """One ranked page of EOD results from the scan index, else from the cached payload."""
+    try:
+        page = await scan_index.query(
+            scan_date=scan_date,
+            sector=sector,
+            pattern=pattern,
+            min_score=min_score,
+            offset=offset,
+            limit=limit,
+        )
+    except Exception as exc:
+        logger.warning("Scan index query failed: %s", exc)
+        page = None
+    if page is not None:
+        return page
 
-    sector_normalized = sector.strip().lower()
-    filtered = [
+    key = SCAN_HISTORY_TEMPLATE.format(date=scan_date) if scan_date else SCAN_LATEST_KEY
+    payload = await cache_service.get(key)
+    if not payload:
+        return None
+    entries = [
         entry for entry in payload.get("results", [])
-        if (entry.get("sector") or "").strip().lower() == sector_normalized
+        if (entry.get("score") or 0) >= min_score
+        and (not sector or index_slug(entry.get("sector")) == index_slug(sector))
+        and (sector or not pattern or index_slug(entry.get("pattern")) == index_slug(pattern))
     ]
-    summary = {
+    entries.sort(key=lambda item: item.get("score") or 0, reverse=True)
+    return {
         "scan_date": payload.get("scan_date"),
         "total_symbols": payload.get("total_symbols"),
-        "patterns_found": len(filtered),
-        "buckets": _bucketize_entries(filtered),
-        "top_setups": sorted(filtered, key=lambda item: item.get("score", 0), reverse=True)[:10],
-        "results": filtered,
         "generated_at": payload.get("generated_at"),
+        "total": len(entries),
+        "offset": offset,
+        "limit": limit,
+        "results": entries[offset:offset + limit],
+    }
+
+
+def _screen_response(page: Dict[str, Any]) -> Dict[str, Any]:
+    results = page["results"]
+    return {
+        **page,
+        "patterns_found": page["total"],
+        "buckets": _bucketize_entries(results),
+        "top_setups": results[:10],
     }
-    return summary
+
+
+@router.get("/scan/date/{scan_date}")
+async def get_scan_by_date(
+    scan_date: str,
+    sector: Optional[str] = Query(None, description="Only results in this sector"),
+    pattern: Optional[str] = Query(None, description="Only results of this pattern type"),
+    min_score: float = Query(0.0, ge=0.0, le=10.0),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit for the full payload"),
+) -> Dict[str, Any]:
+    """Return cached scan results for a specific date (YYYYMMDD)."""
+    if limit is None and not (sector or pattern or min_score or offset):
+        key = SCAN_HISTORY_TEMPLATE.format(date=scan_date)
+        payload = await cache_service.get(key)
+        if not payload:
+            raise HTTPException(status_code=404, detail=f"No scan data for {scan_date}")
+        return payload
+
+    page = await _screen_page(
+        scan_date,
+        sector=sector,
+        pattern=pattern,
+        min_score=min_score,
+        offset=offset,
+        limit=limit or 100,
+    )
+    if page is None:
+        raise HTTPException(status_code=404, detail=f"No scan data for {scan_date}")
+    return _screen_response(page)
+
+
+@router.get("/scan/sector/{sector}")
+async def get_scan_by_sector(
+    sector: str,
+    min_score: float = Query(0.0, ge=0.0, le=10.0),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+) -> Dict[str, Any]:
+    """Return latest scan data filtered by sector name, ranked by score."""
+    page = await _screen_page(sector=sector, min_score=min_score, offset=offset, limit=limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail="No scan results yet")
+    return _screen_response(page)
+
+
+@router.get("/scan/pattern/{pattern}")
+async def get_scan_by_pattern(
+    pattern: str,
+    min_score: float = Query(0.0, ge=0.0, le=10.0),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+) -> Dict[str, Any]:
+    """Return latest scan data filtered by pattern type, ranked by score."""
+    page = await _screen_page(pattern=pattern, min_score=min_score, offset=offset, limit=limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail="No scan results yet")
+    return _screen_response(page)
 
 
 async def _load_top_setups(min_score: float, limit: int) -> tuple[list[ScanResult], bool]:
@@ -267,6 +433,19 @@ async def _load_top_setups(min_score: float, limit: int) -> tuple[list[ScanResul
     results = []
 
     cache_key = f"top_setups:multi:min{min_score}"
+    try:
+        page = await scan_index.query(min_score=min_score, limit=limit)
+    except Exception as exc:
+        logger.warning("Scan index lookup failed: %s", exc)
+        page = None
+    if page and page["results"]:
+        normalized = [
+            _coerce_scan_result({**item, "source": item.get("sector") or "Legend AI"})
+            for item in page["results"]
+        ]
+        logger.info("Using scan index for top setups (%s of %s entries)", len(normalized), page["total"])
+        return normalized, True
+
     latest_payload = await cache_service.get(SCAN_LATEST_KEY)
     if latest_payload:
         cached = True
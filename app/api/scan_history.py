@@ -0,0 +1,67 @@
+"""Pattern scan history endpoints.
+
+Reads go to the month-partitioned scan history: every query carries a
+``days`` window, so only the partitions in range are touched. Pages are
+keyset-paginated; pass ``next_cursor`` back as ``cursor`` for the next page.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.services.database import get_database_service, run_db
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/scans/history", tags=["scan-history"])
+
+
+async def _page(compute) -> Dict[str, Any]:
+    try:
+        return await run_db(compute)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("")
+async def get_scan_history(
+    pattern: Optional[str] = Query(None, description="Pattern type, e.g. VCP"),
+    days: int = Query(30, ge=1, le=3650),
+    min_score: Optional[float] = Query(None, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Detections from the last ``days`` days, newest first."""
+    store = get_database_service().scan_history
+    page = await _page(lambda: store.recent(
+        pattern_type=pattern, days=days, min_score=min_score, limit=limit, cursor=cursor,
+    ))
+    return {"pattern": pattern, "days": days, **page}
+
+
+@router.get("/rollups")
+async def get_scan_rollups(
+    pattern: Optional[str] = None,
+    days: int = Query(30, ge=1, le=3650),
+) -> Dict[str, Any]:
+    """Nightly per-day, per-pattern counts and score histograms."""
+    store = get_database_service().scan_history
+    rollups = await run_db(store.rollups, days, pattern)
+    return {"pattern": pattern, "days": days, "rollups": rollups}
+
+
+@router.get("/{symbol}")
+async def get_ticker_scan_history(
+    symbol: str,
+    pattern: Optional[str] = None,
+    days: int = Query(365, ge=1, le=3650),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """One ticker's pattern detections, newest first."""
+    store = get_database_service().scan_history
+    page = await _page(lambda: store.ticker_history(
+        symbol, days=days, pattern_type=pattern, limit=limit, cursor=cursor,
+    ))
+    return {"symbol": symbol.upper(), "pattern": pattern, "days": days, **page}
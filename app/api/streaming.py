@@ -0,0 +1,79 @@
+"""
+NDJSON / Server-Sent Events encoding for streaming scan endpoints.
+
+Scan endpoints accept ``?stream=ndjson`` or ``?stream=sse`` (or the matching
+``Accept`` header) and hand their event generator to ``event_stream_response``.
+"""
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+STREAM_FORMATS = {"ndjson": NDJSON_MEDIA_TYPE, "sse": SSE_MEDIA_TYPE}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    if hasattr(value, "tolist"):  # numpy arrays
+        return value.tolist()
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def encode_ndjson(event: Dict[str, Any]) -> str:
+    return json.dumps(event, default=_json_default) + "\n"
+
+
+def encode_sse(event: Dict[str, Any]) -> str:
+    payload = json.dumps(event, default=_json_default)
+    return f"event: {event.get('event', 'message')}\ndata: {payload}\n\n"
+
+
+def resolve_stream_format(stream: Optional[str], request: Optional[Request] = None) -> Optional[str]:
+    """Pick the streaming format from ``?stream=`` or the Accept header (None = buffered JSON)."""
+    if stream:
+        return stream if stream in STREAM_FORMATS else None
+    accept = request.headers.get("accept", "") if request is not None else ""
+    if SSE_MEDIA_TYPE in accept:
+        return "sse"
+    if NDJSON_MEDIA_TYPE in accept:
+        return "ndjson"
+    return None
+
+
+def event_stream_response(events: AsyncIterator[Dict[str, Any]], fmt: str) -> StreamingResponse:
+    """Wrap a scan event generator in a streaming response, one frame per event."""
+    encode = encode_sse if fmt == "sse" else encode_ndjson
+
+    async def _body():
+        try:
+            async for event in events:
+                yield encode(event)
+        except Exception as exc:  # Headers are already sent; report in-band
+            yield encode({"event": "error", "error": str(exc), "fatal": True})
+
+    return StreamingResponse(
+        _body(),
+        media_type=STREAM_FORMATS[fmt],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+__all__ = [
+    "NDJSON_MEDIA_TYPE",
+    "SSE_MEDIA_TYPE",
+    "encode_ndjson",
+    "encode_sse",
+    "event_stream_response",
+    "resolve_stream_format",
+]
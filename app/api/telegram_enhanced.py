@@ -10,6 +10,7 @@ import logging
 import json
 
 from app.config import get_settings
+from app.services.access_tracker import record_access
 from app.services.market_data import market_data_service
 from app.core.pattern_detector import PatternDetector
 
@@ -117,6 +118,7 @@ You can also just ask me things like:
             return "❌ Please provide a ticker symbol.\n\n*Usage:* `/pattern NVDA`"
 
         ticker = ticker.upper().strip()
+        record_access(ticker)
 
         try:
             # Send typing indicator
@@ -241,6 +243,7 @@ RS Rating: {result.rs_rating:.0f}
             return ("❌ Please provide a ticker symbol.\n\n*Usage:* `/chart NVDA`", None)
 
         ticker = ticker.upper().strip()
+        record_access(ticker)
 
         try:
             # Generate chart
@@ -340,6 +343,7 @@ RS Rating: {result.rs_rating:.0f}
             return "❌ Please provide a ticker symbol.\n\n*Usage:* `/plan NVDA`"
 
         ticker = ticker.upper().strip()
+        record_access(ticker)
 
         try:
             # Get pattern first
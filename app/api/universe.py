@@ -9,13 +9,16 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import logging
 
+from app.api.streaming import event_stream_response, resolve_stream_format
+from app.services.scan_stream import stream_universe_scan
 from app.services.universe import universe_service
 from app.services.universe_data import (
     get_nasdaq,
     get_sp500,
     get_quick_scan_universe,
 )
-from app.services.market_data import market_data_service
+from app.services.market_data import PROVIDERS, market_data_service
+from app.services.negative_cache import ALL_PROVIDERS
 from app.services.cache import get_cache_service
 from app.services.universe_store import universe_store
 from app.core.pattern_detector import PatternDetector, PatternResult
@@ -157,7 +160,7 @@ async def get_universe_tickers():
 
 
 @router.post("/scan", response_model=ScanResponse)
-async def scan_universe(request: ScanRequest):
+async def scan_universe(request: ScanRequest, stream: Optional[str] = None, summary: bool = True):
     """
     Scan full universe (S&P 500 + NASDAQ 100) for pattern setups
     
@@ -177,7 +180,20 @@ async def scan_universe(request: ScanRequest):
             "max_results": 10,
             "pattern_types": ["VCP", "Cup & Handle"]
         }
+
+    Pass ``?stream=ndjson`` or ``?stream=sse`` to receive each setup as soon as
+    its ticker finishes, followed by a ranked ``summary`` event.
     """
+    stream_format = resolve_stream_format(stream)
+    if stream_format:
+        events = stream_universe_scan(
+            min_score=request.min_score,
+            max_results=request.max_results,
+            pattern_types=request.pattern_types,
+            summary=summary,
+        )
+        return event_stream_response(events, stream_format)
+
     try:
         import time
         start_time = time.time()
@@ -395,6 +411,39 @@ async def quick_scan(request: QuickScanRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/dead-symbols")
+async def get_dead_symbols(limit: int = 500):
+    """
+    Symbols every data provider returned nothing for (delisted or misspelled)
+
+    Requests for these are answered from the negative cache until their
+    retry time; prune them from watchlists and scan universes.
+    """
+    negative_cache = market_data_service.negative_cache
+    if negative_cache is None:
+        return {"success": True, "enabled": False, "total": 0, "symbols": []}
+
+    symbols = await negative_cache.dead_symbols(limit)
+    return {
+        "success": True,
+        "enabled": True,
+        "total": len(symbols),
+        "symbols": symbols,
+    }
+
+
+@router.delete("/dead-symbols/{symbol}")
+async def forgive_dead_symbol(symbol: str, interval: str = "1day"):
+    """Clear a symbol's negative cache entries so every provider is retried"""
+    negative_cache = market_data_service.negative_cache
+    if negative_cache is None:
+        raise HTTPException(status_code=404, detail="Negative cache is disabled")
+
+    providers = [source.value for source in PROVIDERS] + [ALL_PROVIDERS]
+    await negative_cache.clear(symbol, interval, providers)
+    return {"success": True, "symbol": symbol.upper(), "interval": interval}
+
+
 @router.get("/sp500")
 async def get_sp500():
     """Get S&P 500 ticker list"""
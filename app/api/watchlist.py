@@ -103,12 +103,12 @@ class WatchlistUpdate(BaseModel):
 async def add_to_watchlist(item: WatchlistItem):
     """Prefer Postgres, fallback to file store."""
     try:
-        from app.services.database import get_database_service
-        dbs = get_database_service()
+        from app.services.database import get_async_database_service
+        dbs = get_async_database_service()
         tags_str = ",".join(item.tags) if item.tags else None
-        if not dbs.add_watchlist_symbol(item.ticker, item.reason, tags_str, item.status):
+        if not await dbs.add_watchlist_symbol(item.ticker, item.reason, tags_str, item.status):
             raise Exception("Database add failed")
-        all_items = dbs.get_watchlist_items()
+        all_items = await dbs.get_watchlist_items()
         await _sync_cache(all_items)
         return {"success": True, "ticker": item.ticker.upper()}
     except Exception:
@@ -130,9 +130,9 @@ async def add_to_watchlist(item: WatchlistItem):
 @router.get("")
 async def get_watchlist():
     try:
-        from app.services.database import get_database_service
-        dbs = get_database_service()
-        items = dbs.get_watchlist_items()
+        from app.services.database import get_async_database_service
+        dbs = get_async_database_service()
+        items = await dbs.get_watchlist_items()
         if items:
             for item in items:
                 raw_tags = item.get("tags")
@@ -156,10 +156,10 @@ async def get_watchlist():
 async def remove_from_watchlist(ticker: str):
     t = ticker.upper().strip()
     try:
-        from app.services.database import get_database_service
-        dbs = get_database_service()
-        if dbs.remove_watchlist_symbol(t):
-            items = dbs.get_watchlist_items()
+        from app.services.database import get_async_database_service
+        dbs = get_async_database_service()
+        if await dbs.remove_watchlist_symbol(t):
+            items = await dbs.get_watchlist_items()
             await _sync_cache(items)
             return {"success": True, "message": f"{t} removed"}
         else:
@@ -180,17 +180,17 @@ async def update_watchlist_item(ticker: str, payload: WatchlistUpdate):
     t = ticker.upper().strip()
     updated = False
     try:
-        from app.services.database import get_database_service
-        dbs = get_database_service()
+        from app.services.database import get_async_database_service
+        dbs = get_async_database_service()
         tags_str = ",".join(payload.tags) if payload.tags else None
-        updated = dbs.update_watchlist_symbol(
+        updated = await dbs.update_watchlist_symbol(
             t,
             reason=payload.reason,
             tags=tags_str,
             status=payload.status,
         )
         if updated:
-            items = dbs.get_watchlist_items()
+            items = await dbs.get_watchlist_items()
             await _sync_cache(items)
             return {"success": True}
         else:
@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Callable
 import asyncio
+import numpy as np
 import pandas as pd
 import logging
 
@@ -47,6 +48,13 @@ class BacktestConfig:
 class BacktestEngine:
     """
     Event-driven backtesting engine
+
+    Point-in-time data access is precomputed once per run (``_index_history``):
+    each ticker's history is sorted by time and, for every trading date, the
+    number of bars at or before it is stored. Strategies get
+    ``frame.iloc[:end]``, a view sharing memory with the loaded history (no
+    per-day filtering or copying), so they must copy before mutating it.
+    Current prices come from a (dates x tickers) close matrix.
     """
 
     def __init__(self, config: BacktestConfig):
@@ -76,6 +84,14 @@ class BacktestEngine:
         self.historical_data: Dict[str, pd.DataFrame] = {}
         self.current_prices: Dict[str, float] = {}
 
+        # Point-in-time index (built by _index_history)
+        self._frames: Dict[str, pd.DataFrame] = {}  # History sorted by time
+        self._stamps: Dict[str, pd.DatetimeIndex] = {}  # Bar times of each sorted frame
+        self._end_rows: Dict[str, np.ndarray] = {}  # Per trading date: bars at or before it
+        self._date_rows: Dict[pd.Timestamp, int] = {}  # Trading date -> matrix row
+        self._tickers: List[str] = []  # Close matrix columns
+        self._closes: Optional[np.ndarray] = None  # (dates x tickers) closes, NaN without a bar
+
         # Results
         self.performance: Optional[PerformanceMetrics] = None
 
@@ -93,8 +109,8 @@ class BacktestEngine:
             # Load historical data for all tickers
             await self._load_historical_data()
 
-            # Get all trading dates
-            trading_dates = self._get_trading_dates()
+            # Get all trading dates and index each ticker's history against them
+            trading_dates = self._index_history()
             total_days = len(trading_dates)
 
             logger.info(f"Backtesting {len(self.config.universe)} tickers over {total_days} days")
@@ -162,19 +178,58 @@ class BacktestEngine:
 
         logger.info(f"Loaded data for {len(self.historical_data)} tickers")
 
-    def _get_trading_dates(self) -> List[datetime]:
-        """Get all trading dates from available data"""
-        all_dates = set()
+    def _index_history(self) -> List[datetime]:
+        """
+        Sort each ticker's history once and precompute point-in-time lookups
 
+        Returns:
+            Trading dates within the configured range
+        """
+        self._frames.clear()
+        self._stamps.clear()
+        self._end_rows.clear()
         for ticker, data in self.historical_data.items():
             if "timestamp" in data.columns:
-                dates = pd.to_datetime(data["timestamp"])
-            elif data.index.name == "timestamp" or isinstance(data.index, pd.DatetimeIndex):
-                dates = data.index
+                stamps = pd.DatetimeIndex(pd.to_datetime(data["timestamp"]))
+            elif isinstance(data.index, pd.DatetimeIndex):
+                stamps = data.index
             else:
                 continue
+            if not stamps.is_monotonic_increasing:
+                order = np.argsort(stamps.values, kind="stable")
+                data, stamps = data.iloc[order], stamps[order]
+            self._frames[ticker] = data
+            self._stamps[ticker] = stamps
+
+        trading_dates = self._get_trading_dates()
+        dates = pd.DatetimeIndex(trading_dates)
+        self._date_rows = {date: row for row, date in enumerate(trading_dates)}
+        self._tickers = list(self._frames)
+        self._closes = np.full((len(dates), len(self._tickers)), np.nan)
+
+        for column, ticker in enumerate(self._tickers):
+            stamps = self._stamps[ticker]
+            ends = stamps.searchsorted(dates, side="right")
+            self._end_rows[ticker] = ends
+
+            frame = self._frames[ticker]
+            if "close" not in frame.columns or not len(dates):
+                continue
+            # The last bar at or before each date is a bar *on* that date when the times match
+            last = ends - 1
+            on_date = last >= 0
+            on_date[on_date] = stamps.values[last[on_date]] == dates.values[on_date]
+            closes = frame["close"].to_numpy(dtype=float)
+            self._closes[on_date, column] = closes[last[on_date]]
 
-            all_dates.update(dates.tolist())
+        return trading_dates
+
+    def _get_trading_dates(self) -> List[datetime]:
+        """Get all trading dates from available data"""
+        all_dates = set()
+
+        for stamps in self._stamps.values():
+            all_dates.update(stamps.tolist())
 
         # Sort and filter by date range
         trading_dates = sorted([
@@ -202,15 +257,12 @@ class BacktestEngine:
 
         # Process each ticker
         for ticker in self.config.universe:
-            if ticker not in self.historical_data:
+            if ticker not in self._frames or self._bars_up_to(ticker, date) < 2:
                 continue
 
             # Get historical data up to this date
             ticker_data = self._get_data_up_to_date(ticker, date)
 
-            if ticker_data is None or len(ticker_data) < 2:
-                continue
-
             # Get strategy signals
             try:
                 signals = await self.strategy.on_data(
@@ -236,35 +288,28 @@ class BacktestEngine:
         self.portfolio.update_metrics(date)
 
     def _update_current_prices(self, date: datetime):
-        """Update current prices for all tickers"""
-        for ticker, data in self.historical_data.items():
-            # Get price at this date
-            if "timestamp" in data.columns:
-                data_at_date = data[data["timestamp"] == date]
-            elif isinstance(data.index, pd.DatetimeIndex):
-                data_at_date = data[data.index == date]
-            else:
-                continue
+        """Update current prices for tickers with a bar on this date"""
+        row = self._date_rows.get(date)
+        if row is None:
+            return
+        closes = self._closes[row]
+        for column in np.flatnonzero(~np.isnan(closes)):
+            self.current_prices[self._tickers[column]] = float(closes[column])
 
-            if len(data_at_date) > 0:
-                self.current_prices[ticker] = data_at_date.iloc[0]["close"]
+    def _bars_up_to(self, ticker: str, date: datetime) -> int:
+        """Number of bars of ``ticker`` at or before ``date``"""
+        row = self._date_rows.get(date)
+        if row is not None:
+            return int(self._end_rows[ticker][row])
+        return int(self._stamps[ticker].searchsorted(pd.Timestamp(date), side="right"))
 
     def _get_data_up_to_date(self, ticker: str, date: datetime) -> Optional[pd.DataFrame]:
-        """Get historical data up to a specific date"""
-        if ticker not in self.historical_data:
-            return None
-
-        data = self.historical_data[ticker]
-
-        # Filter data up to this date
-        if "timestamp" in data.columns:
-            data_filtered = data[data["timestamp"] <= date].copy()
-        elif isinstance(data.index, pd.DatetimeIndex):
-            data_filtered = data[data.index <= date].copy()
-        else:
+        """Get historical data up to a specific date (a view; no copy)"""
+        if ticker not in self._frames:
             return None
 
-        return data_filtered if len(data_filtered) > 0 else None
+        end = self._bars_up_to(ticker, date)
+        return self._frames[ticker].iloc[:end] if end > 0 else None
 
     async def _check_stop_loss_take_profit(self, date: datetime):
         """Check all positions for stop loss and take profit hits"""
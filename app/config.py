@@ -19,18 +19,21 @@ class Settings(BaseSettings):
     telegram_webhook_url: Optional[str] = None
 
     @property
-    def auto_webhook_url(self) -> str:
-        """Auto-generate webhook URL from Railway domain"""
+    def public_base_url(self) -> Optional[str]:
+        """Publicly reachable base URL (Railway domain or explicit webhook URL), if any"""
         import os
         # Try to get from Railway environment
         railway_domain = os.getenv("RAILWAY_PUBLIC_DOMAIN")
         if railway_domain:
             return f"https://{railway_domain}"
         # Fallback to explicitly set URL
-        if self.telegram_webhook_url:
-            return self.telegram_webhook_url
+        return self.telegram_webhook_url or None
+
+    @property
+    def auto_webhook_url(self) -> str:
+        """Auto-generate webhook URL from Railway domain"""
         # Default for local development
-        return "http://localhost:8000"
+        return self.public_base_url or "http://localhost:8000"
 
     @property
     def allowed_origins(self) -> list[str]:
@@ -106,6 +109,8 @@ class Settings(BaseSettings):
 
     # Feature Flags
     legend_flags_enable_scanner: int = 1
+    scan_prefilter_enabled: bool = True  # Vectorized phase-1 screen before detectors
+    scan_incremental_enabled: bool = True  # EOD scans skip symbols whose inputs are unchanged
 
     # Cost Optimization Settings
     cache_ttl_patterns: int = 3600  # 1 hour
@@ -117,8 +122,27 @@ class Settings(BaseSettings):
     ai_rate_limit_per_minute: int = 20
     market_data_rate_limit: int = 30
 
+    # Adaptive scan concurrency (AIMD limiter shared by all scanners)
+    scan_concurrency_initial: int = 8  # Starting number of in-flight fetches
+    scan_concurrency_max: int = 32  # Hard ceiling, shrunk further as quota runs out
+    scan_latency_target: float = 2.5  # Seconds per symbol before backing off
+    scan_job_workers: int = 1  # In-process workers draining the scan job queue (0 = none)
+    scan_sharding_enabled: bool = False  # Split large scans into shards on a Redis work queue
+    scan_shard_size: int = 50  # Symbols per shard
+    scan_shard_local_workers: int = 1  # Shard workers run by the coordinating process itself
+    scan_shard_lease_seconds: float = 120.0  # Lease before a claimed shard is retried elsewhere
+
     data_source_priority: str = "twelvedata,finnhub,alphavantage"
 
+    # Negative cache: skip providers that had no data for a symbol
+    negative_cache_enabled: bool = True
+    negative_cache_base_ttl: float = 300.0  # First skip window; doubles on each repeat miss
+    negative_cache_max_ttl: float = 86400.0  # Longest skip window
+
+    # Pattern scan history (monthly partitions, nightly rollups)
+    scan_history_retention_days: int = 730  # Older months are dropped; rollups are kept
+    scan_history_months_ahead: int = 2  # Partitions created ahead of the current month
+
     # Multi-Tier Cache Settings
     cache_hot_ttl_min: int = 300  # 5 minutes (Redis hot tier)
     cache_hot_ttl_max: int = 900  # 15 minutes (Redis hot tier)
@@ -129,6 +153,38 @@ class Settings(BaseSettings):
     cache_enable_warming: bool = True  # Enable cache warming on startup
     cache_cdn_path: str = "/tmp/legend-ai-cdn"  # Path for CDN static cache
 
+    # Content-addressed blob store (CDN tier payloads, chart images) served at /blobs
+    blob_store_path: str = "/tmp/legend-ai-blobs"
+    blob_store_max_bytes: int = 512 * 1024 * 1024  # LRU-evicted past this budget
+    chart_blob_mirror: bool = True  # Download Chart-IMG images and serve them from /blobs (needs a public URL)
+    chart_blob_max_bytes: int = 10 * 1024 * 1024  # Larger chart images keep the upstream URL
+
+    # Predictive warming from observed demand
+    cache_predictive_enabled: bool = True
+    cache_access_half_life: float = 21600.0  # Seconds for an access to lose half its weight
+    cache_access_capacity: int = 500  # Tickers kept in the decayed top-K
+    cache_predictive_top_n: int = 50  # Hottest tickers considered per warming run
+    cache_predictive_budget: int = 40  # Max provider fetches per warming run
+    cache_predictive_quota_share: float = 0.1  # Max share of remaining paid quota one run may use
+    cache_predictive_refresh_window: int = 300  # Refresh entries expiring within this many seconds
+
+    # Keyspace analytics (incremental SCAN sampling of Redis)
+    cache_analytics_prefixes: str = "timeseries,pattern,chartimg,api_usage,ratelimit,scan,ohlcv,chart,cache,negcache"
+    cache_analytics_scan_count: int = 500  # Keys per SCAN step
+    cache_analytics_max_keys: int = 200000  # Keys sampled per pass; larger keyspaces report a partial pass
+    cache_analytics_top_n: int = 20  # Largest keys reported
+
+    # Process-local L1 in front of Redis
+    l1_cache_enabled: bool = True
+    l1_cache_max_entries: int = 2048  # LRU bound per process
+    l1_cache_max_ttl: float = 30.0  # Seconds; L1 entries never outlive this (or the Redis TTL)
+    l1_cache_pubsub: bool = True  # Broadcast invalidations so other workers drop stale entries
+
+    # Shared universe price panel (memory-mapped, read by every worker)
+    universe_panel_path: str = "/tmp/legend-ai-panel"  # /dev/shm keeps it in RAM
+    universe_panel_dtype: str = "float64"  # float32 halves the footprint
+    universe_panel_max_age: int = 86400  # Seconds before scans stop trusting it
+
     # Email & Alerts (optional for Phase 4)
     sendgrid_api_key: Optional[str] = None
     alert_email: Optional[str] = None
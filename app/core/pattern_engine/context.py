@@ -0,0 +1,136 @@
+"""
+Per-scan shared context.
+
+Everything that is the same for every ticker in a scan (benchmark series,
+market regime, the universe's relative-strength distribution, sector
+metadata and the scan config) is fetched or computed once, when the scan
+starts, and handed to each stage instead of being re-fetched per ticker.
+It also keeps regime inputs consistent across a scan that spans a data
+refresh.
+"""
+from __future__ import annotations
+
+import bisect
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+from app.core.pattern_engine.filters.regime import MarketRegimeFilter
+
+if TYPE_CHECKING:
+    from app.core.universe_panel import UniversePanel
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_SYMBOL = "SPY"
+RS_LOOKBACK = 63  # ~one quarter of daily bars
+
+
+def rs_value(closes: List[float], benchmark_closes: List[float], lookback: int = RS_LOOKBACK) -> Optional[float]:
+    """Relative performance vs the benchmark over ``lookback`` bars (1.0 = in line)."""
+    if len(closes) <= lookback or len(benchmark_closes) <= lookback:
+        return None
+    base, bench_base = closes[-lookback - 1], benchmark_closes[-lookback - 1]
+    if not base or not bench_base or not benchmark_closes[-1]:
+        return None
+    return (closes[-1] / base) / (benchmark_closes[-1] / bench_base)
+
+
+@dataclass
+class ScanContext:
+    """Inputs shared by every ticker of one scan."""
+
+    benchmark: Optional[Dict[str, Any]] = None
+    regime: Dict[str, Any] = field(default_factory=MarketRegimeFilter.default_regime)
+    sectors: Dict[str, str] = field(default_factory=dict)
+    config: Dict[str, Any] = field(default_factory=dict)
+    benchmark_symbol: str = BENCHMARK_SYMBOL
+    rs_distribution: List[float] = field(default_factory=list)
+    rs_ratings: Dict[str, int] = field(default_factory=dict)  # Latest nightly RS history snapshot
+    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+    @classmethod
+    async def build(
+        cls,
+        *,
+        bars: int = 500,
+        interval: str = "1day",
+        sectors: Optional[Mapping[str, str]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        benchmark_symbol: str = BENCHMARK_SYMBOL,
+    ) -> "ScanContext":
+        """
+        Fetch the benchmark and the latest RS ratings once, and classify the regime.
+
+        Daily scans also rank RS against the shared universe panel when a
+        fresh one is published; callers holding their own universe payloads
+        can replace it with ``add_rs_distribution``.
+        """
+        from app.config import get_settings
+        from app.services.cache import get_cache_service
+        from app.services.market_data import market_data_service
+        from app.services.panel_store import get_panel_store
+        from app.services.rs_history import load_latest_ratings
+
+        benchmark = None
+        try:
+            benchmark = await market_data_service.get_time_series(benchmark_symbol, interval, bars)
+        except Exception as exc:
+            logger.warning("Benchmark %s fetch failed: %s", benchmark_symbol, exc)
+        closes = (benchmark or {}).get("c") or []
+        context = cls(
+            benchmark=benchmark if closes else None,
+            regime=MarketRegimeFilter.classify(closes),
+            sectors={symbol.upper(): sector for symbol, sector in (sectors or {}).items()},
+            config=dict(config or {}),
+            benchmark_symbol=benchmark_symbol,
+            rs_ratings=await load_latest_ratings(get_cache_service()),
+        )
+        if interval == "1day":
+            panel = get_panel_store().attach(max_age=get_settings().universe_panel_max_age)
+            if panel is not None:
+                context.add_panel_rs_distribution(panel)
+        return context
+
+    @property
+    def benchmark_closes(self) -> List[float]:
+        return list((self.benchmark or {}).get("c") or [])
+
+    def sector(self, symbol: str) -> Optional[str]:
+        return self.sectors.get(symbol.upper())
+
+    def rs_rating(self, symbol: str) -> Optional[int]:
+        """Latest stored RS rating (1-99) of ``symbol``, if the nightly job has rated it."""
+        return self.rs_ratings.get(symbol.upper())
+
+    def add_rs_distribution(self, payloads: Iterable[Optional[Dict[str, Any]]]) -> None:
+        """Record the universe's RS values so tickers can be ranked against it."""
+        benchmark = self.benchmark_closes
+        values = (rs_value(list((p or {}).get("c") or []), benchmark) for p in payloads)
+        self.rs_distribution = sorted(v for v in values if v is not None)
+
+    def add_panel_rs_distribution(self, panel: "UniversePanel", lookback: int = RS_LOOKBACK) -> None:
+        """Record the RS values of every panel row with enough history."""
+        benchmark = self.benchmark_closes
+        if panel.n_bars <= lookback or len(benchmark) <= lookback or not benchmark[-lookback - 1]:
+            self.rs_distribution = []
+            return
+        bench_return = benchmark[-1] / benchmark[-lookback - 1]
+        usable = panel.lengths > lookback
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = (panel.close[usable, -1] / panel.close[usable, -lookback - 1]) / bench_return
+        self.rs_distribution = np.sort(values[np.isfinite(values)]).tolist()
+
+    def rs_percentile(self, closes: List[float]) -> Optional[float]:
+        """Percentile (0-100) of a ticker's RS within the scan universe."""
+        value = rs_value(list(closes), self.benchmark_closes)
+        if value is None or not self.rs_distribution:
+            return None
+        rank = bisect.bisect_right(self.rs_distribution, value)
+        return round(100.0 * rank / len(self.rs_distribution), 1)
+
+
+__all__ = ["BENCHMARK_SYMBOL", "ScanContext", "rs_value"]
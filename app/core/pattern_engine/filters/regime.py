@@ -4,9 +4,12 @@ Market Regime Filter
 Analyzes broad market conditions (SPY, QQQ, VIX) to determine the environment.
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 import pandas as pd
 
+if TYPE_CHECKING:
+    from app.core.pattern_engine.context import ScanContext
+
 logger = logging.getLogger(__name__)
 
 class MarketRegimeFilter:
@@ -16,41 +19,25 @@ class MarketRegimeFilter:
     def __init__(self):
         pass
 
-    async def analyze_regime(self) -> Dict[str, Any]:
+    async def analyze_regime(self, context: Optional["ScanContext"] = None) -> Dict[str, Any]:
         """
         Analyze current market regime.
         Returns dict with keys: 'trend', 'volatility', 'score_factor'
+
+        Scans pass their ``ScanContext``, which classified the regime once
+        when the scan started; without one SPY is fetched here.
         """
-        # In a real implementation, this would fetch SPY/QQQ data.
-        # For now, we return a default safe assumption or fetch via market_data_service if possible.
-        # Since this method is async, we can await data.
-        
+        if context is not None:
+            return context.regime
+
         try:
             from app.services.market_data import market_data_service
             # Fetch SPY data
             spy_data = await market_data_service.get_time_series("SPY", "1day", 200)
             if not spy_data or not spy_data.get('c'):
                 return self._default_regime()
-                
-            closes = spy_data.get('c')
-            current_price = closes[-1]
-            ma50 = sum(closes[-50:]) / 50 if len(closes) >= 50 else current_price
-            ma200 = sum(closes[-200:]) / 200 if len(closes) >= 200 else current_price
-            
-            trend = "NEUTRAL"
-            if current_price > ma200:
-                trend = "BULL" if current_price > ma50 else "CORRECTION"
-            else:
-                trend = "BEAR" if current_price < ma50 else "RECOVERY"
-                
-            return {
-                "trend": trend,
-                "volatility": "NORMAL", # Placeholder for VIX check
-                "ma200": ma200,
-                "ma50": ma50,
-                "above_200": current_price > ma200
-            }
-            
+            return self.classify(spy_data.get('c'))
+
         except ImportError:
             logger.warning("MarketData helper not available")
             return self._default_regime()
@@ -58,5 +45,32 @@ class MarketRegimeFilter:
             logger.error(f"Failed to analyze regime: {e}")
             return self._default_regime()
 
-    def _default_regime(self):
+    @classmethod
+    def classify(cls, closes: List[float]) -> Dict[str, Any]:
+        """Regime from benchmark closes (price vs its 50/200-day averages)."""
+        if not closes:
+            return cls.default_regime()
+        current_price = closes[-1]
+        ma50 = sum(closes[-50:]) / 50 if len(closes) >= 50 else current_price
+        ma200 = sum(closes[-200:]) / 200 if len(closes) >= 200 else current_price
+
+        trend = "NEUTRAL"
+        if current_price > ma200:
+            trend = "BULL" if current_price > ma50 else "CORRECTION"
+        else:
+            trend = "BEAR" if current_price < ma50 else "RECOVERY"
+
+        return {
+            "trend": trend,
+            "volatility": "NORMAL", # Placeholder for VIX check
+            "ma200": ma200,
+            "ma50": ma50,
+            "above_200": current_price > ma200
+        }
+
+    @staticmethod
+    def default_regime() -> Dict[str, Any]:
         return {"trend": "NEUTRAL", "volatility": "NORMAL", "above_200": True}
+
+    def _default_regime(self):
+        return self.default_regime()
@@ -16,6 +16,7 @@ logger = logging.getLogger(__name__)
 
 from app.core.pattern_engine.filters.regime import MarketRegimeFilter
 from app.core.pattern_engine.filters.trend import TrendTemplateFilter
+from app.core.pattern_engine.context import ScanContext
 
 class ScanPipeline:
     """
@@ -28,16 +29,21 @@ class ScanPipeline:
         self.regime_filter = MarketRegimeFilter()
         self.trend_filter = TrendTemplateFilter()
 
-    async def run(self, symbol: str, data: pd.DataFrame) -> List[Dict[str, Any]]:
+    async def run(
+        self, symbol: str, data: pd.DataFrame, context: Optional["ScanContext"] = None
+    ) -> List[Dict[str, Any]]:
         """
         Run the 8-stage pipeline for a ticker.
+
+        ``context`` carries the scan-wide inputs (benchmark, regime, RS
+        distribution, sectors); without one the regime is fetched per call.
         """
         # Stage A: Data Validation
         if not self._validate_data(data):
             return []
             
         # Stage B: Market Regime
-        regime = await self.regime_filter.analyze_regime()
+        regime = await self.regime_filter.analyze_regime(context)
         
         # Stage C: Trend Template
         trend_tier = self.trend_filter.check_tier(data)
@@ -58,7 +64,7 @@ class ScanPipeline:
         validated = self._validate_candidates(candidates, regime, trend_tier)
         
         # Stage F: Scoring
-        scored = self._score_patterns(validated, regime, trend_tier)
+        scored = self._score_patterns(validated, regime, trend_tier, self._context_metadata(symbol, data, context))
         
         # Stage G: Trade Plan
         planned = self._generate_trade_plans(scored)
@@ -117,7 +123,21 @@ class ScanPipeline:
         # For now return all, scanner service does filtering
         return candidates
 
-    def _score_patterns(self, patterns: List[Any], regime: Dict, tier: str) -> List[Dict[str, Any]]:
+    def _context_metadata(
+        self, symbol: str, data: pd.DataFrame, context: Optional["ScanContext"]
+    ) -> Dict[str, Any]:
+        """Per-ticker fields derived from the scan context."""
+        if context is None:
+            return {}
+        return {
+            "sector": context.sector(symbol),
+            "rs_percentile": context.rs_percentile(data["close"].tolist()),
+            "rs_rating": context.rs_rating(symbol),
+        }
+
+    def _score_patterns(
+        self, patterns: List[Any], regime: Dict, tier: str, extra: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """Stage F: Scoring."""
         results = []
         for p in patterns:
@@ -128,7 +148,8 @@ class ScanPipeline:
                 "confidence": p.confidence,
                 "metadata": {
                     "trend_tier": tier,
-                    "regime": regime
+                    "regime": regime,
+                    **(extra or {}),
                 },
                 "entry": p.entry,
                 "stop": p.stop,
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-import asyncio
+import heapq
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
+from app.core.pattern_engine.context import ScanContext
 from app.core.pattern_engine.filter import PatternFilter
 from app.core.pattern_engine.scoring import PatternScorer
+from app.services.adaptive_concurrency import bounded_map, concurrency_gate, pool_size
 
 
 # Pattern priority values (higher = more important)
@@ -67,15 +69,56 @@ def get_pattern_priority(pattern_name: str) -> int:
     return PATTERN_PRIORITIES["_default"]
 
 
+def rank_key(item: Dict[str, Any]) -> Tuple[float, int, float]:
+    """Ranking order for results: score, then pattern priority, then confidence."""
+    return (
+        item.get("score") or 0.0,
+        get_pattern_priority(item.get("pattern") or ""),
+        item.get("confidence") or 0.0,
+    )
+
+
+class TopK:
+    """
+    The best ``k`` items pushed so far, held in a min-heap of size ``k``.
+
+    Memory stays O(k) however many items are pushed; ``k=None`` keeps all.
+    Items with equal keys keep their push order.
+    """
+
+    def __init__(self, k: Optional[int] = None, key: Callable[[Dict[str, Any]], Any] = rank_key):
+        self.k = k
+        self.key = key
+        self.seen = 0
+        self._heap: List[Tuple[Any, int, Dict[str, Any]]] = []
+
+    def push(self, item: Dict[str, Any]) -> None:
+        self.seen += 1
+        entry = (self.key(item), -self.seen, item)
+        if self.k is None or len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif self.k > 0 and entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Kept items, best first."""
+        return [item for _, _, item in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+
 @dataclass
 class ScanConfig:
     universe: List[str]  # Ticker list
     interval: str = "1day"
-    max_concurrent: int = 10
+    max_concurrent: Optional[int] = None  # None = shared adaptive limiter
     apply_filters: bool = True
     apply_scoring: bool = True
     min_score: float = 6.0
     filter_config: Optional[Dict[str, Any]] = None
+    limit: Optional[int] = None  # Keep only the top N results (None = all)
+    context: Optional[ScanContext] = None  # Built once per scan when not supplied
 
 
 
@@ -93,80 +136,19 @@ class UniverseScanner:
     async def scan_universe(self, config: ScanConfig) -> Dict[str, Any]:
         """Scan a list of tickers and return ranked results."""
         started = time.perf_counter()
-        sem = asyncio.Semaphore(config.max_concurrent)
-
-        async def _run(ticker: str):
-            async with sem:
-                try:
-                    # Use the new pipeline
-                    from app.services.market_data import market_data_service
-                    price_data = await market_data_service.get_time_series(
-                        ticker=ticker,
-                        interval=config.interval,
-                        outputsize=320,
-                    )
-                    
-                    if not price_data or not price_data.get("c"):
-                        return ticker, [], None
-                        
-                    # Convert to minimal DF for pipeline (it expects DF)
-                    # We might need to move conversion logic here or pipeline handles it
-                    # Pipeline expects DF.
-                    # reusing _to_dataframe from pattern_scanner logic?
-                    # Or implement a helper. 
-                    # For now minimal conversion:
-                    import pandas as pd
-                    df = pd.DataFrame({
-                        'close': price_data.get('c', []),
-                        'high': price_data.get('h', []),
-                        'low': price_data.get('l', []),
-                        'open': price_data.get('o', []),
-                        'volume': price_data.get('v', [])
-                    })
-                    
-                    patterns = await self.pipeline.run(ticker, df)
-                    return ticker, patterns, None
-                except Exception as exc:  # pragma: no cover - defensive
-                    return ticker, [], exc
-
-        tasks = [_run(ticker) for ticker in config.universe]
-        raw_results = await asyncio.gather(*tasks)
-
-        aggregated: List[Dict[str, Any]] = []
+        top = TopK(config.limit)
         errors: Dict[str, str] = {}
-        for ticker, patterns, error in raw_results:
-            if error:
-                errors[ticker] = str(error)
-                continue
-
-            # Filtering and Scoring are now part of Pipeline (Stages E, F)
-            # But pipeline returns scored patterns.
-            # config.apply_filters / apply_scoring checks?
-            # Pipeline does it all. We assume config matches pipeline default or pass config to pipeline.run
-            
-            # The pipeline runs detection, validation, scoring.
-            
-            for pat in patterns:
-                pat.setdefault("ticker", ticker)
-                pat.setdefault("symbol", ticker)
-
-            # Keep only the best pattern per ticker (by priority, then score, then confidence)
-            if patterns:
-                # Need to robustly handle missing keys if pipeline output differs slightly
-                best_pattern = max(
-                    patterns,
-                    key=lambda p: (
-                        get_pattern_priority(p.get("pattern", "")),
-                        p.get("score", 0.0),
-                        p.get("confidence", 0.0)
-                    )
-                )
-                aggregated.append(best_pattern)
-
-        ranked = self.rank_results(aggregated)
-        if config.apply_scoring:
-            ranked = [p for p in ranked if p.get("score", 0.0) >= config.min_score]
-
+        events = self.iter_scan(config)
+        try:
+            async for ticker, best, error in events:
+                if error:
+                    errors[ticker] = str(error)
+                elif best:
+                    top.push(best)
+        finally:
+            await events.aclose()
+
+        ranked = self.rank_results(top.results())
         duration_ms = (time.perf_counter() - started) * 1000
         return {
             "as_of": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
@@ -176,9 +158,97 @@ class UniverseScanner:
             "meta": {
                 "duration_ms": round(duration_ms, 2),
                 "result_count": len(ranked),
+                "total_hits": top.seen,
             },
         }
 
+    async def iter_scan(
+        self, config: ScanConfig
+    ) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Yield ``(ticker, best_pattern, error)`` as each ticker finishes.
+
+        ``best_pattern`` is None when nothing was found or it scored below
+        ``config.min_score``. Tickers are pulled from ``config.universe`` by a
+        fixed pool of workers, so only the tickers in flight hold memory.
+        Closing the iterator early cancels them.
+        """
+        sem = concurrency_gate(config.max_concurrent)
+        context = config.context or await self.build_context(config)
+        results = bounded_map(
+            lambda ticker: self._scan_one(ticker, config, sem, context),
+            config.universe,
+            pool_size(config.max_concurrent),
+        )
+        try:
+            async for ticker, patterns, error in results:
+                best = None if error else self._best_pattern(ticker, patterns)
+                if best and config.apply_scoring and best.get("score", 0.0) < config.min_score:
+                    best = None
+                yield ticker, best, error
+        finally:
+            await results.aclose()
+
+    @staticmethod
+    async def build_context(config: ScanConfig) -> ScanContext:
+        return await ScanContext.build(
+            bars=320,
+            interval=config.interval,
+            config={
+                "interval": config.interval,
+                "min_score": config.min_score,
+                "apply_filters": config.apply_filters,
+                "apply_scoring": config.apply_scoring,
+                "filter_config": config.filter_config,
+            },
+        )
+
+    async def _scan_one(self, ticker: str, config: ScanConfig, sem, context: Optional[ScanContext] = None):
+        async with sem:
+            try:
+                # Use the new pipeline
+                from app.services.market_data import market_data_service
+                price_data = await market_data_service.get_time_series(
+                    ticker=ticker,
+                    interval=config.interval,
+                    outputsize=320,
+                )
+                
+                if not price_data or not price_data.get("c"):
+                    return ticker, [], None
+                    
+                # Convert to minimal DF for pipeline (it expects DF)
+                import pandas as pd
+                df = pd.DataFrame({
+                    'close': price_data.get('c', []),
+                    'high': price_data.get('h', []),
+                    'low': price_data.get('l', []),
+                    'open': price_data.get('o', []),
+                    'volume': price_data.get('v', [])
+                })
+                
+                patterns = await self.pipeline.run(ticker, df, context)
+                return ticker, patterns, None
+            except Exception as exc:  # pragma: no cover - defensive
+                return ticker, [], exc
+
+    @staticmethod
+    def _best_pattern(ticker: str, patterns: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Keep only the best pattern per ticker (by priority, then score, then confidence)."""
+        if not patterns:
+            return None
+        for pat in patterns:
+            pat.setdefault("ticker", ticker)
+            pat.setdefault("symbol", ticker)
+        return max(
+            patterns,
+            key=lambda p: (
+                get_pattern_priority(p.get("pattern", "")),
+                p.get("score", 0.0),
+                p.get("confidence", 0.0)
+            )
+        )
+
     async def scan_ticker(self, ticker: str, interval: str) -> List[Dict[str, Any]]:
         """Deprecated: Use pipeline directly."""
         return [] 
@@ -189,11 +259,7 @@ class UniverseScanner:
         if not results:
             return []
 
-        ranked = sorted(
-            results,
-            key=lambda item: (item.get("score") or 0.0, item.get("confidence") or 0.0),
-            reverse=True,
-        )
+        ranked = sorted(results, key=rank_key, reverse=True)
         for idx, item in enumerate(ranked, start=1):
             item.setdefault("rank", idx)
         return ranked
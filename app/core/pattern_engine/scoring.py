@@ -156,9 +156,20 @@ class PatternScorer:
 
     def _score_relative_strength(self, pattern: Dict, metadata: Dict) -> float:
         # Max 10.
-        # RS Rating > 85 = 10 pts
-        # RS Rating > 70 = 5 pts
-        return 5.0
+        # RS Rating from the nightly RS history (pipeline metadata)
+        # RS Rating >= 85 = 10 pts, >= 70 = 7.5 pts, >= 50 = 5 pts, else 2.5
+        rating = metadata.get("rs_rating")
+        if rating is None:
+            rating = pattern.get("rs_rating")
+        if rating is None:
+            return 5.0  # Not rated yet: neutral
+        if rating >= 85:
+            return 10.0
+        if rating >= 70:
+            return 7.5
+        if rating >= 50:
+            return 5.0
+        return 2.5
 
     def _score_ma_stack(self, pattern: Dict, metadata: Dict) -> float:
         # Max 10.
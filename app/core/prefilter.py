@@ -0,0 +1,216 @@
+"""
+Vectorized cross-sectional prefilter (phase 1 of a universe scan).
+
+Runs cheap screens over the whole ``UniversePanel`` in a single NumPy pass so
+only plausible candidates reach the expensive pattern detectors (phase 2):
+
+- Minervini trend template (same rules as ``minervini_trend_template``)
+- Liquidity (average dollar volume)
+- Proximity to the 52-week high
+- Relative strength percentile within the scanned universe
+
+A screen only rejects a symbol when it has enough history to evaluate it.
+Short histories pass through and are left to the detectors' own checks, so
+the prefilter is never stricter than phase 2 on data it cannot judge.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.universe_panel import UniversePanel
+
+TREND_MIN_BARS = 200
+RS_QUARTER_BARS = 63
+RS_YEAR_BARS = 252
+
+
+@dataclass
+class PrefilterConfig:
+    """Thresholds for the phase-1 screens. ``None`` disables a screen."""
+
+    trend_template: bool = True
+    min_dollar_volume: Optional[float] = 500_000.0  # Matches ScanPipeline stage A
+    liquidity_window: int = 20
+    max_pct_from_high: Optional[float] = 0.25  # Within 25% of the 52-week high
+    high_window: int = RS_YEAR_BARS
+    min_rs_rating: Optional[float] = 70.0
+    min_rs_cohort: int = 20  # Percentiles are meaningless on tiny universes
+
+    @classmethod
+    def liquidity_only(cls) -> "PrefilterConfig":
+        """
+        Only the liquidity screen, for scans whose detectors are not Minervini-gated.
+
+        All-pattern scans look for bottoming and bearish setups too (double
+        bottoms, head & shoulders, falling wedges) that the trend, RS and
+        near-high screens would drop before any detector saw them.
+        """
+        return cls(trend_template=False, max_pct_from_high=None, min_rs_rating=None)
+
+
+@dataclass
+class PrefilterResult:
+    """Outcome of a prefilter pass."""
+
+    survivors: List[str]
+    missing: List[str]
+    rejected: Dict[str, List[str]] = field(default_factory=dict)
+    metrics: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def summary(self) -> Dict[str, Any]:
+        reasons = Counter(reason for failures in self.rejected.values() for reason in failures)
+        evaluated = len(self.survivors) + len(self.rejected)
+        return {
+            "evaluated": evaluated,
+            "passed": len(self.survivors),
+            "rejected": len(self.rejected),
+            "missing": len(self.missing),
+            "rejected_by": dict(reasons),
+            "pass_rate": round(len(self.survivors) / evaluated, 4) if evaluated else None,
+        }
+
+
+def trailing_mean(matrix: np.ndarray, window: int, lag: int = 0) -> np.ndarray:
+    """Mean of the ``window`` columns ending ``lag`` bars before the last one."""
+    end = matrix.shape[1] - lag
+    start = end - window
+    if window <= 0 or start < 0:
+        return np.full(matrix.shape[0], np.nan)
+    return matrix[:, start:end].mean(axis=1)
+
+
+def trend_template_mask(close: np.ndarray) -> np.ndarray:
+    """Vectorized ``minervini_trend_template`` pass/fail for every row."""
+    last = close[:, -1]
+    sma50 = trailing_mean(close, 50)
+    sma150 = trailing_mean(close, 150)
+    sma200 = trailing_mean(close, 200)
+    sma50_prev = trailing_mean(close, 50, lag=10)
+    sma200_prev = trailing_mean(close, 200, lag=10)
+    with np.errstate(invalid="ignore"):
+        return (
+            (last > sma50)
+            & (sma50 > sma150)
+            & (sma150 > sma200)
+            & (sma200 > sma200_prev)
+            & (sma50 > sma50_prev)
+        )
+
+
+def weighted_quarterly_scores(close: np.ndarray) -> np.ndarray:
+    """Minervini weighted RS score (0.4·Q4 + 0.2·Q3 + 0.2·Q2 + 0.2·Q1) per row."""
+    n_rows, n_bars = close.shape
+    if n_bars < RS_YEAR_BARS:
+        return np.full(n_rows, np.nan)
+    marks = close[:, [-RS_YEAR_BARS, -3 * RS_QUARTER_BARS, -2 * RS_QUARTER_BARS, -RS_QUARTER_BARS, -1]]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        quarters = (marks[:, 1:] - marks[:, :-1]) / marks[:, :-1] * 100
+    scores = quarters @ np.array([0.2, 0.2, 0.2, 0.4])
+    scores[~np.isfinite(scores)] = np.nan
+    return scores
+
+
+def percentile_ratings(scores: np.ndarray) -> np.ndarray:
+    """Rank scores into 0-99 percentiles (share of valid scores strictly below)."""
+    ratings = np.full(scores.shape, np.nan)
+    valid = np.isfinite(scores)
+    if not valid.any():
+        return ratings
+    ordered = np.sort(scores[valid])
+    below = np.searchsorted(ordered, scores[valid], side="left")
+    ratings[valid] = np.clip(below / len(ordered) * 100, 0.0, 99.0)
+    return ratings
+
+
+def run_prefilter(
+    panel: UniversePanel,
+    config: Optional[PrefilterConfig] = None,
+    *,
+    requested: Optional[List[str]] = None,
+) -> PrefilterResult:
+    """Apply every enabled screen to ``panel`` and return survivors in input order."""
+    config = config or PrefilterConfig()
+    requested_symbols = [s.upper() for s in requested] if requested else list(panel.symbols)
+    missing = [s for s in requested_symbols if panel.row(s) is None]
+    n_rows = panel.n_symbols
+    if n_rows == 0:
+        return PrefilterResult(survivors=[], missing=missing)
+
+    lengths = panel.lengths
+    close = panel.close
+    last = close[:, -1]
+    failures: Dict[str, np.ndarray] = {}
+
+    trend_pass = np.ones(n_rows, dtype=bool)
+    if config.trend_template and panel.n_bars >= TREND_MIN_BARS:
+        trend_pass = trend_template_mask(close)
+        failures["trend_template"] = (lengths >= TREND_MIN_BARS) & ~trend_pass
+
+    dollar_volume = np.full(n_rows, np.nan)
+    if config.min_dollar_volume is not None and panel.n_bars >= config.liquidity_window:
+        dollar_volume = trailing_mean(close * panel.volume, config.liquidity_window)
+        with np.errstate(invalid="ignore"):
+            failures["liquidity"] = (lengths >= config.liquidity_window) & (
+                dollar_volume < config.min_dollar_volume
+            )
+
+    window = min(config.high_window, panel.n_bars)
+    highs = panel.high[:, -window:]
+    year_high = np.where(np.isnan(highs), -np.inf, highs).max(axis=1)
+    year_high[~np.isfinite(year_high)] = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_from_high = 1.0 - last / year_high
+    if config.max_pct_from_high is not None:
+        with np.errstate(invalid="ignore"):
+            failures["off_highs"] = np.isfinite(pct_from_high) & (
+                pct_from_high > config.max_pct_from_high
+            )
+
+    rs_rating = percentile_ratings(weighted_quarterly_scores(close))
+    if config.min_rs_rating is not None and np.isfinite(rs_rating).sum() >= config.min_rs_cohort:
+        with np.errstate(invalid="ignore"):
+            failures["rs_rating"] = np.isfinite(rs_rating) & (rs_rating < config.min_rs_rating)
+
+    rejected_mask = np.zeros(n_rows, dtype=bool)
+    for mask in failures.values():
+        rejected_mask |= mask
+
+    survivors: List[str] = []
+    rejected: Dict[str, List[str]] = {}
+    metrics: Dict[str, Dict[str, Any]] = {}
+    for symbol in requested_symbols:
+        row = panel.row(symbol)
+        if row is None:
+            continue
+        metrics[symbol] = {
+            "bars": int(lengths[row]),
+            "trend_pass": bool(trend_pass[row]) if lengths[row] >= TREND_MIN_BARS else None,
+            "dollar_volume": _finite(dollar_volume[row]),
+            "pct_from_high": _finite(pct_from_high[row]),
+            "rs_rating": _finite(rs_rating[row]),
+        }
+        if rejected_mask[row]:
+            rejected[symbol] = [name for name, mask in failures.items() if mask[row]]
+        else:
+            survivors.append(symbol)
+
+    return PrefilterResult(survivors=survivors, missing=missing, rejected=rejected, metrics=metrics)
+
+
+def _finite(value: float) -> Optional[float]:
+    return round(float(value), 4) if np.isfinite(value) else None
+
+
+__all__ = [
+    "PrefilterConfig",
+    "PrefilterResult",
+    "percentile_ratings",
+    "run_prefilter",
+    "trailing_mean",
+    "trend_template_mask",
+    "weighted_quarterly_scores",
+]
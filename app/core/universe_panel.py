@@ -0,0 +1,128 @@
+"""
+Aligned (tickers × bars) OHLCV panel for cross-sectional universe work.
+
+Rows are symbols, columns are bars. Every row is right-aligned on the most
+recent bar and left-padded with NaN, matching how the rest of the codebase
+aligns series of different lengths (see ``relative_strength_metrics``).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+
+PANEL_FIELDS = ("open", "high", "low", "close", "volume")
+
+# Field name -> key in the market data payload ({"c": [...], "o": [...], ...})
+PAYLOAD_KEYS = {"open": "o", "high": "h", "low": "l", "close": "c", "volume": "v"}
+
+
+def _to_array(values: Any) -> np.ndarray:
+    """Convert a payload series to float64, mapping bad values to NaN."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        out = np.full(len(values), np.nan, dtype=np.float64)
+        for idx, value in enumerate(values):
+            try:
+                out[idx] = float(value)
+            except (TypeError, ValueError):
+                continue
+        return out
+
+
+@dataclass
+class UniversePanel:
+    """OHLCV matrices for a universe, one row per symbol."""
+
+    symbols: List[str]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    lengths: np.ndarray  # Valid (right-aligned) bars per row
+    dates: Optional[np.ndarray] = None  # Bar labels for the columns, if known
+    row_of: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if not self.row_of:
+            self.row_of = {symbol: idx for idx, symbol in enumerate(self.symbols)}
+
+    @property
+    def n_symbols(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def n_bars(self) -> int:
+        return int(self.close.shape[1]) if self.close.ndim == 2 else 0
+
+    def row(self, symbol: str) -> Optional[int]:
+        return self.row_of.get(symbol.upper())
+
+    def series(self, symbol: str, name: str = "close") -> np.ndarray:
+        """Return the valid tail of one field for ``symbol`` (a view, not a copy)."""
+        idx = self.row(symbol)
+        if idx is None:
+            return np.empty(0, dtype=np.float64)
+        length = int(self.lengths[idx])
+        matrix: np.ndarray = getattr(self, name)
+        return matrix[idx, matrix.shape[1] - length:]
+
+
+def build_panel(
+    payloads: Mapping[str, Optional[Dict[str, Any]]],
+    bars: int,
+) -> UniversePanel:
+    """
+    Build a right-aligned panel from market data payloads.
+
+    Symbols without closes are skipped; callers can diff ``panel.symbols``
+    against their input to find missing data.
+    """
+    usable = [
+        (symbol.upper(), payload)
+        for symbol, payload in payloads.items()
+        if payload and payload.get("c")
+    ]
+    n_symbols = len(usable)
+    width = max(1, int(bars))
+    matrices = {name: np.full((n_symbols, width), np.nan, dtype=np.float64) for name in PANEL_FIELDS}
+    lengths = np.zeros(n_symbols, dtype=np.int64)
+    dates: Optional[np.ndarray] = None
+    longest = 0
+
+    for row, (symbol, payload) in enumerate(usable):
+        closes = _to_array(payload["c"])[-width:]
+        length = len(closes)
+        lengths[row] = length
+        start = width - length
+        matrices["close"][row, start:] = closes
+        for name in ("open", "high", "low", "volume"):
+            raw = payload.get(PAYLOAD_KEYS[name])
+            if raw is None or len(raw) == 0:
+                # Same fallbacks the scanners use when converting to DataFrames
+                if name == "volume":
+                    matrices[name][row, start:] = 0.0
+                else:
+                    matrices[name][row, start:] = closes
+                continue
+            values = _to_array(raw)[-width:]
+            matrices[name][row, width - len(values):] = values
+
+        stamps = payload.get("t") or []
+        if length > longest and len(stamps) >= length:
+            longest = length
+            dates = np.full(width, None, dtype=object)
+            dates[start:] = stamps[-length:]
+
+    return UniversePanel(
+        symbols=[symbol for symbol, _ in usable],
+        lengths=lengths,
+        dates=dates,
+        **matrices,
+    )
+
+
+__all__ = ["PANEL_FIELDS", "PAYLOAD_KEYS", "UniversePanel", "build_panel"]
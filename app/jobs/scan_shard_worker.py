@@ -0,0 +1,48 @@
+"""
+Standalone shard worker for distributed scans.
+
+Run one or more per host to add scan capacity:
+
+    python -m app.jobs.scan_shard_worker
+
+The worker watches the set of active sharded scans in Redis and claims
+shards from whichever scan has work left.
+"""
+import asyncio
+import logging
+
+from app.services.cache import get_cache_service
+from app.services.scan_shards import ACTIVE_SCANS_KEY, ShardedScan, default_worker_id
+
+logger = logging.getLogger("scan_shard_worker")
+
+
+async def run_shard_worker(poll_interval: float = 2.0, once: bool = False) -> int:
+    """Work on active sharded scans; returns shards processed when ``once``."""
+    cache = get_cache_service()
+    worker_id = default_worker_id()
+    processed = 0
+    # Shards read cached series through L1; drop entries other processes overwrite
+    cache.start_invalidation_listener()
+    logger.info("Shard worker %s started", worker_id)
+    try:
+        while True:
+            try:
+                redis = await cache._get_redis()
+                scan_ids = await redis.smembers(ACTIVE_SCANS_KEY)
+                for scan_id in sorted(scan_ids):
+                    sharded = ShardedScan(cache, scan_id)
+                    processed += await sharded.work(worker_id, poll_interval=poll_interval)
+            except Exception as exc:
+                logger.error("Shard worker %s error: %s", worker_id, exc)
+            if once:
+                return processed
+            await asyncio.sleep(poll_interval)
+    finally:
+        if cache.l1 is not None:
+            await cache.l1.stop_listener()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_shard_worker())
@@ -3,14 +3,15 @@ Background job entry point for scheduled scans.
 """
 from app.services.eod_scanner import get_eod_scanner
 import logging
+from typing import Optional
 
 logger = logging.getLogger("eod_scan_job")
 
 
-async def run_scan_job():
+async def run_scan_job(resume: bool = True, incremental: Optional[bool] = None):
     scanner = get_eod_scanner()
     try:
-        result = await scanner.run_scan()
+        result = await scanner.run_scan(resume=resume, incremental=incremental)
         logger.info("EOD scan job completed: %s patterns", result.get("patterns_found"))
     except Exception as exc:
         logger.error("EOD scan job failed: %s", exc)
@@ -8,7 +8,7 @@ from datetime import datetime, time
 from typing import List, Dict, Any, Optional
 from zoneinfo import ZoneInfo
 
-from app.services.database import get_database_service
+from app.services.database import get_database_service, run_db
 
 logger = logging.getLogger(__name__)
 
@@ -116,7 +116,8 @@ class WatchlistMonitor:
             
             # Update status if changed
             if new_status != status:
-                self.db.update_watchlist_symbol(
+                await run_db(
+                    self.db.update_watchlist_symbol,
                     ticker,
                     status=new_status
                 )
@@ -154,7 +155,7 @@ class WatchlistMonitor:
         
         try:
             # Get all watchlist items
-            items = self.db.get_watchlist_items()
+            items = await run_db(self.db.get_watchlist_items)
             
             if not items:
                 logger.debug("No watchlist items to monitor")
@@ -171,7 +172,8 @@ class WatchlistMonitor:
                     
                     # Log alert to database
                     try:
-                        self.db.log_alert(
+                        await run_db(
+                            self.db.log_alert,
                             ticker=alert["ticker"],
                             alert_type=alert["alert_type"],
                             message=f"{alert['ticker']} {alert['alert_type']}: ${alert['current_price']:.2f}",
@@ -149,6 +149,23 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     except Exception as exc:
         logger.warning("⚠️ Scheduler failed to start: %s", exc)
 
+    try:
+        from app.services.scan_jobs import start_scan_workers
+
+        start_scan_workers()
+        logger.info("🧵 Scan job workers started (%s)", settings.scan_job_workers)
+    except Exception as exc:
+        logger.warning("⚠️ Scan job workers failed to start: %s", exc)
+
+    if settings.l1_cache_enabled and settings.l1_cache_pubsub:
+        try:
+            from app.services.cache import get_cache_service
+
+            get_cache_service().start_invalidation_listener()
+            logger.info("🧊 L1 cache invalidation listener started")
+        except Exception as exc:
+            logger.warning("⚠️ L1 cache invalidation listener failed to start: %s", exc)
+
     logger.info("✅ Bot started successfully!")
 
     yield
@@ -186,4 +203,28 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     except Exception as exc:
         logger.warning("⚠️ Scheduler shutdown failed: %s", exc)
 
+    try:
+        from app.services.scan_jobs import stop_scan_workers
+
+        await stop_scan_workers()
+        logger.info("🧵 Scan job workers stopped")
+    except Exception as exc:
+        logger.warning("⚠️ Scan job worker shutdown failed: %s", exc)
+
+    try:
+        from app.services.multi_tier_cache import close_multi_tier_cache
+
+        await close_multi_tier_cache()
+    except Exception as exc:
+        logger.warning("⚠️ Multi-tier cache shutdown failed: %s", exc)
+
+    try:
+        from app.services.l1_cache import get_l1_cache
+
+        l1_cache = get_l1_cache()
+        if l1_cache is not None:
+            await l1_cache.stop_listener()
+    except Exception as exc:
+        logger.warning("⚠️ L1 cache listener shutdown failed: %s", exc)
+
     logger.info("✅ Shutdown complete")
@@ -40,6 +40,9 @@ from app.routers.advanced_analysis import router as advanced_analysis_router
 from app.api.news import router as news_router
 from app.api.portfolio import router as portfolio_router
 from app.api.backtesting import router as backtesting_router
+from app.api.rs_history import router as rs_history_router
+from app.api.scan_history import router as scan_history_router
+from app.api.blobs import router as blobs_router
 from app.middleware.structured_logging import StructuredLoggingMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware
 from app.utils.build_info import resolve_build_sha
@@ -135,6 +138,9 @@ app.include_router(advanced_analysis_router)
 app.include_router(news_router)
 app.include_router(portfolio_router)
 app.include_router(backtesting_router)
+app.include_router(rs_history_router)
+app.include_router(scan_history_router)
+app.include_router(blobs_router)
 
 # Mount static files if they exist
 static_path = Path(__file__).parent.parent / "static"
@@ -3,7 +3,7 @@ Database models for Legend AI
 Phase 1.5: Database Integration
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Boolean, ForeignKey, BigInteger, JSON
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, Text, Boolean, ForeignKey, BigInteger, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 
@@ -34,7 +34,7 @@ class PatternScan(Base):
     stop_price = Column(Float)
     target_price = Column(Float)
     risk_reward_ratio = Column(Float)
-    criteria_met = Column(Text)  # JSON string of met criteria
+    criteria_met = Column(JSON)  # List of met criteria
     analysis = Column(Text)
     current_price = Column(Float)
     volume_dry_up = Column(Boolean, default=False)
@@ -43,6 +43,34 @@ class PatternScan(Base):
     rs_rating = Column(Float, nullable=True)  # Relative strength rating
     scanned_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
+    __table_args__ = (
+        Index("ix_pattern_scans_pattern_scanned", "pattern_type", "scanned_at"),
+        Index("ix_pattern_scans_ticker_scanned", "ticker_id", "scanned_at"),
+    )
+
+class PatternScanRollup(Base):
+    """Nightly per-day, per-pattern summary of pattern_scans"""
+    __tablename__ = "pattern_scan_rollups"
+
+    day = Column(Date, primary_key=True)
+    pattern_type = Column(String(50), primary_key=True)
+    scans = Column(Integer, nullable=False)
+    tickers = Column(Integer, nullable=False)  # Distinct tickers detected that day
+    avg_score = Column(Float)
+    min_score = Column(Float)
+    max_score = Column(Float)
+    score_histogram = Column(JSON)  # Counts per whole score point, index 0..9 (10s fold into 9)
+
+class TickerPatternSeen(Base):
+    """First and last time each ticker was detected with each pattern"""
+    __tablename__ = "ticker_pattern_seen"
+
+    ticker_id = Column(Integer, ForeignKey("tickers.id", ondelete="CASCADE"), primary_key=True)
+    pattern_type = Column(String(50), primary_key=True)
+    first_seen = Column(DateTime(timezone=True), nullable=False)
+    last_seen = Column(DateTime(timezone=True), nullable=False, index=True)
+    best_score = Column(Float)
+
 class RSHistory(Base):
     """Relative Strength rating history for tracking changes over time"""
     __tablename__ = "rs_history"
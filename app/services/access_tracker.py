@@ -0,0 +1,156 @@
+"""
+Decayed top-K of what users actually request.
+
+Every analyze, pattern-detect and chart request records its
+``(ticker, interval)``. Counts live in one Redis sorted set shared by all
+workers, with forward exponential decay: an access at time ``t`` adds
+``2 ** ((t - epoch) / half_life)``, so recent demand outweighs old demand
+without ever rewriting existing scores. When weights grow large the set is
+rescaled in one ZUNIONSTORE and the epoch moves forward. The set is trimmed
+to ``capacity`` members, which keeps the sketch compact.
+
+Requests only touch an in-process buffer; the buffer is flushed in one
+pipeline every few seconds or every few hundred accesses.
+
+    cache:access:hot     zset  "{TICKER}|{interval}" -> decayed count
+    cache:access:epoch   str   unix time the current weights are relative to
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from app.services.cache import CacheService
+
+logger = logging.getLogger(__name__)
+
+ACCESS_KEY = "cache:access:hot"
+EPOCH_KEY = "cache:access:epoch"
+RESCALE_AFTER = 64  # Half-lives before weights are renormalized (2**64 stays well inside float range)
+FLUSH_INTERVAL = 5.0
+FLUSH_BATCH = 200
+
+
+class AccessTracker:
+    """Shared, time-decayed access counts of tickers."""
+
+    def __init__(
+        self,
+        cache: CacheService,
+        half_life: float = 21600.0,
+        capacity: int = 500,
+        clock=time.time,
+    ):
+        self.cache = cache
+        self.half_life = float(half_life)
+        self.capacity = int(capacity)
+        self.clock = clock
+        self._pending: Counter = Counter()
+        self._last_flush = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def member(ticker: str, interval: str = "1day") -> str:
+        return f"{ticker.upper()}|{interval}"
+
+    def record(self, ticker: str, interval: str = "1day") -> None:
+        """Count one request; cheap enough for every request path."""
+        if not ticker:
+            return
+        self._pending[self.member(ticker, interval)] += 1
+        if len(self._pending) < FLUSH_BATCH and time.monotonic() - self._last_flush < FLUSH_INTERVAL:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+        except RuntimeError:
+            pass  # No loop (sync caller); the next async record or flush() picks it up
+
+    async def flush(self) -> int:
+        """Add buffered accesses to the shared sketch; returns members updated."""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, Counter()
+        try:
+            redis = await self.cache._get_redis()
+            epoch = await self._epoch(redis)
+            weight = 2.0 ** ((self.clock() - epoch) / self.half_life)
+            async with redis.pipeline(transaction=False) as pipe:
+                for member, count in batch.items():
+                    pipe.zincrby(ACCESS_KEY, count * weight, member)
+                # Keep only the top `capacity` members
+                pipe.zremrangebyrank(ACCESS_KEY, 0, -self.capacity - 1)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("Access sketch flush failed: %s", exc)
+            return 0
+        return len(batch)
+
+    async def _epoch(self, redis) -> float:
+        now = self.clock()
+        raw = await redis.get(EPOCH_KEY)
+        if raw is None:
+            await redis.set(EPOCH_KEY, now, nx=True)
+            return float(await redis.get(EPOCH_KEY) or now)
+        epoch = float(raw)
+        if (now - epoch) / self.half_life < RESCALE_AFTER:
+            return epoch
+        # Renormalize: scale every score down to the new epoch
+        factor = 2.0 ** (-(now - epoch) / self.half_life)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.zunionstore(ACCESS_KEY, {ACCESS_KEY: factor})
+            pipe.set(EPOCH_KEY, now)
+            await pipe.execute()
+        return now
+
+    async def top(self, n: int = 50) -> List[Tuple[str, str, float]]:
+        """Hottest ``(ticker, interval, score)`` first; scores decayed to now."""
+        try:
+            redis = await self.cache._get_redis()
+            rows = await redis.zrevrange(ACCESS_KEY, 0, n - 1, withscores=True)
+            raw_epoch = await redis.get(EPOCH_KEY)
+        except Exception as exc:
+            logger.warning("Access sketch read failed: %s", exc)
+            return []
+        epoch = float(raw_epoch) if raw_epoch is not None else self.clock()
+        scale = 2.0 ** (-(self.clock() - epoch) / self.half_life)
+        hot = []
+        for member, score in rows:
+            ticker, _, interval = member.partition("|")
+            hot.append((ticker, interval or "1day", round(score * scale, 4)))
+        return hot
+
+
+_access_tracker: Optional[AccessTracker] = None
+
+
+def get_access_tracker() -> AccessTracker:
+    """Process-wide access tracker."""
+    global _access_tracker
+    if _access_tracker is None:
+        from app.config import get_settings
+        from app.services.cache import get_cache_service
+
+        settings = get_settings()
+        _access_tracker = AccessTracker(
+            get_cache_service(),
+            half_life=settings.cache_access_half_life,
+            capacity=settings.cache_access_capacity,
+        )
+    return _access_tracker
+
+
+def record_access(ticker: str, interval: str = "1day") -> None:
+    """Record a user request for ``ticker`` (never raises)."""
+    try:
+        get_access_tracker().record(ticker, interval)
+    except Exception as exc:
+        logger.debug("Access record failed for %s: %s", ticker, exc)
+
+
+__all__ = ["AccessTracker", "get_access_tracker", "record_access"]
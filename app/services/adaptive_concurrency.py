@@ -0,0 +1,313 @@
+"""
+Adaptive (AIMD) concurrency control for scan fan-out.
+
+Scans used to hard-code their parallelism (semaphores of 8 or 10, batches
+with fixed sleeps). ``AdaptiveLimiter`` replaces those with a limit that
+follows what the providers and the event loop can actually sustain:
+
+- additive increase: every call that completes quickly adds ``1/limit``,
+  so the limit grows by roughly one per full window of successes
+- multiplicative decrease: a 429/5xx from a provider, a call slower than
+  the latency target, or event-loop lag above target multiplies the limit
+  by ``backoff`` (at most once per cooldown, so one burst counts once)
+- quota ceiling: when the remaining daily quota of every paid provider
+  drops below ``quota_floor`` the ceiling shrinks proportionally
+
+The current limit and the measured loop lag are exported as gauges.
+Limiters can be used anywhere an ``asyncio.Semaphore`` was: ``async with``.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, Optional, TypeVar, Union
+
+from app.config import get_settings
+from app.telemetry.metrics import EVENT_LOOP_LAG_SECONDS, SCAN_CONCURRENCY_LIMIT
+
+logger = logging.getLogger(__name__)
+
+MARKET_DATA_LIMITER = "market_data"
+
+T = TypeVar("T")
+R = TypeVar("R")
+_DONE = object()
+
+
+class AdaptiveLimiter:
+    """Concurrency limit driven by latency, provider errors, quota and loop lag."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        latency_target: float = 2.5,
+        lag_target: float = 0.25,
+        backoff: float = 0.7,
+        cooldown: float = 1.0,
+        quota_floor: float = 0.1,
+        lag_interval: float = 0.1,
+    ):
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_target = latency_target
+        self.lag_target = lag_target
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.quota_floor = quota_floor
+        self.lag_interval = lag_interval
+
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._started: Dict[Any, float] = {}
+        self._last_decrease = 0.0
+        self._quota: Dict[str, float] = {}
+        self._lag_task: Optional[asyncio.Task] = None
+        self.loop_lag = 0.0
+        self.stats = {"increases": 0, "decreases": 0, "throttled": 0, "slow": 0, "errors": 0}
+        self._publish()
+
+    # ------------------------------------------------------------------ limits
+
+    @property
+    def ceiling(self) -> float:
+        """Upper bound after applying the provider quota signal."""
+        if not self._quota:
+            return float(self.max_limit)
+        remaining = max(self._quota.values())
+        if remaining >= self.quota_floor:
+            return float(self.max_limit)
+        share = max(0.0, remaining) / self.quota_floor
+        return self.min_limit + (self.max_limit - self.min_limit) * share
+
+    @property
+    def limit(self) -> int:
+        return int(max(self.min_limit, min(self._limit, self.ceiling)))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "loop_lag_ms": round(self.loop_lag * 1000, 2),
+            "quota_remaining": dict(self._quota),
+            **self.stats,
+        }
+
+    # ----------------------------------------------------------------- signals
+
+    def record(self, latency: float, *, ok: bool = True) -> None:
+        """Feed back one completed unit of work."""
+        if not ok:
+            self.stats["errors"] += 1
+            self._decrease()
+        elif latency > self.latency_target:
+            self.stats["slow"] += 1
+            self._decrease()
+        elif self.loop_lag > self.lag_target:
+            self._decrease()
+        else:
+            self._increase()
+
+    def on_status(self, status_code: int) -> None:
+        """Provider HTTP status feedback (429 and 5xx back off)."""
+        if status_code == 429 or status_code >= 500:
+            self.stats["throttled"] += 1
+            self._decrease()
+
+    def on_quota(self, source: str, remaining_fraction: float) -> None:
+        self._quota[source] = remaining_fraction
+        self._publish()
+
+    def _increase(self) -> None:
+        if self._limit < self.ceiling:
+            self._limit = min(self.ceiling, self._limit + 1.0 / max(self._limit, 1.0))
+            self.stats["increases"] += 1
+            self._publish()
+            self._wake()
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.min_limit), self._limit * self.backoff)
+        self.stats["decreases"] += 1
+        self._publish()
+        logger.debug("limiter %s backed off to %s", self.name, self.limit)
+
+    def _publish(self) -> None:
+        SCAN_CONCURRENCY_LIMIT.labels(name=self.name).set(self.limit)
+
+    # ----------------------------------------------------------------- gating
+
+    async def acquire(self) -> None:
+        while self._in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()  # Woken then cancelled: pass the slot on, as asyncio.Semaphore does
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._in_flight += 1
+        self._ensure_lag_monitor()
+
+    def release(self) -> None:
+        self._in_flight = max(0, self._in_flight - 1)
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self.limit - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        await self.acquire()
+        self._started[asyncio.current_task()] = time.perf_counter()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        started = self._started.pop(asyncio.current_task(), None)
+        self.release()
+        if started is not None and not isinstance(exc, asyncio.CancelledError):
+            self.record(time.perf_counter() - started, ok=exc is None)
+
+    # ---------------------------------------------------------------- loop lag
+
+    def _ensure_lag_monitor(self) -> None:
+        loop = asyncio.get_running_loop()
+        task = self._lag_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._lag_task = loop.create_task(self._monitor_lag())
+
+    async def _monitor_lag(self) -> None:
+        """Sample scheduling drift while the limiter has work; exits when idle."""
+        loop = asyncio.get_running_loop()
+        while self._in_flight or self._waiters:
+            expected = loop.time() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            drift = max(0.0, loop.time() - expected)
+            self.loop_lag = 0.8 * self.loop_lag + 0.2 * drift
+            EVENT_LOOP_LAG_SECONDS.set(self.loop_lag)
+            if drift > self.lag_target:
+                self._decrease()
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+
+
+def get_limiter(name: str = MARKET_DATA_LIMITER) -> AdaptiveLimiter:
+    """Return the process-wide limiter ``name``, creating it from settings."""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        settings = get_settings()
+        limiter = AdaptiveLimiter(
+            name,
+            initial=settings.scan_concurrency_initial,
+            max_limit=settings.scan_concurrency_max,
+            latency_target=settings.scan_latency_target,
+        )
+        _limiters[name] = limiter
+    return limiter
+
+
+ConcurrencyGate = Union[asyncio.Semaphore, AdaptiveLimiter]
+
+
+def concurrency_gate(fixed: Optional[int] = None) -> ConcurrencyGate:
+    """Shared adaptive limiter, or a plain semaphore when a fixed size is pinned."""
+    if fixed:
+        return asyncio.Semaphore(fixed)
+    return get_limiter()
+
+
+def pool_size(fixed: Optional[int] = None) -> int:
+    """Worker count for a pool feeding ``concurrency_gate(fixed)``: enough to saturate it."""
+    return fixed or get_limiter().max_limit
+
+
+async def bounded_map(
+    fn: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    workers: int,
+) -> AsyncIterator[R]:
+    """
+    Yield ``await fn(item)`` for each item, in completion order.
+
+    ``workers`` tasks pull from one shared iterator, so at most ``workers``
+    coroutines and ``workers`` unconsumed results exist at a time however
+    long ``items`` is. An exception from ``fn`` is re-raised to the consumer;
+    closing the iterator early cancels the work in flight.
+    """
+    iterator = iter(items)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, workers))
+
+    async def worker() -> None:
+        try:
+            for item in iterator:
+                await queue.put((True, await fn(item)))
+        except Exception as exc:
+            await queue.put((False, exc))
+            return
+        await queue.put(_DONE)
+
+    tasks = [asyncio.create_task(worker()) for _ in range(max(1, workers))]
+    try:
+        running = len(tasks)
+        while running:
+            entry = await queue.get()
+            if entry is _DONE:
+                running -= 1
+                continue
+            ok, value = entry
+            if not ok:
+                raise value
+            yield value
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def record_provider_status(source: str, status_code: int) -> None:
+    """Called by the market data providers on non-200 responses."""
+    get_limiter().on_status(status_code)
+
+
+def record_provider_quota(source: str, used: int, limit: int) -> None:
+    """Called by the market data providers when they check their daily quota."""
+    if limit > 0:
+        get_limiter().on_quota(source, max(0.0, (limit - used) / limit))
+
+
+__all__ = [
+    "AdaptiveLimiter",
+    "ConcurrencyGate",
+    "MARKET_DATA_LIMITER",
+    "bounded_map",
+    "concurrency_gate",
+    "get_limiter",
+    "pool_size",
+    "record_provider_quota",
+    "record_provider_status",
+]
@@ -12,6 +12,7 @@ from app.config import get_settings
 from app.services.cache import get_cache_service
 from app.services.market_data import market_data_service
 from app.core.pattern_detector import PatternDetector
+from app.core.pattern_engine.context import ScanContext
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -52,6 +53,9 @@ class AlertService:
 
             logger.info(f"📊 Monitoring {len(watchlist_items)} stocks for patterns...")
 
+            # SPY is the same for every ticker: fetch it once per pass
+            context = await ScanContext.build(bars=500)
+
             for item in watchlist_items:
                 ticker = item.get("ticker", "").upper()
 
@@ -68,8 +72,7 @@ class AlertService:
                         continue
 
                     # Analyze for patterns
-                    spy_data = await market_data_service.get_time_series("SPY", "1day", 500)
-                    pattern_result = await self.detector.analyze_ticker(ticker, price_data, spy_data)
+                    pattern_result = await self.detector.analyze_ticker(ticker, price_data, context.benchmark)
 
                     monitored_count += 1
 
@@ -0,0 +1,210 @@
+"""
+Size-bounded, content-addressed local blob store.
+
+Blobs (chart images, large cached payloads) are stored once per content
+hash and served by ``GET /blobs/{digest}`` with immutable cache headers, so
+repeat views are answered from disk or from the browser cache.
+
+Layout under ``root``::
+
+    ab/cd/abcd...ef        blob named by its SHA-256, sharded two levels deep
+    tmp/                   staging area; writes land here and are renamed in
+    index.sqlite           access index: size, content type, last access per
+                           blob, plus named refs (cache key -> digest)
+
+Writes are atomic (temp file + ``os.replace``). When the store grows past
+``max_bytes`` the least recently accessed blobs are evicted, along with any
+refs pointing at them. All methods are blocking; async callers run them in
+a thread.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+SHARD_DEPTH = 2  # Directory levels, two hex chars each
+
+
+@dataclass(frozen=True)
+class Blob:
+    digest: str
+    path: Path
+    size: int
+    content_type: str
+
+
+def blob_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore:
+    """Content-addressed files with an LRU byte budget."""
+
+    def __init__(self, root: str, max_bytes: int = 512 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self._tmp = self.root / "tmp"
+        self._tmp.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.root / "index.sqlite"
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS blobs ("
+                " digest TEXT PRIMARY KEY, size INTEGER NOT NULL, content_type TEXT NOT NULL,"
+                " created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_blobs_last_access ON blobs (last_access)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS refs ("
+                " name TEXT PRIMARY KEY, digest TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_refs_digest ON refs (digest)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._index_path, timeout=10.0)
+
+    def path_for(self, digest: str) -> Path:
+        parts = [digest[2 * level:2 * level + 2] for level in range(SHARD_DEPTH)]
+        return self.root.joinpath(*parts, digest)
+
+    # ==================== Blobs ====================
+
+    def put(self, data: bytes, content_type: str = DEFAULT_CONTENT_TYPE, name: Optional[str] = None) -> str:
+        """Store ``data`` (once per content) and optionally point ``name`` at it; returns the digest."""
+        digest = blob_digest(data)
+        path = self.path_for(digest)
+        now = time.time()
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self._tmp)
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(data)
+                os.replace(tmp_name, path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO blobs (digest, size, content_type, created_at, last_access) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (digest) DO UPDATE SET last_access = excluded.last_access",
+                (digest, len(data), content_type, now, now),
+            )
+            if name is not None:
+                conn.execute(
+                    "INSERT INTO refs (name, digest, created_at) VALUES (?, ?, ?)"
+                    " ON CONFLICT (name) DO UPDATE SET digest = excluded.digest, created_at = excluded.created_at",
+                    (name, digest, now),
+                )
+            self._evict(conn, keep=digest)
+        return digest
+
+    def get(self, digest: str, touch: bool = True) -> Optional[Blob]:
+        """Metadata of a stored blob (None when missing); marks it recently used."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT size, content_type FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+        path = self.path_for(digest)
+        if row is None or not path.exists():
+            return None
+        if touch:
+            with self._lock, self._connect() as conn:
+                conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (time.time(), digest))
+        return Blob(digest=digest, path=path, size=row[0], content_type=row[1])
+
+    def read(self, digest: str) -> Optional[bytes]:
+        blob = self.get(digest)
+        return blob.path.read_bytes() if blob else None
+
+    def delete(self, digest: str) -> bool:
+        with self._lock, self._connect() as conn:
+            return self._remove(conn, digest)
+
+    # ==================== Named refs ====================
+
+    def resolve(self, name: str, max_age: Optional[float] = None) -> Optional[str]:
+        """Digest ``name`` points at, if set within ``max_age`` seconds."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT digest, created_at FROM refs WHERE name = ?", (name,)).fetchone()
+        if row is None or (max_age is not None and time.time() - row[1] >= max_age):
+            return None
+        return row[0]
+
+    def unlink_ref(self, name: str) -> bool:
+        with self._lock, self._connect() as conn:
+            return conn.execute("DELETE FROM refs WHERE name = ?", (name,)).rowcount > 0
+
+    def expire_refs(self, max_age: float) -> int:
+        """Drop refs older than ``max_age`` seconds (their blobs age out through LRU)."""
+        with self._lock, self._connect() as conn:
+            return conn.execute(
+                "DELETE FROM refs WHERE created_at < ?", (time.time() - max_age,)
+            ).rowcount
+
+    # ==================== Budget ====================
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            refs = conn.execute("SELECT COUNT(*) FROM refs").fetchone()[0]
+        return {
+            "path": str(self.root),
+            "blobs": count,
+            "refs": refs,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
+
+    def _evict(self, conn: sqlite3.Connection, keep: Optional[str] = None) -> int:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        evicted = 0
+        for digest, size in conn.execute(
+            "SELECT digest, size FROM blobs ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            if digest == keep:
+                continue
+            self._remove(conn, digest)
+            total -= size
+            evicted += 1
+        if evicted:
+            logger.info("Blob store evicted %s blobs (now %s / %s bytes)", evicted, total, self.max_bytes)
+        return evicted
+
+    def _remove(self, conn: sqlite3.Connection, digest: str) -> bool:
+        self.path_for(digest).unlink(missing_ok=True)
+        conn.execute("DELETE FROM refs WHERE digest = ?", (digest,))
+        return conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,)).rowcount > 0
+
+
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Process-wide blob store from settings."""
+    global _blob_store
+    if _blob_store is None:
+        from app.config import get_settings
+
+        settings = get_settings()
+        _blob_store = BlobStore(settings.blob_store_path, settings.blob_store_max_bytes)
+    return _blob_store
+
+
+__all__ = ["Blob", "BlobStore", "blob_digest", "get_blob_store"]
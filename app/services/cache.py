@@ -1,13 +1,53 @@
 from redis.asyncio import Redis
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Iterable, List
 import json
 import logging
 from datetime import datetime, time
+from functools import lru_cache
 
 from app.config import get_settings
+from app.services.cache_analytics import record_lookup
+from app.services.l1_cache import INVALIDATION_CHANNEL, MISSING, L1Cache, get_l1_cache
 
 logger = logging.getLogger(__name__)
 
+# Tag generations: cache:gen:{tag} -> int. Tagged keys embed the current
+# generation of each of their tags, so bumping one tag (a single INCR)
+# orphans every key carrying it; the orphans expire on their own TTL.
+GENERATION_KEY_PREFIX = "cache:gen:"
+
+
+@lru_cache()
+def detector_version() -> str:
+    """Version of the pattern engine, part of every cached pattern result's tags."""
+    from app.core.pattern_engine import __version__
+
+    return __version__
+
+
+def cache_tags(
+    *,
+    data_type: Optional[str] = None,
+    ticker: Optional[str] = None,
+    interval: Optional[str] = None,
+    detector: Optional[str] = None,
+) -> List[str]:
+    """
+    Invalidation tags of a cache entry
+
+    Format: type:{data_type}, ticker:{TICKER}, interval:{interval}, detector:{version}
+    """
+    tags = []
+    if data_type:
+        tags.append(f"type:{data_type}")
+    if ticker:
+        tags.append(f"ticker:{ticker.upper()}")
+    if interval:
+        tags.append(f"interval:{interval}")
+    if detector:
+        tags.append(f"detector:{detector}")
+    return tags
+
 
 def is_market_hours() -> bool:
     """Check if currently in US market hours (9:30 AM - 4:00 PM ET, Mon-Fri)"""
@@ -31,11 +71,15 @@ class CacheService:
     - Price data: 15 min TTL (ohlcv:{ticker}:1d:5y)
     - Universe data: 24 hour TTL
     - Chart URLs: 15 min TTL
+
+    Generic ``get``/``set`` go through an optional process-local L1
+    (see ``app.services.l1_cache``) so repeat reads skip Redis entirely.
     """
 
-    def __init__(self, redis_url: str):
+    def __init__(self, redis_url: str, l1: Optional[L1Cache] = None):
         self.redis_url = redis_url
         self.redis: Optional[Redis] = None
+        self.l1 = l1
 
     async def _get_redis(self) -> Redis:
         """Lazy initialization of Redis connection"""
@@ -54,35 +98,75 @@ class CacheService:
         key_parts = [f"{k}={v}" for k, v in sorted_items]
         return f"{prefix}:{':'.join(key_parts)}"
 
-    async def get(self, key: str) -> Optional[Any]:
-        """Generic get from cache (for market_data service)"""
-        try:
+    async def generations(self, tags: Iterable[str]) -> List[int]:
+        """Current generation of each tag (0 until the tag is first invalidated)"""
+        gen_keys = [f"{GENERATION_KEY_PREFIX}{tag}" for tag in tags]
+        values: Dict[str, int] = {}
+        missing = gen_keys
+        versions: Dict[str, int] = {}
+        if self.l1 is not None:
+            missing = []
+            for gen_key in gen_keys:
+                value = self.l1.get(gen_key)
+                if value is MISSING:
+                    missing.append(gen_key)
+                    versions[gen_key] = self.l1.version(gen_key)
+                else:
+                    values[gen_key] = value
+        if missing:
             redis = await self._get_redis()
-            data = await redis.get(key)
-            if data:
-                try:
-                    return json.loads(data)
-                except (json.JSONDecodeError, TypeError) as e:
-                    logger.warning(f"Cache data not JSON for {key}, returning raw: {e}")
-                    return data
-            return None
-        except Exception as e:
-            logger.error(f"Cache get error for {key}: {e}")
-            return None
+            fetched = dict(zip(missing, await redis.mget(missing)))
+            for gen_key in missing:
+                values[gen_key] = int(fetched.get(gen_key) or 0)
+                if self.l1 is not None:
+                    self.l1.set(gen_key, values[gen_key], version=versions[gen_key])
+        return [values[gen_key] for gen_key in gen_keys]
+
+    async def tagged_key(self, base: str, tags: Iterable[str]) -> str:
+        """
+        Key that embeds the current generation of each tag
 
-    async def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
-        """Generic set to cache (for market_data service)"""
+        Format: {base}:g={gen1}.{gen2}...
+        """
+        gens = await self.generations(tags)
+        if not gens:
+            return base
+        return f"{base}:g={'.'.join(str(gen) for gen in gens)}"
+
+    async def invalidate_tags(self, *tags: str) -> Dict[str, int]:
+        """
+        Invalidate every entry carrying any of ``tags``
+
+        One INCR per tag, independent of cache size; orphaned keys expire
+        on their TTL. Returns the new generation of each tag.
+        """
+        if not tags:
+            return {}
+        gen_keys = [f"{GENERATION_KEY_PREFIX}{tag}" for tag in tags]
         try:
             redis = await self._get_redis()
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value)
-            elif isinstance(value, (int, float)):
-                value = str(value)
-            await redis.setex(key, ttl, value)
-            return True
+            async with redis.pipeline(transaction=False) as pipe:
+                for gen_key in gen_keys:
+                    pipe.incr(gen_key)
+                generations = await pipe.execute()
+            await self._evict_local(*gen_keys)
+            logger.info(f"Invalidated cache tags: {', '.join(tags)}")
+            return dict(zip(tags, generations))
         except Exception as e:
-            logger.error(f"Cache set error for {key}: {e}")
-            return False
+            logger.error(f"Cache tag invalidation error for {tags}: {e}")
+            return {}
+
+    async def _pattern_key(self, ticker: str, interval: str) -> str:
+        return await self.tagged_key(
+            self._generate_cache_key("pattern", ticker=ticker, interval=interval),
+            cache_tags(data_type="pattern", ticker=ticker, interval=interval, detector=detector_version()),
+        )
+
+    async def _chart_key(self, ticker: str, interval: str) -> str:
+        return await self.tagged_key(
+            self._generate_cache_key("chart", ticker=ticker, interval=interval),
+            cache_tags(data_type="chart", ticker=ticker, interval=interval),
+        )
 
     async def get_pattern(
         self,
@@ -92,13 +176,15 @@ class CacheService:
         """
         Get cached pattern result
 
-        Key format: pattern:ticker={ticker}:interval={interval}
+        Key format: pattern:interval={interval}:ticker={ticker}:g={generations}
         """
         redis = await self._get_redis()
-        key = self._generate_cache_key("pattern", ticker=ticker, interval=interval)
+        key = "pattern"
 
         try:
+            key = await self._pattern_key(ticker, interval)
             data = await redis.get(key)
+            record_lookup(key, bool(data))
             if data:
                 logger.debug(f"Cache hit for pattern: {key}")
                 return json.loads(data)
@@ -119,10 +205,10 @@ class CacheService:
         """
         Cache pattern result with smart TTL based on market hours
 
-        Key format: pattern:ticker={ticker}:interval={interval}
+        Key format: pattern:interval={interval}:ticker={ticker}:g={generations}
         """
         redis = await self._get_redis()
-        key = self._generate_cache_key("pattern", ticker=ticker, interval=interval)
+        key = "pattern"
 
         # Use config TTL or smart default
         if ttl is None:
@@ -135,6 +221,7 @@ class CacheService:
                 ttl = max(ttl, 7200)  # Min 2 hours outside market hours
 
         try:
+            key = await self._pattern_key(ticker, interval)
             json_data = json.dumps(data)
             await redis.setex(key, ttl, json_data)
             logger.debug(f"Cached pattern result: {key} (TTL: {ttl}s)")
@@ -155,6 +242,7 @@ class CacheService:
 
         try:
             data = await redis.get(key)
+            record_lookup(key, bool(data))
             if data:
                 logger.debug(f"Cache hit for price data: {key}")
                 return json.loads(data)
@@ -209,13 +297,15 @@ class CacheService:
         """
         Get cached chart URL
 
-        Key format: chart:ticker={ticker}:interval={interval}
+        Key format: chart:interval={interval}:ticker={ticker}:g={generations}
         """
         redis = await self._get_redis()
-        key = self._generate_cache_key("chart", ticker=ticker, interval=interval)
+        key = "chart"
 
         try:
+            key = await self._chart_key(ticker, interval)
             url = await redis.get(key)
+            record_lookup(key, bool(url))
             if url:
                 logger.debug(f"Cache hit for chart: {key}")
                 return url
@@ -234,10 +324,10 @@ class CacheService:
         """
         Cache chart URL with smart TTL from config
 
-        Key format: chart:ticker={ticker}:interval={interval}
+        Key format: chart:interval={interval}:ticker={ticker}:g={generations}
         """
         redis = await self._get_redis()
-        key = self._generate_cache_key("chart", ticker=ticker, interval=interval)
+        key = "chart"
 
         # Use config TTL with market hours awareness
         if ttl is None:
@@ -248,6 +338,7 @@ class CacheService:
                 ttl = min(ttl, 3600)  # Max 1 hour during market hours
 
         try:
+            key = await self._chart_key(ticker, interval)
             await redis.setex(key, ttl, url)
             logger.debug(f"Cached chart URL: {key} (TTL: {ttl}s)")
             return True
@@ -259,25 +350,19 @@ class CacheService:
         """
         Manually invalidate cached pattern (all intervals)
 
-        Returns number of keys deleted
+        All intervals bump the ticker's tag generation (one INCR, which also
+        retires the ticker's cached charts); a single interval deletes the
+        one current key. Returns number of keys invalidated.
         """
-        redis = await self._get_redis()
-
         try:
             if interval == "*":
-                # Delete all intervals for this ticker
-                pattern = f"pattern:ticker={ticker}:interval=*"
-                keys = await redis.keys(pattern)
-            else:
-                # Delete specific interval
-                key = self._generate_cache_key("pattern", ticker=ticker, interval=interval)
-                keys = [key]
-
-            if keys:
-                deleted = await redis.delete(*keys)
-                logger.info(f"Invalidated {deleted} pattern cache keys for {ticker}")
-                return deleted
-            return 0
+                await self.invalidate_tags(*cache_tags(ticker=ticker))
+                logger.info(f"Invalidated pattern cache for {ticker} (all intervals)")
+                return 1
+
+            deleted = await self.delete(await self._pattern_key(ticker, interval))
+            logger.info(f"Invalidated {deleted} pattern cache keys for {ticker}")
+            return deleted
         except Exception as e:
             logger.error(f"Cache invalidation error for {ticker}: {e}")
             return 0
@@ -286,11 +371,9 @@ class CacheService:
         """
         Invalidate cached price data for ticker
         """
-        redis = await self._get_redis()
-
         try:
             key = f"ohlcv:{ticker}:1d:5y"
-            deleted = await redis.delete(key)
+            deleted = await self.delete(key)
             logger.info(f"Invalidated price data cache for {ticker}")
             return deleted
         except Exception as e:
@@ -338,9 +421,9 @@ class CacheService:
         redis = await self._get_redis()
 
         try:
-            pattern_keys = await redis.delete(*await redis.keys("pattern:*"))
-            price_keys = await redis.delete(*await redis.keys("ohlcv:*"))
-            chart_keys = await redis.delete(*await redis.keys("chart:*"))
+            pattern_keys = await self._delete_matching(redis, "pattern:*")
+            price_keys = await self._delete_matching(redis, "ohlcv:*")
+            chart_keys = await self._delete_matching(redis, "chart:*")
 
             logger.warning(f"Cleared all cache: {pattern_keys} patterns, {price_keys} price data, {chart_keys} charts")
 
@@ -356,15 +439,39 @@ class CacheService:
 
     async def get(self, key: str) -> Optional[Any]:
         """Generic get from cache (for market_data service)"""
+        version = None
+        if self.l1 is not None:
+            value = self.l1.get(key)
+            if value is not MISSING:
+                record_lookup(key, True)
+                return value
+            version = self.l1.version(key)  # A write landing during the read voids the fill
         try:
             redis = await self._get_redis()
-            data = await redis.get(key)
+            if self.l1 is None:
+                data = await redis.get(key)
+            else:
+                # Fetch the remaining TTL in the same round-trip so L1 never outlives Redis
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.get(key)
+                    pipe.ttl(key)
+                    data, remaining = await pipe.execute()
+            record_lookup(key, bool(data))
             if data:
                 try:
-                    return json.loads(data)
+                    value = json.loads(data)
                 except (json.JSONDecodeError, TypeError) as e:
                     logger.warning(f"Cache data not JSON for {key}, returning raw: {e}")
-                    return data
+                    value = data
+                if self.l1 is not None:
+                    self.l1.set(
+                        key,
+                        value,
+                        ttl=None if remaining == -1 else remaining,
+                        size=len(data),
+                        version=version,
+                    )
+                return value
             return None
         except Exception as e:
             logger.error(f"Cache get error for {key}: {e}")
@@ -379,11 +486,50 @@ class CacheService:
             elif isinstance(value, (int, float)):
                 value = str(value)
             await redis.setex(key, ttl, value)
+            # L1 is filled on the next read, from what Redis actually holds
+            await self._evict_local(key)
             return True
         except Exception as e:
             logger.error(f"Cache set error for {key}: {e}")
             return False
 
+    async def delete(self, *keys: str) -> int:
+        """Delete keys from Redis and from every worker's L1."""
+        if not keys:
+            return 0
+        try:
+            redis = await self._get_redis()
+            deleted = await redis.delete(*keys)
+            await self._evict_local(*keys)
+            return deleted
+        except Exception as e:
+            logger.error(f"Cache delete error for {keys}: {e}")
+            return 0
+
+    async def _delete_matching(self, redis: Redis, pattern: str) -> int:
+        keys = await redis.keys(pattern)
+        deleted = await redis.delete(*keys) if keys else 0
+        await self.evict_local_pattern(pattern)
+        return deleted
+
+    async def evict_local_pattern(self, pattern: str) -> None:
+        """Drop L1 entries matching a Redis glob here and in the other workers."""
+        await self._evict_local(pattern=pattern)
+
+    async def _evict_local(self, *keys: str, pattern: Optional[str] = None) -> None:
+        if self.l1 is None:
+            return
+        if pattern is not None:
+            self.l1.invalidate_pattern(pattern)
+        else:
+            self.l1.invalidate(*keys)
+        if self.l1.broadcast:
+            try:
+                redis = await self._get_redis()
+                await redis.publish(INVALIDATION_CHANNEL, self.l1.message(keys, pattern=pattern))
+            except Exception as e:
+                logger.warning(f"L1 invalidation publish failed: {e}")
+
     async def health_check(self) -> Dict[str, Any]:
         """
         Check Redis connection health
@@ -406,8 +552,15 @@ class CacheService:
                 "error": str(e)
             }
 
+    def start_invalidation_listener(self) -> None:
+        """Keep this process's L1 coherent with writes made by other workers."""
+        if self.l1 is not None and self.l1.broadcast:
+            self.l1.start_listener(self.redis or Redis.from_url(self.redis_url, decode_responses=True))
+
     async def close(self):
         """Close Redis connection"""
+        if self.l1 is not None:
+            await self.l1.stop_listener()
         if self.redis:
             await self.redis.close()
             self.redis = None
@@ -417,4 +570,4 @@ class CacheService:
 def get_cache_service() -> CacheService:
     """Get global cache service instance"""
     settings = get_settings()
-    return CacheService(settings.redis_url)
+    return CacheService(settings.redis_url, l1=get_l1_cache())
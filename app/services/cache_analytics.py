@@ -0,0 +1,267 @@
+"""
+Keyspace analytics for the Redis cache.
+
+Two sources feed the per-prefix view used to size Redis and tune TTLs:
+
+- Lookups: cache getters call ``record_lookup(key, hit)``; counts go to the
+  ``cache_keyspace_lookups_total`` Prometheus counter and to an in-process
+  tally for the admin endpoint.
+- Sampling: ``KeyspaceSampler`` walks the keyspace with SCAN cursors (a few
+  hundred keys per step, yielding to the event loop between steps, so Redis
+  is never blocked), pipelining MEMORY USAGE and PTTL for each batch. A
+  completed pass yields keys, bytes and a TTL histogram per prefix plus the
+  largest keys. It is exported as gauges and stored in Redis, so any worker
+  can serve it.
+
+Prefixes are the first ``:``-separated segment of a key, limited to
+``cache_analytics_prefixes``; everything else is counted as ``other``.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import json
+import logging
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from redis.exceptions import ResponseError
+
+from app.telemetry.metrics import (
+    CACHE_KEYSPACE_BYTES,
+    CACHE_KEYSPACE_KEYS,
+    CACHE_KEYSPACE_LOOKUPS_TOTAL,
+    CACHE_KEYSPACE_TTL_KEYS,
+)
+
+if TYPE_CHECKING:
+    from app.services.cache import CacheService
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = "cache:analytics:keyspace"
+SNAPSHOT_TTL = 86400
+OTHER_PREFIX = "other"
+
+# Remaining-TTL buckets: (label, upper bound in seconds)
+TTL_BUCKETS: Tuple[Tuple[str, float], ...] = (
+    ("<1m", 60),
+    ("<5m", 300),
+    ("<15m", 900),
+    ("<1h", 3600),
+    ("<6h", 21600),
+    ("<1d", 86400),
+    (">=1d", float("inf")),
+)
+NO_EXPIRY = "none"
+
+
+def _configured_prefixes() -> frozenset:
+    from app.config import get_settings
+
+    raw = get_settings().cache_analytics_prefixes
+    return frozenset(prefix.strip() for prefix in raw.split(",") if prefix.strip())
+
+
+_prefixes: Optional[frozenset] = None
+
+
+def prefix_of(key: str, prefixes: Optional[frozenset] = None) -> str:
+    """Analytics prefix of a Redis key (``other`` when not tracked)."""
+    global _prefixes
+    if prefixes is None:
+        if _prefixes is None:
+            _prefixes = _configured_prefixes()
+        prefixes = _prefixes
+    head, sep, _ = key.partition(":")
+    return head if sep and head in prefixes else OTHER_PREFIX
+
+
+def ttl_bucket(pttl: int) -> str:
+    """Bucket label for a PTTL reply in milliseconds (-1 = no expiry)."""
+    if pttl < 0:
+        return NO_EXPIRY
+    seconds = pttl / 1000.0
+    for label, bound in TTL_BUCKETS:
+        if seconds < bound:
+            return label
+    return TTL_BUCKETS[-1][0]
+
+
+# ==================== Lookups ====================
+
+_lookups: Dict[str, Counter] = {}
+
+
+def record_lookup(key: str, hit: bool) -> None:
+    """Count one cache read of ``key`` (never raises)."""
+    try:
+        prefix = prefix_of(key)
+        result = "hit" if hit else "miss"
+        CACHE_KEYSPACE_LOOKUPS_TOTAL.labels(prefix=prefix, result=result).inc()
+        _lookups.setdefault(prefix, Counter())[result] += 1
+    except Exception as exc:
+        logger.debug("Lookup record failed for %s: %s", key, exc)
+
+
+def lookup_stats() -> Dict[str, Dict[str, Any]]:
+    """Hits, misses and hit rate per prefix seen by this process."""
+    stats = {}
+    for prefix, counts in sorted(_lookups.items()):
+        total = counts["hit"] + counts["miss"]
+        stats[prefix] = {
+            "hits": counts["hit"],
+            "misses": counts["miss"],
+            "hit_rate": round(counts["hit"] / total * 100, 2) if total else 0.0,
+        }
+    return stats
+
+
+# ==================== Sampling ====================
+
+class KeyspaceSampler:
+    """Incremental SCAN over Redis, aggregated per key prefix."""
+
+    def __init__(
+        self,
+        cache: CacheService,
+        prefixes: Optional[Sequence[str]] = None,
+        scan_count: int = 500,
+        max_keys: int = 200000,
+        top_n: int = 20,
+    ):
+        self.cache = cache
+        self.prefixes = frozenset(prefixes) if prefixes is not None else _configured_prefixes()
+        self.scan_count = int(scan_count)
+        self.max_keys = int(max_keys)
+        self.top_n = int(top_n)
+        self._memory_usage = True  # Cleared if the server lacks MEMORY USAGE
+
+    async def run_pass(self) -> Dict[str, Any]:
+        """Sample the keyspace once, export it, and store the snapshot."""
+        redis = await self.cache._get_redis()
+        started = time.time()
+        prefixes: Dict[str, Dict[str, Any]] = {}
+        largest: List[Tuple[int, str]] = []
+        sampled = 0
+        cursor = 0
+        while True:
+            cursor, keys = await redis.scan(cursor=cursor, count=self.scan_count)
+            if keys:
+                for key, size, pttl in await self._measure(redis, keys):
+                    self._add(prefixes, largest, key, size, pttl)
+                sampled += len(keys)
+            if cursor == 0 or sampled >= self.max_keys:
+                break
+            await asyncio.sleep(0)  # Let request handlers run between SCAN steps
+
+        dbsize = await redis.dbsize()
+        snapshot = {
+            "sampled_at": started,
+            "duration": round(time.time() - started, 3),
+            "complete": cursor == 0,
+            "sampled_keys": sampled,
+            "dbsize": dbsize,
+            "bytes_method": "memory_usage" if self._memory_usage else "strlen",
+            "prefixes": {
+                prefix: {**stats, "bytes_per_key": round(stats["bytes"] / stats["keys"], 1)}
+                for prefix, stats in sorted(prefixes.items())
+            },
+            "top_keys": [
+                {"key": key, "bytes": size, "prefix": prefix_of(key, self.prefixes)}
+                for size, key in sorted(largest, reverse=True)
+            ],
+        }
+        self._export(snapshot)
+        try:
+            await redis.set(SNAPSHOT_KEY, json.dumps(snapshot), ex=SNAPSHOT_TTL)
+        except Exception as exc:
+            logger.warning("Keyspace snapshot store failed: %s", exc)
+        return snapshot
+
+    async def _measure(self, redis, keys: List[str]) -> List[Tuple[str, int, int]]:
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                if self._memory_usage:
+                    pipe.memory_usage(key, samples=0)
+                else:
+                    pipe.strlen(key)
+                pipe.pttl(key)
+            replies = await pipe.execute(raise_on_error=False)
+
+        sizes, ttls = replies[0::2], replies[1::2]
+        if self._memory_usage and any(
+            isinstance(reply, ResponseError) and "unknown command" in str(reply).lower() for reply in sizes
+        ):
+            # Older or emulated servers: fall back to value length (string keys only)
+            self._memory_usage = False
+            return await self._measure(redis, keys)
+
+        measured = []
+        for key, size, pttl in zip(keys, sizes, ttls):
+            if isinstance(pttl, Exception) or pttl == -2:
+                continue  # Expired between SCAN and PTTL
+            measured.append((key, size if isinstance(size, int) else 0, pttl))
+        return measured
+
+    def _add(self, prefixes, largest, key: str, size: int, pttl: int) -> None:
+        prefix = prefix_of(key, self.prefixes)
+        stats = prefixes.setdefault(prefix, {"keys": 0, "bytes": 0, "ttl": {}})
+        stats["keys"] += 1
+        stats["bytes"] += size
+        bucket = ttl_bucket(pttl)
+        stats["ttl"][bucket] = stats["ttl"].get(bucket, 0) + 1
+        if len(largest) < self.top_n:
+            heapq.heappush(largest, (size, key))
+        elif size > largest[0][0]:
+            heapq.heapreplace(largest, (size, key))
+
+    def _export(self, snapshot: Dict[str, Any]) -> None:
+        for prefix, stats in snapshot["prefixes"].items():
+            CACHE_KEYSPACE_KEYS.labels(prefix=prefix).set(stats["keys"])
+            CACHE_KEYSPACE_BYTES.labels(prefix=prefix).set(stats["bytes"])
+            for bucket in (NO_EXPIRY, *(label for label, _ in TTL_BUCKETS)):
+                CACHE_KEYSPACE_TTL_KEYS.labels(prefix=prefix, bucket=bucket).set(stats["ttl"].get(bucket, 0))
+
+
+async def latest_snapshot(cache: CacheService) -> Optional[Dict[str, Any]]:
+    """Last completed sampling pass, from any worker."""
+    try:
+        redis = await cache._get_redis()
+        raw = await redis.get(SNAPSHOT_KEY)
+    except Exception as exc:
+        logger.warning("Keyspace snapshot read failed: %s", exc)
+        return None
+    return json.loads(raw) if raw else None
+
+
+_sampler: Optional[KeyspaceSampler] = None
+
+
+def get_keyspace_sampler() -> KeyspaceSampler:
+    """Process-wide keyspace sampler."""
+    global _sampler
+    if _sampler is None:
+        from app.config import get_settings
+        from app.services.cache import get_cache_service
+
+        settings = get_settings()
+        _sampler = KeyspaceSampler(
+            get_cache_service(),
+            scan_count=settings.cache_analytics_scan_count,
+            max_keys=settings.cache_analytics_max_keys,
+            top_n=settings.cache_analytics_top_n,
+        )
+    return _sampler
+
+
+__all__ = [
+    "KeyspaceSampler",
+    "get_keyspace_sampler",
+    "latest_snapshot",
+    "lookup_stats",
+    "prefix_of",
+    "record_lookup",
+    "ttl_bucket",
+]
@@ -9,6 +9,7 @@ from typing import List, Dict, Any
 from datetime import datetime
 
 from app.config import get_settings
+from app.services.access_tracker import get_access_tracker
 from app.services.multi_tier_cache import get_multi_tier_cache
 from app.services.market_data import market_data_service
 from app.services.universe_store import universe_store
@@ -24,6 +25,9 @@ class CacheWarmer:
     1. Popular tickers (SPY, QQQ, etc.)
     2. Recent universe data
     3. Common patterns
+
+    During the trading day ``warm_predictive`` keeps what users actually
+    request (the decayed access top-K) fresh, within a provider budget.
     """
 
     # Popular tickers to warm on startup
@@ -235,6 +239,73 @@ class CacheWarmer:
 
         return stats
 
+    async def warm_predictive(self, pre_open: bool = False) -> Dict[str, Any]:
+        """
+        Refresh the most requested time series before they expire
+
+        Walks the decayed access top-K hottest first and re-fetches entries
+        that are missing or expire within the refresh window; before market
+        open every hot entry is refreshed. Stops at the per-run budget.
+
+        Returns:
+            Statistics on the warming run
+        """
+        if not self.settings.cache_predictive_enabled:
+            return {"status": "disabled"}
+
+        tracker = get_access_tracker()
+        await tracker.flush()
+        hot = await tracker.top(self.settings.cache_predictive_top_n)
+        budget = await self._predictive_budget()
+        stats = {"candidates": len(hot), "budget": budget, "refreshed": 0, "fresh": 0, "failed": 0, "deferred": 0}
+        if not hot or budget <= 0:
+            return stats
+
+        # One round-trip for every candidate's remaining TTL
+        redis = await market_data_service.cache._get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            for ticker, interval, _ in hot:
+                pipe.ttl(f"timeseries:{ticker}:{interval}")
+            ttls = await pipe.execute()
+
+        window = self.settings.cache_predictive_refresh_window
+        for (ticker, interval, _), ttl in zip(hot, ttls):
+            # -2: not cached, -1: no expiry
+            due = pre_open or ttl == -2 or 0 <= ttl <= window
+            if not due:
+                stats["fresh"] += 1
+                continue
+            if stats["refreshed"] + stats["failed"] >= budget:
+                stats["deferred"] += 1
+                continue
+            try:
+                data = await market_data_service.get_time_series(
+                    ticker, interval, 500, prefer_free=True, refresh=True
+                )
+                stats["refreshed" if data else "failed"] += 1
+            except Exception as e:
+                logger.warning(f"⚠️ Predictive warm failed for {ticker} {interval}: {e}")
+                stats["failed"] += 1
+
+            # Small delay to avoid rate limiting
+            await asyncio.sleep(0.1)
+
+        logger.info(f"🔮 Predictive warming complete (pre_open={pre_open}): {stats}")
+        return stats
+
+    async def _predictive_budget(self) -> int:
+        """Fetches one run may spend: the configured cap, limited to a share of remaining paid quota."""
+        budget = self.settings.cache_predictive_budget
+        usage = await market_data_service.get_usage_stats()
+        remaining = [
+            stats.get("remaining", 0)
+            for stats in usage.values()
+            if isinstance(stats, dict)
+        ]
+        if remaining:
+            budget = min(budget, int(sum(max(r, 0) for r in remaining) * self.settings.cache_predictive_quota_share))
+        return budget
+
     async def warm_ticker(self, ticker: str) -> bool:
         """
         Warm cache for a specific ticker
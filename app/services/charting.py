@@ -14,6 +14,7 @@ from copy import deepcopy
 from redis.asyncio import Redis
 
 from app.config import get_settings
+from app.services.cache_analytics import record_lookup
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -24,6 +25,7 @@ class ChartingService:
     BASE_URL = "https://api.chart-img.com/v2/tradingview/advanced-chart/storage"
     RATE_LIMIT_DELAY = 0.1  # 100ms = 10 calls/sec
     MAX_PARAMETERS = 5  # Max studies + drawings combined; gracefully degrade if needed
+    CHART_CACHE_TTL = 86400  # Cached chart URLs and their mirrored blobs' refs live 24h
 
     CHART_PRESETS = {
         "breakout": ["EMA21", "SMA50"],  # Simplified: removed RSI to reduce clutter
@@ -393,9 +395,11 @@ class ChartingService:
             try:
                 cache_key = f"chartimg:{ticker}:{timeframe}:{entry}:{stop}:{target}"
                 cached_url = await self.redis.get(cache_key)
+                record_lookup(cache_key, bool(cached_url))
                 if cached_url:
                     logger.info(f"💾 Chart cache HIT for {ticker}")
-                    return cached_url.decode() if isinstance(cached_url, bytes) else cached_url
+                    upstream = cached_url.decode() if isinstance(cached_url, bytes) else cached_url
+                    return await self._local_chart_url(cache_key, upstream)
             except Exception as e:
                 logger.warning(f"Cache lookup failed: {e}")
         
@@ -483,17 +487,17 @@ class ChartingService:
 
                 if chart_url:
                     logger.info(f"✅ Chart generated for {ticker} ({timeframe}): {chart_url[:60]}... (expires: {expires_at})")
-                    
-                    # Cache for 24h (86400 seconds)
+                    cache_key = f"chartimg:{ticker}:{timeframe}:{entry}:{stop}:{target}"
+
+                    # Cache the upstream URL for 24h; hits swap in the local copy while it exists
                     if self.redis:
                         try:
-                            cache_key = f"chartimg:{ticker}:{timeframe}:{entry}:{stop}:{target}"
-                            await self.redis.setex(cache_key, 86400, chart_url)
+                            await self.redis.setex(cache_key, self.CHART_CACHE_TTL, chart_url)
                             logger.debug(f"💾 Cached chart URL for {ticker} (24h TTL)")
                         except Exception as e:
                             logger.warning(f"Failed to cache chart URL: {e}")
-                    
-                    return chart_url
+
+                    return await self._mirror_chart(chart_url, cache_key)
                 else:
                     logger.warning(f"⚠️ Chart-IMG response missing URL for {ticker}: {data}")
                     return self._get_fallback_url(ticker, timeframe)
@@ -508,6 +512,60 @@ class ChartingService:
             logger.warning(f"⚠️ Chart generation error for {ticker}: {e}")
             return self._get_fallback_url(ticker, timeframe)
 
+    async def _mirror_chart(self, chart_url: str, cache_key: str) -> str:
+        """
+        Copy a Chart-IMG image into the local blob store and return its /blobs URL.
+
+        Chart-IMG storage URLs expire; the local copy is content-addressed and
+        served with immutable cache headers. The blob is referenced under
+        ``cache_key`` so cache hits can find it again. Falls back to
+        ``chart_url``, and skips mirroring without a public base URL.
+        """
+        base_url = settings.public_base_url
+        if not settings.chart_blob_mirror or not base_url:
+            return chart_url
+        try:
+            async with httpx.AsyncClient(timeout=15.0) as client:
+                response = await client.get(chart_url)
+            content_type = response.headers.get("content-type", "").split(";")[0]
+            if response.status_code != 200 or not content_type.startswith("image/"):
+                return chart_url
+            if len(response.content) > settings.chart_blob_max_bytes:
+                return chart_url
+            from app.services.blob_store import get_blob_store
+
+            digest = await asyncio.to_thread(
+                get_blob_store().put, response.content, content_type, name=cache_key
+            )
+            return f"{base_url}/blobs/{digest}"
+        except Exception as e:
+            logger.warning(f"Chart mirror failed, keeping upstream URL: {e}")
+            return chart_url
+
+    async def _local_chart_url(self, cache_key: str, chart_url: str) -> str:
+        """
+        /blobs URL of the chart mirrored under ``cache_key``, or ``chart_url``.
+
+        The blob lives on this instance only and may have been evicted, so a
+        missing ref or file (other replica, redeploy, LRU) keeps the upstream URL.
+        """
+        base_url = settings.public_base_url
+        if not settings.chart_blob_mirror or not base_url:
+            return chart_url
+        try:
+            from app.services.blob_store import get_blob_store
+
+            def _resolve() -> Optional[str]:
+                store = get_blob_store()
+                digest = store.resolve(cache_key, max_age=self.CHART_CACHE_TTL)
+                return digest if digest and store.get(digest) else None
+
+            digest = await asyncio.to_thread(_resolve)
+        except Exception as e:
+            logger.warning(f"Chart mirror lookup failed, using upstream URL: {e}")
+            return chart_url
+        return f"{base_url}/blobs/{digest}" if digest else chart_url
+
     async def generate_multi_timeframe_charts(
         self,
         ticker: str,
@@ -6,23 +6,36 @@ Phase 1.5: Database Integration
 from sqlalchemy import create_engine, text, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool, QueuePool
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, List, Dict, Any, Callable, Tuple
+import asyncio
 import logging
 import os
 import hashlib
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 
 from app.config import get_settings
-from app.models import Base, Ticker, PatternScan, Watchlist, ScanLog
+from app.telemetry.metrics import DB_EXECUTOR_PENDING, DB_EXECUTOR_QUEUE_WAIT_SECONDS, DB_QUERY_DURATION_SECONDS
+from app.models import Base, Ticker, Watchlist, ScanLog
+from app.services.scan_history import ScanHistoryStore
+from app.services.scan_persistence import PatternScanWriter
 
 logger = logging.getLogger(__name__)
 
 def cache_query(ttl: int = 300, key_prefix: str = "db"):
-    """Decorator to cache database query results in Redis"""
+    """Decorator to cache database query results in Redis.
+
+    The decorated method is always awaitable: sync query methods run on the
+    DB thread pool (``run_db``) rather than on the event loop.
+    """
     def decorator(func: Callable) -> Callable:
+        import inspect
+        is_async = inspect.iscoroutinefunction(func)
+
         @wraps(func)
-        async def async_wrapper(self, *args, **kwargs):
+        async def wrapper(self, *args, **kwargs):
             # Generate cache key from function name and arguments
             cache_key_parts = [key_prefix, func.__name__]
 
@@ -46,7 +59,10 @@ def cache_query(ttl: int = 300, key_prefix: str = "db"):
                 logger.debug(f"Cache get failed: {e}")
 
             # Execute function and cache result
-            result = func(self, *args, **kwargs)
+            if is_async:
+                result = await func(self, *args, **kwargs)
+            else:
+                result = await run_db(func, self, *args, **kwargs)
 
             try:
                 from app.services.cache import get_cache_service
@@ -58,20 +74,67 @@ def cache_query(ttl: int = 300, key_prefix: str = "db"):
 
             return result
 
-        @wraps(func)
-        def sync_wrapper(self, *args, **kwargs):
-            # For sync functions, just execute without caching
-            # In production, you'd want to handle this differently
-            return func(self, *args, **kwargs)
-
-        # Return async wrapper if function is async, else sync wrapper
-        import inspect
-        if inspect.iscoroutinefunction(func):
-            return async_wrapper
-        return sync_wrapper
+        return wrapper
 
     return decorator
 
+
+def _pool_limits() -> Tuple[int, int]:
+    """Connection pool size and max overflow for server databases"""
+    pool_size = int(os.getenv("DB_POOL_SIZE", "5"))  # Reduced from default 5 for Railway
+    max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "10"))  # Max additional connections
+    return pool_size, max_overflow
+
+
+# ==================== Async access ====================
+
+_db_executor: Optional[ThreadPoolExecutor] = None
+
+
+def db_thread_count(database_url: Optional[str]) -> int:
+    """DB threads for async callers: one per pooled connection (SQLite shares a single connection)"""
+    if not database_url or database_url.startswith("sqlite"):
+        return 1
+    pool_size, max_overflow = _pool_limits()
+    return pool_size + max_overflow
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Process-wide thread pool that runs blocking database work for async code"""
+    global _db_executor
+    if _db_executor is None:
+        _db_executor = ThreadPoolExecutor(
+            max_workers=db_thread_count(get_settings().database_url),
+            thread_name_prefix="db",
+        )
+    return _db_executor
+
+
+async def run_db(func: Callable, *args, **kwargs) -> Any:
+    """Run blocking database work on the DB thread pool and await the result.
+
+    The pool has one thread per pooled connection, so excess calls queue here
+    (exported as ``db_executor_queue_wait_seconds``) rather than holding an
+    event loop turn or a thread blocked on the connection pool.
+    """
+    operation = getattr(func, "__name__", "call")
+    submitted = time.perf_counter()
+
+    def call():
+        started = time.perf_counter()
+        DB_EXECUTOR_QUEUE_WAIT_SECONDS.labels(operation=operation).observe(started - submitted)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            DB_QUERY_DURATION_SECONDS.labels(operation=operation).observe(time.perf_counter() - started)
+
+    DB_EXECUTOR_PENDING.inc()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(get_db_executor(), call)
+    finally:
+        DB_EXECUTOR_PENDING.dec()
+
+
 class DatabaseService:
     """Database service for Legend AI operations"""
 
@@ -79,6 +142,8 @@ class DatabaseService:
         self.database_url = database_url
         self.engine = None
         self.SessionLocal = None
+        self._scan_writer = None
+        self._scan_history = None
 
     def init_db(self):
         """Initialize database connection and create tables"""
@@ -102,8 +167,7 @@ class DatabaseService:
             else:
                 # PostgreSQL connection pooling configuration
                 # Optimized for Railway deployment with limited connections
-                pool_size = int(os.getenv("DB_POOL_SIZE", "5"))  # Reduced from default 5 for Railway
-                max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "10"))  # Max additional connections
+                pool_size, max_overflow = _pool_limits()
                 pool_timeout = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for connection
                 pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "3600"))  # Recycle connections after 1 hour
                 pool_pre_ping = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # Test connections before use
@@ -207,127 +271,52 @@ class DatabaseService:
             return db.query(Ticker).limit(limit).all()
 
     # Pattern operations
-    def save_pattern_scan(self, ticker_symbol: str, pattern_data: Dict[str, Any]) -> PatternScan:
-        """Save pattern scan result"""
-        with self.get_db() as db:
-            ticker = self.get_or_create_ticker(ticker_symbol, pattern_data.get("name"))
-
-            scan = PatternScan(
-                ticker_id=ticker.id,
-                pattern_type=pattern_data.get("pattern", "UNKNOWN"),
-                score=pattern_data.get("score", 0),
-                entry_price=pattern_data.get("entry"),
-                stop_price=pattern_data.get("stop"),
-                target_price=pattern_data.get("target"),
-                risk_reward_ratio=pattern_data.get("risk_reward"),
-                criteria_met=str(pattern_data.get("criteria_met", [])),
-                analysis=pattern_data.get("analysis", ""),
-                current_price=pattern_data.get("current_price"),
-                volume_dry_up=pattern_data.get("volume_dry_up", False),
-                consolidation_days=pattern_data.get("consolidation_days")
-            )
-
-            db.add(scan)
-            db.commit()
-            db.refresh(scan)
-            return scan
+    def save_pattern_scan(self, ticker_symbol: str, pattern_data: Dict[str, Any]) -> int:
+        """Save one pattern scan result; returns rows written"""
+        return self.save_pattern_scans_batch([{**pattern_data, "ticker_symbol": ticker_symbol}])
 
     def save_pattern_scans_batch(self, scans_data: List[Dict[str, Any]]) -> int:
-        """Save multiple pattern scans in a single transaction (optimized bulk insert)"""
+        """Save multiple pattern scans in one transaction (COPY / multi-row INSERT, no ORM objects)"""
         if not scans_data:
             return 0
 
         try:
-            with self.get_db() as db:
-                # Pre-fetch all tickers to avoid N+1 queries
-                symbols = {scan.get("ticker_symbol") for scan in scans_data if scan.get("ticker_symbol")}
-                existing_tickers = {
-                    t.symbol: t for t in db.query(Ticker).filter(Ticker.symbol.in_(symbols)).all()
-                }
-
-                # Create missing tickers
-                new_tickers = []
-                for symbol in symbols:
-                    if symbol not in existing_tickers:
-                        ticker = Ticker(symbol=symbol.upper())
-                        new_tickers.append(ticker)
-                        existing_tickers[symbol] = ticker
-
-                if new_tickers:
-                    db.bulk_save_objects(new_tickers)
-                    db.flush()  # Get IDs for new tickers
-
-                # Build scan objects
-                scans = []
-                for data in scans_data:
-                    symbol = data.get("ticker_symbol")
-                    if not symbol:
-                        continue
-
-                    ticker = existing_tickers.get(symbol)
-                    if not ticker:
-                        continue
-
-                    scan = PatternScan(
-                        ticker_id=ticker.id,
-                        pattern_type=data.get("pattern", "UNKNOWN"),
-                        score=data.get("score", 0),
-                        entry_price=data.get("entry"),
-                        stop_price=data.get("stop"),
-                        target_price=data.get("target"),
-                        risk_reward_ratio=data.get("risk_reward"),
-                        criteria_met=str(data.get("criteria_met", [])),
-                        analysis=data.get("analysis", ""),
-                        current_price=data.get("current_price"),
-                        volume_dry_up=data.get("volume_dry_up", False),
-                        consolidation_days=data.get("consolidation_days")
-                    )
-                    scans.append(scan)
-
-                if scans:
-                    db.bulk_save_objects(scans)
-                    db.commit()
-
-                return len(scans)
-
+            return self.scan_writer.write(scans_data)
         except Exception as e:
             logger.error(f"Failed to save pattern scans batch: {e}")
             raise
 
-    def get_recent_scans(self, limit: int = 50, pattern_type: str = None, min_score: float = None) -> List[Dict[str, Any]]:
-        """Get recent pattern scans with ticker info (optimized with filters)"""
-        with self.get_db() as db:
-            query = db.query(
-                PatternScan.id,
-                PatternScan.pattern_type,
-                PatternScan.score,
-                PatternScan.entry_price,
-                PatternScan.stop_price,
-                PatternScan.target_price,
-                PatternScan.scanned_at,
-                Ticker.symbol
-            ).join(Ticker)
-
-            # Apply filters
-            if pattern_type:
-                query = query.filter(PatternScan.pattern_type == pattern_type)
-            if min_score is not None:
-                query = query.filter(PatternScan.score >= min_score)
-
-            results = query.order_by(
-                PatternScan.scanned_at.desc()
-            ).limit(limit).all()
-
-            return [{
-                "id": row.id,
-                "ticker": row.symbol,
-                "pattern": row.pattern_type,
-                "score": row.score,
-                "entry": row.entry_price,
-                "stop": row.stop_price,
-                "target": row.target_price,
-                "scanned_at": row.scanned_at.isoformat()
-            } for row in results]
+    @property
+    def scan_writer(self) -> PatternScanWriter:
+        """Bulk pattern scan writer (keeps a cached symbol -> ticker id map)"""
+        if self._scan_writer is None:
+            self._scan_writer = PatternScanWriter(self)
+        return self._scan_writer
+
+    @property
+    def scan_history(self) -> ScanHistoryStore:
+        """Month-partitioned pattern scan history (creates upcoming partitions on first use)"""
+        if self._scan_history is None:
+            settings = get_settings()
+            store = ScanHistoryStore(
+                self,
+                retention_days=settings.scan_history_retention_days,
+                months_ahead=settings.scan_history_months_ahead,
+            )
+            try:
+                store.ensure_partitions()
+            except Exception as e:
+                logger.warning(f"Pattern scan partition maintenance failed: {e}")
+            self._scan_history = store
+        return self._scan_history
+
+    def get_recent_scans(
+        self, limit: int = 50, pattern_type: str = None, min_score: float = None, days: int = 30
+    ) -> List[Dict[str, Any]]:
+        """Get recent pattern scans with ticker info (only the partitions of the last ``days`` days)"""
+        return self.scan_history.recent(
+            pattern_type=pattern_type, days=days, min_score=min_score, limit=limit
+        )["items"]
 
     # Watchlist operations
     def add_to_watchlist(self, user_id: str, ticker_symbol: str, notes: str = None) -> Watchlist:
@@ -541,6 +530,44 @@ def get_database_service() -> DatabaseService:
         _db_service.init_db()
     return _db_service
 
+class AsyncDatabaseService:
+    """Awaitable view of a DatabaseService; every method call goes through ``run_db``
+
+        adb = get_async_database_service()
+        rows = await adb.get_universe_symbols()
+        count = await adb.run_session(lambda session: session.query(Trade).count())
+    """
+
+    def __init__(self, db: DatabaseService):
+        self.db = db
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        return await run_db(func, *args, **kwargs)
+
+    async def run_session(self, func: Callable, *args) -> Any:
+        """Run ``func(session, *args)`` in a fresh session on the DB thread pool"""
+        def in_session():
+            with self.db.get_db() as session:
+                return func(session, *args)
+
+        in_session.__name__ = getattr(func, "__name__", "session")
+        return await run_db(in_session)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.db, name)
+        if not callable(attr):
+            return attr
+
+        @wraps(attr)
+        async def call(*args, **kwargs):
+            return await run_db(attr, *args, **kwargs)
+
+        return call
+
+def get_async_database_service() -> AsyncDatabaseService:
+    """Get the global database service for use from coroutines"""
+    return AsyncDatabaseService(get_database_service())
+
 def get_db():
     """Dependency for getting database session"""
     db = get_database_service().get_db()
@@ -3,16 +3,23 @@ End-of-day universe scanner.
 """
 from __future__ import annotations
 
-import asyncio
 import logging
 from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from app.services.cache import get_cache_service
-from app.services.database import get_database_service
+from app.services.database import get_database_service, run_db
 from app.services.pattern_scanner import pattern_scanner_service
+from app.services.market_data import market_data_service
+from app.services.scan_checkpoint import ScanCheckpoint
+from app.services.scan_index import ScanIndex
+from app.services.scan_versions import ScanVersionStore, config_version, data_version
+from app.services.universe_prefilter import load_price_payloads, prefilter_universe
 from app.config import get_settings
+from app.core.pattern_engine.context import ScanContext
+from app.core.prefilter import PrefilterConfig
+from app.utils.build_info import resolve_build_sha
 from app.utils.pattern_groups import bucket_name
 
 logger = logging.getLogger(__name__)
@@ -25,68 +32,292 @@ SCAN_TTL = 24 * 3600  # 24 hours
 class EODScanner:
     """Nightly scanner that batches universe pattern detection."""
 
+    CHUNK_SIZE = 25  # Checkpoint granularity; pacing is left to the adaptive limiter
+    MIN_SCORE = 6.0
+    BARS = 320
+
     def __init__(self):
         self.db_service = get_database_service()
         self.cache = get_cache_service()
         self.scanner_service = pattern_scanner_service
         self.settings = get_settings()
+        self.versions = ScanVersionStore(self.cache, "eod")
+        self.index = ScanIndex(self.cache)
+
+    async def run_scan(
+        self,
+        *,
+        scan_date: Optional[str] = None,
+        scan_id: Optional[str] = None,
+        resume: bool = True,
+        incremental: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """Run ``stream_scan`` to completion and return its summary."""
+        summary: Dict[str, Any] = {}
+        async for event in self.stream_scan(
+            scan_date=scan_date, scan_id=scan_id, resume=resume, incremental=incremental
+        ):
+            if event["event"] == "summary":
+                summary = {k: v for k, v in event.items() if k != "event"}
+        return summary
 
-    async def run_scan(self, *, scan_date: Optional[str] = None) -> Dict[str, Any]:
+    async def stream_scan(
+        self,
+        *,
+        scan_date: Optional[str] = None,
+        scan_id: Optional[str] = None,
+        resume: bool = True,
+        incremental: Optional[bool] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Scan the universe in checkpointed chunks, yielding scan events.
+
+        Completed chunks are persisted under ``scan_id`` (``eod-<date>`` by
+        default). Running the same ID again - after a crash, redeploy or a
+        manual re-trigger - skips every symbol already checkpointed unless
+        ``resume`` is False.
+
+        When ``incremental`` (default: ``scan_incremental_enabled``), symbols
+        whose bars and scan config are unchanged since their last scan carry
+        their previous result forward instead of being rescanned.
+
+        Each chunk yields its hits (``result``) and a ``progress`` event; the
+        last event is the ``summary``. Closing the generator between chunks
+        stops the scan and marks its checkpoint ``cancelled``; a later run
+        with the same ID resumes from there.
+        """
+        if incremental is None:
+            incremental = self.settings.scan_incremental_enabled
         if scan_date is None:
             scan_date = datetime.now(timezone.utc).strftime("%Y%m%d")
+        scan_id = scan_id or f"eod-{scan_date}"
 
-        universe_rows = self.db_service.get_universe_symbols()
+        universe_rows = await run_db(self.db_service.get_universe_symbols)
         symbols = [row.symbol for row in universe_rows]
         metadata = {row.symbol: {"sector": row.sector, "industry": row.industry} for row in universe_rows}
         total = len(symbols)
-        logger.info("Starting EOD scan for %s symbols (date=%s)", total, scan_date)
 
-        results: List[Dict[str, Any]] = []
+        checkpoint = ScanCheckpoint(self.cache, scan_id)
+        if not resume:
+            await checkpoint.reset()
+        completed = await checkpoint.load()
+        logger.info(
+            "Starting EOD scan %s for %s symbols (date=%s, checkpointed=%s)",
+            scan_id,
+            total,
+            scan_date,
+            len(completed),
+        )
+
         errors: List[str] = []
+        prefilter_summary: Optional[Dict[str, Any]] = None
+        candidates = symbols
+        payloads: Dict[str, Optional[Dict[str, Any]]] = {}
+        if self.settings.scan_prefilter_enabled and symbols:
+            # Every detector runs in phase 2, so only screen out what stage A rejects anyway
+            screened, payloads = await prefilter_universe(symbols, config=PrefilterConfig.liquidity_only())
+            candidates = screened.survivors
+            prefilter_summary = screened.summary()
+            logger.info("Prefilter passed %s/%s symbols to detectors", len(candidates), total)
+
+        remaining = [symbol for symbol in candidates if symbol not in completed]
+        done_count = len(candidates) - len(remaining)
+
+        versions: Dict[str, Optional[str]] = {}
+        carried: Dict[str, Optional[Dict[str, Any]]] = {}
+        current_config: Optional[str] = None
+        if incremental and remaining:
+            versions, current_config = await self._input_versions(remaining, payloads)
+            if current_config:
+                remaining, carried = await self.versions.partition(versions, current_config)
+                completed.update(carried)
+                done_count += len(carried)
+                logger.info("Incremental scan: %s unchanged, %s to rescan", len(carried), len(remaining))
+
+        await checkpoint.start(
+            scan_date=scan_date,
+            total_symbols=total,
+            candidates=len(candidates),
+            completed=done_count,
+            prefilter=prefilter_summary,
+        )
+        if carried:
+            await checkpoint.record(carried, completed=done_count, errors=errors)
+
+        # Benchmark, regime and RS ranking are shared by every chunk: build them once
+        context = await ScanContext.build(
+            bars=self.BARS,
+            sectors={symbol: meta["sector"] for symbol, meta in metadata.items() if meta.get("sector")},
+            config={"interval": "1day", "min_score": self.MIN_SCORE, "apply_filters": True},
+        )
+        if payloads:
+            context.add_rs_distribution(payloads.values())
+
+        rescanned = 0
+        yield {"event": "start", "scan_id": scan_id, "total": len(candidates), "completed": done_count}
+
+        finished = False
+        try:
+            for chunk in self._chunks(remaining, self._chunk_size()):
+                try:
+                    payload = await self.scanner_service.scan_with_pattern_engine(
+                        tickers=chunk,
+                        interval="1day",
+                        apply_filters=True,
+                        min_score=self.MIN_SCORE,
+                        context=context,
+                    )
+                except Exception as exc:
+                    # Chunk stays un-checkpointed so a resumed run retries it
+                    logger.error("Chunk scan failed: %s", exc, exc_info=True)
+                    errors.append(str(exc))
+                    await checkpoint.record({}, completed=done_count, errors=errors)
+                    yield {"event": "error", "ticker": f"{chunk[0]}..{chunk[-1]}", "error": str(exc)}
+                    continue
 
-        for chunk in self._chunks(symbols, 25):
-            try:
-                payload = await self.scanner_service.scan_with_pattern_engine(
-                    tickers=chunk,
-                    interval="1day",
-                    apply_filters=True,
-                    min_score=6.0,
-                )
-                chunk_results = payload.get("results", [])
-                for item in chunk_results:
+                chunk_results: Dict[str, Optional[Dict[str, Any]]] = {symbol: None for symbol in chunk}
+                for item in payload.get("results", []):
                     symbol = item.get("symbol")
                     item["sector"] = metadata.get(symbol, {}).get("sector")
                     item["industry"] = metadata.get(symbol, {}).get("industry")
-                results.extend(chunk_results)
-            except Exception as exc:
-                logger.error("Chunk scan failed: %s", exc, exc_info=True)
-                errors.append(str(exc))
-            await asyncio.sleep(2)
-
-        # Deduplicate: keep only the highest-scoring pattern per symbol
-        seen_symbols = {}
-        for item in results:
-            symbol = item.get("symbol")
-            score = item.get("score", 0)
-            if symbol not in seen_symbols or score > seen_symbols[symbol].get("score", 0):
-                seen_symbols[symbol] = item
-        results = list(seen_symbols.values())
+                    best = chunk_results.get(symbol)
+                    if best is None or item.get("score", 0) > best.get("score", 0):
+                        chunk_results[symbol] = item
+                completed.update(chunk_results)
+                done_count += len(chunk)
+                rescanned += len(chunk)
+                await checkpoint.record(chunk_results, completed=done_count, errors=errors)
+                if current_config:
+                    await self.versions.record(chunk_results, versions, current_config)
+                for symbol, item in chunk_results.items():
+                    if item:
+                        yield {"event": "result", "ticker": symbol, "data": item}
+                yield {
+                    "event": "progress",
+                    "completed": done_count,
+                    "total": len(candidates),
+                    "rescanned": rescanned,
+                    "hits": checkpoint.progress.get("hits", 0),
+                }
+            finished = True
+        finally:
+            if not finished:
+                logger.info("EOD scan %s stopped after %s/%s symbols", scan_id, done_count, len(candidates))
+                await checkpoint.finish("cancelled")
+
+        # One entry per symbol already holds its highest-scoring pattern
+        candidate_set = set(candidates)
+        results = [
+            item for symbol, item in completed.items() if item and symbol in candidate_set
+        ]
         logger.info("After deduplication: %s unique symbols", len(results))
 
-        categorized = self._categorize(results)
-        summary = self._build_summary(
+        summary = self._summary_from_results(
             scan_date=scan_date,
             total_symbols=total,
             results=results,
-            buckets=categorized,
             errors=errors,
+            prefilter=prefilter_summary,
         )
+        summary["scan_id"] = scan_id
+        summary["rescanned"] = rescanned
+        summary["carried_over"] = len(carried)
         key = SCAN_KEY_TEMPLATE.format(date=scan_date)
         await self.cache.set(key, summary, ttl=SCAN_TTL)
         await self.cache.set(SCAN_LATEST_KEY, summary, ttl=SCAN_TTL)
+        try:
+            await self.index.write(scan_date, summary)
+        except Exception as exc:
+            logger.warning("Scan index write failed for %s: %s", scan_date, exc)
+        await checkpoint.finish("complete" if not errors else "complete_with_errors")
         logger.info("Scan cached for %s (patterns=%s)", scan_date, len(results))
+        yield {"event": "summary", **summary}
+
+    async def partial_summary(self, progress: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a summary from the checkpoint of a scan that is still running."""
+        scan_id = progress.get("scan_id")
+        completed = await ScanCheckpoint(self.cache, scan_id).load()
+        results = [item for item in completed.values() if item]
+        summary = self._summary_from_results(
+            scan_date=progress.get("scan_date"),
+            total_symbols=progress.get("total_symbols", 0),
+            results=results,
+            errors=progress.get("errors", []),
+            prefilter=progress.get("prefilter"),
+        )
+        summary["scan_id"] = scan_id
+        summary["status"] = "running"
+        summary["progress"] = self.progress_view(progress)
         return summary
 
+    @staticmethod
+    def progress_view(progress: Dict[str, Any]) -> Dict[str, Any]:
+        candidates = progress.get("candidates") or 0
+        completed = progress.get("completed") or 0
+        return {
+            "scan_id": progress.get("scan_id"),
+            "status": progress.get("status"),
+            "completed": completed,
+            "candidates": candidates,
+            "percent": round(completed / candidates * 100, 1) if candidates else 0.0,
+            "hits": progress.get("hits", 0),
+            "started_at": progress.get("started_at"),
+            "updated_at": progress.get("updated_at"),
+        }
+
+    def _summary_from_results(
+        self,
+        *,
+        scan_date: Optional[str],
+        total_symbols: int,
+        results: List[Dict[str, Any]],
+        errors: List[str],
+        prefilter: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        return self._build_summary(
+            scan_date=scan_date,
+            total_symbols=total_symbols,
+            results=results,
+            buckets=self._categorize(results),
+            errors=errors,
+            prefilter=prefilter,
+        )
+
+    async def _input_versions(
+        self,
+        symbols: List[str],
+        payloads: Dict[str, Optional[Dict[str, Any]]],
+    ) -> Tuple[Dict[str, Optional[str]], Optional[str]]:
+        """Data version per symbol plus this run's config version (None = rescan all)."""
+        missing = [symbol for symbol in symbols if payloads.get(symbol) is None]
+        if missing:
+            payloads = {**payloads, **await load_price_payloads(missing, bars=self.BARS)}
+        try:
+            benchmark = await market_data_service.get_time_series("SPY", "1day", self.BARS)
+        except Exception as exc:
+            logger.warning("Benchmark fetch failed: %s", exc)
+            benchmark = None
+        versions = {symbol: data_version(payloads.get(symbol)) for symbol in symbols}
+        benchmark_version = data_version(benchmark)
+        if benchmark_version is None:
+            logger.warning("No benchmark data; rescanning every symbol")
+            return versions, None
+        config = config_version(
+            interval="1day",
+            bars=self.BARS,
+            min_score=self.MIN_SCORE,
+            apply_filters=True,
+            build=resolve_build_sha(),
+            benchmark=benchmark_version,
+        )
+        return versions, config
+
+    def _chunk_size(self) -> int:
+        """With sharding on, each checkpointed chunk fans out to several shards."""
+        if self.settings.scan_sharding_enabled:
+            return max(self.CHUNK_SIZE, self.settings.scan_shard_size * 4)
+        return self.CHUNK_SIZE
+
     def _chunks(self, data: List[str], size: int):
         for i in range(0, len(data), size):
             yield data[i : i + size]
@@ -120,6 +351,7 @@ class EODScanner:
         results: List[Dict[str, Any]],
         buckets: Dict[str, List[Dict[str, Any]]],
         errors: List[str],
+        prefilter: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         sorted_results = sorted(results, key=lambda item: item.get("score", 0), reverse=True)
         top_setups = [self._summarize(item) for item in sorted_results[:10]]
@@ -131,6 +363,7 @@ class EODScanner:
             "buckets": buckets,
             "top_setups": top_setups,
             "errors": errors,
+            "prefilter": prefilter,
             "generated_at": datetime.now(timezone.utc).isoformat(),
             "results": all_summaries,
         }
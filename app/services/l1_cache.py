@@ -0,0 +1,273 @@
+"""
+Process-local L1 cache in front of Redis.
+
+Hot keys (the same ticker's time series, the universe list, RS snapshots)
+are read many times per second by every worker. The L1 keeps the decoded
+value in process memory so repeat reads skip the Redis round-trip and the
+JSON decode:
+
+- bounded by entry count, least recently used entry evicted first
+- every entry expires after ``min(redis_ttl, max_ttl)`` so L1 can never
+  serve a value Redis has already dropped, and staleness is bounded even
+  when an invalidation message is missed
+- writes and deletes are broadcast on the ``cache:l1:invalidate`` channel;
+  each worker's listener drops the named keys (or glob pattern) locally
+- every invalidation bumps the key's write version; a reader takes
+  ``version(key)`` before going to Redis and passes it to ``set``, which
+  skips the fill if the key was invalidated meanwhile, so a read racing a
+  write cannot park the old value in L1
+
+Values are shared between readers. ``get`` hands out a shallow copy of
+dicts and lists so callers that tag a payload (``data["cached"] = True``)
+do not touch the stored entry, but nested values must be treated as
+read-only.
+"""
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.telemetry.metrics import (
+    CACHE_EVICTIONS_TOTAL,
+    CACHE_HITS_TOTAL,
+    CACHE_MISSES_TOTAL,
+    CACHE_SIZE_BYTES,
+)
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "cache:l1:invalidate"
+MISSING = object()
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+class L1Cache:
+    """Size-bounded LRU with per-entry TTLs."""
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        max_ttl: float = 30.0,
+        *,
+        name: str = "l1",
+        broadcast: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.max_ttl = float(max_ttl)
+        self.name = name
+        self.broadcast = broadcast  # Publish local writes/deletes to the other workers
+        self.clock = clock
+        self.origin = uuid.uuid4().hex  # Lets the listener skip this process's own messages
+        self._entries: "OrderedDict[str, Tuple[float, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        # Write versions of recently invalidated keys; older ones fold into the floor
+        self._versions: "OrderedDict[str, int]" = OrderedDict()
+        self._version_floor = 0
+        self._write_seq = 0
+        self._listener: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > self.clock()
+
+    def get(self, key: str) -> Any:
+        """Cached value of ``key``, or ``MISSING`` when absent or expired."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= self.clock():
+            self._drop(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            CACHE_MISSES_TOTAL.labels(name=self.name).inc()
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        CACHE_HITS_TOTAL.labels(name=self.name).inc()
+        return _copy(entry[1])
+
+    def version(self, key: str) -> int:
+        """Write version of ``key``; take it before reading the value from Redis."""
+        return self._versions.get(key, self._version_floor)
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        size: int = 0,
+        version: Optional[int] = None,
+    ) -> None:
+        """
+        Store ``value`` for ``min(ttl, max_ttl)`` seconds; ``size`` feeds the bytes gauge.
+
+        With ``version``, the value is dropped if ``key`` was invalidated after
+        that version was taken (it may predate the write).
+        """
+        if version is not None and self.version(key) != version:
+            return
+        ttl = self.max_ttl if ttl is None else min(float(ttl), self.max_ttl)
+        if ttl <= 0:
+            self.invalidate(key)
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (self.clock() + ttl, _copy(value), size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+            CACHE_EVICTIONS_TOTAL.labels(name=self.name).inc()
+        self._report_size()
+
+    def invalidate(self, *keys: str) -> int:
+        for key in keys:
+            self._bump_version(key)
+        dropped = sum(self._drop(key) for key in keys)
+        if dropped:
+            self._report_size()
+        return dropped
+
+    def invalidate_pattern(self, pattern: str) -> int:
+        """Drop every key matching a Redis-style glob (``ohlcv:AAPL:*``)."""
+        self._bump_all()  # Fills in flight may be for matching keys not cached yet
+        return self.invalidate(*[key for key in self._entries if fnmatch.fnmatchcase(key, pattern)])
+
+    def clear(self) -> None:
+        self._bump_all()
+        self._entries.clear()
+        self._bytes = 0
+        self._report_size()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "max_ttl": self.max_ttl,
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(100.0 * self.hits / lookups, 2) if lookups else 0.0,
+        }
+
+    def _bump_version(self, key: str) -> None:
+        self._write_seq += 1
+        self._versions[key] = self._write_seq
+        self._versions.move_to_end(key)
+        while len(self._versions) > self.max_entries:
+            _, version = self._versions.popitem(last=False)
+            self._version_floor = max(self._version_floor, version)
+
+    def _bump_all(self) -> None:
+        self._write_seq += 1
+        self._version_floor = self._write_seq
+        self._versions.clear()
+
+    def _drop(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[2]
+        return True
+
+    def _report_size(self) -> None:
+        CACHE_SIZE_BYTES.labels(name=self.name).set(self._bytes)
+
+    # ==================== Cross-worker invalidation ====================
+
+    def message(self, keys: Iterable[str] = (), pattern: Optional[str] = None) -> str:
+        """Invalidation message for the other workers."""
+        body: Dict[str, Any] = {"origin": self.origin}
+        if pattern is not None:
+            body["pattern"] = pattern
+        else:
+            body["keys"] = list(keys)
+        return json.dumps(body)
+
+    def apply(self, message: str) -> int:
+        """Apply an invalidation published by another worker."""
+        try:
+            body = json.loads(message)
+        except (TypeError, ValueError):
+            return 0
+        if body.get("origin") == self.origin:
+            return 0
+        if "pattern" in body:
+            return self.invalidate_pattern(body["pattern"])
+        return self.invalidate(*body.get("keys", []))
+
+    async def listen(self, redis) -> None:
+        """Drop keys named on the invalidation channel until cancelled."""
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(INVALIDATION_CHANNEL)
+        try:
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message and message.get("type") == "message":
+                    self.apply(message["data"])
+        finally:
+            # A missed message only costs staleness up to max_ttl, so start clean
+            self.clear()
+            await pubsub.unsubscribe(INVALIDATION_CHANNEL)
+            await pubsub.aclose()
+
+    def start_listener(self, redis) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self.listen(redis), name="l1-cache-invalidation")
+
+    async def stop_listener(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        except Exception as exc:
+            logger.warning("L1 invalidation listener stopped with error: %s", exc)
+        self._listener = None
+
+
+_l1_cache: Optional[L1Cache] = None
+
+
+def get_l1_cache() -> Optional[L1Cache]:
+    """Process-wide L1, or None when disabled in settings."""
+    global _l1_cache
+    from app.config import get_settings
+
+    settings = get_settings()
+    if not settings.l1_cache_enabled:
+        return None
+    if _l1_cache is None:
+        _l1_cache = L1Cache(
+            settings.l1_cache_max_entries,
+            settings.l1_cache_max_ttl,
+            broadcast=settings.l1_cache_pubsub,
+        )
+    return _l1_cache
+
+
+__all__ = ["INVALIDATION_CHANNEL", "L1Cache", "MISSING", "get_l1_cache"]
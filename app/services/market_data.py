@@ -3,18 +3,30 @@ Enhanced Market Data Service with Multi-Source Fallback
 Intelligently manages API limits across TwelveData, Finnhub, and Alpha Vantage
 """
 import httpx
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Awaitable, Set
 from datetime import datetime, timedelta
+from contextvars import ContextVar
 import asyncio
 import logging
 from enum import Enum
 import pandas as pd
 
 from app.config import get_settings
+from app.services.adaptive_concurrency import record_provider_quota, record_provider_status
 from app.services.cache import get_cache_service
+from app.services.negative_cache import ALL_PROVIDERS, NegativeCache
 
 logger = logging.getLogger(__name__)
 
+# Set by provider fetchers when a failure says nothing about the symbol
+# (timeout, 429, 5xx), so it is not negatively cached
+_provider_transient: ContextVar[bool] = ContextVar("provider_transient", default=False)
+
+
+def _mark_transient(status_code: Optional[int] = None) -> None:
+    if status_code is None or status_code == 429 or status_code >= 500:
+        _provider_transient.set(True)
+
 
 class DataSource(str, Enum):
     TWELVE_DATA = "twelvedata"
@@ -24,6 +36,9 @@ class DataSource(str, Enum):
     CACHE = "cache"
 
 
+PROVIDERS = (DataSource.TWELVE_DATA, DataSource.FINNHUB, DataSource.ALPHA_VANTAGE, DataSource.YAHOO)
+
+
 class MarketDataService:
     """
     Unified market data service with intelligent multi-source fallback
@@ -44,6 +59,15 @@ class MarketDataService:
         # API usage tracking (persisted in Redis)
         self.usage_key_prefix = "api_usage"
 
+        # Per-symbol "no data" markers shared across workers
+        self.negative_cache: Optional[NegativeCache] = None
+        if self.settings.negative_cache_enabled:
+            self.negative_cache = NegativeCache(
+                self.cache,
+                base_ttl=self.settings.negative_cache_base_ttl,
+                max_ttl=self.settings.negative_cache_max_ttl,
+            )
+
     async def get_usage_stats(self) -> Dict[str, Any]:
         """Get current API usage for all sources"""
         try:
@@ -98,6 +122,8 @@ class MarketDataService:
 
             limit = limits.get(source, 999999)
             can_request = int(current) < limit
+            if source in limits:
+                record_provider_quota(source.value, int(current), limit)
 
             if not can_request:
                 logger.warning(f"⚠️ {source.value} daily limit reached ({current}/{limit})")
@@ -122,13 +148,15 @@ class MarketDataService:
         ticker: str,
         interval: str = "1day",
         outputsize: int = 500,
-        prefer_free: bool = False
+        prefer_free: bool = False,
+        refresh: bool = False,
     ) -> Optional[Dict[str, Any]]:
         """
         Get OHLCV time series data with intelligent fallback
 
         Args:
             prefer_free: If True, prefer Yahoo Finance for historical data (cost optimization)
+            refresh: If True, skip the cache read and re-fetch (the result is still cached)
 
         Returns:
             {
@@ -144,7 +172,7 @@ class MarketDataService:
         """
         # 1. Try cache first
         cache_key = f"timeseries:{ticker}:{interval}"
-        cached_data = await self.cache.get(cache_key)
+        cached_data = None if refresh else await self.cache.get(cache_key)
         if cached_data:
             logger.info(f"⚡ Cache hit for {ticker}")
             cached_data["cached"] = True
@@ -154,10 +182,21 @@ class MarketDataService:
         # Determine if this is historical data request (large outputsize = historical)
         is_historical = outputsize >= 100
 
+        # Providers known to have nothing for this symbol are skipped
+        negative = {}
+        skip = set()
+        if self.negative_cache is not None:
+            negative = await self.negative_cache.lookup(ticker, interval, [source.value for source in PROVIDERS])
+            skip = self.negative_cache.blocked(negative)
+            if ALL_PROVIDERS in skip:
+                logger.debug(f"🚫 {ticker} ({interval}) is negatively cached; skipping providers")
+                return None
+        outcome: Dict[str, List[str]] = {"empty": [], "transient": []}
+
         # Smart source selection based on data type
         if prefer_free or is_historical:
             # For historical data, try Yahoo first (free, unlimited)
-            data = await self._get_from_yahoo(ticker, interval)
+            data = await self._try_provider(DataSource.YAHOO, self._get_from_yahoo(ticker, interval), skip, outcome)
             if data:
                 # Cache historical data for much longer
                 cache_ttl = 604800 if is_historical else 3600  # 7 days vs 1 hour
@@ -165,54 +204,98 @@ class MarketDataService:
                 data["cached"] = False
                 data["source"] = DataSource.YAHOO
                 logger.info(f"💰 Using free Yahoo Finance for {ticker} (cost optimization)")
-                return data
+                return await self._found(ticker, interval, data, negative)
 
         # 2. Try TwelveData (primary) only if API key configured
         if self.settings.twelvedata_api_key and await self._check_rate_limit(DataSource.TWELVE_DATA):
-            data = await self._get_from_twelvedata(ticker, interval, outputsize)
+            data = await self._try_provider(
+                DataSource.TWELVE_DATA, self._get_from_twelvedata(ticker, interval, outputsize), skip, outcome
+            )
             if data:
                 await self._increment_usage(DataSource.TWELVE_DATA)
                 cache_ttl = 604800 if is_historical else 900  # Smart TTL
                 await self.cache.set(cache_key, data, ttl=cache_ttl)
                 data["cached"] = False
                 data["source"] = DataSource.TWELVE_DATA
-                return data
+                return await self._found(ticker, interval, data, negative)
 
         # 3. Try Finnhub (fallback 1)
         if self.settings.finnhub_api_key and await self._check_rate_limit(DataSource.FINNHUB):
-            data = await self._get_from_finnhub(ticker, interval, outputsize)
+            data = await self._try_provider(
+                DataSource.FINNHUB, self._get_from_finnhub(ticker, interval, outputsize), skip, outcome
+            )
             if data:
                 await self._increment_usage(DataSource.FINNHUB)
                 cache_ttl = 604800 if is_historical else 900
                 await self.cache.set(cache_key, data, ttl=cache_ttl)
                 data["cached"] = False
                 data["source"] = DataSource.FINNHUB
-                return data
+                return await self._found(ticker, interval, data, negative)
 
         # 4. Try Alpha Vantage (fallback 2)
         if self.settings.alpha_vantage_api_key and await self._check_rate_limit(DataSource.ALPHA_VANTAGE):
-            data = await self._get_from_alpha_vantage(ticker, interval, outputsize)
+            data = await self._try_provider(
+                DataSource.ALPHA_VANTAGE, self._get_from_alpha_vantage(ticker, interval, outputsize), skip, outcome
+            )
             if data:
                 await self._increment_usage(DataSource.ALPHA_VANTAGE)
                 cache_ttl = 604800 if is_historical else 900
                 await self.cache.set(cache_key, data, ttl=cache_ttl)
                 data["cached"] = False
                 data["source"] = DataSource.ALPHA_VANTAGE
-                return data
+                return await self._found(ticker, interval, data, negative)
 
         # 5. Try Yahoo Finance (last resort) if not already tried
         if not (prefer_free or is_historical):
-            data = await self._get_from_yahoo(ticker, interval)
+            data = await self._try_provider(DataSource.YAHOO, self._get_from_yahoo(ticker, interval), skip, outcome)
             if data:
                 cache_ttl = 604800 if is_historical else 3600
                 await self.cache.set(cache_key, data, ttl=cache_ttl)
                 data["cached"] = False
                 data["source"] = DataSource.YAHOO
-                return data
+                return await self._found(ticker, interval, data, negative)
+
+        if self.negative_cache is not None and outcome["empty"]:
+            # A symbol is dead only once every provider has answered empty; providers
+            # without a key, over quota or failing transiently have not ruled it out
+            answered = set(outcome["empty"]) | skip
+            dead = not outcome["transient"] and all(source.value in answered for source in PROVIDERS)
+            empty = outcome["empty"] + ([ALL_PROVIDERS] if dead else [])
+            await self.negative_cache.record(ticker, interval, empty, negative)
 
         logger.error(f"❌ All data sources failed for {ticker}")
         return None
 
+    async def _try_provider(
+        self,
+        source: DataSource,
+        fetch: Awaitable[Optional[Dict[str, Any]]],
+        skip: Set[str],
+        outcome: Dict[str, List[str]],
+    ) -> Optional[Dict[str, Any]]:
+        """Run one provider fetch unless negatively cached, noting how it failed in ``outcome``."""
+        if source.value in skip:
+            fetch.close()  # Never awaited
+            return None
+        token = _provider_transient.set(False)
+        try:
+            data = await fetch
+            transient = _provider_transient.get()
+        finally:
+            _provider_transient.reset(token)
+        if not data:
+            outcome["transient" if transient else "empty"].append(source.value)
+        return data
+
+    async def _found(
+        self, ticker: str, interval: str, data: Dict[str, Any], negative: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Drop the dead marker and the winning provider's entry once it has data for ``ticker``."""
+        stale = [name for name in (data["source"].value, ALL_PROVIDERS) if name in negative]
+        if stale and self.negative_cache is not None:
+            await self.negative_cache.clear(ticker, interval, stale)
+        return data
+
     async def _get_from_twelvedata(
         self,
         ticker: str,
@@ -235,12 +318,16 @@ class MarketDataService:
 
             if response.status_code != 200:
                 logger.warning(f"TwelveData HTTP {response.status_code}")
+                record_provider_status(DataSource.TWELVE_DATA.value, response.status_code)
+                _mark_transient(response.status_code)
                 return None
 
             data = response.json()
 
             if "status" in data and data["status"] == "error":
                 logger.warning(f"TwelveData error: {data.get('message')}")
+                if isinstance(data.get("code"), int):
+                    _mark_transient(data["code"])  # Credits exhausted is reported as code 429
                 return None
 
             if "values" not in data:
@@ -267,6 +354,7 @@ class MarketDataService:
             return result
 
         except Exception as e:
+            _mark_transient()
             logger.error(f"TwelveData error: {e}")
             return None
 
@@ -310,6 +398,8 @@ class MarketDataService:
 
             if response.status_code != 200:
                 logger.warning(f"Finnhub HTTP {response.status_code}")
+                record_provider_status(DataSource.FINNHUB.value, response.status_code)
+                _mark_transient(response.status_code)
                 return None
 
             data = response.json()
@@ -335,6 +425,7 @@ class MarketDataService:
             return result
 
         except Exception as e:
+            _mark_transient()
             logger.error(f"Finnhub error: {e}")
             return None
 
@@ -370,6 +461,8 @@ class MarketDataService:
 
             if response.status_code != 200:
                 logger.warning(f"Alpha Vantage HTTP {response.status_code}")
+                record_provider_status(DataSource.ALPHA_VANTAGE.value, response.status_code)
+                _mark_transient(response.status_code)
                 return None
 
             data = response.json()
@@ -383,6 +476,8 @@ class MarketDataService:
 
             if not time_series_key:
                 logger.warning("No Alpha Vantage time series data")
+                if "Note" in data or "Information" in data:
+                    _mark_transient()  # Throttle notices, not an unknown symbol
                 return None
 
             series = data[time_series_key]
@@ -408,6 +503,7 @@ class MarketDataService:
             return result
 
         except Exception as e:
+            _mark_transient()
             logger.error(f"Alpha Vantage error: {e}")
             return None
 
@@ -448,6 +544,8 @@ class MarketDataService:
             response = await self.client.get(url, params=params, headers=headers)
 
             if response.status_code != 200:
+                record_provider_status(DataSource.YAHOO.value, response.status_code)
+                _mark_transient(response.status_code)
                 return None
 
             data = response.json()
@@ -484,6 +582,7 @@ class MarketDataService:
             }
 
         except Exception as e:
+            _mark_transient()
             logger.error(f"Yahoo Finance error: {e}")
             return None
 
@@ -3,13 +3,21 @@ Multi-Tier Caching Service for Legend AI
 Implements intelligent 3-tier caching strategy:
 - Tier 1 (Hot): Redis 5-15min TTL for frequently accessed data
 - Tier 2 (Warm): Database 1 hour TTL for moderately accessed data
-- Tier 3 (CDN): Static files 24 hour TTL for charts/images
+- Tier 3 (CDN): Content-addressed blob store, 24 hour TTL for charts/images
 
 Features:
 - Automatic tier promotion/demotion based on access patterns
 - Smart cache invalidation
 - Cache warming on startup
 - Hit rate monitoring and metrics
+
+The warm tier is synchronous SQLAlchemy, so every warm-tier query goes
+through ``run_db`` and shares the DB executor's thread limit and metrics. Warm hits are counted
+in memory and flushed as one batched UPDATE every few seconds (or every few
+hundred hits), and promotion is decided from the row read by the hit itself.
+The CDN tier stores payloads in the shared ``BlobStore`` under a per-key ref,
+so identical payloads are kept once and the tier stays within its byte budget;
+its file I/O runs in ``asyncio.to_thread`` like the other blob store callers.
 """
 
 import asyncio
@@ -20,15 +28,14 @@ from datetime import datetime, timedelta
 from typing import Optional, Any, Dict, List, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
-from pathlib import Path
-import hashlib
 
 from sqlalchemy import Column, String, Text, Integer, DateTime, Float, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 
 from app.config import get_settings
+from app.services.blob_store import BlobStore, get_blob_store
 from app.services.cache import CacheService
-from app.services.database import DatabaseService
+from app.services.database import DatabaseService, run_db
 
 logger = logging.getLogger(__name__)
 
@@ -113,31 +120,46 @@ class MultiTierCache:
     PROMOTION_THRESHOLD = 3  # Access count to promote from warm to hot
     HOT_TIER_MAX_SIZE = 10000  # Max keys in hot tier before eviction
 
-    def __init__(self, cache_service: CacheService, db_service: Optional[DatabaseService] = None):
+    # Warm tier I/O
+    HIT_FLUSH_INTERVAL = 5.0  # Seconds between batched hit-count UPDATEs
+    HIT_FLUSH_BATCH = 200  # Buffered keys that trigger an early flush
+
+    def __init__(
+        self,
+        cache_service: CacheService,
+        db_service: Optional[DatabaseService] = None,
+        blob_store: Optional[BlobStore] = None,
+    ):
         self.cache_service = cache_service
         self.db_service = db_service
         self.metrics = CacheMetrics()
-        self.cdn_path = Path("/tmp/legend-ai-cdn")  # Static file cache path
-        self.cdn_path.mkdir(exist_ok=True)
+        self._pending_hits: Dict[str, List[Any]] = {}  # key -> [hits, last_accessed]
+        self._flush_task: Optional[asyncio.Task] = None  # Early flush of a full batch
+        self._flusher: Optional[asyncio.Task] = None  # Periodic flush loop, started on first hit
+        self.blob_store = blob_store or get_blob_store()
+        self.cdn_path = self.blob_store.root
 
         # Initialize database tables for warm cache
         if self.db_service and self.db_service.engine:
             CacheEntry.__table__.create(self.db_service.engine, checkfirst=True)
             logger.info("✅ Multi-tier cache tables initialized")
 
-    async def get(self, key: str, data_type: str = "generic") -> Optional[Any]:
+    async def get(self, key: str, data_type: str = "generic", tags: Optional[List[str]] = None) -> Optional[Any]:
         """
         Get value from cache (checks all tiers in order: hot -> warm -> CDN)
 
         Args:
             key: Cache key
             data_type: Type of data (pattern, price, chart, etc.)
+            tags: Invalidation tags the entry was stored with (optional)
 
         Returns:
             Cached value or None if not found
         """
         self.metrics.total_requests += 1
         start_time = time.time()
+        if tags:
+            key = await self.cache_service.tagged_key(key, tags)
 
         # Tier 1: Check hot cache (Redis)
         value = await self._get_hot(key)
@@ -147,13 +169,14 @@ class MultiTierCache:
             return value
 
         # Tier 2: Check warm cache (Database)
-        value = await self._get_warm(key)
-        if value is not None:
+        entry = await self._get_warm_entry(key)
+        if entry is not None:
+            value, hit_count = entry
             self.metrics.warm_hits += 1
             logger.debug(f"🌡️ Warm cache HIT: {key} ({time.time() - start_time:.3f}s)")
 
             # Promote to hot cache if accessed frequently
-            await self._maybe_promote(key, data_type)
+            await self._maybe_promote(key, data_type, value, hit_count)
             return value
 
         # Tier 3: Check CDN cache (Static files) - only for charts
@@ -174,7 +197,8 @@ class MultiTierCache:
         key: str,
         value: Any,
         data_type: str = "generic",
-        tier: Optional[CacheTier] = None
+        tier: Optional[CacheTier] = None,
+        tags: Optional[List[str]] = None,
     ) -> bool:
         """
         Set value in appropriate cache tier
@@ -184,10 +208,13 @@ class MultiTierCache:
             value: Value to cache
             data_type: Type of data (determines default tier)
             tier: Force specific tier (optional)
+            tags: Invalidation tags, e.g. ["ticker:AAPL", "type:price"] (optional)
 
         Returns:
             True if cached successfully
         """
+        if tags:
+            key = await self.cache_service.tagged_key(key, tags)
         # Determine appropriate tier based on data type if not specified
         if tier is None:
             tier = self._determine_tier(data_type)
@@ -224,8 +251,7 @@ class MultiTierCache:
 
         if all_tiers:
             # Invalidate from all tiers
-            redis = await self.cache_service._get_redis()
-            hot_deleted = await redis.delete(key)
+            hot_deleted = await self.cache_service.delete(key)
             count += hot_deleted
 
             if self.db_service:
@@ -239,10 +265,27 @@ class MultiTierCache:
 
         return count
 
+    async def invalidate_tags(self, tags: List[str]) -> Dict[str, int]:
+        """
+        Invalidate every entry stored with any of ``tags``, in every tier
+
+        Constant time: one INCR per tag. Entries of older generations are
+        never read again and expire on their tier's TTL.
+
+        Returns:
+            New generation of each tag
+        """
+        generations = await self.cache_service.invalidate_tags(*tags)
+        logger.info(f"🗑️ Invalidated cache tags: {generations}")
+        return generations
+
     async def invalidate_pattern(self, pattern: str) -> int:
         """
         Invalidate all keys matching pattern
 
+        Scans the whole keyspace; prefer ``invalidate_tags`` for entries
+        stored with tags.
+
         Args:
             pattern: Redis key pattern (e.g., "pattern:*", "ohlcv:AAPL:*")
 
@@ -256,18 +299,17 @@ class MultiTierCache:
         keys = await redis.keys(pattern)
         if keys:
             count += await redis.delete(*keys)
+        await self.cache_service.evict_local_pattern(pattern)
 
         # Invalidate from database (warm tier)
         if self.db_service:
-            with self.db_service.get_db() as db:
-                # Convert Redis pattern to SQL LIKE pattern
-                sql_pattern = pattern.replace("*", "%")
-                result = db.execute(
-                    text("DELETE FROM cache_entries WHERE cache_key LIKE :pattern"),
-                    {"pattern": sql_pattern}
-                )
-                count += result.rowcount
-                db.commit()
+            # Convert Redis pattern to SQL LIKE pattern
+            sql_pattern = pattern.replace("*", "%")
+            count += await run_db(
+                self._execute_warm,
+                "DELETE FROM cache_entries WHERE cache_key LIKE :pattern",
+                {"pattern": sql_pattern},
+            )
 
         logger.info(f"🗑️ Invalidated {count} cache entries matching pattern: {pattern}")
         return count
@@ -319,24 +361,15 @@ class MultiTierCache:
 
         # Clean expired warm cache entries
         if self.db_service:
-            with self.db_service.get_db() as db:
-                result = db.execute(
-                    text("DELETE FROM cache_entries WHERE expires_at < :now"),
-                    {"now": datetime.utcnow()}
-                )
-                stats["warm"] = result.rowcount
-                db.commit()
-
-        # Clean expired CDN files (older than 24 hours)
-        cdn_cleaned = 0
-        cutoff_time = time.time() - self.TTL_CDN
-
-        for file_path in self.cdn_path.glob("*"):
-            if file_path.stat().st_mtime < cutoff_time:
-                file_path.unlink()
-                cdn_cleaned += 1
-
-        stats["cdn"] = cdn_cleaned
+            await self.flush_hits()
+            stats["warm"] = await run_db(
+                self._execute_warm,
+                "DELETE FROM cache_entries WHERE expires_at < :now",
+                {"now": datetime.utcnow()},
+            )
+
+        # Drop expired CDN refs (older than 24 hours); orphaned blobs age out of the LRU budget
+        stats["cdn"] = await asyncio.to_thread(self.blob_store.expire_refs, self.TTL_CDN)
         self.metrics.evictions += stats["warm"] + stats["cdn"]
 
         logger.info(f"🧹 Cleaned up expired cache: {stats}")
@@ -369,41 +402,14 @@ class MultiTierCache:
 
         db_stats = {}
         if self.db_service:
-            with self.db_service.get_db() as db:
-                # Count entries by tier
-                result = db.execute(
-                    text("SELECT cache_tier, COUNT(*) as count FROM cache_entries GROUP BY cache_tier")
-                )
-                db_stats["entries_by_tier"] = {row[0]: row[1] for row in result}
-
-                # Count entries by type
-                result = db.execute(
-                    text("SELECT data_type, COUNT(*) as count FROM cache_entries GROUP BY data_type")
-                )
-                db_stats["entries_by_type"] = {row[0]: row[1] for row in result}
-
-                # Get most accessed entries
-                result = db.execute(
-                    text("""
-                        SELECT cache_key, hit_count, data_type
-                        FROM cache_entries
-                        ORDER BY hit_count DESC
-                        LIMIT 10
-                    """)
-                )
-                db_stats["top_accessed"] = [
-                    {"key": row[0], "hits": row[1], "type": row[2]}
-                    for row in result
-                ]
+            await self.flush_hits()
+            db_stats = await run_db(self._warm_stats_sync)
 
         return {
             "multi_tier": multi_tier_stats,
             "redis": redis_stats,
             "database": db_stats,
-            "cdn": {
-                "path": str(self.cdn_path),
-                "files": len(list(self.cdn_path.glob("*"))),
-            }
+            "cdn": await asyncio.to_thread(self.blob_store.stats),
         }
 
     # ==================== Private Helper Methods ====================
@@ -427,117 +433,215 @@ class MultiTierCache:
             return self.TTL_HOT_MIN  # 5 minutes for other data
 
     async def _get_hot(self, key: str) -> Optional[Any]:
-        """Get from hot tier (Redis)"""
+        """Get from hot tier (process-local L1, then Redis)"""
         return await self.cache_service.get(key)
 
     async def _set_hot(self, key: str, value: Any, ttl: int) -> bool:
         """Set in hot tier (Redis)"""
         return await self.cache_service.set(key, value, ttl)
 
-    async def _get_warm(self, key: str) -> Optional[Any]:
-        """Get from warm tier (Database)"""
+    async def _get_warm_entry(self, key: str) -> Optional[Tuple[Any, int]]:
+        """Get from warm tier (Database): value and hit count including this hit."""
         if not self.db_service:
             return None
 
         try:
-            with self.db_service.get_db() as db:
-                result = db.execute(
-                    text("""
-                        SELECT cache_value, hit_count
-                        FROM cache_entries
-                        WHERE cache_key = :key
-                        AND expires_at > :now
-                    """),
-                    {"key": key, "now": datetime.utcnow()}
-                ).fetchone()
-
-                if result:
-                    # Update hit count and last accessed time
-                    db.execute(
-                        text("""
-                            UPDATE cache_entries
-                            SET hit_count = hit_count + 1, last_accessed = :now
-                            WHERE cache_key = :key
-                        """),
-                        {"key": key, "now": datetime.utcnow()}
-                    )
-                    db.commit()
-
-                    # Deserialize value
-                    try:
-                        return json.loads(result[0])
-                    except:
-                        return result[0]
-
-                return None
-
+            row = await run_db(self._read_warm_sync, key)
         except Exception as e:
             logger.error(f"Error getting from warm cache: {e}")
             return None
+        if row is None:
+            return None
+
+        hit_count = row[1] + self._record_hit(key)
+        # Deserialize value
+        try:
+            return json.loads(row[0]), hit_count
+        except:
+            return row[0], hit_count
+
+    def _read_warm_sync(self, key: str) -> Optional[Tuple[str, int]]:
+        with self.db_service.get_db() as db:
+            row = db.execute(
+                text("""
+                    SELECT cache_value, hit_count
+                    FROM cache_entries
+                    WHERE cache_key = :key
+                    AND expires_at > :now
+                """),
+                {"key": key, "now": datetime.utcnow()}
+            ).fetchone()
+        return (row[0], row[1] or 0) if row else None
 
     async def _set_warm(self, key: str, value: Any, data_type: str, ttl: int) -> bool:
         """Set in warm tier (Database)"""
         if not self.db_service:
             return False
 
-        try:
-            with self.db_service.get_db() as db:
-                # Serialize value
-                if isinstance(value, (dict, list)):
-                    value_str = json.dumps(value)
-                else:
-                    value_str = str(value)
-
-                expires_at = datetime.utcnow() + timedelta(seconds=ttl)
-
-                # Upsert cache entry
-                db.execute(
-                    text("""
-                        INSERT INTO cache_entries
-                        (cache_key, cache_value, cache_tier, data_type, expires_at, created_at, last_accessed, hit_count)
-                        VALUES (:key, :value, 'warm', :data_type, :expires_at, :now, :now, 0)
-                        ON CONFLICT (cache_key)
-                        DO UPDATE SET
-                            cache_value = :value,
-                            expires_at = :expires_at,
-                            last_accessed = :now
-                    """),
-                    {
-                        "key": key,
-                        "value": value_str,
-                        "data_type": data_type,
-                        "expires_at": expires_at,
-                        "now": datetime.utcnow()
-                    }
-                )
-                db.commit()
-                return True
+        # Serialize value
+        if isinstance(value, (dict, list)):
+            value_str = json.dumps(value)
+        else:
+            value_str = str(value)
 
+        try:
+            await run_db(self._write_warm_sync, key, value_str, data_type, ttl)
+            return True
         except Exception as e:
             logger.error(f"Error setting warm cache: {e}")
             return False
 
-    async def _get_cdn(self, key: str) -> Optional[str]:
-        """Get from CDN tier (Static files)"""
-        cache_file = self.cdn_path / self._hash_key(key)
+    def _write_warm_sync(self, key: str, value_str: str, data_type: str, ttl: int) -> None:
+        now = datetime.utcnow()
+        with self.db_service.get_db() as db:
+            # Upsert cache entry
+            db.execute(
+                text("""
+                    INSERT INTO cache_entries
+                    (cache_key, cache_value, cache_tier, data_type, expires_at, created_at, last_accessed, hit_count)
+                    VALUES (:key, :value, 'warm', :data_type, :expires_at, :now, :now, 0)
+                    ON CONFLICT (cache_key)
+                    DO UPDATE SET
+                        cache_value = :value,
+                        expires_at = :expires_at,
+                        last_accessed = :now
+                """),
+                {
+                    "key": key,
+                    "value": value_str,
+                    "data_type": data_type,
+                    "expires_at": now + timedelta(seconds=ttl),
+                    "now": now,
+                }
+            )
+            db.commit()
 
-        if cache_file.exists():
-            # Check if expired
-            if time.time() - cache_file.stat().st_mtime < self.TTL_CDN:
-                return cache_file.read_text()
+    def _execute_warm(self, statement: str, params: Dict[str, Any]) -> int:
+        """Run one write statement against the warm tier; returns affected rows."""
+        with self.db_service.get_db() as db:
+            result = db.execute(text(statement), params)
+            db.commit()
+            return result.rowcount
 
-        return None
+    def _warm_stats_sync(self) -> Dict[str, Any]:
+        db_stats: Dict[str, Any] = {}
+        with self.db_service.get_db() as db:
+            # Count entries by tier
+            result = db.execute(
+                text("SELECT cache_tier, COUNT(*) as count FROM cache_entries GROUP BY cache_tier")
+            )
+            db_stats["entries_by_tier"] = {row[0]: row[1] for row in result}
 
-    async def _set_cdn(self, key: str, value: Any) -> bool:
-        """Set in CDN tier (Static files)"""
+            # Count entries by type
+            result = db.execute(
+                text("SELECT data_type, COUNT(*) as count FROM cache_entries GROUP BY data_type")
+            )
+            db_stats["entries_by_type"] = {row[0]: row[1] for row in result}
+
+            # Get most accessed entries
+            result = db.execute(
+                text("""
+                    SELECT cache_key, hit_count, data_type
+                    FROM cache_entries
+                    ORDER BY hit_count DESC
+                    LIMIT 10
+                """)
+            )
+            db_stats["top_accessed"] = [
+                {"key": row[0], "hits": row[1], "type": row[2]}
+                for row in result
+            ]
+        return db_stats
+
+    # ==================== Batched hit accounting ====================
+
+    def _record_hit(self, key: str) -> int:
+        """Buffer one warm hit; returns the hits buffered for ``key`` so far."""
+        pending = self._pending_hits.setdefault(key, [0, None])
+        pending[0] += 1
+        pending[1] = datetime.utcnow()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_periodically())
+        if len(self._pending_hits) >= self.HIT_FLUSH_BATCH and (
+            self._flush_task is None or self._flush_task.done()
+        ):
+            self._flush_task = asyncio.create_task(self.flush_hits())
+        return pending[0]
+
+    async def _flush_periodically(self) -> None:
+        """Flush every ``HIT_FLUSH_INTERVAL`` seconds, whether or not hits keep arriving."""
+        while True:
+            await asyncio.sleep(self.HIT_FLUSH_INTERVAL)
+            await self.flush_hits()
+
+    async def flush_hits(self) -> int:
+        """Write buffered hit counts in one batched UPDATE; returns keys flushed."""
+        if not self._pending_hits or not self.db_service:
+            return 0
+        batch, self._pending_hits = self._pending_hits, {}
+        params = [
+            {"key": key, "hits": hits, "now": last_accessed}
+            for key, (hits, last_accessed) in batch.items()
+        ]
         try:
-            cache_file = self.cdn_path / self._hash_key(key)
+            await run_db(self._flush_hits_sync, params)
+        except Exception as e:
+            logger.error(f"Error flushing warm cache hit counts: {e}")
+            self._requeue_hits(batch)
+            return 0
+        return len(params)
+
+    def _requeue_hits(self, batch: Dict[str, List[Any]]) -> None:
+        """Merge a batch that failed to flush back into the buffer for the next attempt."""
+        for key, (hits, last_accessed) in batch.items():
+            pending = self._pending_hits.setdefault(key, [0, None])
+            pending[0] += hits
+            if pending[1] is None or last_accessed > pending[1]:
+                pending[1] = last_accessed
+
+    def _flush_hits_sync(self, params: List[Dict[str, Any]]) -> None:
+        with self.db_service.get_db() as db:
+            # executemany: one round-trip per batch instead of one per hit
+            db.execute(
+                text("""
+                    UPDATE cache_entries
+                    SET hit_count = hit_count + :hits, last_accessed = :now
+                    WHERE cache_key = :key
+                """),
+                params
+            )
+            db.commit()
+
+    async def close(self) -> None:
+        """Stop the periodic flush and flush buffered hit counts."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        if self._flush_task is not None:
+            await self._flush_task  # Let an in-flight batch land
+            self._flush_task = None
+        await self.flush_hits()
 
-            if isinstance(value, (dict, list)):
-                cache_file.write_text(json.dumps(value))
-            else:
-                cache_file.write_text(str(value))
+    async def _get_cdn(self, key: str) -> Optional[str]:
+        """Get from CDN tier (blob store)"""
+        def _read() -> Optional[str]:
+            digest = self.blob_store.resolve(self._cdn_ref(key), max_age=self.TTL_CDN)
+            data = self.blob_store.read(digest) if digest else None
+            return data.decode() if data is not None else None
+
+        return await asyncio.to_thread(_read)
 
+    async def _set_cdn(self, key: str, value: Any) -> bool:
+        """Set in CDN tier (blob store)"""
+        try:
+            payload = json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+            await asyncio.to_thread(
+                self.blob_store.put, payload.encode(), "application/json", name=self._cdn_ref(key)
+            )
             return True
 
         except Exception as e:
@@ -549,53 +653,32 @@ class MultiTierCache:
         if not self.db_service:
             return 0
 
-        with self.db_service.get_db() as db:
-            result = db.execute(
-                text("DELETE FROM cache_entries WHERE cache_key = :key"),
-                {"key": key}
-            )
-            db.commit()
-            return result.rowcount
+        self._pending_hits.pop(key, None)
+        return await run_db(
+            self._execute_warm, "DELETE FROM cache_entries WHERE cache_key = :key", {"key": key}
+        )
 
     async def _invalidate_cdn(self, key: str) -> int:
         """Invalidate from CDN tier"""
-        cache_file = self.cdn_path / self._hash_key(key)
-        if cache_file.exists():
-            cache_file.unlink()
-            return 1
-        return 0
+        return int(await asyncio.to_thread(self.blob_store.unlink_ref, self._cdn_ref(key)))
 
-    async def _maybe_promote(self, key: str, data_type: str):
+    async def _maybe_promote(self, key: str, data_type: str, value: Any, hit_count: int):
         """Promote frequently accessed warm cache entries to hot tier"""
-        if not self.db_service:
+        if hit_count < self.PROMOTION_THRESHOLD:
             return
 
         try:
-            with self.db_service.get_db() as db:
-                result = db.execute(
-                    text("SELECT cache_value, hit_count FROM cache_entries WHERE cache_key = :key"),
-                    {"key": key}
-                ).fetchone()
-
-                if result and result[1] >= self.PROMOTION_THRESHOLD:
-                    # Promote to hot tier
-                    value = result[0]
-                    try:
-                        value = json.loads(value)
-                    except:
-                        pass
-
-                    ttl = self._calculate_hot_ttl(data_type)
-                    await self._set_hot(key, value, ttl)
-                    self.metrics.promotions += 1
-                    logger.debug(f"⬆️ Promoted to hot cache: {key} (hits: {result[1]})")
-
+            ttl = self._calculate_hot_ttl(data_type)
+            await self._set_hot(key, value, ttl)
+            self.metrics.promotions += 1
+            logger.debug(f"⬆️ Promoted to hot cache: {key} (hits: {hit_count})")
         except Exception as e:
             logger.error(f"Error during cache promotion: {e}")
 
-    def _hash_key(self, key: str) -> str:
-        """Generate a safe filename from cache key"""
-        return hashlib.sha256(key.encode()).hexdigest()
+    @staticmethod
+    def _cdn_ref(key: str) -> str:
+        """Blob store ref name for a CDN-tier cache key"""
+        return f"cdn:{key}"
 
 
 # Global multi-tier cache instance
@@ -625,3 +708,12 @@ def get_multi_tier_cache() -> MultiTierCache:
         logger.info("✅ Multi-tier cache initialized")
 
     return _multi_tier_cache
+
+
+async def close_multi_tier_cache() -> None:
+    """Flush buffered warm-tier hit counts on shutdown."""
+    global _multi_tier_cache
+
+    if _multi_tier_cache is not None:
+        await _multi_tier_cache.close()
+        _multi_tier_cache = None
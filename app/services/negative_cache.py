@@ -0,0 +1,167 @@
+"""
+Negative cache for symbols providers have no data for.
+
+When a provider answers a time-series request but has nothing usable for a
+symbol (unknown ticker, delisted, too little history), the miss is recorded
+per ``(symbol, interval, provider)``. The fallback chain skips that provider
+until the entry expires. Each repeat miss doubles the skip window, from
+``base_ttl`` up to ``max_ttl``. When every provider tried comes back empty,
+the symbol is recorded under the pseudo-provider ``all`` and requests for
+it return immediately. It is also listed in a sorted set that the universe
+admin endpoints read, so dead symbols can be pruned.
+
+Transient failures (timeouts, 429s, 5xx) are never recorded. A success
+clears the winning provider's entry and the symbol's ``all`` marker.
+
+    negcache:{SYMBOL}:{interval}:{provider}   JSON {"strikes", "until"}
+    negcache:dead                              zset "{SYMBOL}|{interval}" -> last failure
+"""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from app.services.cache import CacheService
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "negcache:"
+DEAD_KEY = "negcache:dead"
+ALL_PROVIDERS = "all"
+
+
+class NegativeCache:
+    """Exponentially backed-off 'no data' markers shared by all workers."""
+
+    def __init__(
+        self,
+        cache: CacheService,
+        base_ttl: float = 300.0,
+        max_ttl: float = 86400.0,
+        clock=time.time,
+    ):
+        self.cache = cache
+        self.base_ttl = float(base_ttl)
+        self.max_ttl = float(max_ttl)
+        self.clock = clock
+
+    @staticmethod
+    def key(symbol: str, interval: str, provider: str) -> str:
+        return f"{KEY_PREFIX}{symbol.upper()}:{interval}:{provider}"
+
+    @staticmethod
+    def member(symbol: str, interval: str) -> str:
+        return f"{symbol.upper()}|{interval}"
+
+    def ttl_for(self, strikes: int) -> float:
+        """Skip window after ``strikes`` consecutive misses."""
+        return min(self.base_ttl * 2 ** max(strikes - 1, 0), self.max_ttl)
+
+    @property
+    def memory(self) -> int:
+        """How long strikes are remembered after their window ends."""
+        return int(self.max_ttl * 2)
+
+    async def lookup(self, symbol: str, interval: str, providers: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Entries recorded for ``providers`` (and ``all``), in one round-trip."""
+        names = [ALL_PROVIDERS, *providers]
+        try:
+            redis = await self.cache._get_redis()
+            raw = await redis.mget([self.key(symbol, interval, name) for name in names])
+        except Exception as exc:
+            logger.warning("Negative cache lookup failed for %s: %s", symbol, exc)
+            return {}
+        entries = {}
+        for name, value in zip(names, raw or []):
+            if value:
+                try:
+                    entries[name] = json.loads(value)
+                except (TypeError, ValueError):
+                    continue
+        return entries
+
+    def blocked(self, entries: Dict[str, Dict[str, Any]]) -> Set[str]:
+        """Providers whose skip window is still open."""
+        now = self.clock()
+        return {name for name, entry in entries.items() if entry.get("until", 0) > now}
+
+    async def record(
+        self,
+        symbol: str,
+        interval: str,
+        providers: Iterable[str],
+        entries: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """Add a strike for each provider that had nothing for ``symbol``."""
+        providers = list(providers)
+        if not providers:
+            return
+        entries = entries or {}
+        now = self.clock()
+        try:
+            redis = await self.cache._get_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                for name in providers:
+                    strikes = entries.get(name, {}).get("strikes", 0) + 1
+                    entry = {"strikes": strikes, "until": now + self.ttl_for(strikes)}
+                    pipe.set(self.key(symbol, interval, name), json.dumps(entry), ex=self.memory)
+                if ALL_PROVIDERS in providers:
+                    pipe.zadd(DEAD_KEY, {self.member(symbol, interval): now})
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("Negative cache record failed for %s: %s", symbol, exc)
+
+    async def clear(self, symbol: str, interval: str, providers: Iterable[str]) -> None:
+        """Forget recorded misses, e.g. after a provider returned data."""
+        providers = list(providers)
+        if not providers:
+            return
+        try:
+            redis = await self.cache._get_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.delete(*(self.key(symbol, interval, name) for name in providers))
+                if ALL_PROVIDERS in providers:
+                    pipe.zrem(DEAD_KEY, self.member(symbol, interval))
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("Negative cache clear failed for %s: %s", symbol, exc)
+
+    async def dead_symbols(self, limit: int = 500) -> List[Dict[str, Any]]:
+        """Symbols every provider came back empty for, most recent first."""
+        try:
+            redis = await self.cache._get_redis()
+            rows = await redis.zrevrange(DEAD_KEY, 0, limit - 1, withscores=True)
+            if not rows:
+                return []
+            parsed = [(member.partition("|"), score) for member, score in rows]
+            raw = await redis.mget(
+                [self.key(symbol, interval, ALL_PROVIDERS) for (symbol, _, interval), _ in parsed]
+            )
+        except Exception as exc:
+            logger.warning("Dead symbol listing failed: %s", exc)
+            return []
+
+        dead, stale = [], []
+        for ((symbol, _, interval), last_failed), value in zip(parsed, raw):
+            if not value:
+                stale.append(self.member(symbol, interval))  # Strikes expired; no longer dead
+                continue
+            entry = json.loads(value)
+            dead.append({
+                "symbol": symbol,
+                "interval": interval,
+                "strikes": entry["strikes"],
+                "retry_at": entry["until"],
+                "last_failed": last_failed,
+            })
+        if stale:
+            try:
+                await redis.zrem(DEAD_KEY, *stale)
+            except Exception:
+                pass
+        return dead
+
+
+__all__ = ["ALL_PROVIDERS", "NegativeCache"]
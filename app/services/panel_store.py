@@ -0,0 +1,207 @@
+"""
+Shared, memory-mapped universe price panel.
+
+One process (the scheduler job) publishes the aligned OHLCV panel to disk once
+per refresh; every other process - API workers, scan jobs, process-pool
+detector workers - attaches to it read-only through ``numpy.memmap``. The OS
+page cache backs all attachments with the same physical pages, so running
+several workers on one box does not duplicate the price history.
+
+Layout under ``universe_panel_path``::
+
+    panel-<version>.npy   float array shaped (5, symbols, bars): o/h/l/c/v
+    panel-<version>.json  symbols, lengths, dates, dtype, published_at
+    CURRENT               name of the live version (swapped atomically)
+
+A memory-backed filesystem such as ``/dev/shm`` can be used as the path to
+keep the panel off disk entirely.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.config import get_settings
+from app.core.universe_panel import PANEL_FIELDS, UniversePanel, build_panel
+
+logger = logging.getLogger(__name__)
+
+CURRENT_POINTER = "CURRENT"
+
+
+class PanelStore:
+    """Publish and attach memory-mapped ``UniversePanel`` snapshots."""
+
+    def __init__(self, root: str | Path, keep_versions: int = 2):
+        self.root = Path(root)
+        self.keep_versions = max(1, keep_versions)
+        self._lock = threading.Lock()
+        self._attached: Optional[UniversePanel] = None
+        self._attached_version: Optional[str] = None
+        self._attached_manifest: Optional[Dict[str, Any]] = None
+
+    # ------------------------------------------------------------------ publish
+
+    def publish(self, panel: UniversePanel, *, dtype: str = "float64") -> str:
+        """Write ``panel`` as a new version and make it current. Returns the version."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        version = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        data_path = self.root / f"panel-{version}.npy"
+        tmp_data = self.root / f".panel-{version}.npy.tmp"
+
+        shape = (len(PANEL_FIELDS), panel.n_symbols, panel.n_bars)
+        out = np.lib.format.open_memmap(tmp_data, mode="w+", dtype=np.dtype(dtype), shape=shape)
+        for idx, name in enumerate(PANEL_FIELDS):
+            out[idx] = getattr(panel, name)
+        out.flush()
+        del out
+        os.replace(tmp_data, data_path)
+
+        manifest = {
+            "version": version,
+            "symbols": panel.symbols,
+            "lengths": [int(n) for n in panel.lengths],
+            "dates": [str(d) if d is not None else None for d in panel.dates]
+            if panel.dates is not None
+            else None,
+            "dtype": np.dtype(dtype).name,
+            "shape": list(shape),
+            "published_at": time.time(),
+        }
+        self._write_atomic(self.root / f"panel-{version}.json", json.dumps(manifest))
+        self._write_atomic(self.root / CURRENT_POINTER, version)
+        self._prune(keep=version)
+        logger.info(
+            "Published universe panel %s (%s symbols x %s bars, %.1f MB)",
+            version,
+            panel.n_symbols,
+            panel.n_bars,
+            data_path.stat().st_size / 1e6,
+        )
+        return version
+
+    # ------------------------------------------------------------------- attach
+
+    def current_version(self) -> Optional[str]:
+        try:
+            return (self.root / CURRENT_POINTER).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        version = self.current_version()
+        if version is None:
+            return None
+        if version == self._attached_version:
+            return self._attached_manifest
+        try:
+            return json.loads((self.root / f"panel-{version}.json").read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def attach(self, max_age: Optional[float] = None) -> Optional[UniversePanel]:
+        """
+        Return a read-only panel backed by the current published version.
+
+        Re-attaches only when a newer version has been published. Returns None
+        when nothing is published or the snapshot is older than ``max_age``.
+        """
+        version = self.current_version()
+        if version is None:
+            return None
+
+        with self._lock:
+            if version != self._attached_version:
+                manifest = self.manifest()
+                if manifest is None:
+                    return None
+                try:
+                    data = np.load(self.root / f"panel-{version}.npy", mmap_mode="r")
+                except FileNotFoundError:
+                    return None
+                dates = manifest.get("dates")
+                self._attached = UniversePanel(
+                    symbols=list(manifest["symbols"]),
+                    lengths=np.asarray(manifest["lengths"], dtype=np.int64),
+                    dates=np.asarray(dates, dtype=object) if dates is not None else None,
+                    **{name: data[idx] for idx, name in enumerate(PANEL_FIELDS)},
+                )
+                self._attached_version = version
+                self._attached_manifest = manifest
+
+            if max_age is not None and self._attached_manifest:
+                age = time.time() - float(self._attached_manifest.get("published_at", 0))
+                if age > max_age:
+                    return None
+            return self._attached
+
+    # ---------------------------------------------------------------- internals
+
+    @staticmethod
+    def _write_atomic(path: Path, content: str) -> None:
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:6]}.tmp")
+        tmp.write_text(content)
+        os.replace(tmp, path)
+
+    def _prune(self, keep: str) -> None:
+        """Drop old versions; processes that still map them keep their pages."""
+        versions = sorted(
+            (p.stem[len("panel-"):] for p in self.root.glob("panel-*.json")),
+            reverse=True,
+        )
+        stale = [v for v in versions if v != keep][self.keep_versions - 1:]
+        for version in stale:
+            for suffix in (".npy", ".json"):
+                try:
+                    (self.root / f"panel-{version}{suffix}").unlink()
+                except FileNotFoundError:
+                    continue
+
+
+async def refresh_universe_panel(
+    symbols: Optional[List[str]] = None,
+    *,
+    bars: int = 320,
+) -> Dict[str, Any]:
+    """Fetch the universe once and publish it as the shared panel."""
+    from app.services import universe_data
+    from app.services.universe_prefilter import load_price_payloads
+    from app.services.universe_store import universe_store
+
+    started = time.perf_counter()
+    if symbols is None:
+        universe_meta = await universe_store.get_all()
+        symbols = list(universe_meta.keys()) or universe_data.get_full_universe()
+
+    payloads = await load_price_payloads(symbols, bars=bars)
+    panel = build_panel(payloads, bars)
+    settings = get_settings()
+    version = get_panel_store().publish(panel, dtype=settings.universe_panel_dtype)
+    return {
+        "version": version,
+        "symbols": panel.n_symbols,
+        "missing": len(symbols) - panel.n_symbols,
+        "bars": panel.n_bars,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+_panel_store: Optional[PanelStore] = None
+
+
+def get_panel_store() -> PanelStore:
+    global _panel_store
+    if _panel_store is None:
+        _panel_store = PanelStore(get_settings().universe_panel_path)
+    return _panel_store
+
+
+__all__ = ["PanelStore", "get_panel_store", "refresh_universe_panel"]
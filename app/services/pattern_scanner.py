@@ -3,20 +3,24 @@ Multi-Pattern Scanner Service
 
 Scans stocks using all available pattern detectors and returns the best setups.
 """
-import asyncio
 import logging
 import time
 from typing import List, Dict, Any, Optional
 import pandas as pd
 from datetime import datetime, timezone
 
+from app.config import get_settings
 from app.core.detector_registry import get_all_detectors
 from app.core.detector_base import PatternResult
+from app.core.pattern_engine.context import ScanContext
 from app.core.pattern_engine.detector import get_pattern_detector
 from app.core.pattern_engine.filter import PatternFilter
 from app.core.pattern_engine.scoring import PatternScorer
-from app.core.pattern_engine.scanner import ScanConfig, UniverseScanner
+from app.core.pattern_engine.scanner import ScanConfig, TopK, UniverseScanner
+from app.services.adaptive_concurrency import bounded_map, concurrency_gate, pool_size
+from app.services.cache import get_cache_service
 from app.services.market_data import market_data_service
+from app.services.scan_shards import run_sharded_scan
 from app.services.universe_store import universe_store
 from app.services import universe_data
 from app.utils.build_info import resolve_build_sha
@@ -59,7 +63,7 @@ class PatternScannerService:
         *,
         max_symbols: int = 600,
         bars: int = 320,
-        max_concurrency: int = 8,
+        max_concurrency: Optional[int] = None,
         min_confidence: float = 0.4,  # Temporarily lowered to debug
     ):
         """
@@ -68,7 +72,7 @@ class PatternScannerService:
         Args:
             max_symbols: Maximum number of symbols to scan
             bars: Number of bars to fetch for analysis
-            max_concurrency: Maximum concurrent scans
+            max_concurrency: Fixed concurrency cap (None = shared adaptive limiter)
             min_confidence: Minimum confidence threshold (0-1)
         """
         self.max_symbols = max_symbols
@@ -219,72 +223,49 @@ class PatternScannerService:
 
         logger.info(f"Starting scan of {len(symbols)} symbols with min_score={min_score}")
 
-        # Scan symbols concurrently
-        sem = asyncio.Semaphore(self.max_concurrency)
+        # Scan symbols through a bounded worker pool, keeping only the top results
+        sem = concurrency_gate(self.max_concurrency)
 
         async def scan_with_semaphore(symbol: str):
             async with sem:
-                return await self.scan_symbol(symbol, "1day", pattern_filter)
-
-        tasks = [scan_with_semaphore(symbol) for symbol in symbols]
-        raw_results = await asyncio.gather(*tasks, return_exceptions=True)
+                try:
+                    return await self.scan_symbol(symbol, "1day", pattern_filter)
+                except Exception as exc:
+                    return exc
 
-        # Flatten results (each symbol now returns at most 1 pattern due to deduplication in scan_symbol)
-        all_patterns = []
+        top = TopK(limit)
+        found_count = 0
         success_count = 0
         error_count = 0
-        for result in raw_results:
-            if isinstance(result, list):
-                all_patterns.extend(result)
-                if result:  # Only count if patterns were found
-                    success_count += 1
-            elif isinstance(result, Exception):
+        async for result in bounded_map(scan_with_semaphore, symbols, pool_size(self.max_concurrency)):
+            if isinstance(result, Exception):
                 logger.error(f"Scan task failed: {result}")
                 error_count += 1
+                continue
+            if not result:
+                continue
+            # One entry per ticker: its highest-scoring pattern
+            success_count += 1
+            found_count += len(result)
+            best = max(result, key=lambda p: p.get("score", 0))
+            if best.get("score", 0) >= min_score:
+                top.push(best)
 
-        logger.info(f"Scan results: {success_count} symbols with patterns, {error_count} errors, {len(all_patterns)} total patterns")
-
-        # Sort by score
-        all_patterns.sort(key=lambda x: x.get("score", 0), reverse=True)
-
-        # =====================================================
-        # FIX: Additional safety deduplication by ticker
-        # (In case scan_symbol deduplication was bypassed somehow)
-        # =====================================================
-        seen_tickers = set()
-        deduplicated_patterns = []
-        for p in all_patterns:
-            symbol = p.get("symbol")
-            if symbol not in seen_tickers:
-                seen_tickers.add(symbol)
-                deduplicated_patterns.append(p)
-        
-        if len(all_patterns) != len(deduplicated_patterns):
-            logger.info(f"Removed {len(all_patterns) - len(deduplicated_patterns)} duplicate ticker entries")
-        
-        all_patterns = deduplicated_patterns
-
-        # Filter by minimum score
-        filtered_patterns = [
-            p for p in all_patterns
-            if p.get("score", 0) >= min_score
-        ]
-
-        logger.info(f"After filtering by min_score {min_score}: {len(filtered_patterns)} patterns remain")
-
-        # Limit results
-        limited_results = filtered_patterns[:limit]
+        logger.info(f"Scan results: {success_count} symbols with patterns, {error_count} errors, {found_count} total patterns")
+        logger.info(f"After filtering by min_score {min_score}: {top.seen} patterns remain")
+
+        limited_results = top.results()
 
         duration = time.perf_counter() - started
         logger.info(
             f"✅ Multi-pattern scan complete: {len(symbols)} symbols scanned, "
-            f"{len(all_patterns)} patterns found, "
-            f"{len(filtered_patterns)} above {min_score}/10, "
+            f"{success_count} patterns found, "
+            f"{top.seen} above {min_score}/10, "
             f"{len(limited_results)} returned, "
             f"{duration:.2f}s"
         )
 
-        return self._response(started, len(symbols), limited_results, len(all_patterns))
+        return self._response(started, len(symbols), limited_results, success_count)
 
     async def scan_with_pattern_engine(
         self,
@@ -293,13 +274,35 @@ class PatternScannerService:
         apply_filters: bool = True,
         min_score: float = 6.0,
         filter_config: Optional[Dict[str, Any]] = None,
+        sharded: Optional[bool] = None,
+        context: Optional[ScanContext] = None,
     ) -> Dict[str, Any]:
         """
         Scan a provided list of tickers using the pattern engine + scoring pipeline.
+
+        Lists larger than one shard are fanned out across shard workers when
+        ``sharded`` (default: the ``scan_sharding_enabled`` setting) is on.
+        Callers scanning one universe in several calls pass a ``context``
+        built once, so the benchmark and regime are not re-fetched per call.
         """
         if not tickers:
             return self._response(time.perf_counter(), 0, [])
 
+        settings = get_settings()
+        use_shards = settings.scan_sharding_enabled if sharded is None else sharded
+        if use_shards and len(tickers) > settings.scan_shard_size:
+            return await self._scan_sharded(
+                [t.upper() for t in tickers],
+                {
+                    "interval": interval,
+                    "apply_filters": apply_filters,
+                    "apply_scoring": True,
+                    "min_score": min_score,
+                    "filter_config": filter_config,
+                },
+                context,
+            )
+
         config = ScanConfig(
             universe=[t.upper() for t in tickers],
             interval=interval,
@@ -308,9 +311,36 @@ class PatternScannerService:
             apply_scoring=True,
             min_score=min_score,
             filter_config=filter_config,
+            context=context,
         )
         return await self.engine_scanner.scan_universe(config)
 
+    async def _scan_sharded(
+        self, tickers: List[str], params: Dict[str, Any], context: Optional[ScanContext] = None
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        settings = get_settings()
+        reduced = await run_sharded_scan(
+            get_cache_service(),
+            tickers,
+            shard_size=settings.scan_shard_size,
+            params=params,
+            local_workers=settings.scan_shard_local_workers,
+            lease_seconds=settings.scan_shard_lease_seconds,
+            local_params={"context": context} if context else None,
+        )
+        return {
+            "as_of": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "universe_size": len(tickers),
+            "results": reduced["results"],
+            "errors": reduced["errors"],
+            "meta": {
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "result_count": len(reduced["results"]),
+                "sharding": reduced["meta"],
+            },
+        }
+
     def _pattern_to_dict(
         self,
         pattern: PatternResult,
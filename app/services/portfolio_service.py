@@ -3,11 +3,18 @@ from typing import List, Optional, Dict, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session
 from app.models import Portfolio, Position, Ticker
+from app.services.database import run_db
 from app.services.market_data import get_current_price
 
 logger = logging.getLogger(__name__)
 
 class PortfolioService:
+    """Portfolio operations on a request-scoped session.
+
+    Queries, commits and refreshes run on the DB thread pool (``run_db``);
+    the session is only ever used by one call at a time.
+    """
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -21,17 +28,17 @@ class PortfolioService:
             total_value=initial_capital
         )
         self.db.add(portfolio)
-        self.db.commit()
-        self.db.refresh(portfolio)
+        await run_db(self.db.commit)
+        await run_db(self.db.refresh, portfolio)
         return portfolio
 
     async def get_portfolio(self, portfolio_id: int) -> Optional[Portfolio]:
         """Get portfolio by ID"""
-        return self.db.query(Portfolio).filter(Portfolio.id == portfolio_id).first()
+        return await run_db(self.db.query(Portfolio).filter(Portfolio.id == portfolio_id).first)
 
     async def get_user_portfolios(self, user_id: int) -> List[Portfolio]:
         """Get all portfolios for a user"""
-        return self.db.query(Portfolio).filter(Portfolio.user_id == user_id).all()
+        return await run_db(self.db.query(Portfolio).filter(Portfolio.user_id == user_id).all)
 
     async def add_position(
         self,
@@ -45,22 +52,22 @@ class PortfolioService:
     ) -> Position:
         """Add a new position to portfolio"""
         # Get or create ticker
-        ticker = self.db.query(Ticker).filter(Ticker.symbol == symbol).first()
+        ticker = await run_db(self.db.query(Ticker).filter(Ticker.symbol == symbol).first)
         if not ticker:
             ticker = Ticker(symbol=symbol)
             self.db.add(ticker)
-            self.db.commit()
-            self.db.refresh(ticker)
+            await run_db(self.db.commit)
+            await run_db(self.db.refresh, ticker)
 
         # Calculate cost
         total_cost = quantity * entry_price
 
         # Check existing position
-        existing_position = self.db.query(Position).filter(
+        existing_position = await run_db(self.db.query(Position).filter(
             Position.portfolio_id == portfolio_id,
             Position.ticker_id == ticker.id,
             Position.status == "open"
-        ).first()
+        ).first)
 
         if existing_position:
             # Average down/up
@@ -99,8 +106,8 @@ class PortfolioService:
             portfolio.cash_balance -= total_cost
             portfolio.updated_at = datetime.utcnow()
 
-        self.db.commit()
-        self.db.refresh(position)
+        await run_db(self.db.commit)
+        await run_db(self.db.refresh, position)
 
         # Update position with current market data
         await self.update_position_pnl(position)
@@ -115,13 +122,13 @@ class PortfolioService:
         exit_price: Optional[float] = None
     ) -> Tuple[Position, float]:
         """Remove or reduce a position (full or partial exit)"""
-        position = self.db.query(Position).filter(Position.id == position_id).first()
+        position = await run_db(self.db.query(Position).filter(Position.id == position_id).first)
         if not position:
             raise ValueError(f"Position {position_id} not found")
 
         # Use current market price if exit price not provided
         if not exit_price:
-            ticker = self.db.query(Ticker).filter(Ticker.id == position.ticker_id).first()
+            ticker = await run_db(self.db.query(Ticker).filter(Ticker.id == position.ticker_id).first)
             exit_price = await get_current_price(ticker.symbol)
 
         # Full or partial exit
@@ -154,14 +161,14 @@ class PortfolioService:
             position.status = "partial"
 
         position.updated_at = datetime.utcnow()
-        self.db.commit()
+        await run_db(self.db.commit)
 
         logger.info(f"Removed {exit_quantity} shares from position {position_id}, P&L: ${realized_pnl:.2f}")
         return position, realized_pnl
 
     async def update_position_pnl(self, position: Position) -> Position:
         """Update position with current market price and P&L"""
-        ticker = self.db.query(Ticker).filter(Ticker.id == position.ticker_id).first()
+        ticker = await run_db(self.db.query(Ticker).filter(Ticker.id == position.ticker_id).first)
         if not ticker:
             return position
 
@@ -173,7 +180,7 @@ class PortfolioService:
             position.unrealized_pnl_pct = (position.unrealized_pnl / position.total_cost) * 100 if position.total_cost > 0 else 0
             position.updated_at = datetime.utcnow()
 
-            self.db.commit()
+            await run_db(self.db.commit)
         except Exception as e:
             logger.warning(f"Failed to update price for {ticker.symbol}: {e}")
 
@@ -184,7 +191,7 @@ class PortfolioService:
         query = self.db.query(Position).filter(Position.portfolio_id == portfolio_id)
         if status:
             query = query.filter(Position.status == status)
-        return query.all()
+        return await run_db(query.all)
 
     async def update_all_positions(self, portfolio_id: int) -> List[Position]:
         """Update all positions with current market prices"""
@@ -215,13 +222,13 @@ class PortfolioService:
         # Update portfolio total value
         portfolio.total_value = total_portfolio_value
         portfolio.updated_at = datetime.utcnow()
-        self.db.commit()
+        await run_db(self.db.commit)
 
         # Calculate allocation percentages
         position_allocations = []
         for position in positions:
             if position.status == "open" and position.current_value:
-                ticker = self.db.query(Ticker).filter(Ticker.id == position.ticker_id).first()
+                ticker = await run_db(self.db.query(Ticker).filter(Ticker.id == position.ticker_id).first)
                 allocation_pct = (position.current_value / total_portfolio_value) * 100 if total_portfolio_value > 0 else 0
                 position.position_size_pct = allocation_pct
 
@@ -233,7 +240,7 @@ class PortfolioService:
                     "pnl_pct": position.unrealized_pnl_pct
                 })
 
-        self.db.commit()
+        await run_db(self.db.commit)
 
         total_pnl = total_portfolio_value - portfolio.initial_capital
         total_return_pct = (total_pnl / portfolio.initial_capital) * 100 if portfolio.initial_capital > 0 else 0
@@ -71,6 +71,90 @@ class RSRating:
             return "⚪"  # Below average
 
 
+@dataclass
+class UniverseRanking:
+    """
+    RS scores for a whole universe, ranked once.
+
+    Built by ``RelativeStrengthCalculator.rank_universe``; ``sorted_scores``
+    lets any score be ranked with a binary search instead of a rescan.
+    """
+    symbols: List[str]
+    quarterly: np.ndarray  # (N, 4) Q1..Q4 performance %
+    one_year: np.ndarray  # (N,) one-year performance %
+    scores: np.ndarray  # (N,) weighted RS score
+    sorted_scores: np.ndarray  # ascending copy of ``scores``
+    timestamp: datetime
+
+    def __post_init__(self):
+        self._index = {symbol: idx for idx, symbol in enumerate(self.symbols)}
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def percentiles(self) -> np.ndarray:
+        """Percentile (0-99) of every symbol: share of the universe scoring below it."""
+        if not len(self.symbols):
+            return np.empty(0)
+        below = np.searchsorted(self.sorted_scores, self.scores, side="left")
+        return np.clip(below / len(self.symbols) * 100, 0.0, 99.0)
+
+    def ranks(self) -> np.ndarray:
+        """Rank of every symbol (1 = strongest)."""
+        return len(self.symbols) - np.searchsorted(self.sorted_scores, self.scores, side="right") + 1
+
+    def ratings(self) -> Dict[str, int]:
+        """RS rating (1-99) of every symbol in the universe."""
+        rounded = np.clip(np.rint(self.percentiles()), 1, 99).astype(int)
+        return dict(zip(self.symbols, rounded.tolist()))
+
+    def rank_score(self, score: float, exclude: Optional[str] = None) -> Tuple[float, int, int]:
+        """
+        (percentile, rank, universe size) of ``score`` among the universe.
+
+        ``exclude`` drops that symbol's own entry, so a symbol can be ranked
+        with fresh prices against everyone else.
+        """
+        below = int(np.searchsorted(self.sorted_scores, score, side="left"))
+        above = len(self.sorted_scores) - int(np.searchsorted(self.sorted_scores, score, side="right"))
+        others = len(self.symbols)
+        idx = self._index.get(exclude) if exclude is not None else None
+        if idx is not None:
+            own = self.scores[idx]
+            below -= int(own < score)
+            above -= int(own > score)
+            others -= 1
+        if others == 0:
+            return (50.0, 1, 1)  # Default to median if no universe
+        total = others + 1
+        percentile = max(0.0, min(99.0, below / total * 100))
+        return (percentile, above + 1, total)
+
+    def rating(self, symbol: str) -> Optional[RSRating]:
+        """Precomputed RS rating of a symbol in the universe, or None."""
+        idx = self._index.get(symbol)
+        if idx is None:
+            return None
+        q1, q2, q3, q4 = (float(v) for v in self.quarterly[idx])
+        percentile, rank, size = self.rank_score(float(self.scores[idx]), exclude=symbol)
+        return RSRating(
+            rs_rating=int(min(99, max(1, round(percentile)))),
+            raw_score=float(self.scores[idx]),
+            q1_performance=q1,
+            q2_performance=q2,
+            q3_performance=q3,
+            q4_performance=q4,
+            one_year_performance=float(self.one_year[idx]),
+            percentile=percentile,
+            universe_rank=rank,
+            universe_size=size,
+            timestamp=self.timestamp,
+        )
+
+
 class RelativeStrengthCalculator:
     """
     Calculate Minervini-style RS ratings.
@@ -103,7 +187,8 @@ class RelativeStrengthCalculator:
         symbol: str,
         prices: np.ndarray,
         universe_prices: Dict[str, np.ndarray],
-        dates: Optional[np.ndarray] = None
+        dates: Optional[np.ndarray] = None,
+        ranking: Optional[UniverseRanking] = None
     ) -> Optional[RSRating]:
         """
         Calculate RS rating for a symbol against universe.
@@ -113,6 +198,9 @@ class RelativeStrengthCalculator:
             prices: Price array (typically close prices)
             universe_prices: Dict of {symbol: prices} for all universe stocks
             dates: Optional date array for validation
+            ranking: ``rank_universe(universe_prices)`` computed by the caller;
+                pass it when rating many symbols against the same universe
+                (``universe_prices`` is then ignored). Ranked afresh when omitted.
             
         Returns:
             RSRating object or None if insufficient data
@@ -140,18 +228,13 @@ class RelativeStrengthCalculator:
         # Calculate 1-year performance
         one_year_perf = ((prices[-1] - prices[-self.DAYS_PER_YEAR]) / prices[-self.DAYS_PER_YEAR]) * 100
         
-        # Calculate RS scores for entire universe
-        universe_scores = self._calculate_universe_scores(universe_prices)
+        # Rank against the universe
+        if ranking is None:
+            ranking = self.rank_universe(universe_prices)
+        percentile, rank, universe_size = ranking.rank_score(raw_score, exclude=symbol)
         
-        # Remove the target symbol from universe if present
-        if symbol in universe_scores:
-            del universe_scores[symbol]
-        
-        # Rank this stock against universe
-        percentile, rank = self._calculate_percentile_rank(raw_score, universe_scores)
-        
-        # Convert percentile to 0-99 scale (RS rating)
-        rs_rating = int(round(percentile))
+        # Convert percentile to 1-99 scale (RS rating)
+        rs_rating = int(min(99, max(1, round(percentile))))
         
         return RSRating(
             rs_rating=rs_rating,
@@ -163,10 +246,58 @@ class RelativeStrengthCalculator:
             one_year_performance=one_year_perf,
             percentile=percentile,
             universe_rank=rank,
-            universe_size=len(universe_scores) + 1,  # +1 for target stock
+            universe_size=universe_size,
             timestamp=datetime.utcnow()
         )
     
+    def rank_universe(self, universe_prices: Dict[str, np.ndarray]) -> UniverseRanking:
+        """
+        Score and rank every symbol of the universe in one vectorized pass.
+        
+        The last year of closes of every symbol with enough history is stacked
+        into an (N, 252) matrix; quarterly returns, scores and the ranking all
+        come from whole-matrix operations, so rating the full universe costs
+        one sort rather than one universe rescan per symbol.
+        
+        Args:
+            universe_prices: Dict of {symbol: prices}
+            
+        Returns:
+            UniverseRanking for all symbols with a full year of valid data
+        """
+        symbols = [
+            symbol for symbol, prices in universe_prices.items()
+            if len(prices) >= self.DAYS_PER_YEAR
+        ]
+        if symbols:
+            matrix = np.vstack([
+                np.asarray(universe_prices[symbol][-self.DAYS_PER_YEAR:], dtype=np.float64)
+                for symbol in symbols
+            ])
+        else:
+            matrix = np.empty((0, self.DAYS_PER_YEAR))
+        
+        # Quarter boundary columns: Q1 start, Q2 start, Q3 start, Q4 start, last bar
+        q = self.DAYS_PER_QUARTER
+        bounds = matrix[:, [0, q, 2 * q, 3 * q, self.DAYS_PER_YEAR - 1]]
+        starts, ends = bounds[:, :-1], bounds[:, 1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            quarterly = (ends - starts) / starts * 100
+            one_year = (bounds[:, -1] - bounds[:, 0]) / bounds[:, 0] * 100
+        scores = quarterly @ np.array([0.2, 0.2, 0.2, 0.4])
+        
+        valid = np.isfinite(scores) & np.isfinite(one_year)
+        kept = [symbol for symbol, ok in zip(symbols, valid) if ok]
+        scores = scores[valid]
+        return UniverseRanking(
+            symbols=kept,
+            quarterly=quarterly[valid],
+            one_year=one_year[valid],
+            scores=scores,
+            sorted_scores=np.sort(scores),
+            timestamp=datetime.utcnow(),
+        )
+    
     def _calculate_quarterly_performance(self, prices: np.ndarray) -> Optional[Tuple[float, float, float, float]]:
         """
         Calculate performance for each quarter (Q1=oldest, Q4=newest).
@@ -216,25 +347,8 @@ class RelativeStrengthCalculator:
         Returns:
             Dict of {symbol: rs_score}
         """
-        scores = {}
-        
-        for symbol, prices in universe_prices.items():
-            # Skip if insufficient data
-            if len(prices) < self.DAYS_PER_YEAR:
-                continue
-            
-            # Calculate quarterly performance
-            quarterly = self._calculate_quarterly_performance(prices)
-            if quarterly is None:
-                continue
-            
-            q1, q2, q3, q4 = quarterly
-            
-            # Calculate weighted score
-            score = 0.4 * q4 + 0.2 * q3 + 0.2 * q2 + 0.2 * q1
-            scores[symbol] = score
-        
-        return scores
+        ranking = self.rank_universe(universe_prices)
+        return dict(zip(ranking.symbols, ranking.scores.tolist()))
     
     def _calculate_percentile_rank(
         self,
@@ -327,26 +441,38 @@ def get_rs_emoji(rs_rating: int) -> str:
         return "⚪"  # Below average
 
 
-def filter_by_rs_threshold(patterns: List[Dict], min_rs: int = 70) -> List[Dict]:
+def filter_by_rs_threshold(
+    patterns: List[Dict],
+    min_rs: int = 70,
+    ratings: Optional[Dict[str, int]] = None,
+) -> List[Dict]:
     """
     Filter patterns by RS rating threshold.
     
     Args:
         patterns: List of pattern dictionaries
         min_rs: Minimum RS rating (default 70)
+        ratings: Optional stored ratings ({symbol: rs_rating}, e.g. the nightly
+            RS history snapshot) used for patterns without an ``rs_rating``
         
     Returns:
         Filtered list of patterns
     """
-    return [
-        p for p in patterns
-        if p.get('rs_rating') is not None and p['rs_rating'] >= min_rs
-    ]
+    ratings = ratings or {}
+    
+    def _rating(pattern: Dict) -> Optional[int]:
+        if pattern.get('rs_rating') is not None:
+            return pattern['rs_rating']
+        symbol = (pattern.get('ticker') or pattern.get('symbol') or '').upper()
+        return ratings.get(symbol)
+    
+    return [p for p in patterns if (rating := _rating(p)) is not None and rating >= min_rs]
 
 
 __all__ = [
     'RelativeStrengthCalculator',
     'RSRating',
+    'UniverseRanking',
     'get_rs_emoji',
     'filter_by_rs_threshold',
 ]
@@ -0,0 +1,244 @@
+"""
+Materialized daily RS history.
+
+A nightly job ranks the whole universe once (``RelativeStrengthCalculator.
+rank_universe``) and bulk-inserts the ratings into ``rs_history``: one
+multi-row INSERT per batch, inside a single transaction that first clears
+any earlier run for the same day, so re-runs are idempotent. Rows are
+stamped with the as-of date at midnight UTC, which keeps a day's rows on a
+single ``calculated_at`` value for the existing indexes:
+
+- a symbol's trajectory  -> ix_rs_history_ticker_date (ticker_id, calculated_at)
+- a date's distribution  -> ix_rs_history_calculated_at
+
+The latest ratings are also published to Redis so scans can read them
+without touching the database:
+
+    rs:latest        hash  symbol -> rs_rating
+    rs:latest:date   str   as-of date of that snapshot (YYYY-MM-DD)
+"""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select
+
+from app.models import RSHistory, Ticker
+from app.services.cache import CacheService
+from app.services.database import DatabaseService, run_db
+from app.services.relative_strength import RelativeStrengthCalculator, UniverseRanking
+
+logger = logging.getLogger(__name__)
+
+RS_LATEST_KEY = "rs:latest"
+RS_LATEST_DATE_KEY = "rs:latest:date"
+RS_LATEST_TTL = 4 * 24 * 3600  # Survives a long weekend without a run
+INSERT_BATCH_SIZE = 1000
+
+
+def _day_start(as_of: date) -> datetime:
+    return datetime.combine(as_of, dt_time.min, tzinfo=timezone.utc)
+
+
+class RSHistoryStore:
+    """Bulk writes and indexed reads of the ``rs_history`` table."""
+
+    def __init__(self, db: DatabaseService, batch_size: int = INSERT_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+
+    def write_ranking(self, ranking: UniverseRanking, as_of: date) -> int:
+        """Replace the rows for ``as_of`` with ``ranking``; returns rows written."""
+        if not len(ranking):
+            return 0
+        stamp = _day_start(as_of)
+        percentiles = ranking.percentiles()
+        ratings = ranking.ratings()
+        ranks = ranking.ranks()
+
+        with self.db.get_db() as session:
+            ticker_ids = self._ticker_ids(session, ranking.symbols)
+            session.execute(
+                delete(RSHistory).where(
+                    RSHistory.calculated_at >= stamp,
+                    RSHistory.calculated_at < stamp + timedelta(days=1),
+                )
+            )
+            rows = [
+                {
+                    "ticker_id": ticker_ids[symbol],
+                    "rs_rating": ratings[symbol],
+                    "raw_score": float(ranking.scores[idx]),
+                    "q1_performance": float(ranking.quarterly[idx, 0]),
+                    "q2_performance": float(ranking.quarterly[idx, 1]),
+                    "q3_performance": float(ranking.quarterly[idx, 2]),
+                    "q4_performance": float(ranking.quarterly[idx, 3]),
+                    "one_year_performance": float(ranking.one_year[idx]),
+                    "percentile": float(percentiles[idx]),
+                    "universe_rank": int(ranks[idx]),
+                    "universe_size": len(ranking),
+                    "calculated_at": stamp,
+                }
+                for idx, symbol in enumerate(ranking.symbols)
+            ]
+            for start in range(0, len(rows), self.batch_size):
+                # .values(list) renders one multi-row INSERT per batch
+                session.execute(insert(RSHistory).values(rows[start:start + self.batch_size]))
+            session.commit()
+        return len(rows)
+
+    @staticmethod
+    def _ticker_ids(session, symbols: List[str]) -> Dict[str, int]:
+        wanted = [symbol.upper() for symbol in symbols]
+        ids: Dict[str, int] = {}
+        for start in range(0, len(wanted), INSERT_BATCH_SIZE):
+            chunk = wanted[start:start + INSERT_BATCH_SIZE]
+            ids.update(session.execute(
+                select(Ticker.symbol, Ticker.id).where(Ticker.symbol.in_(chunk))
+            ).all())
+        missing = [symbol for symbol in wanted if symbol not in ids]
+        if missing:
+            session.execute(insert(Ticker).values([{"symbol": symbol} for symbol in missing]))
+            ids.update(session.execute(
+                select(Ticker.symbol, Ticker.id).where(Ticker.symbol.in_(missing))
+            ).all())
+        return {symbol: ids[symbol.upper()] for symbol in symbols}
+
+    def latest_date(self) -> Optional[date]:
+        with self.db.get_db() as session:
+            latest = session.execute(select(func.max(RSHistory.calculated_at))).scalar()
+        return latest.date() if latest else None
+
+    def trajectory(self, symbol: str, days: int = 180) -> List[Dict[str, Any]]:
+        """Daily RS of one symbol over the last ``days`` days, oldest first."""
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        with self.db.get_db() as session:
+            rows = session.execute(
+                select(
+                    RSHistory.calculated_at,
+                    RSHistory.rs_rating,
+                    RSHistory.raw_score,
+                    RSHistory.universe_rank,
+                    RSHistory.universe_size,
+                )
+                .join(Ticker, Ticker.id == RSHistory.ticker_id)
+                .where(Ticker.symbol == symbol.upper(), RSHistory.calculated_at >= since)
+                .order_by(RSHistory.calculated_at)
+            ).all()
+        return [
+            {
+                "date": row.calculated_at.date().isoformat(),
+                "rs_rating": row.rs_rating,
+                "raw_score": row.raw_score,
+                "universe_rank": row.universe_rank,
+                "universe_size": row.universe_size,
+            }
+            for row in rows
+        ]
+
+    def distribution(self, as_of: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        """Every symbol's RS for one day (latest when omitted), strongest first."""
+        as_of = as_of or self.latest_date()
+        if as_of is None:
+            return None
+        stamp = _day_start(as_of)
+        with self.db.get_db() as session:
+            rows = session.execute(
+                select(Ticker.symbol, RSHistory.rs_rating, RSHistory.raw_score, RSHistory.universe_rank)
+                .join(Ticker, Ticker.id == RSHistory.ticker_id)
+                .where(
+                    RSHistory.calculated_at >= stamp,
+                    RSHistory.calculated_at < stamp + timedelta(days=1),
+                )
+                .order_by(RSHistory.universe_rank)
+            ).all()
+        if not rows:
+            return None
+        ratings = np.array([row.rs_rating for row in rows])
+        return {
+            "date": as_of.isoformat(),
+            "universe_size": len(rows),
+            "histogram": np.bincount(ratings // 10, minlength=10).tolist(),  # 0-9, 10-19, ... 90-99
+            "ratings": [
+                {"symbol": row.symbol, "rs_rating": row.rs_rating, "raw_score": row.raw_score, "universe_rank": row.universe_rank}
+                for row in rows
+            ],
+        }
+
+
+async def publish_latest_ratings(cache: CacheService, ranking: UniverseRanking, as_of: date) -> None:
+    """Replace the Redis snapshot of the latest ratings."""
+    ratings = ranking.ratings()
+    redis = await cache._get_redis()
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.delete(RS_LATEST_KEY)
+        if ratings:
+            pipe.hset(RS_LATEST_KEY, mapping=ratings)
+            pipe.expire(RS_LATEST_KEY, RS_LATEST_TTL)
+        pipe.set(RS_LATEST_DATE_KEY, as_of.isoformat(), ex=RS_LATEST_TTL)
+        await pipe.execute()
+
+
+async def load_latest_ratings(cache: CacheService) -> Dict[str, int]:
+    """Latest published RS ratings (empty when the job has not run)."""
+    try:
+        redis = await cache._get_redis()
+        raw = await redis.hgetall(RS_LATEST_KEY)
+    except Exception as exc:
+        logger.warning("RS snapshot load failed: %s", exc)
+        return {}
+    return {symbol: int(value) for symbol, value in raw.items()}
+
+
+async def materialize_rs_history(
+    symbols: Optional[List[str]] = None,
+    *,
+    as_of: Optional[date] = None,
+) -> Dict[str, Any]:
+    """Rank the universe, store the day's RS rows and publish the snapshot."""
+    from app.config import get_settings
+    from app.core.universe_panel import build_panel
+    from app.services import universe_data
+    from app.services.cache import get_cache_service
+    from app.services.database import get_database_service
+    from app.services.panel_store import get_panel_store
+    from app.services.universe_prefilter import load_price_payloads
+    from app.services.universe_store import universe_store
+
+    started = time.perf_counter()
+    bars = RelativeStrengthCalculator.DAYS_PER_YEAR + 5
+    panel = get_panel_store().attach(max_age=get_settings().universe_panel_max_age) if symbols is None else None
+    if panel is None:
+        if symbols is None:
+            universe_meta = await universe_store.get_all()
+            symbols = list(universe_meta.keys()) or universe_data.get_full_universe()
+        panel = build_panel(await load_price_payloads(symbols, bars=bars), bars)
+
+    ranking = RelativeStrengthCalculator().rank_universe(
+        {symbol: panel.series(symbol, "close") for symbol in panel.symbols}
+    )
+    as_of = as_of or datetime.now(timezone.utc).date()
+    store = RSHistoryStore(get_database_service())
+    written = await run_db(store.write_ranking, ranking, as_of)
+    await publish_latest_ratings(get_cache_service(), ranking, as_of)
+    stats = {
+        "date": as_of.isoformat(),
+        "universe": panel.n_symbols,
+        "ranked": len(ranking),
+        "written": written,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    logger.info("RS history materialized: %s", stats)
+    return stats
+
+
+__all__ = [
+    "RSHistoryStore",
+    "load_latest_ratings",
+    "materialize_rs_history",
+    "publish_latest_ratings",
+]
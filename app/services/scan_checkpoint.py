@@ -0,0 +1,174 @@
+"""
+Redis-backed checkpoints for long-running EOD scans.
+
+Each scan has an ID (``eod-<YYYYMMDD>`` by default). As chunks complete, their
+per-symbol results are written to a Redis hash and a progress document is
+updated, so a crash or redeploy only loses the chunk that was in flight.
+Re-running the same scan ID skips every symbol already in the hash.
+
+Keys:
+    scan:checkpoint:{scan_id}   hash  symbol -> JSON result ("" = no pattern)
+    scan:progress:{scan_id}     JSON  status / counts / timestamps
+    scan:active                 JSON  {"scan_id": ...} of the scan currently running
+
+``scan:active`` doubles as the scan's heartbeat: it expires after
+``HEARTBEAT_TTL`` unless a chunk is recorded, so a scan whose process died
+stops being reported as running within minutes. Its progress is then marked
+``stale``; re-running the same scan ID resumes from the checkpoint.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from app.services.cache import CacheService
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_KEY_TEMPLATE = "scan:checkpoint:{scan_id}"
+PROGRESS_KEY_TEMPLATE = "scan:progress:{scan_id}"
+SCAN_ACTIVE_KEY = "scan:active"
+CHECKPOINT_TTL = 48 * 3600  # Long enough to resume the next day
+HEARTBEAT_TTL = 15 * 60  # A live scan records a chunk well within this
+
+
+def _utcnow_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class ScanCheckpoint:
+    """Persist and restore the progress of a single scan."""
+
+    def __init__(self, cache: CacheService, scan_id: str, ttl: int = CHECKPOINT_TTL):
+        self.cache = cache
+        self.scan_id = scan_id
+        self.ttl = ttl
+        self.results_key = CHECKPOINT_KEY_TEMPLATE.format(scan_id=scan_id)
+        self.progress_key = PROGRESS_KEY_TEMPLATE.format(scan_id=scan_id)
+        self.progress: Dict[str, Any] = {}
+
+    async def load(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Return completed symbols mapped to their result (None = scanned, no hit)."""
+        try:
+            redis = await self.cache._get_redis()
+            raw = await redis.hgetall(self.results_key)
+        except Exception as exc:
+            logger.warning("Checkpoint load failed for %s: %s", self.scan_id, exc)
+            return {}
+        completed: Dict[str, Optional[Dict[str, Any]]] = {}
+        for symbol, value in (raw or {}).items():
+            try:
+                completed[symbol] = json.loads(value) if value else None
+            except (json.JSONDecodeError, TypeError):
+                completed[symbol] = None
+        return completed
+
+    async def reset(self) -> None:
+        # Through the cache so the progress document also leaves every worker's L1
+        await self.cache.delete(self.results_key, self.progress_key)
+
+    async def start(self, **fields: Any) -> None:
+        """Mark the scan as running and publish its initial progress."""
+        previous = await self.cache.get(self.progress_key)
+        self.progress = previous if isinstance(previous, dict) else {}
+        self.progress.update(
+            {
+                "scan_id": self.scan_id,
+                "status": "running",
+                "started_at": self.progress.get("started_at") or _utcnow_iso(),
+                "resumed": bool(self.progress),
+                "updated_at": _utcnow_iso(),
+                **fields,
+            }
+        )
+        await self.cache.set(self.progress_key, self.progress, ttl=self.ttl)
+        await self.heartbeat()
+
+    async def heartbeat(self) -> None:
+        """Mark this scan as the active one for another ``HEARTBEAT_TTL`` seconds."""
+        await self.cache.set(SCAN_ACTIVE_KEY, {"scan_id": self.scan_id}, ttl=HEARTBEAT_TTL)
+
+    async def record(
+        self,
+        chunk_results: Dict[str, Optional[Dict[str, Any]]],
+        *,
+        completed: int,
+        errors: Optional[List[str]] = None,
+    ) -> None:
+        """Write one finished chunk and bump the progress counters."""
+        if chunk_results:
+            mapping = {
+                symbol: json.dumps(result, default=str) if result else ""
+                for symbol, result in chunk_results.items()
+            }
+            try:
+                redis = await self.cache._get_redis()
+                await redis.hset(self.results_key, mapping=mapping)
+                await redis.expire(self.results_key, self.ttl)
+            except Exception as exc:
+                logger.warning("Checkpoint write failed for %s: %s", self.scan_id, exc)
+
+        self.progress.update(
+            {
+                "completed": completed,
+                "hits": self.progress.get("hits", 0)
+                + sum(1 for result in chunk_results.values() if result),
+                "errors": errors if errors is not None else self.progress.get("errors", []),
+                "updated_at": _utcnow_iso(),
+            }
+        )
+        await self.cache.set(self.progress_key, self.progress, ttl=self.ttl)
+        await self.heartbeat()
+
+    async def finish(self, status: str = "complete") -> None:
+        self.progress.update({"status": status, "finished_at": _utcnow_iso(), "updated_at": _utcnow_iso()})
+        await self.cache.set(self.progress_key, self.progress, ttl=self.ttl)
+        try:
+            active = await self.cache.get(SCAN_ACTIVE_KEY)
+            if isinstance(active, dict) and active.get("scan_id") == self.scan_id:
+                await self.cache.delete(SCAN_ACTIVE_KEY)
+        except Exception as exc:
+            logger.warning("Failed to clear active scan marker: %s", exc)
+
+
+def _is_stale(progress: Dict[str, Any]) -> bool:
+    try:
+        updated = datetime.fromisoformat(progress["updated_at"])
+    except (KeyError, TypeError, ValueError):
+        return True
+    return datetime.now(timezone.utc) - updated > timedelta(seconds=HEARTBEAT_TTL)
+
+
+async def get_active_scan(cache: CacheService) -> Optional[Dict[str, Any]]:
+    """
+    Return the progress document of the scan currently running, if any.
+
+    A scan that has not recorded a chunk within ``HEARTBEAT_TTL`` is taken to
+    have died: its progress is marked ``stale`` and None is returned.
+    """
+    active = await cache.get(SCAN_ACTIVE_KEY)
+    if not isinstance(active, dict) or not active.get("scan_id"):
+        return None
+    progress_key = PROGRESS_KEY_TEMPLATE.format(scan_id=active["scan_id"])
+    progress = await cache.get(progress_key)
+    if not isinstance(progress, dict) or progress.get("status") != "running":
+        return None
+    if _is_stale(progress):
+        logger.warning("Scan %s stopped reporting progress; marking it stale", active["scan_id"])
+        progress.update({"status": "stale", "updated_at": _utcnow_iso()})
+        await cache.set(progress_key, progress, ttl=CHECKPOINT_TTL)
+        await cache.delete(SCAN_ACTIVE_KEY)
+        return None
+    return progress
+
+
+__all__ = [
+    "CHECKPOINT_KEY_TEMPLATE",
+    "HEARTBEAT_TTL",
+    "PROGRESS_KEY_TEMPLATE",
+    "SCAN_ACTIVE_KEY",
+    "ScanCheckpoint",
+    "get_active_scan",
+]
@@ -0,0 +1,483 @@
+"""
+Time-partitioned pattern scan history.
+
+Scan rows are partitioned by the calendar month of ``scanned_at``, so
+"recent" queries touch only the months in range and retention drops whole
+months instead of deleting row by row:
+
+- PostgreSQL: ``pattern_scans`` is a native range-partitioned table
+  (alembic revision 006) with one partition per month,
+  ``pattern_scans_yYYYYmMM``, and a default partition that catches anything
+  outside them. Queries go to the parent with a ``scanned_at`` bound and the
+  planner prunes to the months in range.
+- SQLite (local development, tests): there are no native partitions, so
+  each month is its own table with the same columns. Writes are routed by
+  month, and reads walk month tables newest first, stopping once a page is
+  full. Rows left in the plain ``pattern_scans`` table are moved into month
+  tables by ``ensure_partitions``.
+
+Reads are keyset-paginated on ``(scanned_at, id)`` descending. The cursor
+is the last row's position, so a deep page costs the same as the first.
+(On SQLite ids are unique per month table only; the pair stays unique.)
+
+A nightly rollup summarises one day into ``pattern_scan_rollups``
+(per-pattern counts and score histogram) and folds first/last seen per
+ticker and pattern into ``ticker_pattern_seen``. Both are idempotent, so
+re-running a day is safe. Rollups are kept after retention drops the rows.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    Column,
+    Index,
+    MetaData,
+    Table,
+    delete,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.orm import Session
+
+from app.models import PatternScan, PatternScanRollup, Ticker, TickerPatternSeen
+
+logger = logging.getLogger(__name__)
+
+BASE_TABLE = PatternScan.__tablename__
+DEFAULT_PARTITION = f"{BASE_TABLE}_default"
+INSERT_BATCH_SIZE = 1000
+SCORE_BUCKETS = 10  # Whole score points 0-9; a perfect 10 folds into the top bucket
+
+_PARTITION_RE = re.compile(rf"^{BASE_TABLE}_y(\d{{4}})m(\d{{2}})$")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{BASE_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def _utc(moment: datetime) -> datetime:
+    """SQLite hands timestamps back naive; they are stored as UTC."""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def encode_cursor(scanned_at: datetime, scan_id: int) -> str:
+    micros = (_utc(scanned_at) - _EPOCH) // timedelta(microseconds=1)
+    return f"{micros}-{scan_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Position encoded by ``encode_cursor``; ValueError when malformed."""
+    micros, sep, scan_id = cursor.partition("-")
+    if not sep:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return _EPOCH + timedelta(microseconds=int(micros)), int(scan_id)
+
+
+def _dialect_insert(bind):
+    if bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert
+
+
+class ScanHistoryStore:
+    """Month-partitioned writes, keyset reads and maintenance of scan rows."""
+
+    def __init__(self, db, retention_days: int = 730, months_ahead: int = 2):
+        self.db = db
+        self.retention_days = int(retention_days)
+        self.months_ahead = int(months_ahead)
+        self._metadata = MetaData()
+        self._lock = threading.Lock()
+
+    @property
+    def native(self) -> bool:
+        """True when the database partitions ``pattern_scans`` itself."""
+        return self.db.engine.dialect.name == "postgresql"
+
+    # ==================== Partitions ====================
+
+    def _month_table(self, month: datetime) -> Table:
+        """SQLite stand-in for one monthly partition."""
+        name = partition_name(month)
+        with self._lock:
+            table = self._metadata.tables.get(name)
+            if table is None:
+                columns = PatternScan.__table__.columns
+                table = Table(
+                    name,
+                    self._metadata,
+                    *(
+                        Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+                        for column in columns
+                    ),
+                    Index(f"ix_{name}_scanned", "scanned_at", "id"),
+                    Index(f"ix_{name}_pattern_scanned", "pattern_type", "scanned_at"),
+                    Index(f"ix_{name}_ticker_scanned", "ticker_id", "scanned_at"),
+                )
+        return table
+
+    def partitions(self, conn) -> Dict[datetime, str]:
+        """Existing monthly partitions, month start -> table name."""
+        if self.native:
+            names = conn.execute(text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid"
+                " WHERE i.inhparent = to_regclass(:parent)"
+            ), {"parent": BASE_TABLE}).scalars()
+        else:
+            names = inspect(conn).get_table_names()
+        months = {}
+        for name in names:
+            match = _PARTITION_RE.match(name)
+            if match:
+                months[datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)] = name
+        return months
+
+    def _partitioned(self, conn) -> bool:
+        """Whether revision 006 turned the Postgres table into a partitioned one."""
+        return bool(conn.execute(text(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:parent)"
+        ), {"parent": BASE_TABLE}).scalar())
+
+    def ensure_partitions(self, now: Optional[datetime] = None) -> List[str]:
+        """Create partitions for this month and ``months_ahead`` more; returns the new ones."""
+        current = month_start(now or datetime.now(timezone.utc))
+        months = [add_months(current, offset) for offset in range(self.months_ahead + 1)]
+        created = []
+        with self.db.engine.begin() as conn:
+            if self.native and not self._partitioned(conn):
+                return []
+            existing = self.partitions(conn)
+            for month in months:
+                if month in existing:
+                    continue
+                name = partition_name(month)
+                if self.native:
+                    conn.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {BASE_TABLE}"
+                        f" FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                    ))
+                else:
+                    self._month_table(month).create(conn, checkfirst=True)
+                created.append(name)
+            if not self.native:
+                self._adopt_legacy_rows(conn)
+        if created:
+            logger.info("Created pattern scan partitions: %s", ", ".join(created))
+        return created
+
+    def _adopt_legacy_rows(self, conn) -> int:
+        """Move rows from the plain SQLite table into month tables."""
+        base = PatternScan.__table__
+        rows = [dict(row) for row in conn.execute(select(base).order_by(base.c.id)).mappings()]
+        if not rows:
+            return 0
+        now = datetime.now(timezone.utc)
+        for row in rows:
+            row.pop("id")
+            row["scanned_at"] = _utc(row["scanned_at"] or now)
+        self.insert_rows(conn, rows)
+        conn.execute(delete(base))
+        logger.info("Moved %s pattern scans into monthly tables", len(rows))
+        return len(rows)
+
+    def insert_rows(self, conn, rows: List[Dict[str, Any]], batch_size: int = INSERT_BATCH_SIZE) -> None:
+        """Insert column dicts (with ``scanned_at``) into the partition for their month.
+
+        ``conn`` is a session or connection; the caller commits.
+        """
+        if self.native:
+            groups = {PatternScan.__table__: rows}
+        else:
+            groups: Dict[Table, List[Dict[str, Any]]] = {}
+            bind = conn.connection() if isinstance(conn, Session) else conn
+            for row in rows:
+                table = self._month_table(month_start(_utc(row["scanned_at"])))
+                groups.setdefault(table, []).append(row)
+            for table in groups:
+                table.create(bind, checkfirst=True)
+        for table, group in groups.items():
+            statement = insert(table)
+            for start in range(0, len(group), batch_size):
+                conn.execute(statement, group[start:start + batch_size])
+
+    def _read_tables(self, conn, since: datetime, until: Optional[datetime] = None) -> List[Table]:
+        """Tables holding rows in ``[since, until]``, newest month first."""
+        if self.native:
+            return [PatternScan.__table__]
+        return [
+            self._month_table(month)
+            for month in sorted(self.partitions(conn), reverse=True)
+            if add_months(month, 1) > since and (until is None or month <= until)
+        ]
+
+    # ==================== Reads ====================
+
+    def recent(
+        self,
+        pattern_type: Optional[str] = None,
+        days: int = 30,
+        min_score: Optional[float] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Scans from the last ``days`` days, newest first, one keyset page."""
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        return self._page(since, limit, cursor, pattern_type=pattern_type, min_score=min_score)
+
+    def ticker_history(
+        self,
+        symbol: str,
+        days: int = 365,
+        pattern_type: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """One ticker's detections over the last ``days`` days, newest first."""
+        with self.db.get_db() as session:
+            ticker_id = session.execute(
+                select(Ticker.id).where(Ticker.symbol == symbol.upper())
+            ).scalar()
+        if ticker_id is None:
+            return {"items": [], "next_cursor": None}
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        return self._page(since, limit, cursor, pattern_type=pattern_type, ticker_id=ticker_id)
+
+    def _page(
+        self,
+        since: datetime,
+        limit: int,
+        cursor: Optional[str],
+        pattern_type: Optional[str] = None,
+        min_score: Optional[float] = None,
+        ticker_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        after = decode_cursor(cursor) if cursor else None
+        rows: List[Any] = []
+        with self.db.get_db() as session:
+            for table in self._read_tables(session.connection(), since, after[0] if after else None):
+                columns = table.c
+                statement = (
+                    select(
+                        columns.id,
+                        columns.pattern_type,
+                        columns.score,
+                        columns.entry_price,
+                        columns.stop_price,
+                        columns.target_price,
+                        columns.rs_rating,
+                        columns.scanned_at,
+                        Ticker.symbol,
+                    )
+                    .join(Ticker, Ticker.id == columns.ticker_id)
+                    .where(columns.scanned_at >= since)
+                )
+                if pattern_type:
+                    statement = statement.where(columns.pattern_type == pattern_type)
+                if min_score is not None:
+                    statement = statement.where(columns.score >= min_score)
+                if ticker_id is not None:
+                    statement = statement.where(columns.ticker_id == ticker_id)
+                if after:
+                    statement = statement.where(tuple_(columns.scanned_at, columns.id) < tuple_(*after))
+                statement = statement.order_by(columns.scanned_at.desc(), columns.id.desc())
+                rows.extend(session.execute(statement.limit(limit + 1 - len(rows))).all())
+                if len(rows) > limit:
+                    break
+
+        page = rows[:limit]
+        return {
+            "items": [
+                {
+                    "id": row.id,
+                    "ticker": row.symbol,
+                    "pattern": row.pattern_type,
+                    "score": row.score,
+                    "entry": row.entry_price,
+                    "stop": row.stop_price,
+                    "target": row.target_price,
+                    "rs_rating": row.rs_rating,
+                    "scanned_at": _utc(row.scanned_at).isoformat(),
+                }
+                for row in page
+            ],
+            "next_cursor": encode_cursor(page[-1].scanned_at, page[-1].id) if len(rows) > limit else None,
+        }
+
+    def rollups(self, days: int = 30, pattern_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Daily per-pattern summaries for the last ``days`` days, newest first."""
+        since = datetime.now(timezone.utc).date() - timedelta(days=days)
+        statement = select(PatternScanRollup).where(PatternScanRollup.day >= since)
+        if pattern_type:
+            statement = statement.where(PatternScanRollup.pattern_type == pattern_type)
+        statement = statement.order_by(PatternScanRollup.day.desc(), PatternScanRollup.pattern_type)
+        with self.db.get_db() as session:
+            return [
+                {
+                    "day": rollup.day.isoformat(),
+                    "pattern": rollup.pattern_type,
+                    "scans": rollup.scans,
+                    "tickers": rollup.tickers,
+                    "avg_score": rollup.avg_score,
+                    "min_score": rollup.min_score,
+                    "max_score": rollup.max_score,
+                    "score_histogram": rollup.score_histogram,
+                }
+                for rollup in session.execute(statement).scalars()
+            ]
+
+    # ==================== Maintenance ====================
+
+    def rollup(self, day: date) -> Dict[str, Any]:
+        """Summarise ``day`` (UTC) into the rollup tables; safe to re-run."""
+        start = datetime.combine(day, dt_time.min, tzinfo=timezone.utc)
+        end = start + timedelta(days=1)
+        summaries: Dict[str, Dict[str, Any]] = {}
+        seen: Dict[Tuple[int, str], Dict[str, Any]] = {}
+
+        with self.db.get_db() as session:
+            for table in self._read_tables(session.connection(), start, end):
+                columns = table.c
+                scans = session.execute(
+                    select(columns.ticker_id, columns.pattern_type, columns.score, columns.scanned_at)
+                    .where(columns.scanned_at >= start, columns.scanned_at < end)
+                )
+                for ticker_id, pattern_type, score, scanned_at in scans:
+                    self._fold(summaries, seen, ticker_id, pattern_type or "UNKNOWN", score, _utc(scanned_at))
+
+            session.execute(delete(PatternScanRollup).where(PatternScanRollup.day == day))
+            if summaries:
+                session.execute(insert(PatternScanRollup), [
+                    {
+                        "day": day,
+                        "pattern_type": pattern_type,
+                        "scans": summary["scans"],
+                        "tickers": len(summary["tickers"]),
+                        "avg_score": round(summary["total"] / summary["scans"], 3),
+                        "min_score": summary["min"],
+                        "max_score": summary["max"],
+                        "score_histogram": summary["histogram"],
+                    }
+                    for pattern_type, summary in summaries.items()
+                ])
+            if seen:
+                self._upsert_seen(session, list(seen.values()))
+            session.commit()
+
+        return {
+            "day": day.isoformat(),
+            "patterns": len(summaries),
+            "scans": sum(summary["scans"] for summary in summaries.values()),
+            "tickers_seen": len(seen),
+        }
+
+    @staticmethod
+    def _fold(summaries, seen, ticker_id, pattern_type: str, score: float, scanned_at: datetime) -> None:
+        summary = summaries.setdefault(pattern_type, {
+            "scans": 0, "total": 0.0, "min": score, "max": score,
+            "tickers": set(), "histogram": [0] * SCORE_BUCKETS,
+        })
+        summary["scans"] += 1
+        summary["total"] += score
+        summary["min"] = min(summary["min"], score)
+        summary["max"] = max(summary["max"], score)
+        summary["tickers"].add(ticker_id)
+        summary["histogram"][min(max(int(score), 0), SCORE_BUCKETS - 1)] += 1
+        if ticker_id is None:
+            return
+        entry = seen.get((ticker_id, pattern_type))
+        if entry is None:
+            seen[(ticker_id, pattern_type)] = {
+                "ticker_id": ticker_id,
+                "pattern_type": pattern_type,
+                "first_seen": scanned_at,
+                "last_seen": scanned_at,
+                "best_score": score,
+            }
+        else:
+            entry["first_seen"] = min(entry["first_seen"], scanned_at)
+            entry["last_seen"] = max(entry["last_seen"], scanned_at)
+            entry["best_score"] = max(entry["best_score"], score)
+
+    def _upsert_seen(self, session, rows: List[Dict[str, Any]]) -> None:
+        # Least/greatest keep the upsert idempotent when a day is rolled up twice
+        least, greatest = (func.least, func.greatest) if self.native else (func.min, func.max)
+        statement = _dialect_insert(session.get_bind())(TickerPatternSeen)
+        excluded = statement.excluded
+        statement = statement.on_conflict_do_update(
+            index_elements=["ticker_id", "pattern_type"],
+            set_={
+                "first_seen": least(TickerPatternSeen.first_seen, excluded.first_seen),
+                "last_seen": greatest(TickerPatternSeen.last_seen, excluded.last_seen),
+                "best_score": greatest(
+                    func.coalesce(TickerPatternSeen.best_score, excluded.best_score), excluded.best_score
+                ),
+            },
+        )
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            session.execute(statement, rows[start:start + INSERT_BATCH_SIZE])
+
+    def apply_retention(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Drop months entirely older than ``retention_days`` and trim the boundary month."""
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=self.retention_days)
+        dropped = []
+        with self.db.engine.begin() as conn:
+            for month, name in sorted(self.partitions(conn).items()):
+                if add_months(month, 1) <= cutoff:
+                    conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                    if name in self._metadata.tables:
+                        self._metadata.remove(self._metadata.tables[name])
+                    dropped.append(name)
+            # Pruning keeps this to the boundary month (and the Postgres default partition)
+            deleted = sum(
+                conn.execute(delete(table).where(table.c.scanned_at < cutoff)).rowcount or 0
+                for table in self._read_tables(conn, datetime.min.replace(tzinfo=timezone.utc), cutoff)
+            )
+        if dropped or deleted:
+            logger.info("Scan history retention dropped %s partitions, %s rows", len(dropped), deleted)
+        return {"cutoff": cutoff.isoformat(), "dropped_partitions": dropped, "deleted_rows": deleted}
+
+
+async def maintain_scan_history(day: Optional[date] = None) -> Dict[str, Any]:
+    """Nightly job: roll up ``day`` (yesterday, UTC), add partitions, apply retention."""
+    from app.services.database import get_database_service, run_db
+
+    store = get_database_service().scan_history
+    day = day or datetime.now(timezone.utc).date() - timedelta(days=1)
+    rollup = await run_db(store.rollup, day)
+    created = await run_db(store.ensure_partitions)
+    retention = await run_db(store.apply_retention)
+    return {"rollup": rollup, "created_partitions": created, **retention}
+
+
+__all__ = [
+    "ScanHistoryStore",
+    "add_months",
+    "decode_cursor",
+    "encode_cursor",
+    "maintain_scan_history",
+    "month_start",
+    "partition_name",
+]
@@ -0,0 +1,157 @@
+"""
+Redis secondary indexes over EOD scan results.
+
+The EOD scanner stores each run as one JSON summary; screens that filter it
+(top-N, per sector, per pattern) used to load and filter the whole blob.
+``ScanIndex`` additionally writes, per scan date:
+
+    scan:idx:{date}:score               zset  symbol -> score (all results)
+    scan:idx:{date}:sector:{slug}       zset  symbol -> score
+    scan:idx:{date}:pattern:{slug}      zset  symbol -> score
+    scan:idx:{date}:results             hash  symbol -> JSON result summary
+    scan:idx:{date}:meta                JSON  scan_date, totals, sectors, patterns
+    scan:idx:latest                     str   date of the newest indexed scan
+
+so screens become ``ZREVRANGEBYSCORE ... LIMIT offset count`` + ``HMGET``:
+cost depends on the page size, not on the size or number of stored scans.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+from typing import Any, Dict, Optional
+
+from app.services.cache import CacheService
+
+logger = logging.getLogger(__name__)
+
+INDEX_PREFIX = "scan:idx:{date}"
+INDEX_LATEST_KEY = "scan:idx:latest"
+INDEX_TTL = 7 * 24 * 3600
+
+
+def index_slug(value: Optional[str]) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", (value or "").strip().lower()).strip("_") or "unknown"
+
+
+class ScanIndex:
+    """Write and query the per-date scan result indexes."""
+
+    def __init__(self, cache: CacheService, ttl: int = INDEX_TTL):
+        self.cache = cache
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(date: str, *parts: str) -> str:
+        return ":".join([INDEX_PREFIX.format(date=date), *parts])
+
+    async def write(self, scan_date: str, summary: Dict[str, Any]) -> int:
+        """Replace the indexes for ``scan_date`` with ``summary['results']``."""
+        results = [item for item in summary.get("results", []) if item.get("symbol")]
+        redis = await self.cache._get_redis()
+        previous = await self.meta(scan_date) or {}
+        stale = [self._key(scan_date, "sector", slug) for slug in previous.get("sectors", [])]
+        stale += [self._key(scan_date, "pattern", slug) for slug in previous.get("patterns", [])]
+
+        by_score: Dict[str, float] = {}
+        by_sector: Dict[str, Dict[str, float]] = {}
+        by_pattern: Dict[str, Dict[str, float]] = {}
+        documents: Dict[str, str] = {}
+        for item in results:
+            symbol = item["symbol"]
+            score = float(item.get("score") or 0.0)
+            if symbol in by_score and by_score[symbol] >= score:
+                continue
+            by_score[symbol] = score
+            by_sector.setdefault(index_slug(item.get("sector")), {})[symbol] = score
+            by_pattern.setdefault(index_slug(item.get("pattern")), {})[symbol] = score
+            documents[symbol] = json.dumps(item, default=str)
+
+        meta = {
+            "scan_date": scan_date,
+            "scan_id": summary.get("scan_id"),
+            "total_symbols": summary.get("total_symbols"),
+            "patterns_found": len(by_score),
+            "generated_at": summary.get("generated_at"),
+            "sectors": sorted(by_sector),
+            "patterns": sorted(by_pattern),
+        }
+
+        score_key = self._key(scan_date, "score")
+        results_key = self._key(scan_date, "results")
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(score_key, results_key, *stale)
+            written = [score_key, results_key]
+            if by_score:
+                pipe.zadd(score_key, by_score)
+                pipe.hset(results_key, mapping=documents)
+            for slug, members in by_sector.items():
+                key = self._key(scan_date, "sector", slug)
+                pipe.zadd(key, members)
+                written.append(key)
+            for slug, members in by_pattern.items():
+                key = self._key(scan_date, "pattern", slug)
+                pipe.zadd(key, members)
+                written.append(key)
+            for key in written:
+                pipe.expire(key, self.ttl)
+            pipe.set(self._key(scan_date, "meta"), json.dumps(meta), ex=self.ttl)
+            pipe.set(INDEX_LATEST_KEY, scan_date, ex=self.ttl)
+            await pipe.execute()
+        return len(by_score)
+
+    async def latest_date(self) -> Optional[str]:
+        redis = await self.cache._get_redis()
+        return await redis.get(INDEX_LATEST_KEY)
+
+    async def meta(self, scan_date: str) -> Optional[Dict[str, Any]]:
+        redis = await self.cache._get_redis()
+        raw = await redis.get(self._key(scan_date, "meta"))
+        return json.loads(raw) if raw else None
+
+    async def query(
+        self,
+        *,
+        scan_date: Optional[str] = None,
+        sector: Optional[str] = None,
+        pattern: Optional[str] = None,
+        min_score: float = 0.0,
+        offset: int = 0,
+        limit: int = 10,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        One page of results ranked by score, or None if the scan isn't indexed.
+
+        Filters by one of ``sector`` or ``pattern`` (sector wins if both).
+        """
+        scan_date = scan_date or await self.latest_date()
+        if not scan_date:
+            return None
+        meta = await self.meta(scan_date)
+        if meta is None:
+            return None
+
+        if sector:
+            key = self._key(scan_date, "sector", index_slug(sector))
+        elif pattern:
+            key = self._key(scan_date, "pattern", index_slug(pattern))
+        else:
+            key = self._key(scan_date, "score")
+
+        redis = await self.cache._get_redis()
+        total = await redis.zcount(key, min_score, "+inf")
+        symbols = await redis.zrevrangebyscore(key, "+inf", min_score, start=offset, num=limit)
+        documents = await redis.hmget(self._key(scan_date, "results"), symbols) if symbols else []
+        return {
+            "scan_date": scan_date,
+            "total_symbols": meta.get("total_symbols"),
+            "generated_at": meta.get("generated_at"),
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "results": [json.loads(doc) for doc in documents if doc],
+        }
+
+
+__all__ = ["INDEX_LATEST_KEY", "ScanIndex", "index_slug"]
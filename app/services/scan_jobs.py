@@ -0,0 +1,397 @@
+"""
+Redis-backed background queue for long-running scans.
+
+Submitting a scan returns a job ID immediately; ``ScanJobWorker`` tasks pull
+job IDs off a Redis list and run them, writing progress, partial results and
+the final output back to the job document. Identical in-flight submissions
+(same kind + params) are deduplicated onto the existing job.
+
+Popping moves the job ID onto a processing list and takes a short lease that
+the worker renews while the job runs. Entries whose lease has lapsed (the
+worker crashed or was killed) are put back on the queue when workers start.
+A job interrupted by shutdown is re-queued the same way.
+
+Keys (all expire after ``JOB_TTL``):
+    scan:jobs:queue                 list  pending job IDs (FIFO)
+    scan:jobs:processing            list  job IDs popped by a worker
+    scan:job:{job_id}:lease         flag  held by the worker running the job
+    scan:jobs:index                 zset  job ID -> submitted timestamp
+    scan:job:{job_id}               JSON  job document
+    scan:job:{job_id}:cancel        flag  set to request cancellation
+    scan:jobs:dedupe:{fingerprint}  str   job ID of the in-flight duplicate
+
+Job kinds map to runners: async generators yielding the scan events from
+``app.services.scan_stream`` (``result``/``progress``/``error``/``summary``).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from app.config import get_settings
+from app.services.cache import CacheService, get_cache_service
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUE_KEY = "scan:jobs:queue"
+JOB_PROCESSING_KEY = "scan:jobs:processing"
+JOB_INDEX_KEY = "scan:jobs:index"
+JOB_KEY_TEMPLATE = "scan:job:{job_id}"
+JOB_CANCEL_TEMPLATE = "scan:job:{job_id}:cancel"
+JOB_DEDUPE_TEMPLATE = "scan:jobs:dedupe:{fingerprint}"
+JOB_LEASE_TEMPLATE = "scan:job:{job_id}:lease"
+JOB_TTL = 24 * 3600
+JOB_LEASE_SECONDS = 60  # Renewed every third of this while the job runs
+TERMINAL_STATUSES = {"complete", "failed", "cancelled"}
+PARTIAL_RESULTS_LIMIT = 200  # Newest hits kept on the job while it runs
+FLUSH_INTERVAL_SECONDS = 1.0  # Min gap between job document writes
+
+JobRunner = Callable[[Dict[str, Any]], AsyncIterator[Dict[str, Any]]]
+
+
+def _utcnow_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+async def _run_eod_job(params: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    from app.services.eod_scanner import get_eod_scanner
+
+    async for event in get_eod_scanner().stream_scan(
+        resume=params.get("resume", True),
+        incremental=params.get("incremental"),
+    ):
+        yield event
+
+
+async def _run_pattern_job(params: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    from app.services.scan_stream import stream_pattern_scan
+
+    async for event in stream_pattern_scan(
+        params.get("tickers") or [],
+        interval=params.get("interval", "1day"),
+        min_score=params.get("min_score", 6.0),
+        limit=params.get("limit"),
+    ):
+        yield event
+
+
+async def _run_universe_job(params: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    from app.services.scan_stream import stream_universe_scan
+
+    async for event in stream_universe_scan(
+        min_score=params.get("min_score", 7.0),
+        max_results=params.get("max_results", 20),
+        pattern_types=params.get("pattern_types"),
+    ):
+        yield event
+
+
+JOB_RUNNERS: Dict[str, JobRunner] = {
+    "eod": _run_eod_job,
+    "pattern": _run_pattern_job,
+    "universe": _run_universe_job,
+}
+
+
+def job_fingerprint(kind: str, params: Dict[str, Any]) -> str:
+    canonical = json.dumps({"kind": kind, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+class ScanJobQueue:
+    """Submit, inspect and cancel scan jobs stored in Redis."""
+
+    def __init__(self, cache: CacheService, ttl: int = JOB_TTL):
+        self.cache = cache
+        self.ttl = ttl
+
+    async def submit(self, kind: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Enqueue a job, or return the identical job already queued/running."""
+        if kind not in JOB_RUNNERS:
+            raise ValueError(f"Unknown scan job kind: {kind}")
+        params = params or {}
+        fingerprint = job_fingerprint(kind, params)
+        dedupe_key = JOB_DEDUPE_TEMPLATE.format(fingerprint=fingerprint)
+        job_id = uuid.uuid4().hex[:16]
+
+        redis = await self.cache._get_redis()
+        if not await redis.set(dedupe_key, job_id, nx=True, ex=self.ttl):
+            existing_id = await redis.get(dedupe_key)
+            existing = await self.get(existing_id) if existing_id else None
+            if existing and existing.get("status") not in TERMINAL_STATUSES:
+                return {**existing, "deduplicated": True}
+            await redis.set(dedupe_key, job_id, ex=self.ttl)
+
+        job = {
+            "job_id": job_id,
+            "kind": kind,
+            "params": params,
+            "fingerprint": fingerprint,
+            "status": "queued",
+            "submitted_at": _utcnow_iso(),
+            "progress": {},
+            "partial_results": [],
+            "result": None,
+            "error": None,
+        }
+        await self.save(job)
+        await redis.zadd(JOB_INDEX_KEY, {job_id: time.time()})
+        await redis.expire(JOB_INDEX_KEY, self.ttl)
+        await redis.rpush(JOB_QUEUE_KEY, job_id)
+        logger.info("scan job %s queued kind=%s", job_id, kind)
+        return {**job, "deduplicated": False}
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = await self.cache.get(JOB_KEY_TEMPLATE.format(job_id=job_id))
+        return job if isinstance(job, dict) else None
+
+    async def save(self, job: Dict[str, Any]) -> None:
+        job["updated_at"] = _utcnow_iso()
+        payload = json.dumps(job, default=str)  # Results may carry numpy/datetime values
+        await self.cache.set(JOB_KEY_TEMPLATE.format(job_id=job["job_id"]), payload, ttl=self.ttl)
+
+    async def list(self, *, limit: int = 20, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Newest jobs first, without their result payloads."""
+        redis = await self.cache._get_redis()
+        await redis.zremrangebyscore(JOB_INDEX_KEY, 0, time.time() - self.ttl)
+        jobs: List[Dict[str, Any]] = []
+        for job_id in await redis.zrevrange(JOB_INDEX_KEY, 0, -1):
+            job = await self.get(job_id)
+            if not job or (status and job.get("status") != status):
+                continue
+            jobs.append({k: v for k, v in job.items() if k not in ("result", "partial_results")})
+            if len(jobs) >= limit:
+                break
+        return jobs
+
+    async def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued job outright, or flag a running one for the worker."""
+        job = await self.get(job_id)
+        if not job or job.get("status") in TERMINAL_STATUSES:
+            return job
+        redis = await self.cache._get_redis()
+        if job["status"] == "queued":
+            await redis.lrem(JOB_QUEUE_KEY, 0, job_id)
+            job.update({"status": "cancelled", "finished_at": _utcnow_iso()})
+            await self.save(job)
+            await self.release(job)
+        else:
+            await redis.set(JOB_CANCEL_TEMPLATE.format(job_id=job_id), "1", ex=self.ttl)
+            job["cancel_requested"] = True
+        return job
+
+    async def cancel_requested(self, job_id: str) -> bool:
+        redis = await self.cache._get_redis()
+        return bool(await redis.exists(JOB_CANCEL_TEMPLATE.format(job_id=job_id)))
+
+    async def release(self, job: Dict[str, Any]) -> None:
+        """Drop the dedupe marker so the same scan can be submitted again."""
+        redis = await self.cache._get_redis()
+        dedupe_key = JOB_DEDUPE_TEMPLATE.format(fingerprint=job.get("fingerprint", ""))
+        if await redis.get(dedupe_key) == job["job_id"]:
+            await redis.delete(dedupe_key)
+        await redis.delete(JOB_CANCEL_TEMPLATE.format(job_id=job["job_id"]))
+
+    async def pop(self, timeout: float = 0) -> Optional[str]:
+        """
+        Next queued job ID; blocks up to ``timeout`` seconds when > 0.
+
+        The ID moves onto the processing list under a lease, so it survives a
+        worker crash until ``requeue_stale`` puts it back.
+        """
+        redis = await self.cache._get_redis()
+        if timeout > 0:
+            job_id = await redis.blmove(JOB_QUEUE_KEY, JOB_PROCESSING_KEY, timeout, "LEFT", "RIGHT")
+        else:
+            job_id = await redis.lmove(JOB_QUEUE_KEY, JOB_PROCESSING_KEY, "LEFT", "RIGHT")
+        if job_id:
+            await self.renew_lease(job_id)
+        return job_id
+
+    async def renew_lease(self, job_id: str) -> None:
+        redis = await self.cache._get_redis()
+        await redis.set(JOB_LEASE_TEMPLATE.format(job_id=job_id), "1", ex=JOB_LEASE_SECONDS)
+
+    async def ack(self, job_id: str) -> None:
+        """Remove a popped job from the processing list and drop its lease."""
+        redis = await self.cache._get_redis()
+        await redis.lrem(JOB_PROCESSING_KEY, 0, job_id)
+        await redis.delete(JOB_LEASE_TEMPLATE.format(job_id=job_id))
+
+    async def requeue(self, job: Dict[str, Any]) -> None:
+        """Put an unfinished job back at the head of the queue."""
+        redis = await self.cache._get_redis()
+        job.update({"status": "queued", "requeued": job.get("requeued", 0) + 1})
+        for key in ("started_at", "worker"):
+            job.pop(key, None)
+        await self.save(job)
+        await redis.lpush(JOB_QUEUE_KEY, job["job_id"])
+        await self.ack(job["job_id"])
+
+    async def requeue_stale(self) -> int:
+        """Re-queue popped jobs whose worker stopped renewing the lease."""
+        redis = await self.cache._get_redis()
+        requeued = 0
+        for job_id in await redis.lrange(JOB_PROCESSING_KEY, 0, -1):
+            if await redis.exists(JOB_LEASE_TEMPLATE.format(job_id=job_id)):
+                continue
+            if not await redis.lrem(JOB_PROCESSING_KEY, 1, job_id):
+                continue  # Another worker got here first
+            job = await self.get(job_id)
+            if not job or job.get("status") in TERMINAL_STATUSES:
+                continue
+            logger.warning("scan job %s lost its worker; re-queueing", job_id)
+            await self.requeue(job)
+            requeued += 1
+        return requeued
+
+
+class ScanJobWorker:
+    """Pull jobs off the queue and run them one at a time."""
+
+    def __init__(self, queue: ScanJobQueue, *, poll_timeout: float = 5.0, name: str = "scan-worker"):
+        self.queue = queue
+        self.poll_timeout = poll_timeout
+        self.name = name
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self, timeout: float = 0) -> Optional[Dict[str, Any]]:
+        """Run the next queued job, if any, and return its final document."""
+        job_id = await self.queue.pop(timeout)
+        if not job_id:
+            return None
+        job = await self.queue.get(job_id)
+        if not job or job.get("status") != "queued":
+            await self.queue.ack(job_id)
+            return job
+        return await self._execute(job)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+            try:
+                await self.queue.renew_lease(job_id)
+            except Exception as exc:
+                logger.warning("scan job %s lease renewal failed: %s", job_id, exc)
+
+    async def _execute(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        job.update({"status": "running", "started_at": _utcnow_iso(), "worker": self.name})
+        await self.queue.save(job)
+        heartbeat = asyncio.create_task(self._heartbeat(job["job_id"]))
+        events = JOB_RUNNERS[job["kind"]](job["params"])
+        last_flush = time.monotonic()
+        interrupted = False
+        try:
+            async for event in events:
+                kind = event.get("event")
+                if kind == "result":
+                    partial = job["partial_results"]
+                    partial.append(event.get("data"))
+                    del partial[:-PARTIAL_RESULTS_LIMIT]
+                elif kind == "progress":
+                    job["progress"] = {k: v for k, v in event.items() if k != "event"}
+                elif kind == "error":
+                    job.setdefault("errors", {})[event.get("ticker")] = event.get("error")
+                elif kind == "summary":
+                    job["result"] = {k: v for k, v in event.items() if k != "event"}
+
+                if time.monotonic() - last_flush >= FLUSH_INTERVAL_SECONDS:
+                    if await self.queue.cancel_requested(job["job_id"]):
+                        job["status"] = "cancelled"
+                        break
+                    await self.queue.save(job)
+                    last_flush = time.monotonic()
+            else:
+                job["status"] = "complete"
+        except asyncio.CancelledError:
+            # Shutdown: hand the job to the next worker instead of stranding it
+            interrupted = True
+            raise
+        except Exception as exc:
+            logger.error("scan job %s failed: %s", job["job_id"], exc, exc_info=True)
+            job.update({"status": "failed", "error": str(exc)})
+        except BaseException as exc:
+            job.update({"status": "failed", "error": repr(exc)})
+            raise
+        finally:
+            heartbeat.cancel()
+            await events.aclose()
+            if interrupted:
+                await self.queue.requeue(job)
+                logger.info("scan job %s interrupted; re-queued", job["job_id"])
+            else:
+                job["finished_at"] = _utcnow_iso()
+                await self.queue.save(job)
+                await self.queue.release(job)
+                await self.queue.ack(job["job_id"])
+                logger.info("scan job %s finished status=%s", job["job_id"], job["status"])
+        return job
+
+    async def run_forever(self) -> None:
+        try:
+            await self.queue.requeue_stale()
+        except Exception as exc:
+            logger.warning("%s stale job sweep failed: %s", self.name, exc)
+        while True:
+            try:
+                await self.run_once(timeout=self.poll_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("%s poll failed: %s", self.name, exc)
+                await asyncio.sleep(self.poll_timeout)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_queue: Optional[ScanJobQueue] = None
+_workers: List[ScanJobWorker] = []
+
+
+def get_scan_job_queue() -> ScanJobQueue:
+    global _queue
+    if _queue is None:
+        _queue = ScanJobQueue(get_cache_service())
+    return _queue
+
+
+def start_scan_workers() -> None:
+    """Start the in-process workers (``scan_job_workers`` setting)."""
+    queue = get_scan_job_queue()
+    while len(_workers) < get_settings().scan_job_workers:
+        worker = ScanJobWorker(queue, name=f"scan-worker-{len(_workers) + 1}")
+        worker.start()
+        _workers.append(worker)
+
+
+async def stop_scan_workers() -> None:
+    while _workers:
+        await _workers.pop().stop()
+
+
+__all__ = [
+    "JOB_RUNNERS",
+    "ScanJobQueue",
+    "ScanJobWorker",
+    "get_scan_job_queue",
+    "job_fingerprint",
+    "start_scan_workers",
+    "stop_scan_workers",
+]
@@ -0,0 +1,180 @@
+"""
+Bulk persistence of pattern scan results.
+
+``PatternScanWriter`` writes scan rows without building ORM objects:
+
+- Ticker ids come from a symbol -> id map cached for the writer's lifetime.
+  Unknown symbols are resolved in chunked ``IN`` queries and created with an
+  ``ON CONFLICT DO NOTHING`` insert, so concurrent writers cannot collide.
+- On PostgreSQL (psycopg2) rows are streamed with ``COPY ... FROM STDIN``.
+- Elsewhere rows go through a Core executemany of one cached INSERT, in
+  batches: psycopg2 renders each batch as a multi-row ``INSERT ... VALUES``
+  and SQLite reuses one prepared statement. Building the statement with
+  ``.values(list)`` instead re-compiles a huge statement per batch and is
+  slower than the ORM path it replaces.
+
+``criteria_met`` is stored as a JSON array rather than a Python repr. Rows
+are stamped with ``scanned_at`` here rather than by the server default, so
+the scan history store can route them to their monthly partition.
+"""
+from __future__ import annotations
+
+import io
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+
+from app.models import Ticker
+
+logger = logging.getLogger(__name__)
+
+INSERT_BATCH_SIZE = 1000
+
+COLUMNS = (
+    "ticker_id",
+    "pattern_type",
+    "score",
+    "entry_price",
+    "stop_price",
+    "target_price",
+    "risk_reward_ratio",
+    "criteria_met",
+    "analysis",
+    "current_price",
+    "volume_dry_up",
+    "consolidation_days",
+    "chart_url",
+    "rs_rating",
+    "scanned_at",
+)
+
+
+def scan_row(data: Dict[str, Any], ticker_id: int, scanned_at: Optional[datetime] = None) -> Dict[str, Any]:
+    """Column values for one scan result dict (as produced by the scanners)."""
+    criteria = data.get("criteria_met")
+    return {
+        "ticker_id": ticker_id,
+        "pattern_type": data.get("pattern", "UNKNOWN"),
+        "score": data.get("score", 0),
+        "entry_price": data.get("entry"),
+        "stop_price": data.get("stop"),
+        "target_price": data.get("target"),
+        "risk_reward_ratio": data.get("risk_reward"),
+        "criteria_met": list(criteria) if criteria is not None else [],
+        "analysis": data.get("analysis", ""),
+        "current_price": data.get("current_price"),
+        "volume_dry_up": bool(data.get("volume_dry_up", False)),
+        "consolidation_days": data.get("consolidation_days"),
+        "chart_url": data.get("chart_url"),
+        "rs_rating": data.get("rs_rating"),
+        "scanned_at": data.get("scanned_at") or scanned_at or datetime.now(timezone.utc),
+    }
+
+
+def _copy_field(value: Any) -> str:
+    """Encode one value for COPY's text format."""
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value)
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class PatternScanWriter:
+    """High-throughput writer for the ``pattern_scans`` table."""
+
+    def __init__(self, db, batch_size: int = INSERT_BATCH_SIZE, use_copy: bool = True):
+        self.db = db
+        self.batch_size = batch_size
+        self.use_copy = use_copy
+        self._ticker_ids: Dict[str, int] = {}
+
+    def write(self, scans: Iterable[Dict[str, Any]]) -> int:
+        """Insert scan result dicts (keyed by ``ticker_symbol``); returns rows written."""
+        scans = [scan for scan in scans if scan.get("ticker_symbol")]
+        if not scans:
+            return 0
+
+        with self.db.get_db() as session:
+            try:
+                ids = self.ticker_ids(session, [scan["ticker_symbol"] for scan in scans])
+                stamp = datetime.now(timezone.utc)
+                rows = [scan_row(scan, ids[scan["ticker_symbol"].upper()], stamp) for scan in scans]
+                if not (self.use_copy and self._copy(session, rows)):
+                    self._insert(session, rows)
+                session.commit()
+            except Exception:
+                self.forget_tickers()  # Ids created in the failed transaction were rolled back
+                raise
+        return len(rows)
+
+    def ticker_ids(self, session, symbols: Iterable[str]) -> Dict[str, int]:
+        """Resolve symbols to ticker ids, creating missing tickers."""
+        wanted = {symbol.upper() for symbol in symbols}
+        missing = [symbol for symbol in wanted if symbol not in self._ticker_ids]
+        if missing:
+            self._load_ids(session, missing)
+            unknown = [symbol for symbol in missing if symbol not in self._ticker_ids]
+            if unknown:
+                session.execute(
+                    self._insert_ignore(session)(Ticker)
+                    .values([{"symbol": symbol} for symbol in unknown])
+                    .on_conflict_do_nothing(index_elements=["symbol"])
+                )
+                self._load_ids(session, unknown)
+        return {symbol: self._ticker_ids[symbol] for symbol in wanted}
+
+    def forget_tickers(self) -> None:
+        """Drop the cached symbol -> id map (e.g. after tickers were deleted)."""
+        self._ticker_ids.clear()
+
+    def _load_ids(self, session, symbols: List[str]) -> None:
+        for start in range(0, len(symbols), INSERT_BATCH_SIZE):
+            chunk = symbols[start:start + INSERT_BATCH_SIZE]
+            self._ticker_ids.update(
+                session.execute(select(Ticker.symbol, Ticker.id).where(Ticker.symbol.in_(chunk))).all()
+            )
+
+    @staticmethod
+    def _insert_ignore(session):
+        if session.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        return dialect_insert
+
+    def _insert(self, session, rows: List[Dict[str, Any]]) -> None:
+        # Routed by month: the parent table on Postgres, a month table on SQLite
+        self.db.scan_history.insert_rows(session, rows, self.batch_size)
+
+    def _copy(self, session, rows: List[Dict[str, Any]]) -> bool:
+        """Stream rows with COPY into the partitioned parent; False when the connection cannot (non-psycopg2)."""
+        connection = session.connection()
+        if connection.dialect.name != "postgresql":
+            return False
+        cursor = connection.connection.cursor()
+        if not hasattr(cursor, "copy_expert"):
+            return False
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_field(row[column]) for column in COLUMNS))
+            buffer.write("\n")
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY pattern_scans ({', '.join(COLUMNS)}) FROM STDIN", buffer)
+        return True
+
+
+__all__ = ["PatternScanWriter", "scan_row"]
@@ -0,0 +1,435 @@
+"""
+Distributed, sharded pattern-engine scans coordinated through Redis.
+
+A sharded scan splits its symbol list into fixed-size shards and publishes
+them on a Redis work queue. Any process running ``ShardedScan.work`` (the
+coordinator itself plus ``app.jobs.scan_shard_worker`` processes on this or
+other hosts) claims shards, scans them with the regular ``UniverseScanner``
+and writes the shard result back. The coordinator then merges every shard
+with the usual best-pattern-per-symbol dedupe and a bounded top-K heap.
+
+Delivery is at-least-once:
+- a claimed shard holds a lease, renewed while its worker runs it; if the
+  worker dies the lease expires and the shard is re-claimed (up to
+  ``max_attempts``, after which it is recorded as failed)
+- idle workers speculatively re-run one straggling shard that has been
+  running longer than ``steal_after`` seconds (work stealing)
+- the first result written for a shard wins (HSETNX), so duplicates from
+  retries or stealing are harmless; once the scan has left the active set
+  (done or cleaned up) late results are dropped
+
+Scan-wide inputs that cannot travel through Redis (the pattern engine's
+``ScanContext``) are prepared once per scan in each worker process and
+shared by every shard it runs there.
+
+Keys (prefix ``scan:shards:{scan_id}``, expire after ``SHARD_TTL``):
+    :meta      JSON   kind, params, shard count
+    :specs     hash   shard index -> JSON symbol list
+    :pending   list   shard indices waiting for a worker
+    :leases    zset   shard index -> lease deadline
+    :started   zset   shard index -> claim time (straggler detection)
+    :stolen    set    shard indices already speculatively re-run
+    :attempts  hash   shard index -> claim count
+    :results   hash   shard index -> JSON {"results", "errors", "worker"}
+    scan:shards:active  set  scan IDs with outstanding shards
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.core.pattern_engine.scanner import TopK, get_pattern_priority
+from app.services.cache import CacheService
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_SCANS_KEY = "scan:shards:active"
+SHARD_KEY_PREFIX = "scan:shards:{scan_id}"
+SHARD_TTL = 6 * 3600
+
+ShardExecutor = Callable[[List[str], Dict[str, Any]], Awaitable[Dict[str, Any]]]
+ShardPreparer = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+async def _execute_pattern_engine_shard(symbols: List[str], params: Dict[str, Any]) -> Dict[str, Any]:
+    from app.core.pattern_engine.scanner import ScanConfig
+    from app.services.pattern_scanner import pattern_scanner_service
+
+    config = ScanConfig(universe=symbols, **params)
+    return await pattern_scanner_service.engine_scanner.scan_universe(config)
+
+
+async def _prepare_pattern_engine_scan(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the scan context once so shards do not each fetch the benchmark."""
+    from app.core.pattern_engine.scanner import ScanConfig, UniverseScanner
+
+    if params.get("context") is not None:
+        return params
+    context = await UniverseScanner.build_context(ScanConfig(universe=[], **params))
+    return {**params, "context": context}
+
+
+SHARD_EXECUTORS: Dict[str, ShardExecutor] = {
+    "pattern_engine": _execute_pattern_engine_shard,
+}
+SHARD_PREPARERS: Dict[str, ShardPreparer] = {
+    "pattern_engine": _prepare_pattern_engine_scan,
+}
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+def split_shards(symbols: List[str], shard_size: int) -> List[List[str]]:
+    shard_size = max(1, shard_size)
+    return [symbols[i : i + shard_size] for i in range(0, len(symbols), shard_size)]
+
+
+def merge_top_k(shard_payloads: Iterable[Dict[str, Any]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Reduce shard results: keep the best pattern per symbol, then rank.
+
+    Uses the pattern-engine tie-break (priority, score, confidence) for the
+    per-symbol dedupe and the scanner's ``TopK``/``rank_key`` for the final
+    top ``limit``, so sharded and unsharded scans rank identically.
+    """
+    best: Dict[str, Dict[str, Any]] = {}
+    for payload in shard_payloads:
+        for item in payload.get("results", []):
+            symbol = item.get("symbol") or item.get("ticker")
+            current = best.get(symbol)
+            if current is None or _dedupe_key(item) > _dedupe_key(current):
+                best[symbol] = item
+
+    top = TopK(limit or None)
+    for item in best.values():
+        top.push(item)
+    ranked = top.results()
+    for idx, item in enumerate(ranked, start=1):
+        item["rank"] = idx
+    return ranked
+
+
+def _dedupe_key(item: Dict[str, Any]):
+    return (
+        get_pattern_priority(item.get("pattern", "")),
+        item.get("score") or 0.0,
+        item.get("confidence") or 0.0,
+    )
+
+
+class ShardedScan:
+    """Plan, work on and reduce one sharded scan."""
+
+    def __init__(
+        self,
+        cache: CacheService,
+        scan_id: str,
+        *,
+        lease_seconds: float = 120.0,
+        steal_after: float = 30.0,
+        max_attempts: int = 3,
+        ttl: int = SHARD_TTL,
+        local_params: Optional[Dict[str, Any]] = None,
+    ):
+        self.cache = cache
+        self.scan_id = scan_id
+        self.lease_seconds = lease_seconds
+        self.steal_after = steal_after
+        self.max_attempts = max_attempts
+        self.ttl = ttl
+        prefix = SHARD_KEY_PREFIX.format(scan_id=scan_id)
+        self.meta_key = f"{prefix}:meta"
+        self.specs_key = f"{prefix}:specs"
+        self.pending_key = f"{prefix}:pending"
+        self.leases_key = f"{prefix}:leases"
+        self.started_key = f"{prefix}:started"
+        self.stolen_key = f"{prefix}:stolen"
+        self.attempts_key = f"{prefix}:attempts"
+        self.results_key = f"{prefix}:results"
+        self._meta: Optional[Dict[str, Any]] = None
+        self._local_params = dict(local_params or {})  # Merged over the Redis params in this process
+        self._params: Optional[Dict[str, Any]] = None
+        self._prepare_lock = asyncio.Lock()
+
+    @property
+    def _keys(self) -> List[str]:
+        return [
+            self.meta_key,
+            self.specs_key,
+            self.pending_key,
+            self.leases_key,
+            self.started_key,
+            self.stolen_key,
+            self.attempts_key,
+            self.results_key,
+        ]
+
+    # -------------------------------------------------------------- planning
+
+    async def plan(
+        self,
+        symbols: List[str],
+        *,
+        shard_size: int,
+        kind: str = "pattern_engine",
+        params: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Publish the shards and mark the scan active; returns the shard count."""
+        if kind not in SHARD_EXECUTORS:
+            raise ValueError(f"Unknown shard kind: {kind}")
+        shards = split_shards(symbols, shard_size)
+        redis = await self.cache._get_redis()
+        await redis.delete(*self._keys)
+        self._meta = {"kind": kind, "params": params or {}, "shards": len(shards), "symbols": len(symbols)}
+        await redis.set(self.meta_key, json.dumps(self._meta), ex=self.ttl)
+        if shards:
+            await redis.hset(self.specs_key, mapping={str(i): json.dumps(s) for i, s in enumerate(shards)})
+            await redis.rpush(self.pending_key, *[str(i) for i in range(len(shards))])
+            await redis.sadd(ACTIVE_SCANS_KEY, self.scan_id)
+        for key in self._keys[1:]:
+            await redis.expire(key, self.ttl)
+        logger.info("sharded scan %s planned: %s symbols in %s shards", self.scan_id, len(symbols), len(shards))
+        return len(shards)
+
+    async def meta(self) -> Optional[Dict[str, Any]]:
+        if self._meta is None:
+            redis = await self.cache._get_redis()
+            raw = await redis.get(self.meta_key)
+            self._meta = json.loads(raw) if raw else None
+        return self._meta
+
+    async def progress(self) -> Dict[str, Any]:
+        redis = await self.cache._get_redis()
+        meta = await self.meta() or {}
+        return {
+            "scan_id": self.scan_id,
+            "shards": meta.get("shards", 0),
+            "done": await redis.hlen(self.results_key),
+            "pending": await redis.llen(self.pending_key),
+            "leased": await redis.zcard(self.leases_key),
+        }
+
+    async def is_done(self) -> bool:
+        progress = await self.progress()
+        return progress["done"] >= progress["shards"]
+
+    async def is_active(self) -> bool:
+        redis = await self.cache._get_redis()
+        return bool(await redis.sismember(ACTIVE_SCANS_KEY, self.scan_id))
+
+    # ---------------------------------------------------------------- claims
+
+    async def claim(self) -> Optional[int]:
+        """Claim a pending shard, an expired lease, or steal a straggler."""
+        redis = await self.cache._get_redis()
+        now = time.time()
+
+        index = await redis.lpop(self.pending_key)
+        if index is None:
+            for expired in await redis.zrangebyscore(self.leases_key, "-inf", now):
+                if not await redis.zrem(self.leases_key, expired):
+                    continue  # Only one worker wins the reclaim
+                attempts = int(await redis.hget(self.attempts_key, expired) or 0)
+                if attempts >= self.max_attempts:
+                    logger.warning(
+                        "sharded scan %s: shard %s lost its worker %s times; giving up",
+                        self.scan_id, expired, attempts,
+                    )
+                    await self._give_up(int(expired), "lease expired", "reaper")
+                    continue
+                index = expired
+                break
+        if index is None:
+            for straggler in await redis.zrangebyscore(self.started_key, "-inf", now - self.steal_after):
+                if await redis.hexists(self.results_key, straggler):
+                    continue
+                if await redis.sadd(self.stolen_key, straggler):
+                    logger.info("sharded scan %s: stealing straggler shard %s", self.scan_id, straggler)
+                    index = straggler
+                    break
+        if index is None:
+            return None
+
+        await redis.zadd(self.leases_key, {index: now + self.lease_seconds})
+        await redis.zadd(self.started_key, {index: now})
+        await redis.hincrby(self.attempts_key, index, 1)
+        return int(index)
+
+    async def renew(self, index: int) -> bool:
+        """Extend the lease on a shard this worker is still running."""
+        redis = await self.cache._get_redis()
+        deadline = time.time() + self.lease_seconds
+        return bool(await redis.zadd(self.leases_key, {str(index): deadline}, xx=True, ch=True))
+
+    async def complete(self, index: int, payload: Dict[str, Any], worker_id: str) -> bool:
+        """Write a shard result; returns False if another attempt already did."""
+        if not await self.is_active():
+            return False  # Scan finished or was cleaned up; don't recreate its keys
+        redis = await self.cache._get_redis()
+        record = {
+            "results": payload.get("results", []),
+            "errors": payload.get("errors", {}),
+            "worker": worker_id,
+        }
+        written = await redis.hsetnx(self.results_key, str(index), json.dumps(record, default=str))
+        await redis.expire(self.results_key, self.ttl)
+        await redis.zrem(self.leases_key, str(index))
+        await redis.zrem(self.started_key, str(index))
+        if await self.is_done():
+            await redis.srem(ACTIVE_SCANS_KEY, self.scan_id)
+        return bool(written)
+
+    async def fail(self, index: int, error: str, worker_id: str) -> None:
+        """Re-queue a failed shard, or record it as failed after ``max_attempts``."""
+        redis = await self.cache._get_redis()
+        attempts = int(await redis.hget(self.attempts_key, str(index)) or 0)
+        await redis.zrem(self.leases_key, str(index))
+        await redis.zrem(self.started_key, str(index))
+        if attempts < self.max_attempts:
+            if await self.is_active():
+                await redis.rpush(self.pending_key, str(index))
+            return
+        await self._give_up(index, error, worker_id)
+
+    async def _give_up(self, index: int, error: str, worker_id: str) -> None:
+        symbols = await self.shard_symbols(index)
+        await self.complete(index, {"results": [], "errors": {s: error for s in symbols}}, worker_id)
+
+    async def shard_symbols(self, index: int) -> List[str]:
+        redis = await self.cache._get_redis()
+        raw = await redis.hget(self.specs_key, str(index))
+        return json.loads(raw) if raw else []
+
+    # ---------------------------------------------------------------- workers
+
+    async def work(
+        self,
+        worker_id: Optional[str] = None,
+        *,
+        poll_interval: float = 0.5,
+        executor: Optional[ShardExecutor] = None,
+    ) -> int:
+        """Process shards until the scan is done; returns shards this worker ran."""
+        worker_id = worker_id or default_worker_id()
+        meta = await self.meta()
+        if not meta:
+            return 0
+        if executor is None:
+            executor = SHARD_EXECUTORS[meta["kind"]]
+            params = await self._prepared_params(meta)
+        else:
+            params = {**meta.get("params", {}), **self._local_params}
+        processed = 0
+        while True:
+            index = await self.claim()
+            if index is None:
+                if await self.is_done() or not await self.is_active():
+                    return processed
+                await asyncio.sleep(poll_interval)
+                continue
+            symbols = await self.shard_symbols(index)
+            heartbeat = asyncio.create_task(self._heartbeat(index))
+            try:
+                payload = await executor(symbols, params)
+            except Exception as exc:
+                logger.warning("shard %s/%s failed on %s: %s", self.scan_id, index, worker_id, exc)
+                await self.fail(index, str(exc), worker_id)
+                continue
+            finally:
+                heartbeat.cancel()
+            await self.complete(index, payload, worker_id)
+            processed += 1
+
+    async def _prepared_params(self, meta: Dict[str, Any]) -> Dict[str, Any]:
+        """Executor params for this process, prepared once and shared by local workers."""
+        async with self._prepare_lock:
+            if self._params is None:
+                params = {**meta.get("params", {}), **self._local_params}
+                prepare = SHARD_PREPARERS.get(meta["kind"])
+                self._params = await prepare(params) if prepare else params
+            return self._params
+
+    async def _heartbeat(self, index: int) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.renew(index)
+            except Exception as exc:
+                logger.warning("shard %s/%s lease renewal failed: %s", self.scan_id, index, exc)
+
+    # ---------------------------------------------------------------- reduce
+
+    async def reduce(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        redis = await self.cache._get_redis()
+        raw = await redis.hgetall(self.results_key)
+        payloads = [json.loads(value) for value in raw.values()]
+        errors: Dict[str, str] = {}
+        workers: Dict[str, int] = {}
+        for payload in payloads:
+            errors.update(payload.get("errors") or {})
+            workers[payload.get("worker", "?")] = workers.get(payload.get("worker", "?"), 0) + 1
+        return {"results": merge_top_k(payloads, limit), "errors": errors, "workers": workers}
+
+    async def cleanup(self) -> None:
+        redis = await self.cache._get_redis()
+        await redis.delete(*self._keys)
+        await redis.srem(ACTIVE_SCANS_KEY, self.scan_id)
+
+
+async def run_sharded_scan(
+    cache: CacheService,
+    symbols: List[str],
+    *,
+    shard_size: int,
+    params: Optional[Dict[str, Any]] = None,
+    local_workers: int = 1,
+    limit: Optional[int] = None,
+    timeout: Optional[float] = None,
+    scan_id: Optional[str] = None,
+    lease_seconds: float = 120.0,
+    local_params: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Plan a sharded scan, work on it locally alongside remote workers, and reduce.
+
+    ``local_params`` are passed to this process's executors only (e.g. a
+    prebuilt ``ScanContext``); remote workers prepare their own.
+    """
+    scan_id = scan_id or f"shard-{uuid.uuid4().hex[:12]}"
+    sharded = ShardedScan(cache, scan_id, lease_seconds=lease_seconds, local_params=local_params)
+    shards = await sharded.plan(symbols, shard_size=shard_size, params=params)
+    host = default_worker_id()
+    workers = [sharded.work(f"{host}-local{i}") for i in range(max(1, local_workers))]
+    try:
+        counts = await asyncio.wait_for(asyncio.gather(*workers), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("sharded scan %s timed out; reducing partial results", scan_id)
+        counts = []
+    reduced = await sharded.reduce(limit)
+    await sharded.cleanup()
+    reduced["meta"] = {
+        "scan_id": scan_id,
+        "shards": shards,
+        "local_shards": sum(counts),
+        "workers": reduced.pop("workers"),
+    }
+    return reduced
+
+
+__all__ = [
+    "ACTIVE_SCANS_KEY",
+    "SHARD_EXECUTORS",
+    "SHARD_PREPARERS",
+    "ShardedScan",
+    "merge_top_k",
+    "run_sharded_scan",
+    "split_shards",
+]
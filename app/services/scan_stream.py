@@ -0,0 +1,146 @@
+"""
+Incremental scan events for the streaming scan endpoints.
+
+Each generator yields plain dicts keyed by ``event``:
+
+    start     {"total": n, "as_of": ...}
+    result    {"ticker": ..., "data": {...}}      one per qualifying symbol
+    error     {"ticker": ..., "error": "..."}
+    progress  {"completed": k, "total": n, "hits": h}
+    summary   {"results": [...], "count": ..., "meta": {...}}   optional, last
+
+The API layer only encodes them (NDJSON or SSE); generators stay transport
+agnostic so the Telegram bot or jobs can consume them directly.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.core.pattern_engine.scanner import ScanConfig
+from app.services.pattern_scanner import pattern_scanner_service
+from app.services.universe import universe_service
+
+logger = logging.getLogger(__name__)
+
+ScanEvent = Dict[str, Any]
+
+
+def _utcnow_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def rank_hits(hits: List[Dict[str, Any]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    ranked = sorted(hits, key=lambda item: item.get("score", 0) or 0, reverse=True)
+    return ranked[:limit] if limit else ranked
+
+
+async def stream_pattern_scan(
+    tickers: List[str],
+    *,
+    interval: str = "1day",
+    min_score: float = 6.0,
+    limit: Optional[int] = None,
+    summary: bool = True,
+    meta: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[ScanEvent]:
+    """Run the pattern engine over ``tickers`` and yield events as symbols finish."""
+    started = time.perf_counter()
+    tickers = [t.upper() for t in tickers]
+    config = ScanConfig(
+        universe=tickers,
+        interval=interval,
+        apply_filters=True,
+        apply_scoring=True,
+        min_score=min_score,
+    )
+    total = len(tickers)
+    yield {"event": "start", "total": total, "as_of": _utcnow_iso()}
+
+    hits: List[Dict[str, Any]] = []
+    errors: Dict[str, str] = {}
+    completed = 0
+    async for ticker, best, error in pattern_scanner_service.engine_scanner.iter_scan(config):
+        completed += 1
+        if error:
+            errors[ticker] = str(error)
+            yield {"event": "error", "ticker": ticker, "error": str(error)}
+        elif best:
+            hits.append(best)
+            yield {"event": "result", "ticker": ticker, "data": best}
+        yield {"event": "progress", "completed": completed, "total": total, "hits": len(hits)}
+
+    if summary:
+        results = rank_hits(hits, limit)
+        for idx, item in enumerate(results, start=1):
+            item["rank"] = idx
+        yield {
+            "event": "summary",
+            "as_of": _utcnow_iso(),
+            "results": results,
+            "count": len(results),
+            "errors": errors,
+            "meta": {
+                **(meta or {}),
+                "scanned": total,
+                "hits": len(hits),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            },
+        }
+
+
+async def stream_universe_scan(
+    *,
+    min_score: float = 7.0,
+    max_results: int = 20,
+    pattern_types: Optional[List[str]] = None,
+    summary: bool = True,
+) -> AsyncIterator[ScanEvent]:
+    """
+    Stream ``UniverseService`` scan events.
+
+    A cached scan at the same ``min_score`` is replayed immediately. A fresh
+    scan that runs to completion is cached just like the blocking endpoint.
+    """
+    started = time.perf_counter()
+    cached = None
+    try:
+        cached = await universe_service.get_cached_scan(min_score)
+    except Exception as exc:
+        logger.debug("Universe scan cache lookup failed: %s", exc)
+
+    hits: List[Dict[str, Any]] = []
+    if cached is not None:
+        yield {"event": "start", "total": len(cached), "as_of": _utcnow_iso(), "cached": True}
+        for row in cached:
+            if pattern_types is None or row.get("pattern") in pattern_types:
+                hits.append(row)
+                yield {"event": "result", "ticker": row.get("ticker"), "data": row}
+    else:
+        async for event in universe_service.iter_scan_events(min_score=min_score, pattern_types=pattern_types):
+            if event["event"] == "result":
+                hits.append(event["data"])
+            yield event
+        try:
+            await universe_service.store_scan(min_score, rank_hits(hits))
+        except Exception as exc:
+            logger.debug("Universe scan cache store failed: %s", exc)
+
+    if summary:
+        results = rank_hits(hits, max_results)
+        yield {
+            "event": "summary",
+            "as_of": _utcnow_iso(),
+            "results": results,
+            "count": len(results),
+            "meta": {
+                "cached": cached is not None,
+                "hits": len(hits),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            },
+        }
+
+
+__all__ = ["ScanEvent", "rank_hits", "stream_pattern_scan", "stream_universe_scan"]
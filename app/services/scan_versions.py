@@ -0,0 +1,127 @@
+"""
+Per-symbol input versions for change-aware (incremental) EOD scans.
+
+After a symbol is scanned we store the version of its inputs next to its
+result. The next run recomputes the versions and only rescans symbols whose
+inputs changed; everything else carries its previous result forward.
+
+- data version:   last bar timestamp + hash of the OHLCV bars
+- config version: hash of detector settings, the build SHA (detector code)
+                  and the benchmark (SPY) data version, which drives the
+                  market-regime inputs every symbol shares
+
+Key:
+    scan:versions:{name}   hash  symbol -> JSON {"data", "config", "result", "scanned_at"}
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.cache import CacheService
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_KEY_TEMPLATE = "scan:versions:{name}"
+VERSIONS_TTL = 14 * 24 * 3600
+
+
+def data_version(payload: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Version of a price payload, or None when it has no bars."""
+    if not payload or not payload.get("c"):
+        return None
+    digest = hashlib.sha1()
+    for field in ("o", "h", "l", "c", "v"):
+        values = payload.get(field) or []
+        digest.update(np.asarray(values, dtype=np.float64).tobytes())
+    timestamps = payload.get("t") or []
+    last_bar = str(timestamps[-1]) if len(timestamps) else str(len(payload["c"]))
+    return f"{last_bar}:{digest.hexdigest()[:16]}"
+
+
+def config_version(**inputs: Any) -> str:
+    canonical = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha1(canonical.encode()).hexdigest()[:16]
+
+
+class ScanVersionStore:
+    """Stored input versions and last results for one scan family."""
+
+    def __init__(self, cache: CacheService, name: str = "eod", ttl: int = VERSIONS_TTL):
+        self.cache = cache
+        self.key = VERSIONS_KEY_TEMPLATE.format(name=name)
+        self.ttl = ttl
+
+    async def load(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        symbols = list(symbols)
+        if not symbols:
+            return {}
+        try:
+            redis = await self.cache._get_redis()
+            raw = await redis.hmget(self.key, symbols)
+        except Exception as exc:
+            logger.warning("Scan version load failed: %s", exc)
+            return {}
+        stored: Dict[str, Dict[str, Any]] = {}
+        for symbol, value in zip(symbols, raw):
+            if value:
+                try:
+                    stored[symbol] = json.loads(value)
+                except (json.JSONDecodeError, TypeError):
+                    continue
+        return stored
+
+    async def partition(
+        self,
+        versions: Dict[str, Optional[str]],
+        config: str,
+    ) -> Tuple[List[str], Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Split symbols into (to rescan, carried-over results).
+
+        A symbol is carried over only when its data version is known and both
+        versions match what was stored with its last result.
+        """
+        stored = await self.load(versions)
+        changed: List[str] = []
+        carried: Dict[str, Optional[Dict[str, Any]]] = {}
+        for symbol, version in versions.items():
+            previous = stored.get(symbol)
+            if version and previous and previous.get("data") == version and previous.get("config") == config:
+                carried[symbol] = previous.get("result")
+            else:
+                changed.append(symbol)
+        return changed, carried
+
+    async def record(
+        self,
+        results: Dict[str, Optional[Dict[str, Any]]],
+        versions: Dict[str, Optional[str]],
+        config: str,
+    ) -> None:
+        """Store the result and input versions of freshly scanned symbols."""
+        scanned_at = datetime.now(timezone.utc).isoformat()
+        mapping = {
+            symbol: json.dumps(
+                {"data": versions[symbol], "config": config, "result": result, "scanned_at": scanned_at},
+                default=str,
+            )
+            for symbol, result in results.items()
+            if versions.get(symbol)
+        }
+        if not mapping:
+            return
+        try:
+            redis = await self.cache._get_redis()
+            await redis.hset(self.key, mapping=mapping)
+            await redis.expire(self.key, self.ttl)
+        except Exception as exc:
+            logger.warning("Scan version write failed: %s", exc)
+
+
+__all__ = ["ScanVersionStore", "config_version", "data_version"]
@@ -3,17 +3,20 @@ Universe scanner that evaluates VCP patterns across the daily universe.
 """
 from __future__ import annotations
 
-import asyncio
 import logging
 import time
+from dataclasses import replace
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
+from app.config import get_settings
 from app.core.classifiers import minervini_trend_template
 from app.core.detectors.vcp_detector import VCPDetector
 from app.core.detector_base import PatternResult as DetectorPatternResult
+from app.core.pattern_engine.scanner import TopK, get_pattern_priority
+from app.core.prefilter import PrefilterConfig
 from app.core.metrics import (
     compute_atr,
     last_valid,
@@ -21,7 +24,9 @@ from app.core.metrics import (
     relative_strength_metrics,
 )
 from app.services import universe_data
+from app.services.adaptive_concurrency import ConcurrencyGate, bounded_map, concurrency_gate, pool_size
 from app.services.market_data import market_data_service
+from app.services.universe_prefilter import prefilter_universe
 from app.services.universe_store import universe_store
 from app.utils.build_info import resolve_build_sha
 from app.telemetry.metrics import (
@@ -37,6 +42,10 @@ def _has_prices(payload: Optional[Dict[str, Any]]) -> bool:
     return bool(payload and payload.get("c"))
 
 
+def _hit_rank(item: Dict[str, Any]) -> tuple:
+    return (item["legend_score"], get_pattern_priority(item.get("pattern") or "VCP"))
+
+
 def _utcnow_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
@@ -49,14 +58,22 @@ class ScannerService:
         *,
         max_symbols: int = 600,
         bars: int = 320,
-        max_concurrency: int = 8,
+        max_concurrency: Optional[int] = None,
         min_confidence: float = 0.45,
+        prefilter: Optional[PrefilterConfig] = None,
     ) -> None:
         self.max_symbols = max_symbols
         self.output_bars = bars
         self.max_concurrency = max_concurrency
         self.detector = VCPDetector()
         self.min_confidence = min_confidence
+        self.prefilter_config = prefilter or PrefilterConfig()
+
+    def _prefilter_for(self, minervini_trend: bool) -> PrefilterConfig:
+        """Phase-1 screens for one scan; the Minervini screens only apply when it asks for them."""
+        if minervini_trend:
+            return self.prefilter_config
+        return replace(self.prefilter_config, trend_template=False, max_pct_from_high=None, min_rs_rating=None)
 
     async def run_daily_vcp_scan(
         self,
@@ -94,10 +111,24 @@ class ScannerService:
         self._record_cache_metric(spy_series)
         spy_closes = spy_series.get("c", []) if _has_prices(spy_series) else []
 
-        sem = asyncio.Semaphore(self.max_concurrency)
+        sem = concurrency_gate(self.max_concurrency)
         missing_data_symbols: List[str] = []
-        tasks = [
-            self._scan_symbol(
+        payloads: Dict[str, Optional[Dict[str, Any]]] = {}
+        prefilter_summary: Optional[Dict[str, Any]] = None
+        candidates = symbols
+        if get_settings().scan_prefilter_enabled:
+            screened, payloads = await prefilter_universe(
+                symbols,
+                config=self._prefilter_for(minervini_trend),
+                bars=self.output_bars,
+                max_concurrency=self.max_concurrency,
+            )
+            missing_data_symbols.extend(screened.missing)
+            candidates = screened.survivors
+            prefilter_summary = screened.summary()
+
+        async def scan(symbol: str) -> Optional[Dict[str, Any]]:
+            return await self._scan_symbol(
                 symbol,
                 universe_meta.get(symbol, {}),
                 spy_closes,
@@ -105,15 +136,16 @@ class ScannerService:
                 missing_data_symbols,
                 minervini_trend=minervini_trend,
                 vcp=vcp,
+                price_data=payloads.pop(symbol, None),
             )
-            for symbol in symbols
-        ]
-        raw_results = await asyncio.gather(*tasks)
-        results = [item for item in raw_results if item]
-        results.sort(key=lambda item: item["legend_score"], reverse=True)
-
-        total_hits = len(results)
-        limited_hits = results[:limit]
+
+        top = TopK(limit, key=_hit_rank)
+        async for item in bounded_map(scan, candidates, pool_size(self.max_concurrency)):
+            if item:
+                top.push(item)
+
+        total_hits = top.seen
+        limited_hits = top.results()
         remaining_slots = max(limit - len(limited_hits), 0)
         placeholders = self._missing_data_results(missing_data_symbols, remaining_slots)
         final_results = limited_hits + placeholders
@@ -124,24 +156,32 @@ class ScannerService:
             len(final_results),
             duration * 1000,
         )
-        return self._response(started, len(symbols), final_results, total_hits=total_hits)
+        return self._response(
+            started,
+            len(symbols),
+            final_results,
+            total_hits=total_hits,
+            prefilter=prefilter_summary,
+        )
 
     async def _scan_symbol(
         self,
         symbol: str,
         metadata: Dict[str, Any],
         spy_closes: List[float],
-        sem: asyncio.Semaphore,
+        sem: ConcurrencyGate,
         missing_symbols: List[str],
         minervini_trend: bool = False,
         vcp: bool = True,
+        price_data: Optional[Dict[str, Any]] = None,
     ) -> Optional[Dict[str, Any]]:
         async with sem:
-            price_data = await market_data_service.get_time_series(
-                ticker=symbol,
-                interval="1day",
-                outputsize=self.output_bars,
-            )
+            if price_data is None:
+                price_data = await market_data_service.get_time_series(
+                    ticker=symbol,
+                    interval="1day",
+                    outputsize=self.output_bars,
+                )
             self._record_cache_metric(price_data)
             if not _has_prices(price_data):
                 missing_symbols.append(symbol)
@@ -193,7 +233,7 @@ class ScannerService:
                 else:
                     return None
 
-            payload = self._build_result(symbol, df, detection, spy_closes)
+            payload = self._build_result(symbol, df, detection, spy_closes, price_data, metadata)
             return payload
 
     def _build_result(
@@ -202,6 +242,8 @@ class ScannerService:
         df: pd.DataFrame,
         detection: DetectorPatternResult,
         spy_closes: List[float],
+        price_data: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         closes = df["close"].tolist()
         highs = df["high"].tolist()
@@ -413,18 +455,22 @@ class ScannerService:
         results: List[Dict[str, Any]],
         *,
         total_hits: int = 0,
+        prefilter: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         duration_ms = (time.perf_counter() - started) * 1000
+        meta: Dict[str, Any] = {
+            "build_sha": resolve_build_sha(),
+            "duration_ms": round(duration_ms, 2),
+            "result_count": len(results),
+            "total_hits": total_hits,
+        }
+        if prefilter is not None:
+            meta["prefilter"] = prefilter
         return {
             "as_of": _utcnow_iso(),
             "universe_size": universe_size,
             "results": results,
-            "meta": {
-                "build_sha": resolve_build_sha(),
-                "duration_ms": round(duration_ms, 2),
-                "result_count": len(results),
-                "total_hits": total_hits,
-            },
+            "meta": meta,
         }
 
 
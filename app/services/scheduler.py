@@ -20,6 +20,62 @@ def _ensure_job(id: str, func: Callable, trigger: CronTrigger):
         scheduler.remove_job(id)
     scheduler.add_job(func, trigger=trigger, id=id, replace_existing=True)
 
+async def _universe_panel_job():
+    """Publish the shared universe price panel ahead of the EOD scan"""
+    try:
+        from app.services.panel_store import refresh_universe_panel
+
+        stats = await refresh_universe_panel()
+        logger.info(f"Universe panel refreshed: {stats}")
+    except Exception as e:
+        logger.error(f"Universe panel refresh failed: {e}")
+
+async def _rs_history_job():
+    """Rank the universe and store the day's RS ratings"""
+    try:
+        from app.services.rs_history import materialize_rs_history
+
+        stats = await materialize_rs_history()
+        logger.info(f"RS history materialized: {stats}")
+    except Exception as e:
+        logger.error(f"RS history job failed: {e}")
+
+async def _scan_history_job():
+    """Roll up yesterday's pattern scans, add partitions and apply retention"""
+    try:
+        from app.services.scan_history import maintain_scan_history
+
+        stats = await maintain_scan_history()
+        logger.info(f"Scan history maintained: {stats}")
+    except Exception as e:
+        logger.error(f"Scan history job failed: {e}")
+
+async def _predictive_warm_job(pre_open: bool = False):
+    """Refresh the most requested tickers before their cache entries expire"""
+    try:
+        from app.services.cache_warmer import get_cache_warmer
+
+        stats = await get_cache_warmer().warm_predictive(pre_open=pre_open)
+        logger.info(f"Predictive cache warm: {stats}")
+    except Exception as e:
+        logger.error(f"Predictive cache warm failed: {e}")
+
+async def _pre_open_warm_job():
+    await _predictive_warm_job(pre_open=True)
+
+async def _keyspace_analytics_job():
+    """Sample the Redis keyspace for per-prefix memory and TTL analytics"""
+    try:
+        from app.services.cache_analytics import get_keyspace_sampler
+
+        snapshot = await get_keyspace_sampler().run_pass()
+        logger.info(
+            f"Keyspace sampled: {snapshot['sampled_keys']} keys in {snapshot['duration']}s "
+            f"(complete: {snapshot['complete']})"
+        )
+    except Exception as e:
+        logger.error(f"Keyspace analytics job failed: {e}")
+
 async def _watchlist_monitor_job():
     """Wrapper for watchlist monitoring job"""
     try:
@@ -43,6 +99,20 @@ def start_scheduler():
 
     logger.info("Starting APScheduler for EOD scanning, universe refresh, and watchlist monitoring")
     
+    # Shared price panel: 4:02 PM ET Mon-Fri (read by the EOD scan prefilter)
+    _ensure_job(
+        "universe_panel_refresh",
+        _universe_panel_job,
+        CronTrigger(day_of_week="mon-fri", hour=16, minute=2),
+    )
+
+    # RS history: 4:03 PM ET Mon-Fri (reads the shared panel; scans read its snapshot)
+    _ensure_job(
+        "rs_history",
+        _rs_history_job,
+        CronTrigger(day_of_week="mon-fri", hour=16, minute=3),
+    )
+
     # EOD scan: 4:05 PM ET Mon-Fri
     _ensure_job(
         "eod_scan",
@@ -50,6 +120,32 @@ def start_scheduler():
         CronTrigger(day_of_week="mon-fri", hour=16, minute=5),
     )
     
+    # Scan history rollup and retention: 12:30 AM ET daily (the previous UTC day has ended)
+    _ensure_job(
+        "scan_history_maintenance",
+        _scan_history_job,
+        CronTrigger(hour=0, minute=30),
+    )
+
+    # Predictive cache warming: 9:15 AM ET pre-open, then every 10 minutes in session
+    _ensure_job(
+        "predictive_warm_pre_open",
+        _pre_open_warm_job,
+        CronTrigger(day_of_week="mon-fri", hour=9, minute=15),
+    )
+    _ensure_job(
+        "predictive_warm",
+        _predictive_warm_job,
+        CronTrigger(day_of_week="mon-fri", hour="9-15", minute="*/10"),
+    )
+
+    # Keyspace analytics: every 15 minutes
+    _ensure_job(
+        "keyspace_analytics",
+        _keyspace_analytics_job,
+        CronTrigger(minute="*/15"),
+    )
+
     # Universe refresh: 8:00 PM ET Sunday
     _ensure_job(
         "universe_refresh",
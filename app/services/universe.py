@@ -5,11 +5,13 @@ Manages stock universe (S&P 500 + NASDAQ 100) and bulk scanning operations.
 """
 import httpx
 import logging
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import asyncio
 
 from app.config import get_settings
+from app.core.pattern_engine.context import ScanContext
+from app.services.adaptive_concurrency import concurrency_gate
 from app.services.cache import get_cache_service
 from app.services.universe_store import universe_store
 
@@ -203,106 +205,25 @@ class UniverseService:
         """
         try:
             # Check if we have a recent scan cached
-            cache_key = f"universe:scan:min{min_score}"
-            cached = await self.cache._get_redis()
-            cached_scan = await cached.get(cache_key)
-            
-            if cached_scan:
-                import json
-                results = json.loads(cached_scan)
-                logger.info(f"✅ Loaded cached universe scan: {len(results)} results")
-                return results[:max_results]
+            cached_scan = await self.get_cached_scan(min_score)
+            if cached_scan is not None:
+                logger.info(f"✅ Loaded cached universe scan: {len(cached_scan)} results")
+                return cached_scan[:max_results]
             
             logger.info("🔍 Starting universe scan... (this may take a while)")
 
-            # Get universe
-            universe = await self.get_full_universe()
-            logger.info(f"📊 Scanning {len(universe)} tickers from universe (SP500 + NASDAQ100)")
-
-            # Scan in batches to avoid overwhelming APIs
-            from app.core.pattern_detector import PatternDetector
-            from app.services.market_data import market_data_service
-
-            detector = PatternDetector()
             results = []
-            batch_size = 10
-            delay_between_batches = 1  # seconds
+            async for event in self.iter_scan_events(min_score=min_score, pattern_types=pattern_types):
+                if event["event"] == "result":
+                    results.append(event["data"])
 
-            for i in range(0, len(universe), batch_size):  # Scan ALL tickers in universe
-                batch = universe[i:i+batch_size]
-                logger.info(f"📊 Scanning batch {i//batch_size + 1} ({len(batch)} tickers)...")
-                
-                # Process batch
-                for item in batch:
-                    ticker = item["ticker"]
-                    
-                    try:
-                        # Try cache first
-                        cached_pattern = await self.cache.get_pattern(ticker, "1day")
-                        
-                        if cached_pattern:
-                            # Use cached result
-                            from app.core.pattern_detector import PatternResult
-                            from datetime import datetime
-                            if isinstance(cached_pattern.get("timestamp"), str):
-                                cached_pattern["timestamp"] = datetime.fromisoformat(cached_pattern["timestamp"])
-                            
-                            pattern_result = PatternResult(**cached_pattern)
-                        else:
-                            # Fetch and analyze (uses smart fallback)
-                            price_data = await market_data_service.get_time_series(
-                                ticker=ticker,
-                                interval="1day",
-                                outputsize=500
-                            )
-
-                            if not price_data:
-                                continue
-
-                            # Get SPY for RS calculation (uses smart fallback)
-                            spy_data = await market_data_service.get_time_series("SPY", "1day", 500)
-                            
-                            # Analyze
-                            pattern_result = await detector.analyze_ticker(ticker, price_data, spy_data)
-                            
-                            if pattern_result:
-                                # Cache result
-                                await self.cache.set_pattern(ticker, "1day", pattern_result.to_dict())
-                        
-                        # Add to results if meets criteria
-                        if pattern_result and pattern_result.score >= min_score:
-                            if pattern_types is None or pattern_result.pattern in pattern_types:
-                                results.append({
-                                    "ticker": ticker,
-                                    "pattern": pattern_result.pattern,
-                                    "score": pattern_result.score,
-                                    "entry": pattern_result.entry,
-                                    "stop": pattern_result.stop,
-                                    "target": pattern_result.target,
-                                    "risk_reward": pattern_result.risk_reward,
-                                    "current_price": pattern_result.current_price,
-                                    "source": item["source"],
-                                    "chart_url": pattern_result.chart_url
-                                })
-                                
-                                logger.info(f"✅ {ticker}: {pattern_result.pattern} ({pattern_result.score}/10)")
-                        
-                    except Exception as e:
-                        logger.debug(f"⚠️ Error scanning {ticker}: {e}")
-                        continue
-                
-                # Delay between batches
-                if i + batch_size < len(universe):
-                    await asyncio.sleep(delay_between_batches)
-            
             # Sort by score descending
             results.sort(key=lambda x: x["score"], reverse=True)
             
             logger.info(f"✅ Universe scan complete: {len(results)} setups found (min score: {min_score})")
             
             # Cache results for 24 hours
-            import json
-            await cached.setex(cache_key, 24 * 3600, json.dumps(results))
+            await self.store_scan(min_score, results)
             
             return results[:max_results]
             
@@ -310,6 +231,145 @@ class UniverseService:
             logger.error(f"❌ Universe scan failed: {e}")
             return []
 
+    async def get_cached_scan(self, min_score: float) -> Optional[List[Dict[str, Any]]]:
+        """Return the ranked results of a recent scan at ``min_score``, if cached."""
+        import json
+
+        redis = await self.cache._get_redis()
+        cached_scan = await redis.get(f"universe:scan:min{min_score}")
+        return json.loads(cached_scan) if cached_scan else None
+
+    async def store_scan(self, min_score: float, results: List[Dict[str, Any]]) -> None:
+        """Cache ranked scan results for 24 hours."""
+        import json
+
+        redis = await self.cache._get_redis()
+        await redis.setex(f"universe:scan:min{min_score}", 24 * 3600, json.dumps(results))
+
+    async def iter_scan_events(
+        self,
+        min_score: float = 7.0,
+        pattern_types: Optional[List[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Scan the universe and yield events as each ticker finishes.
+
+        Yields ``start``, then per ticker an optional ``result`` (qualifying
+        setup) or ``error`` followed by ``progress``. Closing the iterator
+        early (e.g. a streaming client disconnects) cancels pending tickers.
+        Results are unsorted; ``scan_universe`` ranks and caches them.
+        """
+        # Get universe
+        universe = await self.get_full_universe()
+        logger.info(f"📊 Scanning {len(universe)} tickers from universe (SP500 + NASDAQ100)")
+
+        from app.core.pattern_detector import PatternDetector
+        from app.services.market_data import market_data_service
+
+        # Phase 1: vectorized prefilter so only plausible setups reach the detector
+        payloads: Dict[str, Optional[Dict[str, Any]]] = {}
+        if settings.scan_prefilter_enabled:
+            from app.core.prefilter import PrefilterConfig
+            from app.services.universe_prefilter import prefilter_universe
+
+            screened, payloads = await prefilter_universe(
+                [item["ticker"] for item in universe],
+                config=PrefilterConfig.liquidity_only(),
+                bars=500,
+            )
+            survivors = set(screened.survivors)
+            universe = [item for item in universe if item["ticker"].upper() in survivors]
+            logger.info(
+                f"🧮 Prefilter kept {len(universe)} tickers "
+                f"({len(screened.rejected)} rejected, {len(screened.missing)} missing data)"
+            )
+
+        yield {"event": "start", "total": len(universe), "as_of": datetime.utcnow().isoformat()}
+
+        detector = PatternDetector()
+        gate = concurrency_gate()
+        # Benchmark and regime are shared by every ticker: fetch them once per scan
+        context = await ScanContext.build(
+            bars=500,
+            sectors={item["ticker"].upper(): item["sector"] for item in universe if item.get("sector")},
+            config={"min_score": min_score, "pattern_types": pattern_types},
+        )
+        if payloads:  # Otherwise ranked against the shared panel by ScanContext.build
+            context.add_rs_distribution(payloads.values())
+
+        async def _scan(item: Dict[str, Any]):  # Phase 2: detectors on survivors
+            ticker = item["ticker"]
+            async with gate:
+                try:
+                    # Try cache first
+                    cached_pattern = await self.cache.get_pattern(ticker, "1day")
+                    
+                    if cached_pattern:
+                        # Use cached result
+                        from app.core.pattern_detector import PatternResult
+                        from datetime import datetime
+                        if isinstance(cached_pattern.get("timestamp"), str):
+                            cached_pattern["timestamp"] = datetime.fromisoformat(cached_pattern["timestamp"])
+                        
+                        pattern_result = PatternResult(**cached_pattern)
+                    else:
+                        # Fetch and analyze (uses smart fallback)
+                        price_data = payloads.get(ticker) or await market_data_service.get_time_series(
+                            ticker=ticker,
+                            interval="1day",
+                            outputsize=500
+                        )
+
+                        if not price_data:
+                            return ticker, None, None
+
+                        # Analyze against the scan's shared SPY series
+                        pattern_result = await detector.analyze_ticker(ticker, price_data, context.benchmark)
+                        
+                        if pattern_result:
+                            # Cache result
+                            await self.cache.set_pattern(ticker, "1day", pattern_result.to_dict())
+                    
+                    # Keep it if it meets criteria
+                    row = None
+                    if pattern_result and pattern_result.score >= min_score:
+                        if pattern_types is None or pattern_result.pattern in pattern_types:
+                            row = {
+                                "ticker": ticker,
+                                "pattern": pattern_result.pattern,
+                                "score": pattern_result.score,
+                                "entry": pattern_result.entry,
+                                "stop": pattern_result.stop,
+                                "target": pattern_result.target,
+                                "risk_reward": pattern_result.risk_reward,
+                                "current_price": pattern_result.current_price,
+                                "source": item["source"],
+                                "chart_url": pattern_result.chart_url
+                            }
+                            
+                            logger.info(f"✅ {ticker}: {pattern_result.pattern} ({pattern_result.score}/10)")
+                    return ticker, row, None
+
+                except Exception as e:
+                    logger.debug(f"⚠️ Error scanning {ticker}: {e}")
+                    return ticker, None, str(e)
+
+        logger.info(f"📊 Scanning {len(universe)} tickers (adaptive concurrency, limit {gate.limit})...")
+        tasks = [asyncio.ensure_future(_scan(item)) for item in universe]
+        hits = 0
+        try:
+            for completed, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+                ticker, row, error = await next_done
+                if error:
+                    yield {"event": "error", "ticker": ticker, "error": error}
+                elif row:
+                    hits += 1
+                    yield {"event": "result", "ticker": ticker, "data": row}
+                yield {"event": "progress", "completed": completed, "total": len(universe), "hits": hits}
+        finally:
+            for task in tasks:
+                task.cancel()
+
 
 # Global instance
 universe_service = UniverseService()
@@ -0,0 +1,99 @@
+"""
+Phase-1 universe loading and prefiltering for the scanners.
+
+Fetches price history for a symbol list once, builds a ``UniversePanel`` and
+runs the vectorized prefilter. The fetched payloads are returned alongside the
+result so phase 2 can reuse them instead of going back to the cache.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import get_settings
+from app.core.prefilter import PrefilterConfig, PrefilterResult, run_prefilter
+from app.core.universe_panel import UniversePanel, build_panel
+from app.services.adaptive_concurrency import concurrency_gate
+from app.services.market_data import market_data_service
+from app.services.panel_store import get_panel_store
+
+logger = logging.getLogger(__name__)
+
+PricePayloads = Dict[str, Optional[Dict[str, Any]]]
+
+
+async def load_price_payloads(
+    symbols: List[str],
+    *,
+    interval: str = "1day",
+    bars: int = 320,
+    max_concurrency: Optional[int] = None,
+) -> PricePayloads:
+    """Fetch time series for every symbol through the shared concurrency gate."""
+    sem = concurrency_gate(max_concurrency)
+
+    async def _fetch(symbol: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        async with sem:
+            try:
+                payload = await market_data_service.get_time_series(
+                    ticker=symbol,
+                    interval=interval,
+                    outputsize=bars,
+                )
+            except Exception as exc:
+                logger.debug("Prefilter fetch failed for %s: %s", symbol, exc)
+                payload = None
+            return symbol, payload
+
+    pairs = await asyncio.gather(*(_fetch(symbol) for symbol in symbols))
+    return dict(pairs)
+
+
+async def prefilter_universe(
+    symbols: List[str],
+    *,
+    config: Optional[PrefilterConfig] = None,
+    interval: str = "1day",
+    bars: int = 320,
+    max_concurrency: Optional[int] = None,
+    panel: Optional[UniversePanel] = None,
+) -> Tuple[PrefilterResult, PricePayloads]:
+    """
+    Screen ``symbols`` and return (prefilter result, payloads).
+
+    Daily scans read the shared memory-mapped panel when a fresh one is
+    published, so phase 1 does no I/O at all; the returned payloads are then
+    empty and phase 2 fetches survivors itself. Symbols the shared panel does
+    not cover are passed through rather than reported as missing.
+    """
+    started = time.perf_counter()
+    payloads: PricePayloads = {}
+    shared = False
+    if panel is None and interval == "1day":
+        panel = get_panel_store().attach(max_age=get_settings().universe_panel_max_age)
+        shared = panel is not None
+    if panel is None:
+        payloads = await load_price_payloads(
+            symbols, interval=interval, bars=bars, max_concurrency=max_concurrency
+        )
+        panel = build_panel(payloads, bars)
+    result = run_prefilter(panel, config, requested=symbols)
+    if shared and result.missing:
+        keep = set(result.missing) | set(result.survivors)
+        result.survivors = [s.upper() for s in symbols if s.upper() in keep]
+        result.missing = []
+    logger.info(
+        "prefilter universe=%s shared_panel=%s passed=%s rejected=%s missing=%s duration_ms=%.1f",
+        len(symbols),
+        shared,
+        len(result.survivors),
+        len(result.rejected),
+        len(result.missing),
+        (time.perf_counter() - started) * 1000,
+    )
+    return result, payloads
+
+
+__all__ = ["load_price_payloads", "prefilter_universe"]
@@ -47,7 +47,10 @@ class UniverseStore:
         except Exception as exc:
             logger.debug("universe cache seed failed: %s", exc)
 
-        self._persist_to_database(payload)
+        if self.settings.database_url:
+            from app.services.database import run_db
+
+            await run_db(self._persist_to_database, payload)
         self._memory = payload
         self._seeded = True
         logger.info("Seeded universe metadata: %s symbols", len(payload))
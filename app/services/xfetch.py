@@ -0,0 +1,159 @@
+"""
+Stampede-safe caching with probabilistic early expiration (XFetch).
+
+Entries are stored as an envelope that records how long the value took to
+compute and when it expires:
+
+    {"v": value, "delta": compute_seconds, "expiry": unix_ts}
+
+A reader recomputes early when
+
+    now - delta * beta * ln(random()) >= expiry
+
+so the chance of refreshing grows as expiry approaches, and expensive
+values start refreshing earlier than cheap ones. Whoever decides to
+refresh takes a per-key lock (``SET NX``); everyone else keeps serving the
+current value, so at most one recomputation per key is in flight. On a
+cold miss, readers that lose the lock wait briefly for the winner's value
+before falling back to computing it themselves.
+
+Usage::
+
+    @xfetch_cached(lambda symbol: f"internals:{symbol}", ttl=600)
+    async def build_internals(symbol: str) -> dict: ...
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import random
+import time
+import uuid
+from functools import wraps
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from app.services.cache import CacheService, get_cache_service
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = "xfetch:lock:"
+DEFAULT_BETA = 1.0  # >1 refreshes earlier, <1 later
+COLD_WAIT_SECONDS = 5.0  # How long a cold-miss reader waits on another worker's recompute
+COLD_POLL_SECONDS = 0.05
+
+
+def should_refresh(delta: float, expiry: float, beta: float = DEFAULT_BETA, now: Optional[float] = None) -> bool:
+    """XFetch test: recompute early with probability rising towards expiry."""
+    now = time.time() if now is None else now
+    return now - delta * beta * math.log(1.0 - random.random()) >= expiry
+
+
+def _unwrap(entry: Any) -> Optional[dict]:
+    if isinstance(entry, dict) and "v" in entry and "expiry" in entry:
+        return entry
+    return None
+
+
+async def _store(cache: CacheService, key: str, value: Any, delta: float, ttl: int) -> None:
+    envelope = {"v": value, "delta": round(delta, 4), "expiry": time.time() + ttl}
+    await cache.set(key, envelope, ttl=ttl)
+
+
+async def _acquire(cache: CacheService, key: str, token: str, lock_ttl: int) -> bool:
+    try:
+        redis = await cache._get_redis()
+        return bool(await redis.set(f"{LOCK_PREFIX}{key}", token, nx=True, ex=lock_ttl))
+    except Exception as exc:
+        logger.warning("XFetch lock unavailable for %s: %s", key, exc)
+        return True  # Without Redis there is no one to coordinate with
+
+
+async def _release(cache: CacheService, key: str, token: str) -> None:
+    try:
+        redis = await cache._get_redis()
+        lock_key = f"{LOCK_PREFIX}{key}"
+        if await redis.get(lock_key) == token:
+            await redis.delete(lock_key)
+    except Exception as exc:
+        logger.debug("XFetch lock release failed for %s: %s", key, exc)
+
+
+async def xfetch(
+    cache: CacheService,
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    ttl: int,
+    *,
+    beta: float = DEFAULT_BETA,
+    lock_ttl: Optional[int] = None,
+    force: bool = False,
+) -> Any:
+    """
+    Cached value of ``key``, recomputed by ``compute`` at most once at a time.
+
+    ``None`` results are returned but not cached. ``force`` recomputes
+    unconditionally (still under the lock).
+    """
+    entry = None if force else _unwrap(await cache.get(key))
+    if entry is not None and not should_refresh(entry.get("delta", 0.0), entry["expiry"], beta):
+        return entry["v"]
+
+    token = uuid.uuid4().hex
+    lock_ttl = lock_ttl or max(30, int(ttl))
+    if not await _acquire(cache, key, token, lock_ttl):
+        if entry is not None:
+            return entry["v"]  # Someone else is refreshing; serve the current value
+        deadline = time.monotonic() + COLD_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(COLD_POLL_SECONDS)
+            entry = _unwrap(await cache.get(key))
+            if entry is not None:
+                return entry["v"]
+        logger.warning("XFetch wait for %s timed out; computing locally", key)
+
+    try:
+        started = time.perf_counter()
+        value = await compute()
+        if value is not None:
+            await _store(cache, key, value, time.perf_counter() - started, ttl)
+        return value
+    finally:
+        await _release(cache, key, token)
+
+
+def xfetch_cached(
+    key: Union[str, Callable[..., str]],
+    ttl: int,
+    *,
+    beta: float = DEFAULT_BETA,
+    lock_ttl: Optional[int] = None,
+    cache: Optional[CacheService] = None,
+):
+    """Decorator: serve an async function's result through ``xfetch``.
+
+    ``key`` is a fixed cache key or a callable building one from the call's
+    arguments. Pass ``force_refresh=True`` to the wrapped function to
+    recompute regardless of the cached entry.
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        @wraps(func)
+        async def wrapper(*args, force_refresh: bool = False, **kwargs):
+            cache_key = key(*args, **kwargs) if callable(key) else key
+            return await xfetch(
+                cache or get_cache_service(),
+                cache_key,
+                lambda: func(*args, **kwargs),
+                ttl,
+                beta=beta,
+                lock_ttl=lock_ttl,
+                force=force_refresh,
+            )
+
+        return wrapper
+
+    return decorator
+
+
+__all__ = ["should_refresh", "xfetch", "xfetch_cached"]
@@ -83,6 +83,17 @@ API_QUOTA_REMAINING = Gauge(
     ["service"],
 )
 
+SCAN_CONCURRENCY_LIMIT = Gauge(
+    "scan_concurrency_limit",
+    "Current adaptive concurrency limit for scan fan-out.",
+    ["name"],
+)
+
+EVENT_LOOP_LAG_SECONDS = Gauge(
+    "event_loop_lag_seconds",
+    "Smoothed event-loop scheduling lag observed during scans.",
+)
+
 EXTERNAL_API_ERRORS_TOTAL = Counter(
     "external_api_errors_total",
     "Total errors from external API calls.",
@@ -122,6 +133,30 @@ CACHE_EVICTIONS_TOTAL = Counter(
     ["name"],
 )
 
+CACHE_KEYSPACE_LOOKUPS_TOTAL = Counter(
+    "cache_keyspace_lookups_total",
+    "Redis cache lookups by key prefix and result (hit/miss).",
+    ["prefix", "result"],
+)
+
+CACHE_KEYSPACE_KEYS = Gauge(
+    "cache_keyspace_keys",
+    "Redis keys per key prefix, from the last keyspace sampling pass.",
+    ["prefix"],
+)
+
+CACHE_KEYSPACE_BYTES = Gauge(
+    "cache_keyspace_bytes",
+    "Redis memory per key prefix, from the last keyspace sampling pass.",
+    ["prefix"],
+)
+
+CACHE_KEYSPACE_TTL_KEYS = Gauge(
+    "cache_keyspace_ttl_keys",
+    "Redis keys per key prefix and remaining-TTL bucket.",
+    ["prefix", "bucket"],
+)
+
 # ==================== Database Metrics ====================
 
 DB_CONNECTIONS_TOTAL = Gauge(
@@ -153,6 +188,18 @@ DB_QUERY_ERRORS_TOTAL = Counter(
     ["operation", "error_type"],
 )
 
+DB_EXECUTOR_QUEUE_WAIT_SECONDS = Histogram(
+    "db_executor_queue_wait_seconds",
+    "Time database calls from async code waited for a free DB thread.",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+DB_EXECUTOR_PENDING = Gauge(
+    "db_executor_pending",
+    "Database calls submitted to the DB thread pool and not yet finished.",
+)
+
 # ==================== Health Check Metrics ====================
 
 HEALTH_CHECK_STATUS = Gauge(
@@ -212,6 +259,8 @@ __all__ = [
     "API_QUOTA_USED",
     "API_QUOTA_LIMIT",
     "API_QUOTA_REMAINING",
+    "SCAN_CONCURRENCY_LIMIT",
+    "EVENT_LOOP_LAG_SECONDS",
     "EXTERNAL_API_ERRORS_TOTAL",
     "EXTERNAL_API_DURATION_SECONDS",
     # Cache
@@ -219,12 +268,18 @@ __all__ = [
     "CACHE_MISSES_TOTAL",
     "CACHE_SIZE_BYTES",
     "CACHE_EVICTIONS_TOTAL",
+    "CACHE_KEYSPACE_LOOKUPS_TOTAL",
+    "CACHE_KEYSPACE_KEYS",
+    "CACHE_KEYSPACE_BYTES",
+    "CACHE_KEYSPACE_TTL_KEYS",
     # Database
     "DB_CONNECTIONS_TOTAL",
     "DB_CONNECTIONS_POOL_SIZE",
     "DB_CONNECTIONS_POOL_OVERFLOW",
     "DB_QUERY_DURATION_SECONDS",
     "DB_QUERY_ERRORS_TOTAL",
+    "DB_EXECUTOR_QUEUE_WAIT_SECONDS",
+    "DB_EXECUTOR_PENDING",
     # Health checks
     "HEALTH_CHECK_STATUS",
     "HEALTH_CHECK_DURATION_SECONDS",
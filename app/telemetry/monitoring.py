@@ -159,10 +159,10 @@ class MonitoringService:
         start_time = time.perf_counter()
 
         try:
-            from app.services.database import get_database_service
+            from app.services.database import get_database_service, run_db
 
             db_service = get_database_service()
-            health = db_service.health_check()
+            health = await run_db(db_service.health_check)
 
             status = 1 if health.get("status") == "healthy" else 0
             HEALTH_CHECK_STATUS.labels(component="database").set(status)
@@ -0,0 +1,125 @@
+"""
+Benchmark pattern scan persistence: ORM bulk_save_objects vs PatternScanWriter.
+
+    PYTHONPATH=. python scripts/bench_pattern_scan_writes.py [--rows 10000] [--database-url URL]
+
+Without --database-url a temporary SQLite file is used; pass a PostgreSQL URL
+to measure the COPY path. Each run writes into a fresh set of tables.
+"""
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import delete, text
+
+from app.models import PatternScan, Ticker
+from app.services.database import DatabaseService
+from app.services.scan_persistence import PatternScanWriter
+
+logger = logging.getLogger("bench_pattern_scan_writes")
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+
+def _scans(count: int, symbols: int = 500):
+    rng = random.Random(7)
+    return [
+        {
+            "ticker_symbol": f"SYM{i % symbols:04d}",
+            "pattern": rng.choice(["VCP", "Cup & Handle", "Flat Base"]),
+            "score": round(rng.uniform(5, 10), 2),
+            "entry": 100.0,
+            "stop": 95.0,
+            "target": 120.0,
+            "risk_reward": 4.0,
+            "criteria_met": ["trend_template", "volume_dry_up", "tight_closes"],
+            "analysis": "Benchmark row",
+            "current_price": 101.5,
+            "volume_dry_up": True,
+            "consolidation_days": 30,
+        }
+        for i in range(count)
+    ]
+
+
+def _legacy_write(db: DatabaseService, scans) -> int:
+    """The previous save_pattern_scans_batch: ORM objects + bulk_save_objects."""
+    with db.get_db() as session:
+        symbols = {scan["ticker_symbol"] for scan in scans}
+        tickers = {t.symbol: t for t in session.query(Ticker).filter(Ticker.symbol.in_(symbols)).all()}
+        new = [Ticker(symbol=symbol) for symbol in symbols if symbol not in tickers]
+        if new:
+            session.add_all(new)
+            session.flush()
+            tickers.update({t.symbol: t for t in new})
+        rows = [
+            PatternScan(
+                ticker_id=tickers[data["ticker_symbol"]].id,
+                pattern_type=data["pattern"],
+                score=data["score"],
+                entry_price=data["entry"],
+                stop_price=data["stop"],
+                target_price=data["target"],
+                risk_reward_ratio=data["risk_reward"],
+                criteria_met=list(data["criteria_met"]),
+                analysis=data["analysis"],
+                current_price=data["current_price"],
+                volume_dry_up=data["volume_dry_up"],
+                consolidation_days=data["consolidation_days"],
+            )
+            for data in scans
+        ]
+        session.bulk_save_objects(rows)
+        session.commit()
+        return len(rows)
+
+
+def _reset(db: DatabaseService) -> None:
+    with db.get_db() as session:
+        session.execute(delete(PatternScan))
+        if not db.scan_history.native:
+            for name in db.scan_history.partitions(session.connection()).values():
+                session.execute(text(f"DELETE FROM {name}"))
+        session.execute(delete(Ticker).where(Ticker.symbol.like("SYM%")))
+        session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    url = args.database_url
+    tmpdir = None
+    if url is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+
+    db = DatabaseService(url)
+    db.init_db()
+    scans = _scans(args.rows)
+
+    results = {}
+    for name, write in (
+        ("orm bulk_save_objects", lambda: _legacy_write(db, scans)),
+        ("PatternScanWriter", lambda: PatternScanWriter(db).write(scans)),
+    ):
+        _reset(db)
+        started = time.perf_counter()
+        written = write()
+        elapsed = time.perf_counter() - started
+        results[name] = written / elapsed
+        logger.info("%-24s %6d rows in %.3fs  -> %10.0f rows/s", name, written, elapsed, results[name])
+
+    _reset(db)
+    db.close_db()
+    logger.info("Speedup: %.1fx", results["PatternScanWriter"] / results["orm bulk_save_objects"])
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
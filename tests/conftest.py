@@ -0,0 +1,19 @@
+"""Shared fixtures for the test suite."""
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.services.cache import CacheService
+
+
+@pytest.fixture
+def fake_redis():
+    """In-memory stand-in for the Redis server."""
+    return FakeAsyncRedis(decode_responses=True)
+
+
+@pytest.fixture
+def fake_cache(fake_redis):
+    """CacheService wired to the in-memory Redis."""
+    cache = CacheService("redis://fake")
+    cache.redis = fake_redis
+    return cache
@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+from app.services.adaptive_concurrency import AdaptiveLimiter, bounded_map, concurrency_gate, get_limiter
+
+
+def _limiter(**kwargs):
+    kwargs.setdefault("cooldown", 0.0)
+    return AdaptiveLimiter("test", **kwargs)
+
+
+def test_additive_increase_and_multiplicative_decrease():
+    limiter = _limiter(initial=4, max_limit=10, latency_target=1.0)
+
+    for _ in range(5):  # Roughly one full window of successes
+        limiter.record(0.01)
+    assert limiter.limit == 5
+
+    limiter.on_status(429)
+    assert limiter.limit == 3  # 5 * 0.7
+    limiter.record(5.0)
+    assert limiter.limit == 2
+    limiter.on_status(404)
+    assert limiter.limit == 2
+    assert limiter.stats["throttled"] == 1
+    assert limiter.stats["slow"] == 1
+
+
+def test_decrease_respects_cooldown_and_floor():
+    limiter = AdaptiveLimiter("test", initial=8, cooldown=60.0)
+    limiter.on_status(503)
+    limiter.on_status(503)
+    assert limiter.limit == 5
+
+    floor = _limiter(initial=1)
+    floor.on_status(500)
+    assert floor.limit == 1
+
+
+def test_low_quota_shrinks_ceiling():
+    limiter = _limiter(initial=20, min_limit=2, max_limit=20, quota_floor=0.1)
+    limiter.on_quota("twelvedata", 0.5)
+    assert limiter.limit == 20
+
+    limiter.on_quota("twelvedata", 0.05)
+    assert limiter.limit == 11
+    limiter.on_quota("finnhub", 0.8)  # Another provider still has headroom
+    assert limiter.limit == 20
+
+
+@pytest.mark.asyncio
+async def test_limiter_bounds_in_flight_work():
+    limiter = _limiter(initial=2, max_limit=2)
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        async with limiter:
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(work() for _ in range(10)))
+
+    assert peak == 2
+    assert limiter.in_flight == 0
+    assert limiter.snapshot()["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_hands_its_slot_on():
+    limiter = _limiter(initial=1, max_limit=1)
+    await limiter.acquire()
+    first = asyncio.create_task(limiter.acquire())
+    second = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)  # Both queued
+
+    limiter.release()  # Wakes the first waiter...
+    first.cancel()  # ...which is cancelled before it resumes
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    await asyncio.wait_for(second, timeout=1.0)
+    assert limiter.in_flight == 1
+    limiter.release()
+
+
+@pytest.mark.asyncio
+async def test_failed_block_backs_off():
+    limiter = _limiter(initial=6)
+
+    with pytest.raises(RuntimeError):
+        async with limiter:
+            raise RuntimeError("provider down")
+
+    assert limiter.limit == 4
+    assert limiter.stats["errors"] == 1
+
+
+def test_concurrency_gate_pins_fixed_size():
+    assert isinstance(concurrency_gate(3), asyncio.Semaphore)
+    assert concurrency_gate() is get_limiter()
+
+
+@pytest.mark.asyncio
+async def test_bounded_map_limits_work_in_flight():
+    in_flight = 0
+    peak = 0
+    pulled = []
+
+    def symbols():
+        for idx in range(50):
+            pulled.append(idx)
+            yield idx
+
+    async def work(idx):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return idx * 2
+
+    results = [value async for value in bounded_map(work, symbols(), 4)]
+
+    assert sorted(results) == [idx * 2 for idx in range(50)]
+    assert peak <= 4
+
+    pulled.clear()
+    events = bounded_map(work, symbols(), 4)
+    await events.__anext__()
+    await events.aclose()
+    assert len(pulled) < 50
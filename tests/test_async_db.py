@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services import database as db_mod
+from app.services.database import (
+    AsyncDatabaseService,
+    DatabaseService,
+    cache_query,
+    db_thread_count,
+    run_db,
+)
+from app.telemetry.metrics import DB_EXECUTOR_QUEUE_WAIT_SECONDS
+
+
+@pytest.fixture
+def db():
+    service = DatabaseService("sqlite://")
+    service.init_db()
+    return service
+
+
+def _wait_count(operation):
+    for metric in DB_EXECUTOR_QUEUE_WAIT_SECONDS.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count") and sample.labels.get("operation") == operation:
+                return sample.value
+    return 0.0
+
+
+def test_thread_count_matches_connection_pool(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "4")
+
+    assert db_thread_count("postgresql://u@h/db") == 7
+    assert db_thread_count("sqlite:///./legend_ai.db") == 1
+    assert db_thread_count(None) == 1
+
+
+@pytest.mark.asyncio
+async def test_run_db_keeps_the_event_loop_free():
+    loop_thread = threading.get_ident()
+    ticks = 0
+
+    def slow_query():
+        time.sleep(0.2)
+        return threading.get_ident()
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    before = _wait_count("slow_query")
+    task = asyncio.create_task(ticker())
+    worker_thread = await run_db(slow_query)
+    task.cancel()
+
+    assert worker_thread != loop_thread
+    assert ticks >= 10  # The loop kept running while the query slept
+    assert _wait_count("slow_query") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_facade_awaits_database_methods(db, monkeypatch):
+    monkeypatch.setattr(db_mod, "get_database_service", lambda: db)
+    adb = db_mod.get_async_database_service()
+
+    ticker = await adb.get_or_create_ticker("nvda", "NVIDIA")
+    tickers = await adb.get_tickers()
+    count = await adb.run_session(lambda session: session.execute(db_mod.text("SELECT COUNT(*) FROM tickers")).scalar())
+
+    assert ticker.symbol == "NVDA"
+    assert [row.symbol for row in tickers] == ["NVDA"]
+    assert count == 1
+    assert adb.engine is db.engine
+    assert isinstance(adb, AsyncDatabaseService)
+
+
+@pytest.mark.asyncio
+async def test_cache_query_runs_sync_queries_off_loop_and_caches(fake_cache, monkeypatch):
+    import app.services.cache as cache_mod
+
+    monkeypatch.setattr(cache_mod, "get_cache_service", lambda: fake_cache)
+    calls = []
+
+    class Repo:
+        @cache_query(ttl=60, key_prefix="test")
+        def symbols(self, sector):
+            calls.append(threading.get_ident())
+            return [sector.upper()]
+
+    repo = Repo()
+    assert await repo.symbols("tech") == ["TECH"]
+    assert await repo.symbols("tech") == ["TECH"]
+    assert len(calls) == 1 and calls[0] != threading.get_ident()
@@ -0,0 +1,101 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.backtesting.engine import BacktestConfig, BacktestEngine
+from app.backtesting.strategy import Strategy
+
+
+class Recorder(Strategy):
+    def __init__(self):
+        super().__init__("recorder")
+        self.seen = []
+
+    async def on_data(self, ticker, data, timestamp, portfolio_value, cash):
+        self.seen.append((ticker, timestamp, data))
+        return []
+
+    async def calculate_position_size(self, signal, portfolio_value, cash, current_price):
+        return 0
+
+
+def _history(dates, start=100.0):
+    close = start + np.arange(len(dates), dtype=float)
+    return pd.DataFrame({
+        "timestamp": dates,
+        "open": close,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": 1_000,
+    })
+
+
+def _engine(data):
+    dates = pd.bdate_range("2024-01-01", periods=10)
+    return BacktestEngine(BacktestConfig(
+        strategy=Recorder(),
+        start_date=dates[0].to_pydatetime(),
+        end_date=dates[-1].to_pydatetime(),
+        initial_capital=10_000,
+        universe=list(data),
+    ))
+
+
+def _indexed(data):
+    engine = _engine(data)
+    engine.historical_data = data
+    return engine, engine._index_history()
+
+
+def test_point_in_time_slices_are_views_matching_a_filter():
+    dates = pd.bdate_range("2024-01-01", periods=10)
+    data = {"AAA": _history(dates), "BBB": _history(dates.delete([2, 3]), start=50.0)}
+    engine, trading_dates = _indexed(data)
+
+    for date in trading_dates:
+        for ticker, frame in data.items():
+            view = engine._get_data_up_to_date(ticker, date)
+            expected = frame[frame["timestamp"] <= date]
+            pd.testing.assert_frame_equal(view, expected)
+            assert np.shares_memory(view["close"].to_numpy(), frame["close"].to_numpy())
+
+
+def test_current_prices_come_from_bars_on_that_date():
+    dates = pd.bdate_range("2024-01-01", periods=10)
+    data = {"AAA": _history(dates), "BBB": _history(dates.delete([2]), start=50.0)}
+    engine, trading_dates = _indexed(data)
+
+    engine._update_current_prices(trading_dates[1])
+    assert engine.current_prices == {"AAA": 101.0, "BBB": 51.0}
+
+    engine._update_current_prices(trading_dates[2])  # No BBB bar: keep the last price
+    assert engine.current_prices == {"AAA": 102.0, "BBB": 51.0}
+
+
+def test_unsorted_history_is_sorted_once():
+    dates = pd.bdate_range("2024-01-01", periods=10)
+    shuffled = _history(dates).sample(frac=1, random_state=7)
+    engine, trading_dates = _indexed({"AAA": shuffled})
+
+    view = engine._get_data_up_to_date("AAA", trading_dates[4])
+    assert view["close"].tolist() == [100.0, 101.0, 102.0, 103.0, 104.0]
+    assert engine._get_data_up_to_date("AAA", datetime(2023, 12, 1)) is None
+
+
+@pytest.mark.asyncio
+async def test_run_hands_strategies_growing_windows():
+    dates = pd.bdate_range("2024-01-01", periods=10)
+    data = {"AAA": _history(dates)}
+    engine = _engine(data)
+
+    async def provider(ticker, start, end):
+        return data[ticker]
+
+    engine.config.data_provider = provider
+    await engine.run()
+
+    lengths = [len(window) for _, _, window in engine.strategy.seen]
+    assert lengths == list(range(2, 11))
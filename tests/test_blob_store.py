@@ -0,0 +1,86 @@
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import blobs as blobs_api
+from app.services.blob_store import BlobStore, blob_digest
+from app.services.database import DatabaseService
+from app.services.multi_tier_cache import CacheTier, MultiTierCache
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(str(tmp_path / "blobs"), max_bytes=100)
+
+
+def test_identical_content_is_stored_once_in_a_sharded_path(store):
+    digest = store.put(b"chart-bytes", "image/png")
+
+    assert store.put(b"chart-bytes", "image/png") == digest == blob_digest(b"chart-bytes")
+    path = store.path_for(digest)
+    assert path.relative_to(store.root).parts == (digest[:2], digest[2:4], digest)
+    assert store.read(digest) == b"chart-bytes"
+    assert store.stats()["blobs"] == 1
+    assert os.listdir(store.root / "tmp") == []  # Staged file was renamed into place
+
+
+def test_least_recently_used_blobs_are_evicted_over_budget(store, monkeypatch):
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr("app.services.blob_store.time.time", lambda: next(clock))
+    first = store.put(b"a" * 40, name="first")
+    second = store.put(b"b" * 40)
+    store.get(first)  # First becomes the most recently used
+
+    third = store.put(b"c" * 40)
+
+    assert store.get(second) is None and not store.path_for(second).exists()
+    assert store.get(first) and store.get(third)
+    assert store.resolve("first") == first
+    assert store.stats()["bytes"] == 80
+
+
+def test_refs_expire_and_unlink(store, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.services.blob_store.time.time", lambda: now[0])
+    digest = store.put(b"payload", name="cdn:chart:SPY")
+
+    assert store.resolve("cdn:chart:SPY", max_age=60) == digest
+    now[0] += 61
+    assert store.resolve("cdn:chart:SPY", max_age=60) is None
+    assert store.expire_refs(60) == 1
+    assert store.resolve("cdn:chart:SPY") is None
+    assert store.get(digest) is not None  # Blob outlives the ref until LRU evicts it
+
+
+def test_blob_route_serves_immutable_content_with_etag(store, monkeypatch):
+    monkeypatch.setattr(blobs_api, "get_blob_store", lambda: store)
+    app = FastAPI()
+    app.include_router(blobs_api.router)
+    client = TestClient(app)
+    digest = store.put(b"\x89PNG", "image/png")
+
+    response = client.get(f"/blobs/{digest}")
+    assert response.status_code == 200
+    assert response.content == b"\x89PNG"
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["etag"] == f'"{digest}"'
+    assert "immutable" in response.headers["cache-control"]
+
+    assert client.get(f"/blobs/{digest}", headers={"If-None-Match": f'"{digest}"'}).status_code == 304
+    assert client.get("/blobs/" + "0" * 64).status_code == 404
+    assert client.get("/blobs/..%2Findex.sqlite").status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_cdn_tier_round_trips_through_blob_store(fake_cache, tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    cache = MultiTierCache(fake_cache, DatabaseService("sqlite://"), blob_store=store)
+    await cache.set("chart:NVDA:1day", {"url": "x"}, data_type="chart")
+    await cache.set("chart:NVDA:1week", {"url": "x"}, tier=CacheTier.CDN)
+
+    assert await cache._get_cdn("chart:NVDA:1day") == '{"url": "x"}'
+    assert store.stats()["blobs"] == 1 and store.stats()["refs"] == 2
+    assert await cache._invalidate_cdn("chart:NVDA:1day") == 1
+    assert await cache._get_cdn("chart:NVDA:1day") is None
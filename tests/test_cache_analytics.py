@@ -0,0 +1,64 @@
+import pytest
+
+from app.services import cache_analytics
+from app.services.cache_analytics import KeyspaceSampler, lookup_stats, prefix_of, record_lookup, ttl_bucket
+from app.telemetry.metrics import CACHE_KEYSPACE_BYTES, CACHE_KEYSPACE_TTL_KEYS
+
+PREFIXES = frozenset({"timeseries", "pattern", "ratelimit"})
+
+
+def test_prefix_and_ttl_bucket_classification():
+    assert prefix_of("timeseries:AAPL:1day", PREFIXES) == "timeseries"
+    assert prefix_of("unknown:AAPL", PREFIXES) == "other"
+    assert prefix_of("pattern", PREFIXES) == "other"
+    assert ttl_bucket(-1) == "none"
+    assert ttl_bucket(30_000) == "<1m"
+    assert ttl_bucket(3_600_000) == "<6h"
+    assert ttl_bucket(10 * 86_400_000) == ">=1d"
+
+
+def test_lookups_are_tallied_per_prefix(monkeypatch):
+    monkeypatch.setattr(cache_analytics, "_lookups", {})
+    monkeypatch.setattr(cache_analytics, "_prefixes", PREFIXES)
+    for hit in (True, True, False):
+        record_lookup("pattern:AAPL", hit)
+    record_lookup("misc:x", False)
+
+    assert lookup_stats() == {
+        "other": {"hits": 0, "misses": 1, "hit_rate": 0.0},
+        "pattern": {"hits": 2, "misses": 1, "hit_rate": 66.67},
+    }
+
+
+@pytest.mark.asyncio
+async def test_sampling_pass_aggregates_prefixes_over_scan_steps(fake_cache, fake_redis):
+    for i in range(7):
+        await fake_redis.set(f"timeseries:T{i}:1day", "x" * (10 * (i + 1)), ex=120)
+    await fake_redis.set("ratelimit:1.2.3.4:/api", "5", ex=30)
+    await fake_redis.set("legacy", "y" * 500)
+
+    sampler = KeyspaceSampler(fake_cache, prefixes=PREFIXES, scan_count=2, top_n=2)
+    snapshot = await sampler.run_pass()
+
+    assert snapshot["complete"] and snapshot["sampled_keys"] == 9
+    assert snapshot["bytes_method"] == "strlen"  # fakeredis has no MEMORY USAGE
+    series = snapshot["prefixes"]["timeseries"]
+    assert series["keys"] == 7 and series["bytes"] == 280 and series["ttl"] == {"<5m": 7}
+    assert snapshot["prefixes"]["ratelimit"]["ttl"] == {"<1m": 1}
+    assert snapshot["prefixes"]["other"]["ttl"] == {"none": 1}
+    assert [entry["key"] for entry in snapshot["top_keys"]] == ["legacy", "timeseries:T6:1day"]
+
+    assert CACHE_KEYSPACE_BYTES.labels(prefix="timeseries")._value.get() == 280
+    assert CACHE_KEYSPACE_TTL_KEYS.labels(prefix="timeseries", bucket="<5m")._value.get() == 7
+    assert await cache_analytics.latest_snapshot(fake_cache) == snapshot
+
+
+@pytest.mark.asyncio
+async def test_sampling_stops_at_the_key_budget(fake_cache, fake_redis):
+    for i in range(20):
+        await fake_redis.set(f"pattern:T{i}", "1")
+
+    snapshot = await KeyspaceSampler(fake_cache, prefixes=PREFIXES, scan_count=5, max_keys=10).run_pass()
+
+    assert not snapshot["complete"]
+    assert 10 <= snapshot["sampled_keys"] < 20 and snapshot["dbsize"] == 20
@@ -0,0 +1,44 @@
+import pytest
+
+from app.services.cache import CacheService, cache_tags, detector_version
+from app.services.l1_cache import L1Cache
+
+
+@pytest.mark.asyncio
+async def test_ticker_tag_invalidates_patterns_and_charts(fake_cache, fake_redis):
+    await fake_cache.set_pattern("AAPL", "1day", {"score": 90}, ttl=60)
+    await fake_cache.set_pattern("MSFT", "1day", {"score": 70}, ttl=60)
+    await fake_cache.set_chart("AAPL", "1D", "https://charts/aapl", ttl=60)
+
+    await fake_cache.invalidate_pattern("AAPL")
+
+    assert await fake_cache.get_pattern("AAPL", "1day") is None
+    assert await fake_cache.get_chart("AAPL", "1D") is None
+    assert await fake_cache.get_pattern("MSFT", "1day") == {"score": 70}
+    assert await fake_redis.get("cache:gen:ticker:AAPL") == "1"
+
+
+@pytest.mark.asyncio
+async def test_detector_version_tag_retires_all_pattern_results(fake_cache):
+    await fake_cache.set_pattern("AAPL", "1day", {"score": 90}, ttl=60)
+    await fake_cache.set_pattern("MSFT", "1week", {"score": 70}, ttl=60)
+
+    generations = await fake_cache.invalidate_tags(f"detector:{detector_version()}")
+
+    assert generations == {f"detector:{detector_version()}": 1}
+    assert await fake_cache.get_pattern("AAPL", "1day") is None
+    assert await fake_cache.get_pattern("MSFT", "1week") is None
+
+
+@pytest.mark.asyncio
+async def test_generations_are_read_through_l1(fake_redis):
+    cache = CacheService("redis://fake", l1=L1Cache())
+    cache.redis = fake_redis
+    tags = cache_tags(data_type="price", ticker="aapl")
+
+    first = await cache.tagged_key("ohlcv:AAPL", tags)
+    await fake_redis.set("cache:gen:ticker:AAPL", 7)  # Bumped without a broadcast
+    assert await cache.tagged_key("ohlcv:AAPL", tags) == first == "ohlcv:AAPL:g=0.0"
+
+    await cache.invalidate_tags("ticker:AAPL")
+    assert await cache.tagged_key("ohlcv:AAPL", tags) == "ohlcv:AAPL:g=0.8"
@@ -95,3 +95,27 @@ def test_resolve_interval_normalizes_timeframe(monkeypatch):
     service = _service(monkeypatch)
     interval = service._resolve_interval("1week")
     assert interval == "1W"
+
+
+def test_cached_chart_uses_local_blob_only_while_it_exists(monkeypatch, tmp_path):
+    from app.services import blob_store as blob_store_mod
+
+    service = _service(monkeypatch)
+    store = blob_store_mod.BlobStore(str(tmp_path / "blobs"))
+    monkeypatch.setattr(blob_store_mod, "get_blob_store", lambda: store)
+    monkeypatch.delenv("RAILWAY_PUBLIC_DOMAIN", raising=False)
+    key = "chartimg:AAPL:1D:None:None:None"
+    upstream = "https://r2.chart-img.com/chart.png"
+    digest = store.put(b"png", "image/png", name=key)
+
+    # No public URL: nothing can reach /blobs, so the upstream URL is used
+    assert asyncio.run(service._mirror_chart(upstream, key)) == upstream
+    assert asyncio.run(service._local_chart_url(key, upstream)) == upstream
+
+    monkeypatch.setenv("RAILWAY_PUBLIC_DOMAIN", "legend.example.com")
+    assert asyncio.run(service._local_chart_url(key, upstream)) == (
+        f"https://legend.example.com/blobs/{digest}"
+    )
+
+    store.delete(digest)  # Evicted, or never on this replica
+    assert asyncio.run(service._local_chart_url(key, upstream)) == upstream
@@ -0,0 +1,192 @@
+import types
+
+import pytest
+
+from app.core.pattern_engine.context import ScanContext
+from app.services import eod_scanner as eod_module
+from app.services.eod_scanner import EODScanner
+from app.services.scan_checkpoint import HEARTBEAT_TTL, ScanCheckpoint, get_active_scan
+
+
+def _rows(symbols):
+    return [types.SimpleNamespace(symbol=s, sector="Tech", industry="Chips") for s in symbols]
+
+
+class _StubPatternScanner:
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.contexts = []
+        self.fail_on = fail_on
+
+    async def scan_with_pattern_engine(self, tickers, **kwargs):
+        self.calls.append(list(tickers))
+        self.contexts.append(kwargs.get("context"))
+        if self.fail_on and self.fail_on in tickers:
+            raise RuntimeError("provider outage")
+        return {
+            "results": [
+                {"symbol": t, "pattern": "VCP", "score": 8.0 + i / 10} for i, t in enumerate(tickers)
+            ]
+        }
+
+
+def _scanner(monkeypatch, fake_cache, symbols, pattern_scanner):
+    monkeypatch.setattr(
+        eod_module,
+        "get_database_service",
+        lambda: types.SimpleNamespace(get_universe_symbols=lambda: _rows(symbols)),
+    )
+    monkeypatch.setattr(eod_module, "get_cache_service", lambda: fake_cache)
+
+    async def _build(**kwargs):
+        return ScanContext(sectors=kwargs.get("sectors") or {})
+
+    monkeypatch.setattr(ScanContext, "build", _build)
+    scanner = EODScanner()
+    scanner.scanner_service = pattern_scanner
+    scanner.settings = types.SimpleNamespace(
+        scan_prefilter_enabled=False,
+        scan_sharding_enabled=False,
+        scan_incremental_enabled=False,
+    )
+    scanner.CHUNK_SIZE = 2
+    return scanner
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_is_retried_on_resume(monkeypatch, fake_cache):
+    symbols = ["AAA", "BBB", "CCC", "DDD"]
+    first = _StubPatternScanner(fail_on="CCC")
+    scanner = _scanner(monkeypatch, fake_cache, symbols, first)
+
+    summary = await scanner.run_scan(scan_date="20240102")
+    assert summary["patterns_found"] == 2
+    assert summary["errors"]
+
+    retry = _StubPatternScanner()
+    scanner.scanner_service = retry
+    summary = await scanner.run_scan(scan_date="20240102")
+
+    assert retry.calls == [["CCC", "DDD"]]
+    assert summary["patterns_found"] == 4
+    assert summary["scan_id"] == "eod-20240102"
+    assert await get_active_scan(fake_cache) is None
+
+
+@pytest.mark.asyncio
+async def test_chunks_share_one_scan_context(monkeypatch, fake_cache):
+    stub = _StubPatternScanner()
+    scanner = _scanner(monkeypatch, fake_cache, ["AAA", "BBB", "CCC", "DDD", "EEE"], stub)
+
+    await scanner.run_scan(scan_date="20240102")
+
+    assert len(stub.contexts) == 3
+    assert all(context is stub.contexts[0] for context in stub.contexts)
+    assert stub.contexts[0].sector("eee") == "Tech"
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_chunks_and_stops_between_them(monkeypatch, fake_cache):
+    stub = _StubPatternScanner()
+    scanner = _scanner(monkeypatch, fake_cache, ["AAA", "BBB", "CCC", "DDD"], stub)
+
+    events = []
+    stream = scanner.stream_scan(scan_date="20240102")
+    async for event in stream:
+        events.append(event)
+        if event["event"] == "progress":
+            break  # A cancel request lands after the first chunk
+    await stream.aclose()
+
+    assert [e["event"] for e in events] == ["start", "result", "result", "progress"]
+    assert events[-1]["completed"] == 2 and events[-1]["total"] == 4
+    assert stub.calls == [["AAA", "BBB"]]
+    progress = await fake_cache.get("scan:progress:eod-20240102")
+    assert progress["status"] == "cancelled"
+    assert await get_active_scan(fake_cache) is None
+
+    summary = await scanner.run_scan(scan_date="20240102")
+    assert stub.calls[1:] == [["CCC", "DDD"]]
+    assert summary["patterns_found"] == 4
+
+
+@pytest.mark.asyncio
+async def test_fresh_run_discards_checkpoint(monkeypatch, fake_cache):
+    stub = _StubPatternScanner()
+    scanner = _scanner(monkeypatch, fake_cache, ["AAA", "BBB", "CCC"], stub)
+
+    await scanner.run_scan(scan_date="20240102")
+    await scanner.run_scan(scan_date="20240102")
+    assert len(stub.calls) == 2  # second run found everything checkpointed
+
+    await scanner.run_scan(scan_date="20240102", resume=False)
+    assert len(stub.calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_partial_summary_reports_progress(monkeypatch, fake_cache):
+    scanner = _scanner(monkeypatch, fake_cache, ["AAA"], _StubPatternScanner())
+    checkpoint = ScanCheckpoint(fake_cache, "eod-20240103")
+    await checkpoint.start(scan_date="20240103", total_symbols=4, candidates=4, completed=0)
+    await checkpoint.record(
+        {"AAA": {"symbol": "AAA", "pattern": "VCP", "score": 9.0}, "BBB": None},
+        completed=2,
+    )
+
+    active = await get_active_scan(fake_cache)
+    partial = await scanner.partial_summary(active)
+
+    assert partial["status"] == "running"
+    assert partial["patterns_found"] == 1
+    assert partial["progress"]["percent"] == 50.0
+    assert partial["progress"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_crashed_scan_stops_reporting_as_running(fake_cache):
+    checkpoint = ScanCheckpoint(fake_cache, "eod-20240104")
+    await checkpoint.start(scan_date="20240104", total_symbols=4, candidates=4, completed=0)
+    redis = await fake_cache._get_redis()
+    assert 0 < await redis.ttl("scan:active") <= HEARTBEAT_TTL  # Expires unless chunks keep landing
+
+    checkpoint.progress["updated_at"] = "2024-01-04T21:00:00+00:00"  # Last chunk long ago
+    await fake_cache.set(checkpoint.progress_key, checkpoint.progress)
+
+    assert await get_active_scan(fake_cache) is None
+    assert (await fake_cache.get(checkpoint.progress_key))["status"] == "stale"
+    assert await fake_cache.get("scan:active") is None
+
+    resumed = ScanCheckpoint(fake_cache, "eod-20240104")
+    await resumed.start(scan_date="20240104")
+    assert resumed.progress["resumed"] is True
+    assert (await get_active_scan(fake_cache))["status"] == "running"
+
+
+@pytest.mark.asyncio
+async def test_incremental_scan_only_rescans_changed_symbols(monkeypatch, fake_cache):
+    bars = {s: [10.0, 11.0, 12.0] for s in ["AAA", "BBB", "CCC"]}
+
+    async def fake_payloads(symbols, **kwargs):
+        return {s: {"c": bars[s], "t": [1, 2, 3]} for s in symbols}
+
+    async def fake_spy(*args, **kwargs):
+        return {"c": [400.0, 401.0], "t": [2, 3]}
+
+    monkeypatch.setattr(eod_module, "load_price_payloads", fake_payloads)
+    monkeypatch.setattr(eod_module.market_data_service, "get_time_series", fake_spy)
+    stub = _StubPatternScanner()
+    scanner = _scanner(monkeypatch, fake_cache, list(bars), stub)
+
+    first = await scanner.run_scan(scan_date="20240105", incremental=True)
+    assert first["rescanned"] == 3 and first["carried_over"] == 0
+
+    bars["BBB"] = [10.0, 11.0, 12.5]  # New data for one symbol only
+    second = await scanner.run_scan(scan_date="20240106", incremental=True)
+
+    assert stub.calls[-1] == ["BBB"]
+    assert second["rescanned"] == 1
+    assert second["carried_over"] == 2
+    assert second["patterns_found"] == 3
+
+    third = await scanner.run_scan(scan_date="20240107", incremental=False)
+    assert third["rescanned"] == 3
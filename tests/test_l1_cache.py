@@ -0,0 +1,170 @@
+import asyncio
+
+import pytest
+
+from app.services.cache import CacheService
+from app.services.l1_cache import INVALIDATION_CHANNEL, MISSING, L1Cache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_bound_and_ttl_cap():
+    clock = _Clock()
+    l1 = L1Cache(max_entries=2, max_ttl=10, clock=clock)
+
+    l1.set("a", {"v": 1}, ttl=3600)
+    l1.set("b", 2, ttl=5)
+    assert l1.get("a") == {"v": 1}  # "a" is now most recently used
+    l1.set("c", 3)
+
+    assert l1.get("b") is MISSING
+    assert l1.evictions == 1
+
+    clock.now = 10.5  # Past max_ttl even though Redis TTL was an hour
+    assert l1.get("a") is MISSING
+    assert l1.stats()["hits"] == 1
+
+
+def test_fill_is_dropped_when_the_key_was_written_during_the_read():
+    l1 = L1Cache(max_entries=2)
+
+    version = l1.version("a")
+    l1.invalidate("a")  # A write lands while the reader is at Redis
+    l1.set("a", "old", version=version)
+    assert l1.get("a") is MISSING
+    l1.set("a", "new", version=l1.version("a"))
+    assert l1.get("a") == "new"
+
+    version = l1.version("b")
+    l1.invalidate_pattern("b*")
+    l1.set("b", "old", version=version)
+    assert l1.get("b") is MISSING
+
+    version = l1.version("c")
+    l1.invalidate("x", "y", "z")  # Old versions fold into the floor: stays conservative
+    l1.set("c", "maybe-old", version=version)
+    assert l1.get("c") is MISSING
+
+
+@pytest.mark.asyncio
+async def test_get_racing_a_set_does_not_cache_the_old_value(fake_redis):
+    cache = CacheService("redis://fake", l1=L1Cache(broadcast=False))
+    cache.redis = fake_redis
+    await cache.set("universe", ["OLD"])
+    pipeline = fake_redis.pipeline
+
+    class _RacingPipeline:
+        def __init__(self, *args, **kwargs):
+            self.inner = pipeline(*args, **kwargs)
+
+        async def __aenter__(self):
+            await self.inner.__aenter__()
+            return self
+
+        async def __aexit__(self, *exc):
+            return await self.inner.__aexit__(*exc)
+
+        def __getattr__(self, name):
+            return getattr(self.inner, name)
+
+        async def execute(self):
+            result = await self.inner.execute()
+            await cache.set("universe", ["NEW"])  # Lands after Redis answered the read
+            return result
+
+    fake_redis.pipeline = _RacingPipeline
+    assert await cache.get("universe") == ["OLD"]
+    fake_redis.pipeline = pipeline
+
+    assert await cache.get("universe") == ["NEW"]
+
+
+def test_readers_get_their_own_top_level_copy():
+    l1 = L1Cache()
+    l1.set("ts", {"c": [1, 2], "cached": False})
+
+    first = l1.get("ts")
+    first["cached"] = True
+
+    assert l1.get("ts")["cached"] is False
+
+
+def test_messages_from_other_workers_invalidate():
+    here, there = L1Cache(), L1Cache()
+    for key in ("ohlcv:AAPL:1d", "ohlcv:MSFT:1d", "universe"):
+        here.set(key, 1)
+
+    assert here.apply(here.message(["universe"])) == 0  # Own messages are ignored
+    assert here.apply(there.message(["universe"])) == 1
+    assert here.apply(there.message(pattern="ohlcv:AAPL:*")) == 1
+    assert len(here) == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_service_reads_through_l1(fake_redis):
+    l1 = L1Cache(max_ttl=60)
+    cache = CacheService("redis://fake", l1=l1)
+    cache.redis = fake_redis
+
+    await cache.set("timeseries:AAPL:1day", {"c": [1.0]}, ttl=5)
+    assert "timeseries:AAPL:1day" not in l1
+    assert await cache.get("timeseries:AAPL:1day") == {"c": [1.0]}
+
+    await fake_redis.delete("timeseries:AAPL:1day")  # Served from L1 now
+    assert await cache.get("timeseries:AAPL:1day") == {"c": [1.0]}
+    assert l1._entries["timeseries:AAPL:1day"][0] - l1.clock() <= 5
+
+    await cache.delete("timeseries:AAPL:1day")
+    assert await cache.get("timeseries:AAPL:1day") is None
+
+
+@pytest.mark.asyncio
+async def test_writes_are_broadcast(fake_redis):
+    cache = CacheService("redis://fake", l1=L1Cache())
+    cache.redis = fake_redis
+    pubsub = fake_redis.pubsub()
+    await pubsub.subscribe(INVALIDATION_CHANNEL)
+    await pubsub.get_message(timeout=1.0)  # Subscribe confirmation
+
+    await cache.set("universe", ["AAPL"])
+
+    message = None
+    for _ in range(20):
+        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0.1)
+        if message:
+            break
+        await asyncio.sleep(0)
+    assert message is not None
+    other = L1Cache()
+    other.set("universe", ["STALE"])
+    other.apply(message["data"])
+    assert other.get("universe") is MISSING
+    await pubsub.aclose()
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_reset_evicts_l1_progress(fake_redis):
+    from app.services.scan_checkpoint import ScanCheckpoint, get_active_scan
+
+    cache = CacheService("redis://fake", l1=L1Cache(broadcast=False))
+    cache.redis = fake_redis
+    old = ScanCheckpoint(cache, "eod-20240102")
+    await old.start(scan_date="20240102")
+    await old.record({"AAA": {"score": 8.0}}, completed=1)
+    assert (await get_active_scan(cache))["hits"] == 1  # Now held in L1
+
+    fresh = ScanCheckpoint(cache, "eod-20240102")
+    await fresh.reset()
+    await fresh.start(scan_date="20240102")
+
+    assert fresh.progress["resumed"] is False
+    assert fresh.progress.get("hits", 0) == 0
+    await fresh.finish()
+    assert await get_active_scan(cache) is None
+    assert await cache.get("scan:active") is None
@@ -0,0 +1,95 @@
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import text
+
+from app.services.blob_store import BlobStore
+from app.services.database import DatabaseService
+from app.services.multi_tier_cache import CacheTier, MultiTierCache
+
+
+@pytest.fixture
+def tiered(fake_cache, tmp_path):
+    db = DatabaseService("sqlite://")
+    db.init_db()
+    cache = MultiTierCache(fake_cache, db, blob_store=BlobStore(str(tmp_path / "blobs")))
+    return cache
+
+
+def _hit_count(cache, key):
+    with cache.db_service.get_db() as db:
+        return db.execute(text("SELECT hit_count FROM cache_entries WHERE cache_key = :key"), {"key": key}).scalar()
+
+
+@pytest.mark.asyncio
+async def test_warm_hits_are_buffered_and_flushed_in_one_batch(tiered):
+    await tiered.set("universe:meta", {"count": 3}, tier=CacheTier.WARM)
+
+    for _ in range(2):
+        assert await tiered.get("universe:meta") == {"count": 3}
+
+    assert _hit_count(tiered, "universe:meta") == 0  # Nothing written per hit
+    assert await tiered.flush_hits() == 1
+    assert _hit_count(tiered, "universe:meta") == 2
+    assert await tiered.flush_hits() == 0
+
+
+@pytest.mark.asyncio
+async def test_hits_flush_periodically_after_traffic_stops(tiered, monkeypatch):
+    monkeypatch.setattr(tiered, "HIT_FLUSH_INTERVAL", 0.05)
+    await tiered.set("universe:meta", {"count": 3}, tier=CacheTier.WARM)
+
+    await tiered.get("universe:meta")  # The last hit; nothing else arrives
+    for _ in range(50):
+        if _hit_count(tiered, "universe:meta") == 1:
+            break
+        await asyncio.sleep(0.02)
+
+    assert _hit_count(tiered, "universe:meta") == 1
+    await tiered.close()
+    assert tiered._flusher is None
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_the_batch(tiered, monkeypatch):
+    await tiered.set("universe:meta", {"count": 3}, tier=CacheTier.WARM)
+    for _ in range(2):
+        await tiered.get("universe:meta")
+
+    def _down(params):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(tiered, "_flush_hits_sync", _down)
+    assert await tiered.flush_hits() == 0
+    await tiered.get("universe:meta")
+
+    monkeypatch.undo()
+    assert await tiered.flush_hits() == 1
+    assert _hit_count(tiered, "universe:meta") == 3
+
+
+@pytest.mark.asyncio
+async def test_promotion_uses_the_hit_read(tiered, fake_redis):
+    await tiered.set("pattern:AAPL", {"score": 88}, data_type="pattern", tier=CacheTier.WARM)
+
+    for _ in range(MultiTierCache.PROMOTION_THRESHOLD):
+        await tiered.get("pattern:AAPL", data_type="pattern")
+
+    assert tiered.metrics.promotions == 1
+    assert await fake_redis.get("pattern:AAPL") == '{"score": 88}'
+
+
+@pytest.mark.asyncio
+async def test_warm_queries_run_on_the_db_executor(tiered, monkeypatch):
+    threads = []
+    read = tiered._read_warm_sync
+
+    def _read(key):
+        threads.append(threading.current_thread().name)
+        return read(key)
+
+    monkeypatch.setattr(tiered, "_read_warm_sync", _read)
+    await tiered.get("missing")
+
+    assert threads and threads[0].startswith("db_")  # Shares run_db's thread limit
@@ -0,0 +1,135 @@
+import pytest
+
+from app.services import market_data as market_data_module
+from app.services.market_data import MarketDataService
+from app.services.negative_cache import NegativeCache
+
+SERIES = {"c": [1.0] * 60}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def service(fake_cache, monkeypatch):
+    svc = MarketDataService()
+    svc.cache = fake_cache
+    svc.negative_cache = NegativeCache(fake_cache, base_ttl=60, max_ttl=600, clock=_Clock())
+    for name in ("twelvedata_api_key", "finnhub_api_key", "alpha_vantage_api_key"):
+        monkeypatch.setattr(svc.settings, name, None)
+    return svc
+
+
+def _provider(calls, name, result=None, transient=False):
+    async def _fetch(ticker, interval, *args):
+        calls.append(name)
+        if transient:
+            market_data_module._mark_transient()
+        return result
+
+    return _fetch
+
+
+@pytest.mark.asyncio
+async def test_skip_window_doubles_per_miss_up_to_the_cap(fake_cache):
+    clock = _Clock()
+    negative = NegativeCache(fake_cache, base_ttl=60, max_ttl=200, clock=clock)
+
+    for expected in (60, 120, 200, 200):
+        entries = await negative.lookup("zzzz", "1day", ["yahoo"])
+        await negative.record("ZZZZ", "1day", ["yahoo"], entries)
+        entry = (await negative.lookup("ZZZZ", "1day", ["yahoo"]))["yahoo"]
+        assert entry["until"] - clock.now == expected
+        assert negative.blocked({"yahoo": entry}) == {"yahoo"}
+        clock.now = entry["until"]
+        assert negative.blocked({"yahoo": entry}) == set()
+
+
+def _all_providers(service, monkeypatch, calls, result=None):
+    for name in ("twelvedata_api_key", "finnhub_api_key", "alpha_vantage_api_key"):
+        monkeypatch.setattr(service.settings, name, "key")
+
+    async def _allowed(source):
+        return True
+
+    service._check_rate_limit = _allowed
+    for name, attr in (
+        ("twelvedata", "_get_from_twelvedata"),
+        ("finnhub", "_get_from_finnhub"),
+        ("alphavantage", "_get_from_alpha_vantage"),
+        ("yahoo", "_get_from_yahoo"),
+    ):
+        setattr(service, attr, _provider(calls, name, result))
+
+
+@pytest.mark.asyncio
+async def test_dead_symbol_short_circuits_until_retry(service, monkeypatch):
+    calls = []
+    _all_providers(service, monkeypatch, calls)
+
+    assert await service.get_time_series("GONE", "1day", 500) is None
+    assert await service.get_time_series("GONE", "1day", 500) is None
+    assert calls == ["yahoo", "twelvedata", "finnhub", "alphavantage"]
+
+    dead = await service.negative_cache.dead_symbols()
+    assert [(row["symbol"], row["strikes"]) for row in dead] == [("GONE", 1)]
+
+    service.negative_cache.clock.now += 61
+    service._get_from_yahoo = _provider(calls, "yahoo", dict(SERIES))
+    assert await service.get_time_series("GONE", "1day", 500)
+    assert await service.negative_cache.dead_symbols() == []
+
+
+@pytest.mark.asyncio
+async def test_untried_providers_keep_a_symbol_alive(service, monkeypatch):
+    calls = []
+    service._get_from_yahoo = _provider(calls, "yahoo")  # No API keys configured
+
+    assert await service.get_time_series("THIN", "1day", 500) is None
+    assert await service.negative_cache.dead_symbols() == []
+
+    _all_providers(service, monkeypatch, calls)
+
+    async def _over_quota(source):
+        return source.value != "twelvedata"
+
+    service._check_rate_limit = _over_quota
+    service.negative_cache.clock.now += 61
+    assert await service.get_time_series("THIN", "1day", 500) is None
+    assert await service.negative_cache.dead_symbols() == []
+    assert calls == ["yahoo", "yahoo", "finnhub", "alphavantage"]
+
+
+@pytest.mark.asyncio
+async def test_empty_provider_is_skipped_but_symbol_is_not_dead(service, monkeypatch):
+    calls = []
+    monkeypatch.setattr(service.settings, "twelvedata_api_key", "key")
+
+    async def _allowed(source):
+        return True
+
+    service._check_rate_limit = _allowed
+    service._get_from_twelvedata = _provider(calls, "twelvedata")
+    service._get_from_yahoo = _provider(calls, "yahoo", transient=True)  # Yahoo throttled
+
+    assert await service.get_time_series("ODD", "1day", 50) is None
+    assert await service.negative_cache.dead_symbols() == []
+    service._get_from_yahoo = _provider(calls, "yahoo", dict(SERIES))
+    assert await service.get_time_series("ODD", "1day", 50)
+    assert calls == ["twelvedata", "yahoo", "yahoo"]  # TwelveData skipped on the second call
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_not_negatively_cached(service):
+    calls = []
+    service._get_from_yahoo = _provider(calls, "yahoo", transient=True)
+
+    assert await service.get_time_series("SPY", "1day", 500) is None
+    assert await service.get_time_series("SPY", "1day", 500) is None
+    assert calls == ["yahoo", "yahoo"]
+    assert await service.negative_cache.lookup("SPY", "1day", ["yahoo"]) == {}
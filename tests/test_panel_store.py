@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from app.core.universe_panel import build_panel
+from app.services import universe_prefilter
+from app.services.panel_store import PanelStore
+
+
+def _payload(closes, volume=1_000_000.0):
+    closes = [float(c) for c in closes]
+    return {
+        "c": closes,
+        "o": closes,
+        "h": [c * 1.01 for c in closes],
+        "l": [c * 0.99 for c in closes],
+        "v": [volume] * len(closes),
+        "t": [f"2024-01-{i + 1:02d}" for i in range(len(closes))],
+    }
+
+
+def _panel():
+    return build_panel(
+        {"AAA": _payload([1, 2, 3, 4]), "BBB": _payload([5, 6])},
+        bars=4,
+    )
+
+
+def test_publish_and_attach_roundtrip(tmp_path):
+    store = PanelStore(tmp_path)
+    version = store.publish(_panel())
+
+    attached = store.attach()
+    assert store.current_version() == version
+    assert attached.symbols == ["AAA", "BBB"]
+    assert list(attached.series("BBB")) == [5.0, 6.0]
+    assert attached.dates[-1] == "2024-01-04"
+    assert isinstance(attached.close.base, np.memmap) or isinstance(attached.close, np.memmap)
+
+
+def test_attached_panel_is_read_only(tmp_path):
+    store = PanelStore(tmp_path)
+    store.publish(_panel())
+    attached = store.attach()
+
+    with pytest.raises((ValueError, TypeError)):
+        attached.close[0, -1] = 99.0
+
+
+def test_attach_is_cached_until_a_new_version(tmp_path):
+    store = PanelStore(tmp_path)
+    store.publish(_panel())
+    first = store.attach()
+    assert store.attach() is first
+
+    reader = PanelStore(tmp_path)
+    store.publish(build_panel({"CCC": _payload([7, 8, 9])}, bars=3), dtype="float32")
+    assert store.attach() is not first
+    fresh = reader.attach()
+    assert fresh.symbols == ["CCC"]
+    assert fresh.close.dtype == np.float32
+
+
+def test_publish_prunes_old_versions_and_honours_max_age(tmp_path):
+    store = PanelStore(tmp_path, keep_versions=2)
+    for _ in range(4):
+        store.publish(_panel())
+
+    assert len(list(tmp_path.glob("panel-*.npy"))) == 2
+    assert store.attach(max_age=3600) is not None
+    assert store.attach(max_age=-1) is None
+
+
+@pytest.mark.asyncio
+async def test_prefilter_uses_shared_panel_without_fetching(tmp_path, monkeypatch):
+    store = PanelStore(tmp_path)
+    store.publish(_panel())
+    monkeypatch.setattr(universe_prefilter, "get_panel_store", lambda: store)
+
+    async def no_fetch(*args, **kwargs):
+        raise AssertionError("phase 1 should read the shared panel")
+
+    monkeypatch.setattr(universe_prefilter, "load_price_payloads", no_fetch)
+
+    result, payloads = await universe_prefilter.prefilter_universe(["AAA", "NEW"])
+
+    assert payloads == {}
+    assert result.survivors == ["AAA", "NEW"]
+    assert result.missing == []
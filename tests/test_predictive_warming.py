@@ -0,0 +1,84 @@
+import pytest
+
+from app.services import cache_warmer as cache_warmer_module
+from app.services.access_tracker import AccessTracker
+from app.services.cache_warmer import CacheWarmer
+from app.services.market_data import market_data_service
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_recent_demand_outranks_old_demand(fake_cache):
+    clock = _Clock()
+    tracker = AccessTracker(fake_cache, half_life=3600, capacity=2, clock=clock)
+
+    for _ in range(4):
+        tracker.record("aapl")
+    tracker.record("msft", "1week")
+    await tracker.flush()
+
+    clock.now += 3 * 3600  # AAPL's four hits decay to half a hit
+    tracker.record("NVDA")
+    tracker.record("NVDA")
+    await tracker.flush()
+
+    top = await tracker.top(10)
+    assert [(ticker, interval) for ticker, interval, _ in top] == [("NVDA", "1day"), ("AAPL", "1day")]
+    assert top[0][2] == pytest.approx(2.0)
+    assert top[1][2] == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_weights_are_rescaled_after_many_half_lives(fake_cache):
+    clock = _Clock()
+    tracker = AccessTracker(fake_cache, half_life=1, clock=clock)
+    tracker.record("SPY")
+    await tracker.flush()
+
+    clock.now += 100
+    tracker.record("QQQ")
+    await tracker.flush()
+
+    top = await tracker.top(2)
+    assert top[0][:2] == ("QQQ", "1day") and top[0][2] == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_warmer_refreshes_hot_expiring_entries_within_budget(fake_cache, fake_redis, monkeypatch):
+    tracker = AccessTracker(fake_cache)
+    for ticker, hits in (("AAA", 5), ("BBB", 4), ("CCC", 3), ("DDD", 2)):
+        for _ in range(hits):
+            tracker.record(ticker)
+    await tracker.flush()
+    await fake_redis.set("timeseries:AAA:1day", "{}", ex=60)  # Expiring soon
+    await fake_redis.set("timeseries:BBB:1day", "{}", ex=86400)  # Fresh
+    # CCC and DDD are not cached at all
+
+    fetched = []
+
+    async def _get_time_series(ticker, interval="1day", outputsize=500, prefer_free=False, refresh=False):
+        assert refresh and prefer_free
+        fetched.append(ticker)
+        return {"c": [1.0]}
+
+    async def _usage():
+        return {"twelvedata": {"remaining": 100}, "finnhub": {"remaining": -5}}
+
+    monkeypatch.setattr(cache_warmer_module, "get_access_tracker", lambda: tracker)
+    monkeypatch.setattr(market_data_service, "cache", fake_cache)
+    monkeypatch.setattr(market_data_service, "get_time_series", _get_time_series)
+    monkeypatch.setattr(market_data_service, "get_usage_stats", _usage)
+
+    warmer = CacheWarmer()
+    monkeypatch.setattr(warmer.settings, "cache_predictive_quota_share", 0.02)  # 100 * 0.02 = 2 fetches
+    stats = await warmer.warm_predictive()
+
+    assert fetched == ["AAA", "CCC"]
+    assert stats == {"candidates": 4, "budget": 2, "refreshed": 2, "fresh": 1, "failed": 0, "deferred": 1}
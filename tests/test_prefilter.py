@@ -0,0 +1,159 @@
+import numpy as np
+import pytest
+
+from app.core.classifiers import minervini_trend_template
+from app.core.prefilter import (
+    PrefilterConfig,
+    percentile_ratings,
+    run_prefilter,
+    trend_template_mask,
+)
+from app.core.universe_panel import build_panel
+from app.services import universe_prefilter
+from app.services.market_data import market_data_service
+from app.services.panel_store import PanelStore
+from app.services.scanner import ScannerService
+from app.services.universe_store import universe_store
+
+
+@pytest.fixture(autouse=True)
+def _isolated_panel_store(tmp_path, monkeypatch):
+    store = PanelStore(tmp_path / "panel")
+    monkeypatch.setattr(universe_prefilter, "get_panel_store", lambda: store)
+    return store
+
+
+def _payload(closes, volume=1_000_000.0):
+    closes = [float(c) for c in closes]
+    return {
+        "c": closes,
+        "o": closes,
+        "h": [c * 1.01 for c in closes],
+        "l": [c * 0.99 for c in closes],
+        "v": [volume] * len(closes),
+    }
+
+
+def _uptrend(bars=320, start=50.0, step=0.2):
+    return [start + step * i for i in range(bars)]
+
+
+def _downtrend(bars=320, start=150.0, step=0.2):
+    return [start - step * i for i in range(bars)]
+
+
+def test_build_panel_right_aligns_and_pads():
+    panel = build_panel({"aaa": _payload([1, 2, 3]), "BBB": _payload([4, 5]), "NONE": None}, bars=4)
+
+    assert panel.symbols == ["AAA", "BBB"]
+    assert panel.row("aaa") == 0
+    assert np.isnan(panel.close[0, 0])
+    assert panel.close[0, -1] == 3
+    assert list(panel.series("BBB")) == [4.0, 5.0]
+    assert list(panel.lengths) == [3, 2]
+
+
+def test_trend_mask_matches_scalar_template():
+    rng = np.random.default_rng(7)
+    series = {
+        "UP": _uptrend(),
+        "DOWN": _downtrend(),
+        "NOISE": list(100 + np.cumsum(rng.normal(0, 1, 320))),
+    }
+    panel = build_panel({k: _payload(v) for k, v in series.items()}, bars=320)
+    mask = trend_template_mask(panel.close)
+
+    for symbol, closes in series.items():
+        expected = minervini_trend_template(closes)["pass"]
+        assert bool(mask[panel.row(symbol)]) == expected
+
+
+def test_percentile_ratings_rank_strictly_below():
+    ratings = percentile_ratings(np.array([3.0, 1.0, np.nan, 2.0]))
+
+    assert ratings[1] == 0.0
+    assert ratings[0] == pytest.approx(66.6666, rel=1e-3)
+    assert np.isnan(ratings[2])
+
+
+def test_prefilter_rejects_with_reasons_and_passes_short_history():
+    payloads = {
+        "UP": _payload(_uptrend()),
+        "DOWN": _payload(_downtrend()),
+        "THIN": _payload(_uptrend(), volume=10.0),
+        "NEW": _payload([10.0, 10.5, 11.0]),
+    }
+    panel = build_panel(payloads, bars=320)
+    result = run_prefilter(panel, PrefilterConfig(), requested=list(payloads) + ["GONE"])
+
+    assert result.survivors == ["UP", "NEW"]
+    assert "trend_template" in result.rejected["DOWN"]
+    assert "off_highs" in result.rejected["DOWN"]
+    assert result.rejected["THIN"] == ["liquidity"]
+    assert result.missing == ["GONE"]
+    summary = result.summary()
+    assert summary["evaluated"] == 4
+    assert summary["passed"] == 2
+
+
+def test_liquidity_only_config_keeps_bearish_setups():
+    payloads = {
+        "UP": _payload(_uptrend()),
+        "DOWN": _payload(_downtrend()),
+        "THIN": _payload(_downtrend(), volume=10.0),
+    }
+    panel = build_panel(payloads, bars=320)
+
+    assert run_prefilter(panel).survivors == ["UP"]
+    screened = run_prefilter(panel, PrefilterConfig.liquidity_only())
+    assert screened.survivors == ["UP", "DOWN"]
+    assert screened.rejected == {"THIN": ["liquidity"]}
+
+
+def test_prefilter_rs_screen_needs_a_cohort():
+    payloads = {f"S{i:02d}": _payload(_uptrend(step=0.05 + 0.01 * i)) for i in range(25)}
+    panel = build_panel(payloads, bars=320)
+
+    ranked = run_prefilter(panel, PrefilterConfig(min_rs_rating=70.0))
+    assert 0 < len(ranked.survivors) < 25
+    assert all(reasons == ["rs_rating"] for reasons in ranked.rejected.values())
+
+    tiny = run_prefilter(panel, PrefilterConfig(min_rs_rating=70.0, min_rs_cohort=100))
+    assert len(tiny.survivors) == 25
+
+
+@pytest.mark.asyncio
+async def test_scanner_service_only_runs_detectors_on_survivors(monkeypatch):
+    series = {"AAA": _uptrend(), "BBB": _downtrend(), "CCC": _uptrend(step=0.25)}
+
+    async def fake_get_all():
+        return {symbol: {"symbol": symbol} for symbol in series}
+
+    async def fake_time_series(ticker, interval="1day", outputsize=320, **kwargs):
+        if ticker == "SPY":
+            return _payload(_uptrend())
+        return _payload(series[ticker])
+
+    monkeypatch.setattr(universe_store, "get_all", fake_get_all)
+    monkeypatch.setattr(market_data_service, "get_time_series", fake_time_series)
+    monkeypatch.setattr(universe_prefilter.market_data_service, "get_time_series", fake_time_series)
+
+    scanned = []
+
+    async def stub_scan_symbol(self, symbol, metadata, spy_closes, sem, missing_symbols, minervini_trend=False, vcp=False, price_data=None):
+        assert price_data is not None
+        scanned.append(symbol)
+        return None
+
+    monkeypatch.setattr(ScannerService, "_scan_symbol", stub_scan_symbol)
+
+    payload = await ScannerService(max_symbols=10).run_daily_vcp_scan(limit=5, minervini_trend=True)
+
+    assert sorted(scanned) == ["AAA", "CCC"]
+    assert payload["meta"]["prefilter"]["rejected"] == 1
+
+    # Without the trend template, phase 1 must not apply the Minervini screens
+    scanned.clear()
+    payload = await ScannerService(max_symbols=10).run_daily_vcp_scan(limit=5)
+    assert sorted(scanned) == ["AAA", "BBB", "CCC"]
+    assert payload["meta"]["prefilter"]["rejected"] == 0
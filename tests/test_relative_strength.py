@@ -368,6 +368,73 @@ class TestMinerviniFormula:
         assert score_recent > score_consistent, "Recent strong performance should score higher due to Q4 weighting"
 
 
+class TestUniverseRanking:
+    """Test the vectorized universe ranking"""
+    
+    def _universe(self, count, seed=7):
+        rng = np.random.default_rng(seed)
+        returns = rng.normal(0.0005, 0.02, size=(count, 300))
+        return {f'S{i:04d}': 100 * np.cumprod(1 + returns[i]) for i in range(count)}
+    
+    def test_batch_matches_single_symbol_ratings(self):
+        """Batch ratings agree with per-symbol calculation"""
+        calc = RelativeStrengthCalculator()
+        universe = self._universe(50)
+        universe['SHORT'] = np.ones(100) * 100
+        
+        ranking = calc.rank_universe(universe)
+        assert 'SHORT' not in ranking
+        assert len(ranking) == 50
+        
+        for symbol in ['S0000', 'S0017', 'S0049']:
+            single = calc.calculate_rs_rating(symbol, universe[symbol], universe)
+            batch = ranking.rating(symbol)
+            assert batch.rs_rating == single.rs_rating
+            assert batch.universe_rank == single.universe_rank
+            assert batch.raw_score == pytest.approx(single.raw_score)
+            assert batch.q4_performance == pytest.approx(single.q4_performance)
+        
+        ratings = ranking.ratings()
+        assert min(ratings.values()) >= 1 and max(ratings.values()) <= 99
+        best = ranking.symbols[int(np.argmax(ranking.scores))]
+        assert ranking.rating(best).universe_rank == 1
+    
+    def test_single_lookups_reuse_a_passed_ranking(self, monkeypatch):
+        """Lookups given a ranking never re-rank; without one they see current prices"""
+        calc = RelativeStrengthCalculator()
+        universe = self._universe(20)
+        ranking = calc.rank_universe(universe)
+        calls = []
+        original = calc.rank_universe
+        monkeypatch.setattr(calc, 'rank_universe', lambda prices: calls.append(1) or original(prices))
+        
+        for symbol, prices in universe.items():
+            rating = calc.calculate_rs_rating(symbol, prices, universe, ranking=ranking)
+            assert rating.rs_rating == ranking.rating(symbol).rs_rating
+        assert calls == []
+        
+        # Same dict, prices updated in place: an unranked lookup must not be stale
+        symbol = ranking.symbols[int(np.argmin(ranking.scores))]
+        universe[symbol] = universe[symbol] * np.linspace(1.0, 3.0, len(universe[symbol]))
+        before = ranking.rating(symbol).rs_rating
+        after = calc.calculate_rs_rating(symbol, universe[symbol], universe).rs_rating
+        assert len(calls) == 1 and after > before
+    
+    def test_rates_large_universe_quickly(self):
+        """3,000 symbols rank in well under a second"""
+        import time
+        
+        calc = RelativeStrengthCalculator()
+        universe = self._universe(3000)
+        
+        started = time.perf_counter()
+        ratings = calc.rank_universe(universe).ratings()
+        elapsed = time.perf_counter() - started
+        
+        assert len(ratings) == 3000
+        assert elapsed < 1.0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
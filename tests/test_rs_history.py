@@ -0,0 +1,66 @@
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.core.pattern_engine.scoring import PatternScorer
+from app.services.database import DatabaseService
+from app.services.relative_strength import RelativeStrengthCalculator, filter_by_rs_threshold
+from app.services.rs_history import RSHistoryStore, load_latest_ratings, publish_latest_ratings
+
+
+def _universe(count, seed=3):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0005, 0.02, size=(count, 260))
+    return {f"S{i:03d}": 100 * np.cumprod(1 + returns[i]) for i in range(count)}
+
+
+@pytest.fixture
+def store():
+    db = DatabaseService("sqlite://")
+    db.init_db()
+    return RSHistoryStore(db, batch_size=7)
+
+
+def test_write_ranking_is_queryable_and_idempotent(store):
+    calc = RelativeStrengthCalculator()
+    today = datetime.now(timezone.utc).date()
+    yesterday = today - timedelta(days=1)
+    first = calc.rank_universe(_universe(20, seed=1))
+    second = calc.rank_universe(_universe(20, seed=2))
+
+    assert store.write_ranking(first, yesterday) == 20
+    assert store.write_ranking(second, today) == 20
+    assert store.write_ranking(second, today) == 20  # Re-run replaces the day
+
+    assert store.latest_date() == today
+    trajectory = store.trajectory("s005", days=30)
+    assert [row["date"] for row in trajectory] == [yesterday.isoformat(), today.isoformat()]
+    assert trajectory[-1]["rs_rating"] == second.ratings()["S005"]
+
+    dist = store.distribution()
+    assert dist["universe_size"] == 20
+    assert sum(dist["histogram"]) == 20
+    assert dist["ratings"][0]["universe_rank"] == 1
+    assert store.distribution(date(2000, 1, 1)) is None
+
+
+@pytest.mark.asyncio
+async def test_latest_ratings_snapshot_round_trips(fake_cache):
+    ranking = RelativeStrengthCalculator().rank_universe(_universe(10))
+
+    assert await load_latest_ratings(fake_cache) == {}
+    await publish_latest_ratings(fake_cache, ranking, date(2024, 1, 5))
+
+    assert await load_latest_ratings(fake_cache) == ranking.ratings()
+
+
+def test_scoring_and_filters_read_stored_ratings():
+    scorer = PatternScorer()
+    assert scorer._score_relative_strength({}, {"rs_rating": 92}) == 10.0
+    assert scorer._score_relative_strength({}, {"rs_rating": 30}) == 2.5
+    assert scorer._score_relative_strength({}, {}) == 5.0
+
+    patterns = [{"ticker": "AAA"}, {"ticker": "BBB"}, {"ticker": "CCC", "rs_rating": 90}]
+    kept = filter_by_rs_threshold(patterns, min_rs=70, ratings={"AAA": 80, "BBB": 40})
+    assert [p["ticker"] for p in kept] == ["AAA", "CCC"]
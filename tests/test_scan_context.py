@@ -0,0 +1,76 @@
+import pytest
+
+from app.core.pattern_engine.context import ScanContext
+from app.core.pattern_engine.filters.regime import MarketRegimeFilter
+from app.core.pattern_engine.scanner import ScanConfig, UniverseScanner
+from app.core.universe_panel import build_panel
+from app.services import panel_store
+from app.services.market_data import market_data_service
+from app.services.panel_store import PanelStore
+
+
+def _series(start, step, bars=260):
+    closes = [start + step * idx for idx in range(bars)]
+    return {"o": closes, "h": closes, "l": closes, "c": closes, "v": [1e6] * bars}
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = []
+
+    async def _get_time_series(ticker, interval="1day", outputsize=500, **kwargs):
+        calls.append(ticker)
+        return _series(100.0, 0.5 if ticker == "SPY" else 1.0)
+
+    monkeypatch.setattr(market_data_service, "get_time_series", _get_time_series)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_build_fetches_benchmark_and_classifies_regime(fetches):
+    context = await ScanContext.build(bars=260, sectors={"aapl": "Technology"})
+
+    assert fetches == ["SPY"]
+    assert context.regime["trend"] == "BULL"
+    assert context.sector("AAPL") == "Technology"
+    assert await MarketRegimeFilter().analyze_regime(context) is context.regime
+    assert fetches == ["SPY"]
+
+
+def test_rs_percentile_ranks_within_universe():
+    context = ScanContext(benchmark=_series(100.0, 0.5))
+    context.add_rs_distribution([_series(100.0, step) for step in (0.1, 0.3, 0.5, 1.0)] + [None])
+
+    assert len(context.rs_distribution) == 4
+    assert context.rs_percentile(_series(100.0, 2.0)["c"]) == 100.0
+    assert context.rs_percentile(_series(100.0, 0.0)["c"]) == 0.0
+    assert ScanContext().rs_percentile(_series(100.0, 1.0)["c"]) is None
+
+
+@pytest.mark.asyncio
+async def test_build_ranks_rs_against_the_shared_panel(fetches, tmp_path, monkeypatch):
+    store = PanelStore(tmp_path / "panel")
+    store.publish(build_panel({f"S{step}": _series(100.0, step) for step in (0.1, 0.3, 0.5, 1.0)}, bars=260))
+    monkeypatch.setattr(panel_store, "get_panel_store", lambda: store)
+
+    context = await ScanContext.build(bars=260)
+
+    assert len(context.rs_distribution) == 4
+    assert context.rs_percentile(_series(100.0, 0.4)["c"]) == 50.0
+    assert (await ScanContext.build(bars=260, interval="1week")).rs_distribution == []
+
+
+@pytest.mark.asyncio
+async def test_universe_scan_shares_one_context(fetches, monkeypatch):
+    scanner = UniverseScanner(detector=None, filter_system=None, scorer=None)
+    seen = []
+
+    async def _run(symbol, data, context=None):
+        seen.append(context)
+        return []
+
+    monkeypatch.setattr(scanner.pipeline, "run", _run)
+    await scanner.scan_universe(ScanConfig(universe=["AAA", "BBB", "CCC"], max_concurrent=2))
+
+    assert fetches.count("SPY") == 1
+    assert len(seen) == 3 and all(context is seen[0] for context in seen)
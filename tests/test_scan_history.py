@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, text
+
+from app.models import PatternScan, TickerPatternSeen
+from app.services.database import DatabaseService
+from app.services.scan_history import add_months, month_start, partition_name
+
+
+@pytest.fixture
+def db():
+    service = DatabaseService("sqlite://")
+    service.init_db()
+    return service
+
+
+def _scan(symbol, pattern="VCP", score=8.0, days_ago=0.0):
+    return {
+        "ticker_symbol": symbol,
+        "pattern": pattern,
+        "score": score,
+        "scanned_at": datetime.now(timezone.utc) - timedelta(days=days_ago),
+    }
+
+
+def test_rows_are_routed_to_month_tables(db):
+    db.save_pattern_scans_batch([_scan("AAPL"), _scan("MSFT", days_ago=40)])
+
+    now = datetime.now(timezone.utc)
+    with db.engine.connect() as conn:
+        partitions = db.scan_history.partitions(conn)
+        counts = {
+            name: conn.execute(text(f"SELECT COUNT(*) FROM {name}")).scalar()
+            for name in partitions.values()
+        }
+    assert add_months(month_start(now), 2) in partitions  # Created ahead of time
+    assert counts[partition_name(month_start(now))] >= 1
+    assert counts[partition_name(month_start(now - timedelta(days=40)))] >= 1
+    assert sum(counts.values()) == 2
+
+
+def test_recent_pages_with_keyset_cursor(db):
+    db.save_pattern_scans_batch(
+        [_scan(f"T{i}", days_ago=i * 7) for i in range(6)] + [_scan("FLAT", pattern="Flat Base")]
+    )
+    store = db.scan_history
+
+    first = store.recent(pattern_type="VCP", days=60, limit=4)
+    second = store.recent(pattern_type="VCP", days=60, limit=4, cursor=first["next_cursor"])
+
+    assert [item["ticker"] for item in first["items"]] == ["T0", "T1", "T2", "T3"]
+    assert [item["ticker"] for item in second["items"]] == ["T4", "T5"]
+    assert second["next_cursor"] is None
+    assert [item["ticker"] for item in store.recent(pattern_type="VCP", days=10)["items"]] == ["T0", "T1"]
+    with pytest.raises(ValueError):
+        store.recent(cursor="garbage")
+
+
+def test_ticker_history_and_legacy_rows(db):
+    with db.get_db() as session:
+        session.execute(text("INSERT INTO tickers (symbol) VALUES ('NVDA')"))
+        session.add(PatternScan(ticker_id=1, pattern_type="Cup & Handle", score=7.5))
+        session.commit()
+    db.save_pattern_scans_batch([_scan("NVDA", score=9.0, days_ago=1)])
+
+    db.scan_history.ensure_partitions()  # Adopts rows left in the plain table
+
+    history = db.scan_history.ticker_history("nvda")
+    assert [item["pattern"] for item in history["items"]] == ["Cup & Handle", "VCP"]
+    assert db.get_recent_scans(pattern_type="VCP")[0]["ticker"] == "NVDA"
+    assert db.scan_history.ticker_history("UNKNOWN")["items"] == []
+
+
+def test_rollup_is_idempotent(db):
+    day = datetime.now(timezone.utc).date() - timedelta(days=1)
+    noon = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=12)
+    scans = [
+        {"ticker_symbol": "AAPL", "pattern": "VCP", "score": 8.5, "scanned_at": noon},
+        {"ticker_symbol": "AAPL", "pattern": "VCP", "score": 6.2, "scanned_at": noon + timedelta(hours=1)},
+        {"ticker_symbol": "MSFT", "pattern": "VCP", "score": 10.0, "scanned_at": noon},
+        {"ticker_symbol": "MSFT", "pattern": "VCP", "score": 5.0, "scanned_at": noon + timedelta(days=1)},
+    ]
+    db.save_pattern_scans_batch(scans)
+    store = db.scan_history
+
+    assert store.rollup(day) == store.rollup(day)
+
+    (rollup,) = store.rollups(days=7)
+    assert rollup["scans"] == 3 and rollup["tickers"] == 2
+    assert rollup["min_score"] == 6.2 and rollup["max_score"] == 10.0
+    assert rollup["score_histogram"][6] == 1 and rollup["score_histogram"][9] == 1
+    with db.get_db() as session:
+        seen = session.execute(
+            select(TickerPatternSeen.best_score, TickerPatternSeen.last_seen).order_by(TickerPatternSeen.best_score)
+        ).all()
+    assert [(row.best_score, row.last_seen.hour) for row in seen] == [(8.5, 13), (10.0, 12)]
+
+
+def test_retention_drops_old_months(db):
+    store = db.scan_history
+    store.retention_days = 60
+    db.save_pattern_scans_batch([_scan("OLD", days_ago=120), _scan("EDGE", days_ago=61), _scan("NEW")])
+
+    result = store.apply_retention()
+
+    assert partition_name(month_start(datetime.now(timezone.utc) - timedelta(days=120))) in result[
+        "dropped_partitions"
+    ]
+    assert [item["ticker"] for item in store.recent(days=365)["items"]] == ["NEW"]
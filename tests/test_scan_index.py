@@ -0,0 +1,55 @@
+import pytest
+
+from app.services.scan_index import ScanIndex
+
+
+def _summary(results):
+    return {"scan_date": "20240105", "total_symbols": 100, "generated_at": "2024-01-05T21:00:00Z", "results": results}
+
+
+def _result(symbol, score, sector="Technology", pattern="VCP"):
+    return {"symbol": symbol, "score": score, "sector": sector, "pattern": pattern}
+
+
+@pytest.mark.asyncio
+async def test_query_pages_results_by_score(fake_cache):
+    index = ScanIndex(fake_cache)
+    await index.write("20240105", _summary([_result(f"S{i}", float(i)) for i in range(10)]))
+
+    page = await index.query(min_score=3.0, offset=2, limit=3)
+
+    assert page["scan_date"] == "20240105"
+    assert page["total"] == 7
+    assert [item["symbol"] for item in page["results"]] == ["S7", "S6", "S5"]
+
+
+@pytest.mark.asyncio
+async def test_query_filters_by_sector_and_pattern(fake_cache):
+    index = ScanIndex(fake_cache)
+    await index.write(
+        "20240105",
+        _summary([
+            _result("AAA", 8.0, "Technology", "VCP"),
+            _result("BBB", 9.0, "Health Care", "Cup and Handle"),
+            _result("CCC", 7.0, "Health Care", "VCP"),
+        ]),
+    )
+
+    sector = await index.query(sector="health care")
+    pattern = await index.query(pattern="VCP")
+
+    assert [item["symbol"] for item in sector["results"]] == ["BBB", "CCC"]
+    assert [item["symbol"] for item in pattern["results"]] == ["AAA", "CCC"]
+
+
+@pytest.mark.asyncio
+async def test_rewrite_replaces_previous_index(fake_cache, fake_redis):
+    index = ScanIndex(fake_cache)
+    await index.write("20240105", _summary([_result("AAA", 8.0, "Energy")]))
+    await index.write("20240105", _summary([_result("BBB", 7.0, "Technology")]))
+
+    page = await index.query(scan_date="20240105")
+
+    assert [item["symbol"] for item in page["results"]] == ["BBB"]
+    assert not await fake_redis.exists("scan:idx:20240105:sector:energy")
+    assert await index.query(scan_date="20240101") is None
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+from app.services import scan_jobs
+from app.services.scan_jobs import ScanJobQueue, ScanJobWorker
+
+
+async def _fake_runner(params):
+    for idx, ticker in enumerate(params["tickers"], start=1):
+        yield {"event": "result", "ticker": ticker, "data": {"ticker": ticker, "score": idx}}
+        yield {"event": "progress", "completed": idx, "total": len(params["tickers"])}
+    yield {"event": "summary", "results": [{"ticker": params["tickers"][-1]}], "count": 1}
+
+
+async def _failing_runner(params):
+    yield {"event": "progress", "completed": 0, "total": 1}
+    raise RuntimeError("provider exploded")
+
+
+async def _slow_runner(params):
+    yield {"event": "progress", "completed": 0, "total": 1}
+    await asyncio.sleep(10)
+    yield {"event": "summary", "count": 0}
+
+
+@pytest.fixture
+def queue(fake_cache, monkeypatch):
+    monkeypatch.setitem(scan_jobs.JOB_RUNNERS, "fake", _fake_runner)
+    monkeypatch.setitem(scan_jobs.JOB_RUNNERS, "boom", _failing_runner)
+    monkeypatch.setitem(scan_jobs.JOB_RUNNERS, "slow", _slow_runner)
+    return ScanJobQueue(fake_cache)
+
+
+@pytest.mark.asyncio
+async def test_submit_runs_and_stores_result(queue):
+    submitted = await queue.submit("fake", {"tickers": ["AAA", "BBB"]})
+    assert submitted["status"] == "queued"
+    assert submitted["deduplicated"] is False
+
+    finished = await ScanJobWorker(queue).run_once()
+
+    assert finished["status"] == "complete"
+    stored = await queue.get(submitted["job_id"])
+    assert stored["status"] == "complete"
+    assert stored["progress"] == {"completed": 2, "total": 2}
+    assert [r["ticker"] for r in stored["partial_results"]] == ["AAA", "BBB"]
+    assert stored["result"]["count"] == 1
+    assert await ScanJobWorker(queue).run_once() is None
+
+
+@pytest.mark.asyncio
+async def test_identical_in_flight_requests_are_deduplicated(queue):
+    first = await queue.submit("fake", {"tickers": ["AAA"]})
+    second = await queue.submit("fake", {"tickers": ["AAA"]})
+    other = await queue.submit("fake", {"tickers": ["ZZZ"]})
+
+    assert second["job_id"] == first["job_id"]
+    assert second["deduplicated"] is True
+    assert other["job_id"] != first["job_id"]
+
+    worker = ScanJobWorker(queue)
+    await worker.run_once()
+    again = await queue.submit("fake", {"tickers": ["AAA"]})
+    assert again["job_id"] != first["job_id"]
+
+
+@pytest.mark.asyncio
+async def test_cancel_queued_and_running_jobs(queue, monkeypatch):
+    queued = await queue.submit("fake", {"tickers": ["AAA"]})
+    cancelled = await queue.cancel(queued["job_id"])
+    assert cancelled["status"] == "cancelled"
+    assert await ScanJobWorker(queue).run_once() is None
+
+    running = await queue.submit("fake", {"tickers": ["AAA", "BBB", "CCC"]})
+    job = await queue.get(running["job_id"])
+    job["status"] = "running"
+    await queue.save(job)
+    flagged = await queue.cancel(running["job_id"])
+    assert flagged["cancel_requested"] is True
+
+    monkeypatch.setattr(scan_jobs, "FLUSH_INTERVAL_SECONDS", 0.0)
+    job["status"] = "queued"
+    await queue.save(job)
+    finished = await ScanJobWorker(queue).run_once()
+    assert finished["status"] == "cancelled"
+    assert len(finished["partial_results"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_job_records_error_and_lists(queue):
+    await queue.submit("fake", {"tickers": ["AAA"]})
+    boom = await queue.submit("boom", {})
+    worker = ScanJobWorker(queue)
+    await worker.run_once()
+    failed = await worker.run_once()
+
+    assert failed["status"] == "failed"
+    assert "provider exploded" in failed["error"]
+    listed = await queue.list()
+    assert [j["job_id"] for j in listed][0] == boom["job_id"]
+    assert "result" not in listed[0]
+    assert [j["kind"] for j in await queue.list(status="failed")] == ["boom"]
+
+
+@pytest.mark.asyncio
+async def test_jobs_of_crashed_workers_are_requeued(queue, fake_redis):
+    submitted = await queue.submit("fake", {"tickers": ["AAA"]})
+    assert await queue.pop() == submitted["job_id"]  # Worker dies right after popping
+    assert await fake_redis.lrange(scan_jobs.JOB_PROCESSING_KEY, 0, -1) == [submitted["job_id"]]
+
+    assert await queue.requeue_stale() == 0  # Lease still held
+    await fake_redis.delete(scan_jobs.JOB_LEASE_TEMPLATE.format(job_id=submitted["job_id"]))
+    assert await queue.requeue_stale() == 1
+
+    finished = await ScanJobWorker(queue).run_once()
+    assert finished["status"] == "complete"
+    assert await fake_redis.llen(scan_jobs.JOB_PROCESSING_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_shutdown_requeues_the_running_job(queue, fake_redis):
+    submitted = await queue.submit("slow", {})
+    task = asyncio.create_task(ScanJobWorker(queue).run_once())
+    while (await queue.get(submitted["job_id"]))["status"] != "running":
+        await asyncio.sleep(0.01)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    job = await queue.get(submitted["job_id"])
+    assert job["status"] == "queued" and job["requeued"] == 1
+    assert await fake_redis.lrange(scan_jobs.JOB_QUEUE_KEY, 0, -1) == [submitted["job_id"]]
+    assert await fake_redis.llen(scan_jobs.JOB_PROCESSING_KEY) == 0
+    assert (await queue.submit("slow", {}))["deduplicated"] is True
+
+
+@pytest.mark.asyncio
+async def test_unknown_kind_is_rejected(queue):
+    with pytest.raises(ValueError):
+        await queue.submit("nope", {})
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event, select
+
+from app.models import PatternScan, Ticker
+from app.services.database import DatabaseService
+from app.services.scan_history import month_start
+from app.services.scan_persistence import _copy_field
+
+
+@pytest.fixture
+def db():
+    service = DatabaseService("sqlite://")
+    service.init_db()
+    return service
+
+
+def _scan(symbol, **overrides):
+    return {
+        "ticker_symbol": symbol,
+        "pattern": "VCP",
+        "score": 8.5,
+        "entry": 100.0,
+        "stop": 95.0,
+        "criteria_met": ["trend_template", "tight_closes"],
+        **overrides,
+    }
+
+
+def test_batch_writes_rows_with_json_criteria(db):
+    with db.get_db() as session:
+        session.add(Ticker(symbol="AAPL"))
+        session.commit()
+
+    written = db.save_pattern_scans_batch([_scan("AAPL"), _scan("msft", pattern="Flat Base"), {"pattern": "x"}])
+
+    assert written == 2
+    table = db.scan_history._month_table(month_start(datetime.now(timezone.utc)))
+    with db.get_db() as session:
+        rows = session.execute(
+            select(Ticker.symbol, table.c.pattern_type, table.c.criteria_met).join(Ticker, Ticker.id == table.c.ticker_id)
+        ).all()
+        assert session.query(Ticker).count() == 2
+        assert session.query(PatternScan).count() == 0  # Routed to the month table
+    assert sorted(rows) == [
+        ("AAPL", "VCP", ["trend_template", "tight_closes"]),
+        ("MSFT", "Flat Base", ["trend_template", "tight_closes"]),
+    ]
+
+
+def test_ticker_ids_are_cached_between_batches(db):
+    db.save_pattern_scans_batch([_scan("NVDA"), _scan("AMD")])
+    statements = []
+
+    @event.listens_for(db.engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    db.save_pattern_scans_batch([_scan("NVDA"), _scan("AMD"), _scan("AMD")])
+
+    assert not any("tickers" in statement for statement in statements)
+    assert sum("INSERT INTO pattern_scans" in statement for statement in statements) == 1
+
+
+def test_copy_fields_escape_text_format():
+    assert _copy_field(None) == r"\N"
+    assert _copy_field(True) == "t"
+    assert _copy_field(["a\tb"]) == '["a\\\\tb"]'
+    assert _copy_field("line\nbreak\\") == "line\\nbreak\\\\"
@@ -0,0 +1,33 @@
+from app.core.pattern_engine.scanner import TopK
+
+
+def _hit(symbol, score, pattern="Channel", confidence=0.5):
+    return {"symbol": symbol, "score": score, "pattern": pattern, "confidence": confidence}
+
+
+def test_top_k_keeps_best_results_in_order():
+    top = TopK(3)
+    for idx, score in enumerate([5.0, 9.0, 1.0, 7.0, 8.0, 2.0]):
+        top.push(_hit(f"S{idx}", score))
+
+    assert [item["score"] for item in top.results()] == [9.0, 8.0, 7.0]
+    assert len(top) == 3
+    assert top.seen == 6
+
+
+def test_top_k_breaks_score_ties_by_pattern_priority_then_order():
+    top = TopK(2)
+    top.push(_hit("AAA", 8.0, "Channel"))
+    top.push(_hit("BBB", 8.0, "VCP"))
+    top.push(_hit("CCC", 8.0, "Channel"))
+
+    assert [item["symbol"] for item in top.results()] == ["BBB", "AAA"]
+
+
+def test_top_k_without_limit_keeps_everything():
+    top = TopK()
+    for idx in range(10):
+        top.push(_hit(f"S{idx}", float(idx)))
+
+    assert len(top.results()) == 10
+    assert TopK(0).results() == []
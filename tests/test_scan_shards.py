@@ -0,0 +1,179 @@
+import asyncio
+
+import pytest
+
+from app.services import scan_shards
+from app.services.scan_shards import ACTIVE_SCANS_KEY, ShardedScan, merge_top_k, run_sharded_scan
+
+
+async def _fake_executor(symbols, params):
+    return {
+        "results": [{"symbol": s, "ticker": s, "pattern": "VCP", "score": float(len(s))} for s in symbols],
+        "errors": {},
+    }
+
+
+def test_merge_top_k_dedupes_by_priority_then_ranks():
+    shards = [
+        {"results": [{"symbol": "AAA", "pattern": "Outside Day", "score": 9.0}, {"symbol": "BBB", "pattern": "VCP", "score": 7.0}]},
+        {"results": [{"symbol": "AAA", "pattern": "VCP", "score": 6.0}, {"symbol": "CCC", "pattern": "VCP", "score": 8.0}]},
+    ]
+
+    merged = merge_top_k(shards, limit=2)
+
+    assert [(r["symbol"], r["rank"]) for r in merged] == [("CCC", 1), ("BBB", 2)]
+    everything = merge_top_k(shards)
+    assert {r["symbol"]: r["pattern"] for r in everything}["AAA"] == "VCP"
+
+
+def test_merge_top_k_breaks_ties_like_the_scanner():
+    from app.core.pattern_engine.scanner import rank_key
+
+    shards = [
+        {"results": [{"symbol": "AAA", "pattern": "Outside Day", "score": 8.0, "confidence": 0.9}]},
+        {"results": [{"symbol": "BBB", "pattern": "VCP", "score": 8.0, "confidence": 0.5}]},
+    ]
+
+    merged = merge_top_k(shards, limit=1)
+
+    assert [r["symbol"] for r in merged] == ["BBB"]  # Equal score: priority beats confidence
+    assert [r["symbol"] for r in merge_top_k(shards)] == [
+        item["symbol"] for item in sorted((s["results"][0] for s in shards), key=rank_key, reverse=True)
+    ]
+
+
+@pytest.fixture
+def prepared(monkeypatch):
+    calls = []
+
+    async def _prepare(params):
+        calls.append(dict(params))
+        return {**params, "context": params.get("context") or object()}
+
+    monkeypatch.setitem(scan_shards.SHARD_PREPARERS, "pattern_engine", _prepare)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_run_sharded_scan_merges_all_shards(fake_cache, monkeypatch, prepared):
+    monkeypatch.setitem(scan_shards.SHARD_EXECUTORS, "pattern_engine", _fake_executor)
+    symbols = ["A", "BB", "CCC", "DDDD", "EEEEE"]
+
+    reduced = await run_sharded_scan(fake_cache, symbols, shard_size=2, local_workers=2, limit=3, scan_id="t1")
+
+    assert [r["symbol"] for r in reduced["results"]] == ["EEEEE", "DDDD", "CCC"]
+    assert reduced["meta"]["shards"] == 3
+    assert reduced["meta"]["local_shards"] == 3
+    redis = await fake_cache._get_redis()
+    assert not await redis.exists("scan:shards:t1:results")
+    assert not await redis.sismember(ACTIVE_SCANS_KEY, "t1")
+    assert len(prepared) == 1  # Once per scan, shared by both local workers
+
+
+@pytest.mark.asyncio
+async def test_shards_share_the_local_context(fake_cache, monkeypatch, prepared):
+    contexts = []
+
+    async def _executor(symbols, params):
+        contexts.append(params["context"])
+        return await _fake_executor(symbols, params)
+
+    monkeypatch.setitem(scan_shards.SHARD_EXECUTORS, "pattern_engine", _executor)
+    context = object()
+
+    await run_sharded_scan(
+        fake_cache, ["A", "B", "C"], shard_size=1, params={"min_score": 6.0},
+        local_params={"context": context}, scan_id="t8",
+    )
+
+    assert contexts == [context] * 3
+    assert prepared == [{"min_score": 6.0, "context": context}]
+
+
+@pytest.mark.asyncio
+async def test_failed_shard_is_retried_then_recorded(fake_cache):
+    calls = []
+
+    async def flaky(symbols, params):
+        calls.append(symbols)
+        if symbols == ["BAD"]:
+            raise RuntimeError("boom")
+        return await _fake_executor(symbols, params)
+
+    sharded = ShardedScan(fake_cache, "t2", max_attempts=2)
+    await sharded.plan(["OK", "BAD"], shard_size=1)
+    await sharded.work("w1", poll_interval=0, executor=flaky)
+
+    assert calls.count(["BAD"]) == 2
+    reduced = await sharded.reduce()
+    assert [r["symbol"] for r in reduced["results"]] == ["OK"]
+    assert reduced["errors"] == {"BAD": "boom"}
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed(fake_cache):
+    dead = ShardedScan(fake_cache, "t3", lease_seconds=-1)
+    await dead.plan(["AAA"], shard_size=1)
+    assert await dead.claim() == 0  # Worker dies holding the lease
+
+    survivor = ShardedScan(fake_cache, "t3")
+    assert await survivor.claim() == 0
+    assert await survivor.claim() is None
+
+
+@pytest.mark.asyncio
+async def test_shard_that_keeps_losing_its_worker_is_failed(fake_cache):
+    crashy = ShardedScan(fake_cache, "t5", lease_seconds=-1, max_attempts=2)
+    await crashy.plan(["POISON"], shard_size=1)
+    assert await crashy.claim() == 0  # Attempt 1 dies
+    assert await crashy.claim() == 0  # Attempt 2 dies
+
+    assert await crashy.claim() is None
+    assert await crashy.is_done()
+    assert (await crashy.reduce())["errors"] == {"POISON": "lease expired"}
+
+
+@pytest.mark.asyncio
+async def test_slow_shard_keeps_its_lease(fake_cache):
+    sharded = ShardedScan(fake_cache, "t6", lease_seconds=0.15, steal_after=60)
+    await sharded.plan(["SLOW"], shard_size=1)
+    runs = []
+
+    async def slow(symbols, params):
+        runs.append(symbols)
+        await asyncio.sleep(0.4)  # Well past the lease; the heartbeat renews it
+        return await _fake_executor(symbols, params)
+
+    async def rival():
+        await asyncio.sleep(0.25)
+        return await sharded.claim()
+
+    processed, reclaimed = await asyncio.gather(sharded.work("w1", poll_interval=0, executor=slow), rival())
+    assert processed == 1 and reclaimed is None and runs == [["SLOW"]]
+
+
+@pytest.mark.asyncio
+async def test_late_result_after_cleanup_is_dropped(fake_cache):
+    sharded = ShardedScan(fake_cache, "t7")
+    await sharded.plan(["AAA", "BBB"], shard_size=1)
+    assert await sharded.claim() == 0
+    await sharded.cleanup()
+
+    assert await sharded.complete(0, await _fake_executor(["AAA"], {}), "late") is False
+    redis = await fake_cache._get_redis()
+    assert not await redis.exists(sharded.results_key)
+
+
+@pytest.mark.asyncio
+async def test_idle_worker_steals_straggler_and_first_result_wins(fake_cache):
+    sharded = ShardedScan(fake_cache, "t4", steal_after=0)
+    await sharded.plan(["SLOW"], shard_size=1)
+    assert await sharded.claim() == 0
+
+    thief = ShardedScan(fake_cache, "t4", steal_after=-1)
+    assert await thief.claim() == 0
+    assert await thief.claim() is None  # Only one speculative copy
+
+    assert await thief.complete(0, await _fake_executor(["SLOW"], {}), "thief") is True
+    assert await sharded.complete(0, {"results": []}, "slow") is False
+    assert (await sharded.reduce())["workers"] == {"thief": 1}
@@ -0,0 +1,128 @@
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.streaming import encode_sse, resolve_stream_format
+from app.services import scan_stream
+from app.services.pattern_scanner import pattern_scanner_service
+from app.services.universe_store import universe_store
+
+
+async def _fake_iter_scan(config):
+    for ticker in config.universe:
+        if ticker == "BAD":
+            yield ticker, None, RuntimeError("no data")
+        elif ticker == "NONE":
+            yield ticker, None, None
+        else:
+            yield ticker, {"ticker": ticker, "pattern": "VCP", "score": len(ticker)}, None
+
+
+@pytest.fixture
+def fake_engine(monkeypatch):
+    monkeypatch.setattr(pattern_scanner_service.engine_scanner, "iter_scan", _fake_iter_scan)
+
+
+@pytest.mark.asyncio
+async def test_stream_pattern_scan_emits_incremental_events(fake_engine):
+    events = [e async for e in scan_stream.stream_pattern_scan(["aa", "bad", "cccc", "none"], limit=1)]
+
+    kinds = [e["event"] for e in events]
+    assert kinds[0] == "start" and kinds[-1] == "summary"
+    assert kinds.count("progress") == 4
+    assert [e["ticker"] for e in events if e["event"] == "result"] == ["AA", "CCCC"]
+    assert events[kinds.index("error")]["ticker"] == "BAD"
+    summary = events[-1]
+    assert [r["ticker"] for r in summary["results"]] == ["CCCC"]
+    assert summary["errors"] == {"BAD": "no data"}
+
+
+@pytest.mark.asyncio
+async def test_stream_pattern_scan_summary_is_optional(fake_engine):
+    events = [e async for e in scan_stream.stream_pattern_scan(["AA"], summary=False)]
+    assert [e["event"] for e in events] == ["start", "result", "progress"]
+
+
+def test_scan_market_streams_ndjson(fake_engine, monkeypatch):
+    import app.api.patterns as patterns_mod
+
+    async def _noop():
+        return {}
+
+    monkeypatch.setattr(universe_store, "seed", _noop)
+    monkeypatch.setattr(universe_store, "get_all", _noop)
+    test_app = FastAPI()
+    test_app.include_router(patterns_mod.router)
+
+    res = TestClient(test_app).post("/api/patterns/scan-market?stream=ndjson&limit=3")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in res.text.splitlines()]
+    assert lines[0]["event"] == "start"
+    assert lines[-1]["event"] == "summary"
+    assert lines[-1]["count"] == 3
+
+
+class _StubUniverseService:
+    def __init__(self, cached=None):
+        self.cached = cached
+        self.stored = None
+
+    async def get_cached_scan(self, min_score):
+        return self.cached
+
+    async def store_scan(self, min_score, results):
+        self.stored = results
+
+    async def iter_scan_events(self, min_score=7.0, pattern_types=None):
+        yield {"event": "start", "total": 2}
+        yield {"event": "result", "ticker": "AAPL", "data": {"ticker": "AAPL", "pattern": "VCP", "score": 7.0}}
+        yield {"event": "progress", "completed": 1, "total": 2, "hits": 1}
+        yield {"event": "result", "ticker": "MSFT", "data": {"ticker": "MSFT", "pattern": "VCP", "score": 9.0}}
+        yield {"event": "progress", "completed": 2, "total": 2, "hits": 2}
+
+
+def test_universe_scan_streams_sse_and_caches(monkeypatch):
+    import app.api.universe as universe_mod
+
+    stub = _StubUniverseService()
+    monkeypatch.setattr(scan_stream, "universe_service", stub)
+    test_app = FastAPI()
+    test_app.include_router(universe_mod.router)
+
+    res = TestClient(test_app).post("/api/universe/scan?stream=sse", json={"min_score": 7.0})
+
+    assert res.headers["content-type"].startswith("text/event-stream")
+    frames = [f for f in res.text.split("\n\n") if f]
+    assert frames[0].startswith("event: start")
+    summary = json.loads(frames[-1].split("data: ", 1)[1])
+    assert [r["ticker"] for r in summary["results"]] == ["MSFT", "AAPL"]
+    assert [r["ticker"] for r in stub.stored] == ["MSFT", "AAPL"]
+
+
+@pytest.mark.asyncio
+async def test_stream_universe_scan_replays_cache(monkeypatch):
+    cached = [{"ticker": "NVDA", "pattern": "VCP", "score": 8.0}, {"ticker": "AMD", "pattern": "Flag", "score": 7.5}]
+    monkeypatch.setattr(scan_stream, "universe_service", _StubUniverseService(cached=cached))
+
+    events = [e async for e in scan_stream.stream_universe_scan(pattern_types=["VCP"])]
+
+    assert events[0]["cached"] is True
+    assert [e["ticker"] for e in events if e["event"] == "result"] == ["NVDA"]
+    assert events[-1]["meta"]["cached"] is True
+
+
+def test_stream_format_negotiation():
+    class _Req:
+        headers = {"accept": "text/event-stream"}
+
+    assert resolve_stream_format("ndjson") == "ndjson"
+    assert resolve_stream_format("xml") is None
+    assert resolve_stream_format(None, _Req()) == "sse"
+    assert resolve_stream_format(None) is None
+    assert encode_sse({"event": "progress", "completed": 1}).startswith("event: progress\ndata: {")
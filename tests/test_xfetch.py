@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services import xfetch as xfetch_module
+from app.services.xfetch import should_refresh, xfetch, xfetch_cached
+
+
+def test_refresh_probability_rises_towards_expiry(monkeypatch):
+    monkeypatch.setattr(xfetch_module.random, "random", lambda: 0.5)  # -ln(0.5) ~= 0.69
+    now = 1000.0
+
+    assert not should_refresh(delta=2.0, expiry=now + 10, now=now)
+    assert should_refresh(delta=2.0, expiry=now + 1, now=now)
+    assert should_refresh(delta=0.0, expiry=now, now=now)
+    assert not should_refresh(delta=20.0, expiry=now + 10, beta=0.5, now=now)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cold_misses_compute_once(fake_cache, monkeypatch):
+    monkeypatch.setattr(xfetch_module, "COLD_POLL_SECONDS", 0.001)
+    calls = []
+
+    async def _compute():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return {"spy": 1}
+
+    results = await asyncio.gather(*(xfetch(fake_cache, "internals", _compute, ttl=60) for _ in range(5)))
+
+    assert calls == [1]
+    assert results == [{"spy": 1}] * 5
+    entry = await fake_cache.get("internals")
+    assert entry["v"] == {"spy": 1} and entry["delta"] >= 0.02
+    assert not await (await fake_cache._get_redis()).exists("xfetch:lock:internals")
+
+
+@pytest.mark.asyncio
+async def test_early_refresh_serves_current_value_while_locked(fake_cache, fake_redis):
+    await fake_cache.set("scan", {"v": "old", "delta": 5.0, "expiry": time.time() + 1}, ttl=60)
+    await fake_redis.set("xfetch:lock:scan", "other-worker", ex=30)
+
+    async def _compute():
+        raise AssertionError("another worker holds the refresh lock")
+
+    assert await xfetch(fake_cache, "scan", _compute, ttl=60, beta=100) == "old"
+
+
+@pytest.mark.asyncio
+async def test_decorator_builds_key_from_arguments(fake_cache):
+    calls = []
+
+    @xfetch_cached(lambda symbol: f"quote:{symbol}", ttl=60, cache=fake_cache)
+    async def quote(symbol):
+        calls.append(symbol)
+        return {"symbol": symbol}
+
+    assert await quote("SPY") == {"symbol": "SPY"}
+    assert await quote("SPY") == {"symbol": "SPY"}
+    assert await quote("SPY", force_refresh=True) == {"symbol": "SPY"}
+    assert calls == ["SPY", "SPY"]